@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+OCR payload encoding benchmark for market monitoring system.
+Measures payload size, encode time and OCR text agreement of encoder variants on a stored corpus.
+
+Usage:
+    python benchmarks/ocr_encoding_benchmark.py --generate 12
+    python benchmarks/ocr_encoding_benchmark.py --corpus /tmp/encoding_corpus --generate 12
+    python benchmarks/ocr_encoding_benchmark.py --corpus /tmp/encoding_corpus --ocr tesseract
+    python benchmarks/ocr_encoding_benchmark.py --corpus /tmp/encoding_corpus --ocr yandex --config config.json
+
+Without --corpus the generated images live in a temporary folder for one run.
+"""
+
+import argparse
+import difflib
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from PIL import Image, ImageDraw
+
+from core.ocr_image_encoder import OCRImageEncoder
+
+try:
+    import pytesseract
+    TESSERACT_AVAILABLE = True
+except ImportError:
+    TESSERACT_AVAILABLE = False
+
+
+SAMPLE_TEXT = PROJECT_ROOT / "test" / "merged_images_vertical_text.txt"
+
+
+def generate_corpus(corpus_dir: Path, count: int, seed: int = 7) -> None:
+    """
+    Render synthetic merged market screenshots with ground truth text.
+    
+    Args:
+        corpus_dir: Output folder for <name>.png and <name>.txt pairs
+        count: Number of images
+        seed: Random seed for reproducible corpora
+    """
+    rng = random.Random(seed)
+    words = [line.strip() for line in SAMPLE_TEXT.read_text(encoding='utf-8').splitlines() if line.strip()]
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    
+    for index in range(count):
+        screenshots = rng.randint(3, 12)
+        width = rng.choice([445, 640, 800])
+        lines = []
+        merged = Image.new('RGB', (width, screenshots * 180), (24, 26, 30))
+        draw = ImageDraw.Draw(merged)
+        
+        for shot in range(screenshots):
+            top = shot * 180
+            draw.rectangle((0, top, width - 1, top + 179), outline=(60, 64, 70))
+            for row in range(rng.randint(3, 6)):
+                seller = rng.choice(words)
+                price = f"{rng.randint(1, 999)},{rng.randint(0, 999):03d}"
+                text = f"{seller}  {rng.randint(1, 50)}  {price}"
+                draw.text((14, top + 16 + row * 26), text, fill=(214, 206, 180))
+                lines.append(text)
+        
+        name = f"merged_{index:03d}"
+        merged.save(corpus_dir / f"{name}.png")
+        (corpus_dir / f"{name}.txt").write_text("\n".join(lines), encoding='utf-8')
+    
+    print(f"Generated {count} corpus images in {corpus_dir}")
+
+
+def baseline_encode(image: Image.Image) -> bytes:
+    """Previous behaviour: RGB JPEG at fixed quality 85."""
+    buffer = io.BytesIO()
+    image.convert('RGB').save(buffer, format='JPEG', optimize=True, quality=85)
+    return buffer.getvalue()
+
+
+def build_variants(max_bytes: int) -> Dict[str, Callable[[Image.Image], bytes]]:
+    """Encoder variants to compare, keyed by name."""
+    variants = {'baseline_jpeg85': baseline_encode}
+    configs = {
+        'encoder_default': {},
+        'png_gray': {'encodings': ['png_gray']},
+        'png_palette': {'encodings': ['png_palette']},
+        'jpeg_ladder': {'encodings': ['jpeg']},
+        'webp_ladder': {'encodings': ['webp']},
+        'default_no_trim': {'trim_margins': False, 'collapse_blank_rows': False}
+    }
+    for name, options in configs.items():
+        encoder = OCRImageEncoder(max_bytes=max_bytes, **options)
+        variants[name] = lambda image, encoder=encoder: encoder.encode(image).data
+    return variants
+
+
+def make_ocr(engine: str, config_path: Optional[Path]) -> Optional[Callable[[bytes], str]]:
+    """Create OCR function for encoded bytes, or None to skip agreement."""
+    if engine == 'none':
+        return None
+    
+    if engine == 'tesseract':
+        if not TESSERACT_AVAILABLE:
+            raise SystemExit("pytesseract is not installed")
+        return lambda data: pytesseract.image_to_string(Image.open(io.BytesIO(data)))
+    
+    from config.settings import SettingsManager
+    from core.simple_ocr_client import SimpleYandexOCRClient
+    
+    settings = SettingsManager(str(config_path or PROJECT_ROOT / "config.json"))
+    client = SimpleYandexOCRClient(api_key=settings.yandex_ocr.api_key)
+    return lambda data: client.process_image_bytes(data) or ""
+
+
+def agreement(text: str, reference: str) -> float:
+    """Similarity of recognized text to reference, ignoring whitespace layout."""
+    return difflib.SequenceMatcher(None, " ".join(text.split()), " ".join(reference.split())).ratio()
+
+
+def run_benchmark(corpus_dir: Path, ocr: Optional[Callable[[bytes], str]],
+                  max_bytes: int) -> List[Dict[str, object]]:
+    """
+    Encode every corpus image with every variant.
+    
+    Returns:
+        One result row per variant
+    """
+    images = sorted(corpus_dir.glob("*.png")) + sorted(corpus_dir.glob("*.jpg"))
+    if not images:
+        raise SystemExit(f"No corpus images in {corpus_dir}, run with --generate N first")
+    
+    variants = build_variants(max_bytes)
+    totals = {name: {'bytes': 0, 'time': 0.0, 'agreement': []} for name in variants}
+    
+    for path in images:
+        with Image.open(path) as source:
+            image = source.convert('RGB')
+        
+        truth_path = path.with_suffix('.txt')
+        reference = truth_path.read_text(encoding='utf-8') if truth_path.exists() else None
+        if ocr and reference is None:
+            # No ground truth: agreement is measured against OCR of the lossless original
+            reference = ocr(path.read_bytes())
+        
+        for name, encode in variants.items():
+            start_time = time.perf_counter()
+            data = encode(image)
+            totals[name]['time'] += time.perf_counter() - start_time
+            totals[name]['bytes'] += len(data)
+            if ocr:
+                totals[name]['agreement'].append(agreement(ocr(data), reference))
+    
+    baseline_bytes = totals['baseline_jpeg85']['bytes']
+    rows = []
+    for name, total in totals.items():
+        scores = total['agreement']
+        rows.append({
+            'variant': name,
+            'images': len(images),
+            'total_kb': round(total['bytes'] / 1024, 1),
+            'size_vs_baseline': round(total['bytes'] / baseline_bytes, 3),
+            'mean_encode_ms': round(total['time'] * 1000 / len(images), 2),
+            'mean_agreement': round(sum(scores) / len(scores), 4) if scores else None
+        })
+    return rows
+
+
+def print_table(rows: List[Dict[str, object]]) -> None:
+    """Print results as an aligned table."""
+    header = f"{'variant':<18} {'total KB':>10} {'vs base':>8} {'enc ms':>8} {'agreement':>10}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        score = "n/a" if row['mean_agreement'] is None else f"{row['mean_agreement']:.4f}"
+        print(
+            f"{row['variant']:<18} {row['total_kb']:>10.1f} {row['size_vs_baseline']:>8.3f} "
+            f"{row['mean_encode_ms']:>8.2f} {score:>10}"
+        )
+
+
+def main() -> None:
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description='OCR payload encoding benchmark')
+    parser.add_argument('--corpus', type=Path, help='Corpus folder of images and .txt truth (default: temporary)')
+    parser.add_argument('--generate', type=int, default=0, help='Generate N synthetic corpus images first')
+    parser.add_argument('--ocr', choices=['none', 'tesseract', 'yandex'], default='none',
+                        help='OCR engine used to measure text agreement')
+    parser.add_argument('--config', type=Path, help='Configuration file with Yandex OCR API key')
+    parser.add_argument('--max-bytes', type=int, default=4 * 1024 * 1024, help='Encoder byte cap')
+    parser.add_argument('--json', type=Path, help='Write results as JSON')
+    args = parser.parse_args()
+    
+    if args.corpus is None and not args.generate:
+        parser.error("pass --corpus DIR or --generate N")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Generated corpora stay out of the source tree unless a folder is given
+        corpus_dir = args.corpus or Path(temp_dir)
+        if args.generate:
+            generate_corpus(corpus_dir, args.generate)
+        
+        rows = run_benchmark(corpus_dir, make_ocr(args.ocr, args.config), args.max_bytes)
+    print_table(rows)
+    
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=2), encoding='utf-8')
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Text parser performance and accuracy benchmark for market monitoring system.
+Runs TextParser.parse_items_data over a stored corpus of anonymized OCR outputs and reports
+throughput, allocations and precision/recall against golden items.
+
+Usage:
+    python benchmarks/parser_benchmark.py
+    python benchmarks/parser_benchmark.py --repeat 200 --scale 20 --json run.json
+    python benchmarks/parser_benchmark.py --baseline previous.json --tolerance 0.2 --accuracy-tolerance 0.01
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from core.database_manager import ItemData
+from core.text_parser import TextParser
+
+
+DEFAULT_CORPUS = PROJECT_ROOT / "benchmarks" / "corpus" / "parser"
+
+ItemKey = Tuple[str, str, Optional[float], Optional[int]]
+
+
+@dataclass
+class ParserCase:
+    """One stored OCR output with its golden items."""
+    name: str
+    text: str
+    hotkey: str
+    processing_type: str
+    golden: List[ItemKey]
+    
+    @property
+    def format(self) -> str:
+        """Corpus format, the case name prefix (trade, broker, fallback)."""
+        return self.name.split('_', 1)[0]
+
+
+def item_key(item: Any) -> ItemKey:
+    """Comparable key of an ItemData or golden item dictionary."""
+    if isinstance(item, ItemData):
+        item = item.__dict__
+    price = item.get('price')
+    quantity = item.get('quantity')
+    return (item['seller_name'], item['item_name'],
+            float(price) if price is not None else None,
+            int(quantity) if quantity is not None else None)
+
+
+def load_corpus(corpus_dir: Path, scale: int = 1) -> List[ParserCase]:
+    """
+    Load <name>.txt OCR outputs with <name>.json golden items.
+    
+    Args:
+        corpus_dir: Corpus folder
+        scale: Repeat each text this many times to measure large inputs
+    
+    Returns:
+        Cases sorted by name
+    """
+    cases = []
+    for golden_path in sorted(corpus_dir.glob("*.json")):
+        text_path = golden_path.with_suffix('.txt')
+        if not text_path.exists():
+            continue
+        golden = json.loads(golden_path.read_text(encoding='utf-8'))
+        text = text_path.read_text(encoding='utf-8')
+        if not text.endswith('\n'):
+            text += '\n'
+        cases.append(ParserCase(
+            name=golden_path.stem,
+            text=text * scale,
+            hotkey=golden['hotkey'],
+            processing_type=golden['processing_type'],
+            golden=[item_key(item) for item in golden['items']] * scale
+        ))
+    return cases
+
+
+def score(items: List[ItemData], golden: List[ItemKey]) -> Dict[str, int]:
+    """
+    Count extracted items matching golden items, as multisets.
+    
+    Returns:
+        Dictionary with true positives, false positives and false negatives
+    """
+    extracted = Counter(item_key(item) for item in items)
+    expected = Counter(golden)
+    true_positives = sum((extracted & expected).values())
+    return {
+        'true_positives': true_positives,
+        'false_positives': sum(extracted.values()) - true_positives,
+        'false_negatives': sum(expected.values()) - true_positives
+    }
+
+
+def accuracy(counts: Dict[str, int]) -> Dict[str, float]:
+    """Precision and recall from match counts."""
+    extracted = counts['true_positives'] + counts['false_positives']
+    expected = counts['true_positives'] + counts['false_negatives']
+    return {
+        'precision': round(counts['true_positives'] / extracted, 4) if extracted else 1.0,
+        'recall': round(counts['true_positives'] / expected, 4) if expected else 1.0
+    }
+
+
+def measure_allocations(parser: TextParser, case: ParserCase) -> Dict[str, int]:
+    """
+    Trace memory allocations of one parse.
+    
+    Returns:
+        Peak traced bytes and number of memory blocks allocated by the parse and still alive with its result
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        result = parser.parse_items_data(case.text, case.hotkey, processing_type=case.processing_type)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+    del result
+    return {'alloc_peak_kb': round(peak / 1024, 1), 'alloc_blocks': blocks}
+
+
+def run_benchmark(cases: List[ParserCase], repeat: int = 50) -> Dict[str, Any]:
+    """
+    Parse every case repeatedly and score one parse against its golden items.
+    
+    Args:
+        cases: Corpus cases
+        repeat: Timed parses per case
+    
+    Returns:
+        Report with per-case, per-format and overall throughput and accuracy
+    """
+    parser = TextParser()
+    report_cases = {}
+    formats: Dict[str, Dict[str, Any]] = {}
+    totals = {'bytes': 0, 'lines': 0, 'seconds': 0.0, 'true_positives': 0, 'false_positives': 0, 'false_negatives': 0}
+    
+    for case in cases:
+        result = parser.parse_items_data(case.text, case.hotkey, processing_type=case.processing_type)
+        counts = score(result.items, case.golden)
+        
+        start = time.perf_counter()
+        for _ in range(repeat):
+            parser.parse_items_data(case.text, case.hotkey, processing_type=case.processing_type)
+        seconds = time.perf_counter() - start
+        
+        size = len(case.text.encode('utf-8')) * repeat
+        lines = case.text.count('\n') * repeat
+        row = {
+            'format': case.format,
+            'processing_type': case.processing_type,
+            'items': len(result.items),
+            'golden': len(case.golden),
+            'mb_per_s': round(size / seconds / 1e6, 3),
+            'lines_per_s': round(lines / seconds),
+            'ms_per_parse': round(seconds / repeat * 1000, 3),
+            **measure_allocations(parser, case),
+            **counts,
+            **accuracy(counts)
+        }
+        report_cases[case.name] = row
+        
+        for group in (formats.setdefault(case.format, dict.fromkeys(totals, 0)), totals):
+            group['bytes'] += size
+            group['lines'] += lines
+            group['seconds'] += seconds
+            for key in counts:
+                group[key] += counts[key]
+    
+    def summarize(group: Dict[str, Any]) -> Dict[str, Any]:
+        seconds = group['seconds'] or 1e-9
+        return {
+            'mb_per_s': round(group['bytes'] / seconds / 1e6, 3),
+            'lines_per_s': round(group['lines'] / seconds),
+            **accuracy(group)
+        }
+    
+    return {
+        'repeat': repeat,
+        'cases': report_cases,
+        'formats': {name: summarize(group) for name, group in formats.items()},
+        'overall': summarize(totals)
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print per-case throughput, allocations and accuracy as an aligned table."""
+    header = (f"{'case':<18} {'items':>11} {'MB/s':>8} {'lines/s':>10} {'ms':>8} "
+              f"{'peak KB':>8} {'blocks':>7} {'prec':>6} {'recall':>6}")
+    print(header)
+    print("-" * len(header))
+    for name, row in report['cases'].items():
+        print(
+            f"{name:<18} {row['items']:>5}/{row['golden']:<5} {row['mb_per_s']:>8.2f} {row['lines_per_s']:>10} "
+            f"{row['ms_per_parse']:>8.3f} {row['alloc_peak_kb']:>8.1f} {row['alloc_blocks']:>7} "
+            f"{row['precision']:>6.2f} {row['recall']:>6.2f}"
+        )
+    print("-" * len(header))
+    for name, row in list(report['formats'].items()) + [('overall', report['overall'])]:
+        print(f"{name:<18} {'':>11} {row['mb_per_s']:>8.2f} {row['lines_per_s']:>10} "
+              f"{'':>8} {'':>8} {'':>7} {row['precision']:>6.2f} {row['recall']:>6.2f}")
+
+
+def find_regressions(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float,
+                     accuracy_tolerance: float) -> List[str]:
+    """
+    Compare report with a previous run.
+    
+    Args:
+        report: Current report
+        baseline: Previous report
+        tolerance: Allowed relative throughput drop
+        accuracy_tolerance: Allowed absolute precision or recall drop
+    
+    Returns:
+        Descriptions of throughput or accuracy drops beyond tolerance
+    """
+    regressions = []
+    rows = list(report['formats'].items()) + [('overall', report['overall'])]
+    previous_rows = dict(baseline.get('formats', {}), overall=baseline.get('overall'))
+    
+    for name, row in rows:
+        previous = previous_rows.get(name)
+        if not previous:
+            continue
+        if row['mb_per_s'] < previous['mb_per_s'] * (1 - tolerance):
+            regressions.append(f"{name} throughput {row['mb_per_s']} MB/s < baseline {previous['mb_per_s']} MB/s")
+        for metric in ('precision', 'recall'):
+            if row[metric] < previous[metric] - accuracy_tolerance:
+                regressions.append(f"{name} {metric} {row[metric]} < baseline {previous[metric]}")
+    return regressions
+
+
+def main() -> None:
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description='Text parser throughput and accuracy benchmark')
+    parser.add_argument('--corpus', type=Path, default=DEFAULT_CORPUS, help='OCR outputs with golden .json next to them')
+    parser.add_argument('--repeat', type=int, default=50, help='Timed parses per case')
+    parser.add_argument('--scale', type=int, default=1, help='Repeat each corpus text N times')
+    parser.add_argument('--json', type=Path, help='Write report as JSON')
+    parser.add_argument('--baseline', type=Path, help='Previous JSON report to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative throughput regression')
+    parser.add_argument('--accuracy-tolerance', type=float, default=0.0, help='Allowed absolute precision/recall drop')
+    args = parser.parse_args()
+    
+    # Parser logs every call at info level
+    logging.disable(logging.INFO)
+    
+    cases = load_corpus(args.corpus, args.scale)
+    if not cases:
+        raise SystemExit(f"No corpus cases in {args.corpus}")
+    
+    report = run_benchmark(cases, args.repeat)
+    report['scale'] = args.scale
+    
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    
+    if args.baseline:
+        regressions = find_regressions(report, json.loads(args.baseline.read_text(encoding='utf-8')),
+                                       args.tolerance, args.accuracy_tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+End-to-end pipeline throughput benchmark for market monitoring system.
+Drives capture folder -> merge -> OCR -> parse -> engine -> DB against the local stub OCR server
+and reports throughput and per-stage latency percentiles.
+
+Usage:
+    python benchmarks/pipeline_benchmark.py --generate 24
+    python benchmarks/pipeline_benchmark.py --corpus /tmp/pipeline_corpus --generate 24
+    python benchmarks/pipeline_benchmark.py --corpus /tmp/pipeline_corpus --cycles 50 --rate 2 --latency lognormal:0.4:0.3
+    python benchmarks/pipeline_benchmark.py --generate 24 --json run.json --baseline previous.json --tolerance 0.2
+
+Without --corpus the generated screenshots live in a temporary folder for one run.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from PIL import Image, ImageDraw
+
+from config.settings import SettingsManager
+from core.database_manager import DatabaseManager
+from core.image_processor import ImageProcessor
+from core.monitoring_engine import MonitoringEngine
+from core.ocr_client import YandexOCRClient
+from core.ocr_queue import OCRQueue, OCRJobPriority
+from core.text_parser import TextParser
+from stub_ocr_server import StubOCRServer, LatencyModel, load_canned_texts
+
+
+SAMPLE_TEXT = PROJECT_ROOT / "test" / "merged_images_vertical_text.txt"
+STAGES = ['capture', 'merge', 'queue_wait', 'ocr', 'parse', 'db', 'engine', 'end_to_end']
+
+
+def generate_corpus(corpus_dir: Path, count: int, seed: int = 11) -> None:
+    """
+    Render synthetic trade window screenshots with their text next to them.
+    
+    Args:
+        corpus_dir: Output folder for <name>.png and <name>.txt pairs
+        count: Number of screenshots
+        seed: Random seed for reproducible corpora
+    """
+    rng = random.Random(seed)
+    words = [line.strip() for line in SAMPLE_TEXT.read_text(encoding='utf-8').splitlines() if line.strip()]
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    
+    for index in range(count):
+        lines = [
+            "Trade",
+            f"Items to Sell {rng.choice(words).split()[0]}",
+            f"{rng.choice(words)} ({rng.randint(1, 200)})",
+            f"Unit Price : {rng.randint(1, 999)},{rng.randint(0, 999):03d} Adena",
+            f"Quantity : {rng.randint(1, 50)}"
+        ]
+        image = Image.new('RGB', (445, 150), (24, 26, 30))
+        draw = ImageDraw.Draw(image)
+        for row, text in enumerate(lines):
+            draw.text((12, 10 + row * 26), text, fill=(214, 206, 180))
+        
+        name = f"trade_{index:03d}"
+        image.save(corpus_dir / f"{name}.png")
+        (corpus_dir / f"{name}.txt").write_text("\n".join(lines), encoding='utf-8')
+    
+    print(f"Generated {count} corpus screenshots in {corpus_dir}")
+
+
+def write_config(base_config: Path, work_dir: Path, api_url: str) -> Path:
+    """
+    Write configuration pointing paths at work_dir and OCR at the stub server.
+    The OCR result cache is disabled so every cycle reaches the OCR stage.
+    
+    Returns:
+        Path to the written configuration
+    """
+    data = json.loads(base_config.read_text(encoding='utf-8'))
+    data['yandex_ocr'].update({'api_key': 'benchmark-key', 'api_url': api_url, 'async_requests': False})
+    data['paths'] = {
+        'temp_screenshots': str(work_dir / "screenshots"),
+        'temp_merged': str(work_dir / "merged"),
+        'database': str(work_dir / "market_data.db"),
+        'logs': str(work_dir / "logs")
+    }
+    if 'ocr_cache' in data:
+        data['ocr_cache']['enabled'] = False
+    
+    config_path = work_dir / "config.json"
+    config_path.write_text(json.dumps(data, indent=4), encoding='utf-8')
+    return config_path
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of values, 0.0 when empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+class PipelineBenchmark:
+    """Runs capture cycles at a fixed rate and collects per-stage timings."""
+    
+    def __init__(self, settings: SettingsManager, stub: StubOCRServer, corpus: List[Path],
+                 hotkey: str, screenshots_per_cycle: int, workers: int, seed: int = 3):
+        self.settings = settings
+        self.stub = stub
+        self.corpus = corpus
+        self.hotkey = hotkey
+        self.screenshots_per_cycle = screenshots_per_cycle
+        self.rng = random.Random(seed)
+        
+        self.db = DatabaseManager(str(settings.paths.database))
+        self.image_processor = ImageProcessor(settings)
+        self.text_parser = TextParser()
+        self.engine = MonitoringEngine(self.db, settings)
+        self.ocr_client = YandexOCRClient(settings)
+        self.ocr_queue = OCRQueue(self.ocr_client, num_workers=workers)
+        
+        hotkey_config = settings.get_hotkey_config(hotkey)
+        self.processing_type = hotkey_config.processing_type
+        self.screenshot_type = hotkey_config.screenshot_type
+        self.folder = settings.get_screenshot_path(hotkey)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        
+        self.timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self.items = 0
+        self.failed_cycles = 0
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._drained = threading.Condition(self._lock)
+    
+    def _record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.timings[stage].append(seconds)
+    
+    def run_cycle(self, index: int) -> None:
+        """Capture, merge and submit one cycle; the rest runs in the OCR callback."""
+        cycle_start = time.perf_counter()
+        
+        sources = [self.rng.choice(self.corpus) for _ in range(self.screenshots_per_cycle)]
+        for position, source in enumerate(sources):
+            shutil.copy(source, self.folder / f"{self.hotkey}_cycle{index:05d}_{position:02d}{source.suffix}")
+        captured = time.perf_counter()
+        self._record('capture', captured - cycle_start)
+        
+        merged_path = self.image_processor.process_hotkey_folder(self.hotkey)
+        merged = time.perf_counter()
+        self._record('merge', merged - captured)
+        if not merged_path:
+            with self._lock:
+                self.failed_cycles += 1
+            return
+        
+        # Merged image gets the text of its screenshots, in capture order
+        texts = [source.with_suffix('.txt').read_text(encoding='utf-8') for source in sources]
+        self.stub.texts_by_hash[hashlib.sha256(merged_path.read_bytes()).hexdigest()] = "\n".join(texts)
+        
+        session_id = self.db.create_ocr_session(self.hotkey)
+        with self._lock:
+            self._pending += 1
+        
+        def callback(job):
+            try:
+                if job.status.value != "completed" or not job.result:
+                    with self._lock:
+                        self.failed_cycles += 1
+                    self.db.update_ocr_session(session_id, 0.0, job.error or "OCR failed")
+                    return
+                
+                self._record('queue_wait', (job.started_at - job.created_at).total_seconds())
+                self._record('ocr', (job.completed_at - job.started_at).total_seconds())
+                
+                stage_start = time.perf_counter()
+                result = self.text_parser.parse_layout(job.result, self.hotkey, self.screenshot_type,
+                                                       self.processing_type)
+                parsed = time.perf_counter()
+                self._record('parse', parsed - stage_start)
+                
+                self.db.save_ocr_text(session_id, self.hotkey, job.result['text'], job.result.get('lines'),
+                                      self.processing_type, self.screenshot_type)
+                if result.items:
+                    self.db.save_items_data(result.items, session_id)
+                self.db.update_ocr_session(session_id, time.perf_counter() - merged)
+                saved = time.perf_counter()
+                self._record('db', saved - parsed)
+                
+                if result.items:
+                    self.engine.process_parsing_results([result], save_items=False)
+                finished = time.perf_counter()
+                self._record('engine', finished - saved)
+                self._record('end_to_end', finished - cycle_start)
+                with self._lock:
+                    self.items += len(result.items)
+            finally:
+                with self._lock:
+                    self._pending -= 1
+                    self._drained.notify_all()
+        
+        self.ocr_queue.submit_job(merged_path, self.hotkey, priority=OCRJobPriority.NORMAL,
+                                  cleanup_image=True, callback=callback, layout=True)
+    
+    def run(self, cycles: int, rate: float, timeout: float) -> Dict[str, Any]:
+        """
+        Run cycles at rate per second and wait for their OCR callbacks.
+        
+        Returns:
+            Report with throughput, per-stage percentiles in ms and stub statistics
+        """
+        self.ocr_queue.start()
+        start_time = time.perf_counter()
+        try:
+            for index in range(cycles):
+                delay = start_time + index / rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                self.run_cycle(index)
+            
+            with self._lock:
+                self._drained.wait_for(lambda: self._pending == 0, timeout=timeout)
+                unfinished = self._pending
+        finally:
+            self.ocr_queue.stop()
+        wall_time = time.perf_counter() - start_time
+        
+        completed = len(self.timings['end_to_end'])
+        return {
+            'cycles': cycles,
+            'completed_cycles': completed,
+            'failed_cycles': self.failed_cycles,
+            'unfinished_cycles': unfinished,
+            'items': self.items,
+            'wall_time_s': round(wall_time, 3),
+            'cycles_per_s': round(completed / wall_time, 3) if wall_time else 0.0,
+            'items_per_s': round(self.items / wall_time, 3) if wall_time else 0.0,
+            'stages': {
+                stage: {
+                    'count': len(values),
+                    'p50_ms': round(percentile(values, 0.50) * 1000, 2),
+                    'p95_ms': round(percentile(values, 0.95) * 1000, 2),
+                    'p99_ms': round(percentile(values, 0.99) * 1000, 2),
+                    'max_ms': round(max(values) * 1000, 2) if values else 0.0
+                }
+                for stage, values in self.timings.items()
+            },
+            'stub': self.stub.get_server_statistics()
+        }
+    
+    def close(self) -> None:
+        """Release OCR client and database connection."""
+        self.ocr_client.close()
+        self.db.close_connection()
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print throughput summary and stage percentiles as an aligned table."""
+    print(
+        f"{report['completed_cycles']}/{report['cycles']} cycles in {report['wall_time_s']:.1f}s: "
+        f"{report['cycles_per_s']:.2f} cycles/s, {report['items_per_s']:.1f} items/s "
+        f"({report['failed_cycles']} failed, {report['unfinished_cycles']} unfinished)"
+    )
+    header = f"{'stage':<12} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for stage, row in report['stages'].items():
+        print(
+            f"{stage:<12} {row['count']:>6} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} "
+            f"{row['p99_ms']:>9.2f} {row['max_ms']:>9.2f}"
+        )
+    print(f"Stub responses: {report['stub']['responses']}")
+
+
+def find_regressions(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Compare report with a previous run.
+    
+    Returns:
+        Descriptions of throughput drops or p95 increases beyond tolerance
+    """
+    regressions = []
+    if report['cycles_per_s'] < baseline['cycles_per_s'] * (1 - tolerance):
+        regressions.append(f"throughput {report['cycles_per_s']} < baseline {baseline['cycles_per_s']}")
+    for stage, row in report['stages'].items():
+        previous = baseline.get('stages', {}).get(stage)
+        if previous and previous['p95_ms'] and row['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{stage} p95 {row['p95_ms']}ms > baseline {previous['p95_ms']}ms")
+    return regressions
+
+
+def main() -> None:
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description='End-to-end pipeline throughput benchmark')
+    parser.add_argument('--corpus', type=Path, help='Screenshots with .txt text next to them (default: temporary)')
+    parser.add_argument('--generate', type=int, default=0, help='Generate N synthetic corpus screenshots first')
+    parser.add_argument('--config', type=Path, default=PROJECT_ROOT / "config.json", help='Base configuration')
+    parser.add_argument('--hotkey', default='F1', help='Hotkey whose processing type is used')
+    parser.add_argument('--cycles', type=int, default=20, help='Capture cycles to run')
+    parser.add_argument('--rate', type=float, default=2.0, help='Cycles started per second')
+    parser.add_argument('--screenshots', type=int, default=6, help='Screenshots per cycle')
+    parser.add_argument('--workers', type=int, default=2, help='OCR queue workers')
+    parser.add_argument('--latency', type=LatencyModel.parse, default=LatencyModel('lognormal', 0.3, 0.4),
+                        help="Stub latency as 'distribution:mean[:spread]' in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of stub HTTP 500 responses')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Share of stub HTTP 429 responses')
+    parser.add_argument('--seed', type=int, default=3, help='Random seed')
+    parser.add_argument('--timeout', type=float, default=120.0, help='Seconds to wait for queued cycles')
+    parser.add_argument('--json', type=Path, help='Write report as JSON')
+    parser.add_argument('--baseline', type=Path, help='Previous JSON report to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative regression')
+    args = parser.parse_args()
+    
+    if args.corpus is None and not args.generate:
+        parser.error("pass --corpus DIR or --generate N")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Generated corpora stay out of the source tree unless a folder is given
+        corpus_dir = args.corpus or Path(temp_dir) / "corpus"
+        if args.generate:
+            generate_corpus(corpus_dir, args.generate)
+        
+        texts, by_hash = load_canned_texts(corpus_dir)
+        corpus = [path for path in sorted(corpus_dir.glob("*.png")) if path.with_suffix('.txt').exists()]
+        if not corpus:
+            raise SystemExit(f"No corpus screenshots in {corpus_dir}, run with --generate N first")
+        
+        with StubOCRServer(texts, by_hash, args.latency, args.error_rate, args.rate_limit_rate,
+                           retry_after=0.5, seed=args.seed) as stub:
+            settings = SettingsManager(str(write_config(args.config, Path(temp_dir), stub.url)))
+            benchmark = PipelineBenchmark(settings, stub, corpus, args.hotkey, args.screenshots,
+                                          args.workers, args.seed)
+            try:
+                report = benchmark.run(args.cycles, args.rate, args.timeout)
+            finally:
+                benchmark.close()
+    
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    
+    if args.baseline:
+        regressions = find_regressions(report, json.loads(args.baseline.read_text(encoding='utf-8')), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Yandex OCR recognizeText API.
+Answers with canned text from stored screenshots after a configurable latency, with injected errors and 429s.
+
+Usage:
+    python benchmarks/stub_ocr_server.py --screenshots data/temp/screenshots/F1 --latency lognormal:0.4:0.3
+    python benchmarks/stub_ocr_server.py --port 8808 --error-rate 0.05 --rate-limit-rate 0.1
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import pytesseract
+    from PIL import Image
+    TESSERACT_AVAILABLE = True
+except ImportError:
+    TESSERACT_AVAILABLE = False
+
+
+API_PATH = "/ocr/v1/recognizeText"
+DEFAULT_TEXT = "Items to Sell Stub\nSoulshot (10)\nUnit Price : 1,000 Adena\nQuantity : 5"
+
+
+@dataclass
+class LatencyModel:
+    """Distribution of simulated OCR response times in seconds."""
+    distribution: str = 'fixed'  # fixed, uniform, normal or lognormal
+    mean: float = 0.0
+    spread: float = 0.0  # Half width for uniform, deviation for normal, sigma of log for lognormal
+    
+    @classmethod
+    def parse(cls, spec: str) -> 'LatencyModel':
+        """
+        Parse 'distribution:mean[:spread]', e.g. 'lognormal:0.4:0.3' or '0.2' for fixed.
+        
+        Raises:
+            ValueError: If the specification is malformed
+        """
+        parts = spec.split(':')
+        if len(parts) == 1:
+            return cls('fixed', float(parts[0]))
+        
+        model = cls(parts[0], float(parts[1]), float(parts[2]) if len(parts) > 2 else 0.0)
+        if model.distribution not in ('fixed', 'uniform', 'normal', 'lognormal'):
+            raise ValueError(f"Unknown latency distribution: {model.distribution}")
+        return model
+    
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency, never negative."""
+        if self.distribution == 'uniform':
+            value = rng.uniform(self.mean - self.spread, self.mean + self.spread)
+        elif self.distribution == 'normal':
+            value = rng.gauss(self.mean, self.spread)
+        elif self.distribution == 'lognormal' and self.mean > 0:
+            # Median equals mean * exp(-sigma^2 / 2) so the mean is kept
+            value = rng.lognormvariate(math.log(self.mean) - self.spread ** 2 / 2, self.spread)
+        else:
+            value = self.mean
+        return max(0.0, value)
+
+
+def load_canned_texts(folder: Path) -> Tuple[List[str], Dict[str, str]]:
+    """
+    Derive canned OCR text from stored screenshots.
+    A screenshot's text is read from a .txt file next to it, or recognized
+    once with Tesseract when pytesseract is installed.
+    
+    Args:
+        folder: Folder with screenshots
+    
+    Returns:
+        Tuple of texts in file order and mapping of image SHA-256 to text
+    """
+    texts = []
+    by_hash = {}
+    for path in sorted(folder.glob("*.png")) + sorted(folder.glob("*.jpg")):
+        truth_path = path.with_suffix('.txt')
+        if truth_path.exists():
+            text = truth_path.read_text(encoding='utf-8').strip()
+        elif TESSERACT_AVAILABLE:
+            with Image.open(path) as image:
+                text = pytesseract.image_to_string(image).strip()
+        else:
+            continue
+        if text:
+            texts.append(text)
+            by_hash[hashlib.sha256(path.read_bytes()).hexdigest()] = text
+    return texts, by_hash
+
+
+def build_text_annotation(text: str, line_height: int = 24, char_width: int = 9) -> Dict[str, Any]:
+    """
+    Build a textAnnotation with one block and a box per line and word.
+    
+    Args:
+        text: Full text, one OCR line per text line
+        line_height: Pixels per line
+        char_width: Pixels per character
+    
+    Returns:
+        textAnnotation dictionary as returned by recognizeText
+    """
+    def box(left: int, top: int, right: int, bottom: int) -> Dict[str, Any]:
+        return {'vertices': [
+            {'x': str(left), 'y': str(top)}, {'x': str(left), 'y': str(bottom)},
+            {'x': str(right), 'y': str(bottom)}, {'x': str(right), 'y': str(top)}
+        ]}
+    
+    lines = []
+    for index, line_text in enumerate(line for line in text.splitlines() if line.strip()):
+        top = 10 + index * line_height
+        bottom = top + line_height - 6
+        words = []
+        left = 10
+        for word in line_text.split():
+            right = left + len(word) * char_width
+            words.append({'text': word, 'boundingBox': box(left, top, right, bottom)})
+            left = right + char_width
+        lines.append({'text': line_text, 'boundingBox': box(10, top, left - char_width, bottom), 'words': words})
+    
+    return {'fullText': text, 'blocks': [{'lines': lines}] if lines else []}
+
+
+class StubOCRServer:
+    """
+    Threaded HTTP server answering recognizeText requests offline.
+    An image whose bytes match a stored screenshot gets that screenshot's
+    text; any other image gets the canned texts in turn. Each request is
+    delayed by a sampled latency and may fail with HTTP 500 or 429.
+    """
+    
+    def __init__(self, texts: Optional[List[str]] = None,
+                 texts_by_hash: Optional[Dict[str, str]] = None,
+                 latency: Optional[LatencyModel] = None,
+                 error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0,
+                 retry_after: Optional[float] = 1.0,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 seed: Optional[int] = None):
+        """
+        Initialize stub OCR server.
+        
+        Args:
+            texts: Canned texts served in turn
+            texts_by_hash: Texts of known images keyed by SHA-256 of their bytes
+            latency: Response time model
+            error_rate: Share of requests answered with HTTP 500
+            rate_limit_rate: Share of requests answered with HTTP 429
+            retry_after: Retry-After seconds sent with 429, None to omit the header
+            host: Interface to bind
+            port: Port to bind, 0 for any free port
+            seed: Random seed for reproducible runs
+        """
+        self.texts = list(texts or [DEFAULT_TEXT])
+        self.texts_by_hash = dict(texts_by_hash or {})
+        self.latency = latency or LatencyModel()
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._next_text = 0
+        self._thread: Optional[threading.Thread] = None
+        
+        self._stats = {
+            'requests': 0,
+            'responses': {},
+            'total_latency': 0.0
+        }
+        
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+    
+    @property
+    def url(self) -> str:
+        """recognizeText endpoint of this server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PATH}"
+    
+    def start(self) -> 'StubOCRServer':
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="StubOCRServer", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+    
+    def _draw(self) -> Tuple[float, float, float]:
+        """Sample latency and outcome under one lock so seeded runs repeat."""
+        with self._lock:
+            return self.latency.sample(self._rng), self._rng.random(), self._rng.random()
+    
+    def _pick_text(self, content: bytes) -> str:
+        """Text of a known image, otherwise the next canned text."""
+        text = self.texts_by_hash.get(hashlib.sha256(content).hexdigest())
+        if text is not None:
+            return text
+        with self._lock:
+            text = self.texts[self._next_text % len(self.texts)]
+            self._next_text += 1
+        return text
+    
+    def respond(self, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        """
+        Produce response for a recognizeText payload.
+        
+        Args:
+            payload: Decoded JSON request body
+        
+        Returns:
+            Tuple of HTTP status, JSON body and extra headers
+        """
+        latency, error_draw, limit_draw = self._draw()
+        time.sleep(latency)
+        
+        if limit_draw < self.rate_limit_rate:
+            headers = {'Retry-After': f"{self.retry_after:g}"} if self.retry_after is not None else {}
+            status, body = 429, {'code': 8, 'message': "Stub rate limit exceeded"}
+        elif error_draw < self.error_rate:
+            status, body, headers = 500, {'code': 13, 'message': "Stub internal error"}, {}
+        else:
+            try:
+                content = base64.b64decode(payload['content'], validate=True)
+            except (KeyError, TypeError, ValueError):
+                status, body, headers = 400, {'code': 3, 'message': "Invalid content"}, {}
+            else:
+                text = self._pick_text(content)
+                status, body, headers = 200, {'result': {'textAnnotation': build_text_annotation(text)}}, {}
+        
+        with self._lock:
+            self._stats['requests'] += 1
+            self._stats['responses'][status] = self._stats['responses'].get(status, 0) + 1
+            self._stats['total_latency'] += latency
+        return status, body, headers
+    
+    def _make_handler(self):
+        """Build request handler bound to this server."""
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if self.path != API_PATH:
+                    self._send(404, {'message': "Not found"})
+                    return
+                if not self.headers.get('Authorization'):
+                    self._send(401, {'message': "Missing Authorization header"})
+                    return
+                try:
+                    length = int(self.headers.get('Content-Length', 0))
+                    payload = json.loads(self.rfile.read(length))
+                except ValueError:
+                    self._send(400, {'message': "Invalid JSON"})
+                    return
+                self._send(*stub.respond(payload))
+            
+            def _send(self, status, body, headers=None):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+    
+    def get_server_statistics(self) -> Dict[str, Any]:
+        """
+        Get stub server statistics.
+        
+        Returns:
+            Dictionary with request counts by status and mean latency
+        """
+        with self._lock:
+            stats = dict(self._stats, responses=dict(self._stats['responses']))
+        stats['average_latency'] = stats['total_latency'] / stats['requests'] if stats['requests'] else 0.0
+        return stats
+
+
+def main() -> None:
+    """Stub server entry point."""
+    parser = argparse.ArgumentParser(description='Local stand-in for Yandex OCR recognizeText')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=8808, help='Port to bind')
+    parser.add_argument('--screenshots', type=Path, help='Stored screenshots to derive canned text from')
+    parser.add_argument('--latency', type=LatencyModel.parse, default=LatencyModel(),
+                        help="Latency as 'distribution:mean[:spread]' in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of HTTP 500 responses')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Share of HTTP 429 responses')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429')
+    parser.add_argument('--seed', type=int, help='Random seed')
+    args = parser.parse_args()
+    
+    texts, by_hash = load_canned_texts(args.screenshots) if args.screenshots else ([], {})
+    server = StubOCRServer(texts, by_hash, args.latency, args.error_rate, args.rate_limit_rate,
+                           args.retry_after, args.host, args.port, args.seed)
+    print(f"Stub OCR server on {server.url} with {len(server.texts)} canned texts")
+    
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(json.dumps(server.get_server_statistics(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
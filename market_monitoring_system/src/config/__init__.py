@@ -9,6 +9,20 @@ from .settings import (
     LoggingConfig,
     DatabaseConfig,
     ImageProcessingConfig,
+    CaptureExecutorConfig,
+    CapturePlannerConfig,
+    ScreenshotDedupConfig,
+    OCREncodingConfig,
+    OCRRateLimitConfig,
+    OCRSchedulingConfig,
+    OCRJournalConfig,
+    OCRPackingConfig,
+    OCRBackendsConfig,
+    OCRCacheConfig,
+    OCRArchiveConfig,
+    NameCanonicalizationConfig,
+    AlertsConfig,
+    ChangePublisherConfig,
     ConfigurationError
 )
 
@@ -21,5 +35,19 @@ __all__ = [
     'LoggingConfig', 
     'DatabaseConfig',
     'ImageProcessingConfig',
+    'CaptureExecutorConfig',
+    'CapturePlannerConfig',
+    'ScreenshotDedupConfig',
+    'OCREncodingConfig',
+    'OCRRateLimitConfig',
+    'OCRSchedulingConfig',
+    'OCRJournalConfig',
+    'OCRPackingConfig',
+    'OCRBackendsConfig',
+    'OCRCacheConfig',
+    'OCRArchiveConfig',
+    'NameCanonicalizationConfig',
+    'AlertsConfig',
+    'ChangePublisherConfig',
     'ConfigurationError'
 ]
\ No newline at end of file
@@ -22,6 +22,8 @@ class HotkeyConfig:
     description: str = ""
     screenshot_type: str = "individual_seller_items"
     processing_type: str = "full"  # NEW FIELD: 'full' or 'minimal'
+    ocr_weight: float = 1.0  # Share of OCR capacity relative to other hotkeys
+    ocr_max_wait: float = 0.0  # OCR queue-wait SLO in seconds (0 = scheduling default)
 
 
 @dataclass  
@@ -32,6 +34,9 @@ class YandexOCRConfig:
     max_retries: int = 3
     timeout: int = 30
     max_image_size_mb: int = 20
+    async_requests: bool = False  # Dispatch OCR jobs through the asyncio client (requires aiohttp)
+    max_in_flight: int = 8  # Concurrent OCR requests in async mode
+    keepalive_timeout: int = 30  # Seconds idle pooled connections are kept open
     supported_formats: List[str] = field(default_factory=lambda: [".jpg", ".jpeg", ".png", ".pdf"])
     mime_types: Dict[str, str] = field(default_factory=lambda: {
         ".jpg": "JPEG",
@@ -92,6 +97,168 @@ class ImageProcessingConfig:
     max_image_height: int = 8000
     jpeg_quality: int = 85
     optimize_for_ocr: bool = True
+    strip_mode: bool = False  # OCR only screenshot strips that changed since previous cycles
+    strip_height: int = 0  # 0 = one strip per screenshot
+    strip_cache_size: int = 2000
+    in_memory_pipeline: bool = False  # Keep captured frames in memory instead of temp PNG files
+    frame_buffer_size: int = 200  # Maximum buffered frames per hotkey
+    merge_engine: str = "numpy"  # 'numpy' composes into one array, 'pil' pastes image by image
+    process_pool: bool = False  # Run NumPy merges in worker processes instead of the scheduler thread
+    process_pool_workers: int = 0  # 0 = one worker per CPU core
+    process_pool_chunk_rows: int = 2048  # Rows per chunk when one large merge is split across workers
+    oversize_mode: str = "scale"  # 'scale' shrinks columns over max_image_height, 'chunk' splits them into several OCR jobs
+
+
+@dataclass
+class CaptureExecutorConfig:
+    """Configuration for asynchronous capture execution."""
+    enabled: bool = True  # Hotkey hook only enqueues, a worker thread grabs the screen
+    max_queue_size: int = 64
+    coalesce_bursts: bool = True  # Merge presses while the previous capture is still pending
+
+
+@dataclass
+class CapturePlannerConfig:
+    """Configuration for union-region grabs of areas captured together."""
+    enabled: bool = True
+    max_waste_ratio: float = 2.0  # Max union area relative to summed area sizes
+    capture_all_hotkey: str = ""  # Optional hotkey capturing all enabled areas at once
+
+
+@dataclass
+class ScreenshotDedupConfig:
+    """Configuration for near-duplicate screenshot suppression at capture time."""
+    enabled: bool = True
+    action: str = "drop"  # 'drop' skips writing byte-identical frames, 'count' only records them
+    history_size: int = 5  # Number of recent frames compared per hotkey
+    max_hamming_distance: int = 0
+    hash_size: int = 16
+    max_age_seconds: int = 0  # 0 = use hotkey merge_interval
+
+
+@dataclass
+class OCREncodingConfig:
+    """Configuration for payload-minimizing encoding of merged images sent to OCR."""
+    enabled: bool = True
+    encodings: List[str] = field(default_factory=lambda: ["png_gray", "jpeg"])  # Lossy 'png_palette' is opt-in; 'webp' is not accepted by Yandex OCR
+    quality_ladder: List[int] = field(default_factory=lambda: [85, 70, 55, 40])  # Lossy qualities, preferred first
+    max_bytes: int = 4194304  # Per-request cap, at most the 20MB API limit
+    trim_margins: bool = True
+    collapse_blank_rows: bool = True
+    blank_row_gap: int = 8  # Rows kept from each collapsed blank run
+    palette_colors: int = 16
+
+
+@dataclass
+class OCRSchedulingConfig:
+    """Configuration for weighted fair OCR job scheduling across hotkeys."""
+    enabled: bool = True
+    default_max_wait: float = 120.0  # Queue-wait SLO for hotkeys without ocr_max_wait (0 = none)
+    aging_interval: float = 30.0  # Seconds of waiting that raise a job one priority level
+    cost_unit_bytes: int = 262144  # Image bytes counted as one extra unit of job cost
+
+
+@dataclass
+class OCRJournalConfig:
+    """Configuration for the durable OCR job journal."""
+    enabled: bool = True
+    db_path: str = "data/ocr_journal.db"
+    retention_hours: float = 24.0  # Finished jobs are kept this long for inspection
+
+
+@dataclass
+class OCRPackingConfig:
+    """Configuration for packing small OCR images into one request under backlog."""
+    enabled: bool = True
+    min_backlog: int = 3  # Queued jobs from which small images share a request
+    max_images: int = 8
+    max_image_bytes: int = 524288  # Larger images always get a request of their own
+    max_bytes: int = 4194304  # Cap of the encoded composite, below the OCR request limit
+    max_height: int = 8000
+    gap: int = 32  # White rows between packed images
+
+
+@dataclass
+class OCRBackendsConfig:
+    """Configuration for the local Tesseract backend and latency-aware OCR routing."""
+    enabled: bool = True  # Routing starts only if Tesseract is installed
+    tesseract_cmd: str = ""  # Path of the tesseract executable, empty = search PATH
+    tesseract_oem: int = 3
+    tesseract_psm: int = 6
+    small_image_bytes: int = 16384  # Images up to this size skip the cloud round trip (0 = never)
+    max_cloud_latency: float = 3.0  # Cloud latency EWMA in seconds above which Tesseract is used
+    max_cloud_error_rate: float = 0.5
+    rate_limit_cooldown: float = 30.0  # Seconds to avoid the cloud after a 429 without Retry-After
+    probe_interval: float = 15.0  # Seconds between probe requests to an avoided cloud
+    ewma_alpha: float = 0.2
+
+
+@dataclass
+class OCRRateLimitConfig:
+    """Configuration for OCR request rate limiting and circuit breaking."""
+    enabled: bool = True
+    requests_per_second: float = 10.0  # Keep at or below the cloud OCR request quota
+    burst: int = 10
+    failure_threshold: int = 5  # Consecutive failed requests that open the circuit
+    rate_limit_threshold: int = 2  # Consecutive HTTP 429 responses that open the circuit
+    reset_timeout: float = 30.0  # Seconds the circuit stays open, doubled per failed probe
+    max_reset_timeout: float = 300.0
+    max_rate_limit_retries: int = 10  # HTTP 429 rejections after which a job fails
+
+
+@dataclass
+class OCRCacheConfig:
+    """Configuration for OCR result cache."""
+    enabled: bool = True
+    db_path: str = "data/cache/ocr_cache.db"
+    ttl_seconds: int = 3600
+    max_entries: int = 500
+    perceptual_matching: bool = False
+    max_hamming_distance: int = 0
+    hash_size: int = 16
+
+
+@dataclass
+class OCRArchiveConfig:
+    """Configuration for the compressed raw OCR text archive and offline reparsing."""
+    enabled: bool = True
+    compression_level: int = 6  # zlib level of archived text and layout
+    store_layout: bool = True  # Keep line boxes so reparsing can use geometry
+    reprocess_workers: int = 0  # Parser processes for reparsing, 0 = CPU count
+    reprocess_batch_size: int = 200  # Sessions per worker task and per bulk write
+
+
+@dataclass
+class NameCanonicalizationConfig:
+    """Configuration for mapping OCR variants of seller and item names to canonical names."""
+    enabled: bool = True
+    max_seller_substitutions: int = 1  # Most OCR-confusable substitutions (l/1/I, O/0, rn/m) in a seller variant
+    max_item_substitutions: int = 2  # Most OCR-confusable substitutions in an item variant
+    min_name_length: int = 5  # Shorter names are never matched fuzzily
+    cache_size: int = 4096  # Resolved variants kept in memory
+    learn_aliases: bool = False  # Save matched variants to the alias table
+
+
+@dataclass
+class AlertsConfig:
+    """Configuration for alert rule engine."""
+    enabled: bool = False
+    rules_file: str = "alert_rules.json"
+    sinks: List[Dict[str, Any]] = field(default_factory=lambda: [
+        {"type": "jsonl", "path": "data/alerts/alerts.jsonl"}
+    ])
+
+
+@dataclass
+class ChangePublisherConfig:
+    """Configuration for batched change publication."""
+    enabled: bool = False
+    max_batch_size: int = 100
+    max_batch_delay_ms: int = 200
+    max_buffer_size: int = 10000
+    sinks: List[Dict[str, Any]] = field(default_factory=lambda: [
+        {"type": "jsonl", "path": "data/changes/changes.jsonl"}
+    ])
 
 
 class ConfigurationError(Exception):
@@ -126,6 +293,20 @@ class SettingsManager:
         self.logging: Optional[LoggingConfig] = None
         self.database: Optional[DatabaseConfig] = None
         self.image_processing: Optional[ImageProcessingConfig] = None
+        self.capture_executor: Optional[CaptureExecutorConfig] = None
+        self.capture_planner: Optional[CapturePlannerConfig] = None
+        self.screenshot_dedup: Optional[ScreenshotDedupConfig] = None
+        self.ocr_encoding: Optional[OCREncodingConfig] = None
+        self.ocr_rate_limit: Optional[OCRRateLimitConfig] = None
+        self.ocr_scheduling: Optional[OCRSchedulingConfig] = None
+        self.ocr_journal: Optional[OCRJournalConfig] = None
+        self.ocr_packing: Optional[OCRPackingConfig] = None
+        self.ocr_backends: Optional[OCRBackendsConfig] = None
+        self.ocr_cache: Optional[OCRCacheConfig] = None
+        self.ocr_archive: Optional[OCRArchiveConfig] = None
+        self.name_canonicalization: Optional[NameCanonicalizationConfig] = None
+        self.alerts: Optional[AlertsConfig] = None
+        self.change_publisher: Optional[ChangePublisherConfig] = None
         
         # Load initial configuration
         self.load_config()
@@ -160,6 +341,20 @@ class SettingsManager:
             self._parse_logging_config()
             self._parse_database_config()
             self._parse_image_processing_config()
+            self._parse_capture_executor_config()
+            self._parse_capture_planner_config()
+            self._parse_screenshot_dedup_config()
+            self._parse_ocr_encoding_config()
+            self._parse_ocr_rate_limit_config()
+            self._parse_ocr_scheduling_config()
+            self._parse_ocr_journal_config()
+            self._parse_ocr_packing_config()
+            self._parse_ocr_backends_config()
+            self._parse_ocr_cache_config()
+            self._parse_ocr_archive_config()
+            self._parse_name_canonicalization_config()
+            self._parse_alerts_config()
+            self._parse_change_publisher_config()
             
             # Validate configuration
             self._validate_config()
@@ -187,7 +382,9 @@ class SettingsManager:
                     merge_interval=config['merge_interval'],
                     enabled=config.get('enabled', True),
                     description=config.get('description', ''),
-                    screenshot_type=config.get('screenshot_type', 'individual_seller_items')
+                    screenshot_type=config.get('screenshot_type', 'individual_seller_items'),
+                    ocr_weight=config.get('ocr_weight', 1.0),
+                    ocr_max_wait=config.get('ocr_max_wait', 0.0)
                 )
             except (KeyError, TypeError, ValueError) as e:
                 raise ConfigurationError(f"Invalid hotkey configuration for '{key}': {e}")
@@ -203,6 +400,9 @@ class SettingsManager:
                 max_retries=ocr_data.get('max_retries', 3),
                 timeout=ocr_data.get('timeout', 30),
                 max_image_size_mb=ocr_data.get('max_image_size_mb', 20),
+                async_requests=ocr_data.get('async_requests', False),
+                max_in_flight=ocr_data.get('max_in_flight', 8),
+                keepalive_timeout=ocr_data.get('keepalive_timeout', 30),
                 supported_formats=ocr_data.get('supported_formats', [".jpg", ".jpeg", ".png", ".pdf"]),
                 mime_types=ocr_data.get('mime_types', {
                     ".jpg": "JPEG",
@@ -270,7 +470,193 @@ class SettingsManager:
             max_image_width=img_data.get('max_image_width', 4000),
             max_image_height=img_data.get('max_image_height', 8000),
             jpeg_quality=img_data.get('jpeg_quality', 85),
-            optimize_for_ocr=img_data.get('optimize_for_ocr', True)
+            optimize_for_ocr=img_data.get('optimize_for_ocr', True),
+            strip_mode=img_data.get('strip_mode', False),
+            strip_height=img_data.get('strip_height', 0),
+            strip_cache_size=img_data.get('strip_cache_size', 2000),
+            in_memory_pipeline=img_data.get('in_memory_pipeline', False),
+            frame_buffer_size=img_data.get('frame_buffer_size', 200),
+            merge_engine=img_data.get('merge_engine', "numpy"),
+            process_pool=img_data.get('process_pool', False),
+            process_pool_workers=img_data.get('process_pool_workers', 0),
+            process_pool_chunk_rows=img_data.get('process_pool_chunk_rows', 2048),
+            oversize_mode=img_data.get('oversize_mode', "scale")
+        )
+    
+    def _parse_capture_executor_config(self) -> None:
+        """Parse capture executor configuration."""
+        executor_data = self._config_data.get('capture_executor', {})
+        
+        self.capture_executor = CaptureExecutorConfig(
+            enabled=executor_data.get('enabled', True),
+            max_queue_size=executor_data.get('max_queue_size', 64),
+            coalesce_bursts=executor_data.get('coalesce_bursts', True)
+        )
+    
+    def _parse_capture_planner_config(self) -> None:
+        """Parse capture planner configuration."""
+        planner_data = self._config_data.get('capture_planner', {})
+        
+        self.capture_planner = CapturePlannerConfig(
+            enabled=planner_data.get('enabled', True),
+            max_waste_ratio=planner_data.get('max_waste_ratio', 2.0),
+            capture_all_hotkey=planner_data.get('capture_all_hotkey', "")
+        )
+    
+    def _parse_screenshot_dedup_config(self) -> None:
+        """Parse screenshot deduplication configuration."""
+        dedup_data = self._config_data.get('screenshot_dedup', {})
+        
+        self.screenshot_dedup = ScreenshotDedupConfig(
+            enabled=dedup_data.get('enabled', True),
+            action=dedup_data.get('action', 'drop'),
+            history_size=dedup_data.get('history_size', 5),
+            max_hamming_distance=dedup_data.get('max_hamming_distance', 0),
+            hash_size=dedup_data.get('hash_size', 16),
+            max_age_seconds=dedup_data.get('max_age_seconds', 0)
+        )
+    
+    def _parse_ocr_encoding_config(self) -> None:
+        """Parse OCR image encoding configuration."""
+        encoding_data = self._config_data.get('ocr_encoding', {})
+        
+        self.ocr_encoding = OCREncodingConfig(
+            enabled=encoding_data.get('enabled', True),
+            encodings=encoding_data.get('encodings', ["png_gray", "jpeg"]),
+            quality_ladder=encoding_data.get('quality_ladder', [85, 70, 55, 40]),
+            max_bytes=encoding_data.get('max_bytes', 4194304),
+            trim_margins=encoding_data.get('trim_margins', True),
+            collapse_blank_rows=encoding_data.get('collapse_blank_rows', True),
+            blank_row_gap=encoding_data.get('blank_row_gap', 8),
+            palette_colors=encoding_data.get('palette_colors', 16)
+        )
+    
+    def _parse_ocr_rate_limit_config(self) -> None:
+        """Parse OCR rate limit configuration."""
+        limit_data = self._config_data.get('ocr_rate_limit', {})
+        
+        self.ocr_rate_limit = OCRRateLimitConfig(
+            enabled=limit_data.get('enabled', True),
+            requests_per_second=limit_data.get('requests_per_second', 10.0),
+            burst=limit_data.get('burst', 10),
+            failure_threshold=limit_data.get('failure_threshold', 5),
+            rate_limit_threshold=limit_data.get('rate_limit_threshold', 2),
+            reset_timeout=limit_data.get('reset_timeout', 30.0),
+            max_reset_timeout=limit_data.get('max_reset_timeout', 300.0),
+            max_rate_limit_retries=limit_data.get('max_rate_limit_retries', 10)
+        )
+    
+    def _parse_ocr_scheduling_config(self) -> None:
+        """Parse OCR scheduling configuration."""
+        scheduling_data = self._config_data.get('ocr_scheduling', {})
+        
+        self.ocr_scheduling = OCRSchedulingConfig(
+            enabled=scheduling_data.get('enabled', True),
+            default_max_wait=scheduling_data.get('default_max_wait', 120.0),
+            aging_interval=scheduling_data.get('aging_interval', 30.0),
+            cost_unit_bytes=scheduling_data.get('cost_unit_bytes', 262144)
+        )
+    
+    def _parse_ocr_journal_config(self) -> None:
+        """Parse OCR job journal configuration."""
+        journal_data = self._config_data.get('ocr_journal', {})
+        
+        self.ocr_journal = OCRJournalConfig(
+            enabled=journal_data.get('enabled', True),
+            db_path=journal_data.get('db_path', 'data/ocr_journal.db'),
+            retention_hours=journal_data.get('retention_hours', 24.0)
+        )
+    
+    def _parse_ocr_packing_config(self) -> None:
+        """Parse OCR request packing configuration."""
+        packing_data = self._config_data.get('ocr_packing', {})
+        
+        self.ocr_packing = OCRPackingConfig(
+            enabled=packing_data.get('enabled', True),
+            min_backlog=packing_data.get('min_backlog', 3),
+            max_images=packing_data.get('max_images', 8),
+            max_image_bytes=packing_data.get('max_image_bytes', 524288),
+            max_bytes=packing_data.get('max_bytes', 4194304),
+            max_height=packing_data.get('max_height', 8000),
+            gap=packing_data.get('gap', 32)
+        )
+    
+    def _parse_ocr_backends_config(self) -> None:
+        """Parse OCR backend routing configuration."""
+        backends_data = self._config_data.get('ocr_backends', {})
+        
+        self.ocr_backends = OCRBackendsConfig(
+            enabled=backends_data.get('enabled', True),
+            tesseract_cmd=backends_data.get('tesseract_cmd', ''),
+            tesseract_oem=backends_data.get('tesseract_oem', 3),
+            tesseract_psm=backends_data.get('tesseract_psm', 6),
+            small_image_bytes=backends_data.get('small_image_bytes', 16384),
+            max_cloud_latency=backends_data.get('max_cloud_latency', 3.0),
+            max_cloud_error_rate=backends_data.get('max_cloud_error_rate', 0.5),
+            rate_limit_cooldown=backends_data.get('rate_limit_cooldown', 30.0),
+            probe_interval=backends_data.get('probe_interval', 15.0),
+            ewma_alpha=backends_data.get('ewma_alpha', 0.2)
+        )
+    
+    def _parse_ocr_cache_config(self) -> None:
+        """Parse OCR result cache configuration."""
+        cache_data = self._config_data.get('ocr_cache', {})
+        
+        self.ocr_cache = OCRCacheConfig(
+            enabled=cache_data.get('enabled', True),
+            db_path=cache_data.get('db_path', 'data/cache/ocr_cache.db'),
+            ttl_seconds=cache_data.get('ttl_seconds', 3600),
+            max_entries=cache_data.get('max_entries', 500),
+            perceptual_matching=cache_data.get('perceptual_matching', False),
+            max_hamming_distance=cache_data.get('max_hamming_distance', 0),
+            hash_size=cache_data.get('hash_size', 16)
+        )
+    
+    def _parse_ocr_archive_config(self) -> None:
+        """Parse raw OCR text archive configuration."""
+        archive_data = self._config_data.get('ocr_archive', {})
+        
+        self.ocr_archive = OCRArchiveConfig(
+            enabled=archive_data.get('enabled', True),
+            compression_level=archive_data.get('compression_level', 6),
+            store_layout=archive_data.get('store_layout', True),
+            reprocess_workers=archive_data.get('reprocess_workers', 0),
+            reprocess_batch_size=archive_data.get('reprocess_batch_size', 200)
+        )
+    
+    def _parse_name_canonicalization_config(self) -> None:
+        """Parse name canonicalization configuration."""
+        names_data = self._config_data.get('name_canonicalization', {})
+        
+        self.name_canonicalization = NameCanonicalizationConfig(
+            enabled=names_data.get('enabled', True),
+            max_seller_substitutions=names_data.get('max_seller_substitutions', 1),
+            max_item_substitutions=names_data.get('max_item_substitutions', 2),
+            min_name_length=names_data.get('min_name_length', 5),
+            cache_size=names_data.get('cache_size', 4096),
+            learn_aliases=names_data.get('learn_aliases', False)
+        )
+    
+    def _parse_alerts_config(self) -> None:
+        """Parse alert engine configuration."""
+        alerts_data = self._config_data.get('alerts', {})
+        
+        self.alerts = AlertsConfig(
+            enabled=alerts_data.get('enabled', False),
+            rules_file=alerts_data.get('rules_file', 'alert_rules.json'),
+            sinks=alerts_data.get('sinks', [{"type": "jsonl", "path": "data/alerts/alerts.jsonl"}])
+        )
+    
+    def _parse_change_publisher_config(self) -> None:
+        """Parse change publisher configuration."""
+        publisher_data = self._config_data.get('change_publisher', {})
+        
+        self.change_publisher = ChangePublisherConfig(
+            enabled=publisher_data.get('enabled', False),
+            max_batch_size=publisher_data.get('max_batch_size', 100),
+            max_batch_delay_ms=publisher_data.get('max_batch_delay_ms', 200),
+            max_buffer_size=publisher_data.get('max_buffer_size', 10000),
+            sinks=publisher_data.get('sinks', [{"type": "jsonl", "path": "data/changes/changes.jsonl"}])
         )
     
     def _validate_config(self) -> None:
@@ -286,6 +672,10 @@ class SettingsManager:
                 errors.append(f"Hotkey '{key}': area must have 4 coordinates")
             if config.merge_interval <= 0:
                 errors.append(f"Hotkey '{key}': merge_interval must be positive")
+            if config.ocr_weight <= 0:
+                errors.append(f"Hotkey '{key}': ocr_weight must be positive")
+            if config.ocr_max_wait < 0:
+                errors.append(f"Hotkey '{key}': ocr_max_wait must be non-negative")
         
         # Validate OCR config
         if self.yandex_ocr:
@@ -299,6 +689,10 @@ class SettingsManager:
                 errors.append("OCR max_retries must be non-negative")
             if self.yandex_ocr.max_image_size_mb <= 0:
                 errors.append("OCR max_image_size_mb must be positive")
+            if self.yandex_ocr.max_in_flight < 1:
+                errors.append("OCR max_in_flight must be at least 1")
+            if self.yandex_ocr.keepalive_timeout < 0:
+                errors.append("OCR keepalive_timeout must be non-negative")
         
         # Validate monitoring config
         if self.monitoring:
@@ -307,6 +701,156 @@ class SettingsManager:
             if self.monitoring.cleanup_old_data_days <= 0:
                 errors.append("Cleanup days must be positive")
         
+        # Validate image processing config
+        if self.image_processing:
+            if self.image_processing.strip_height < 0:
+                errors.append("Image processing strip_height must be non-negative")
+            if self.image_processing.strip_cache_size <= 0:
+                errors.append("Image processing strip_cache_size must be positive")
+            if self.image_processing.frame_buffer_size <= 0:
+                errors.append("Image processing frame_buffer_size must be positive")
+            if self.image_processing.in_memory_pipeline and self.image_processing.strip_mode:
+                errors.append("Image processing in_memory_pipeline cannot be combined with strip_mode")
+            if self.image_processing.merge_engine not in ('numpy', 'pil'):
+                errors.append("Image processing merge_engine must be 'numpy' or 'pil'")
+            if self.image_processing.process_pool_workers < 0:
+                errors.append("Image processing process_pool_workers cannot be negative")
+            if self.image_processing.process_pool_chunk_rows <= 0:
+                errors.append("Image processing process_pool_chunk_rows must be positive")
+            if self.image_processing.oversize_mode not in ('scale', 'chunk'):
+                errors.append("Image processing oversize_mode must be 'scale' or 'chunk'")
+        
+        # Validate capture executor config
+        if self.capture_executor and self.capture_executor.max_queue_size <= 0:
+            errors.append("Capture executor max_queue_size must be positive")
+        
+        # Validate capture planner config
+        if self.capture_planner:
+            if self.capture_planner.max_waste_ratio < 1.0:
+                errors.append("Capture planner max_waste_ratio must be at least 1.0")
+            if self.capture_planner.capture_all_hotkey.lower() in {key.lower() for key in self.hotkeys}:
+                errors.append("Capture planner capture_all_hotkey conflicts with a configured hotkey")
+        
+        # Validate screenshot dedup config
+        if self.screenshot_dedup:
+            if self.screenshot_dedup.action not in ('drop', 'count'):
+                errors.append("Screenshot dedup action must be 'drop' or 'count'")
+            if self.screenshot_dedup.history_size <= 0:
+                errors.append("Screenshot dedup history_size must be positive")
+            if self.screenshot_dedup.max_hamming_distance < 0:
+                errors.append("Screenshot dedup max_hamming_distance must be non-negative")
+        
+        # Validate OCR encoding config
+        if self.ocr_encoding:
+            unknown = set(self.ocr_encoding.encodings) - {'png_gray', 'png_palette', 'jpeg', 'webp'}
+            if not self.ocr_encoding.encodings or unknown:
+                errors.append(f"OCR encoding encodings must be png_gray, png_palette, jpeg or webp, got {sorted(unknown)}")
+            if not all(1 <= quality <= 100 for quality in self.ocr_encoding.quality_ladder):
+                errors.append("OCR encoding quality_ladder values must be between 1 and 100")
+            if not 0 < self.ocr_encoding.max_bytes <= 20 * 1024 * 1024:
+                errors.append("OCR encoding max_bytes must be positive and at most 20MB")
+            if not 2 <= self.ocr_encoding.palette_colors <= 256:
+                errors.append("OCR encoding palette_colors must be between 2 and 256")
+        
+        # Validate OCR rate limit config
+        if self.ocr_rate_limit:
+            if self.ocr_rate_limit.requests_per_second <= 0:
+                errors.append("OCR rate limit requests_per_second must be positive")
+            if self.ocr_rate_limit.burst < 1:
+                errors.append("OCR rate limit burst must be at least 1")
+            if self.ocr_rate_limit.failure_threshold < 1 or self.ocr_rate_limit.rate_limit_threshold < 1:
+                errors.append("OCR rate limit thresholds must be at least 1")
+            if self.ocr_rate_limit.reset_timeout <= 0:
+                errors.append("OCR rate limit reset_timeout must be positive")
+            if self.ocr_rate_limit.max_rate_limit_retries < 0:
+                errors.append("OCR rate limit max_rate_limit_retries must be non-negative")
+        
+        # Validate OCR scheduling config
+        if self.ocr_scheduling:
+            if self.ocr_scheduling.default_max_wait < 0:
+                errors.append("OCR scheduling default_max_wait must be non-negative")
+            if self.ocr_scheduling.aging_interval < 0:
+                errors.append("OCR scheduling aging_interval must be non-negative")
+            if self.ocr_scheduling.cost_unit_bytes <= 0:
+                errors.append("OCR scheduling cost_unit_bytes must be positive")
+        
+        # Validate OCR journal config
+        if self.ocr_journal and self.ocr_journal.enabled:
+            if not self.ocr_journal.db_path:
+                errors.append("OCR journal db_path is required")
+            if self.ocr_journal.retention_hours <= 0:
+                errors.append("OCR journal retention_hours must be positive")
+        
+        # Validate OCR packing config
+        if self.ocr_packing and self.ocr_packing.enabled:
+            if self.ocr_packing.min_backlog < 1:
+                errors.append("OCR packing min_backlog must be at least 1")
+            if self.ocr_packing.max_images < 2:
+                errors.append("OCR packing max_images must be at least 2")
+            if not 0 < self.ocr_packing.max_image_bytes <= self.ocr_packing.max_bytes:
+                errors.append("OCR packing max_image_bytes must be positive and not above max_bytes")
+            if self.ocr_packing.max_height <= 0:
+                errors.append("OCR packing max_height must be positive")
+            if self.ocr_packing.gap < 0:
+                errors.append("OCR packing gap must be non-negative")
+        
+        # Validate OCR backends config
+        if self.ocr_backends and self.ocr_backends.enabled:
+            if self.ocr_backends.small_image_bytes < 0:
+                errors.append("OCR backends small_image_bytes must be non-negative")
+            if self.ocr_backends.max_cloud_latency <= 0:
+                errors.append("OCR backends max_cloud_latency must be positive")
+            if not 0 < self.ocr_backends.max_cloud_error_rate <= 1:
+                errors.append("OCR backends max_cloud_error_rate must be between 0 and 1")
+            if self.ocr_backends.rate_limit_cooldown < 0 or self.ocr_backends.probe_interval < 0:
+                errors.append("OCR backends rate_limit_cooldown and probe_interval must be non-negative")
+            if not 0 < self.ocr_backends.ewma_alpha <= 1:
+                errors.append("OCR backends ewma_alpha must be between 0 and 1")
+        
+        # Validate OCR cache config
+        if self.ocr_cache:
+            if self.ocr_cache.ttl_seconds <= 0:
+                errors.append("OCR cache ttl_seconds must be positive")
+            if self.ocr_cache.max_entries <= 0:
+                errors.append("OCR cache max_entries must be positive")
+            if self.ocr_cache.max_hamming_distance < 0:
+                errors.append("OCR cache max_hamming_distance must be non-negative")
+        
+        # Validate OCR archive config
+        if self.ocr_archive:
+            if not 0 <= self.ocr_archive.compression_level <= 9:
+                errors.append("OCR archive compression_level must be between 0 and 9")
+            if self.ocr_archive.reprocess_workers < 0:
+                errors.append("OCR archive reprocess_workers must be non-negative")
+            if self.ocr_archive.reprocess_batch_size <= 0:
+                errors.append("OCR archive reprocess_batch_size must be positive")
+        
+        # Validate name canonicalization config
+        if self.name_canonicalization:
+            if (self.name_canonicalization.max_seller_substitutions < 0
+                    or self.name_canonicalization.max_item_substitutions < 0):
+                errors.append("Name canonicalization substitution limits must be non-negative")
+            if self.name_canonicalization.cache_size <= 0:
+                errors.append("Name canonicalization cache_size must be positive")
+        
+        # Validate alerts config
+        if self.alerts:
+            for sink_config in self.alerts.sinks:
+                if not isinstance(sink_config, dict) or 'type' not in sink_config:
+                    errors.append(f"Alert sink definition must be an object with 'type': {sink_config}")
+        
+        # Validate change publisher config
+        if self.change_publisher:
+            if self.change_publisher.max_batch_size <= 0:
+                errors.append("Change publisher max_batch_size must be positive")
+            if self.change_publisher.max_batch_delay_ms < 0:
+                errors.append("Change publisher max_batch_delay_ms must be non-negative")
+            if self.change_publisher.max_buffer_size < self.change_publisher.max_batch_size:
+                errors.append("Change publisher max_buffer_size must be at least max_batch_size")
+            for sink_config in self.change_publisher.sinks:
+                if not isinstance(sink_config, dict) or 'type' not in sink_config:
+                    errors.append(f"Change sink definition must be an object with 'type': {sink_config}")
+        
         if errors:
             raise ConfigurationError("Configuration validation failed:\n" + "\n".join(f"- {error}" for error in errors))
     
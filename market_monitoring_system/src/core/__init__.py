@@ -2,16 +2,56 @@
 
 from .database_manager import DatabaseManager, ItemData, ChangeLogEntry
 from .screenshot_capture import ScreenshotCapture, ScreenshotCaptureError
+from .frame_buffer import FrameBuffer, CapturedFrame
+from .capture_executor import CaptureExecutor, CaptureRequest, CaptureExecutorError
+from .capture_planner import CapturePlanner, CapturePlan, CaptureRegion
 from .image_processor import ImageProcessor, ImageProcessingError
+from .numpy_imaging import compose_vertical, enhance_for_ocr, NumpyImagingError
+from .image_worker_pool import ImageWorkerPool, MergeSource, ImageWorkerPoolError
+from .ocr_image_encoder import OCRImageEncoder, EncodedImage, OCRImageEncoderError
 from .ocr_client import YandexOCRClient, OCRError
+from .ocr_backends import OCRBackend, YandexOCRBackend, TesseractOCRBackend, OCRBackendRouter, BackendHealth, OCRBackendError
+from .async_ocr_client import AsyncYandexOCRClient, AsyncOCRError
+from .rate_limiter import TokenBucket, CircuitBreaker, CircuitState, RetryScheduler, RateLimiterError
+from .fair_job_queue import FairJobQueue
+from .ocr_job_journal import OCRJobJournal, JournalRecord, OCRJobJournalError
+from .ocr_request_packer import OCRRequestPacker, PackedImage, PackedRegion, OCRRequestPackerError
+from .ocr_reprocessor import OCRReprocessor, OCRReprocessorError
+from .ocr_cache import OCRResultCache, OCRCacheKey, OCRCacheError
+from .strip_tracker import StripTracker, ImageStrip, StripMergeResult
+from .ocr_document import OCRDocument, OCRBlock, OCRLine, OCRWord, BoundingBox, shift_layout_line
 from .text_parser import TextParser, ParsingResult, ParsingPattern, TextParsingError
+from .name_canonicalizer import NameCanonicalizer, NameCanonicalizerError
 from .monitoring_engine import MonitoringEngine, MonitoringEngineError, StatusTransition, ChangeDetection
+from .event_sinks import EventSink, JSONLFileSink, UnixSocketSink, NamedPipeSink, CallbackSink, EventSinkError, create_sink
+from .alert_engine import AlertEngine, AlertRule, Alert, AlertEngineError
+from .change_publisher import ChangePublisher, ChangePublisherError
 
 __all__ = [
     'DatabaseManager', 'ItemData', 'ChangeLogEntry',
     'ScreenshotCapture', 'ScreenshotCaptureError',
+    'FrameBuffer', 'CapturedFrame',
+    'CaptureExecutor', 'CaptureRequest', 'CaptureExecutorError',
+    'CapturePlanner', 'CapturePlan', 'CaptureRegion',
     'ImageProcessor', 'ImageProcessingError',
+    'compose_vertical', 'enhance_for_ocr', 'NumpyImagingError',
+    'ImageWorkerPool', 'MergeSource', 'ImageWorkerPoolError',
+    'OCRImageEncoder', 'EncodedImage', 'OCRImageEncoderError',
     'YandexOCRClient', 'OCRError',
+    'OCRBackend', 'YandexOCRBackend', 'TesseractOCRBackend', 'OCRBackendRouter', 'BackendHealth', 'OCRBackendError',
+    'AsyncYandexOCRClient', 'AsyncOCRError',
+    'TokenBucket', 'CircuitBreaker', 'CircuitState', 'RetryScheduler', 'RateLimiterError',
+    'FairJobQueue',
+    'OCRJobJournal', 'JournalRecord', 'OCRJobJournalError',
+    'OCRRequestPacker', 'PackedImage', 'PackedRegion', 'OCRRequestPackerError',
+    'OCRReprocessor', 'OCRReprocessorError',
+    'OCRResultCache', 'OCRCacheKey', 'OCRCacheError',
+    'StripTracker', 'ImageStrip', 'StripMergeResult',
+    'OCRDocument', 'OCRBlock', 'OCRLine', 'OCRWord', 'BoundingBox', 'shift_layout_line',
     'TextParser', 'ParsingResult', 'ParsingPattern', 'TextParsingError',
-    'MonitoringEngine', 'MonitoringEngineError', 'StatusTransition', 'ChangeDetection'
+    'NameCanonicalizer', 'NameCanonicalizerError',
+    'MonitoringEngine', 'MonitoringEngineError', 'StatusTransition', 'ChangeDetection',
+    'EventSink', 'JSONLFileSink', 'UnixSocketSink', 'NamedPipeSink', 'CallbackSink', 'EventSinkError', 'create_sink',
+    'AlertEngine', 'AlertRule', 'Alert', 'AlertEngineError',
+    'ChangePublisher', 'ChangePublisherError'
 ]
\ No newline at end of file
@@ -0,0 +1,377 @@
+"""
+Alert rule engine for market monitoring system.
+Evaluates user-defined rules incrementally against detected changes.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Any
+
+from .database_manager import ChangeLogEntry
+from .event_sinks import EventSink, EventSinkError
+
+
+# Change types that mean a seller (re)listed an item
+RELIST_CHANGE_TYPES = ['NEW_ITEM', 'NEW_COMBINATION', 'SELLER_NEW']
+
+
+@dataclass
+class AlertRule:
+    """User-defined alert rule matched against change log entries."""
+    rule_id: str
+    description: str = ""
+    seller_name: Optional[str] = None  # None matches any seller
+    item_name: Optional[str] = None  # None matches any item
+    change_types: List[str] = field(default_factory=list)  # Empty list matches any change type
+    relist: bool = False  # Match only RELIST_CHANGE_TYPES
+    price_below: Optional[float] = None
+    price_above: Optional[float] = None
+    cooldown_seconds: int = 0
+    enabled: bool = True
+
+
+@dataclass
+class Alert:
+    """Alert produced when a change matches a rule."""
+    rule_id: str
+    description: str
+    seller_name: str
+    item_name: str
+    change_type: str
+    old_value: Optional[str]
+    new_value: Optional[str]
+    price: Optional[float] = None
+    triggered_at: datetime = field(default_factory=datetime.now)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert alert to JSON-serializable dictionary."""
+        data = asdict(self)
+        data['triggered_at'] = self.triggered_at.isoformat()
+        return data
+
+
+class AlertEngineError(Exception):
+    """Exception raised for alert engine errors."""
+    pass
+
+
+class AlertEngine:
+    """
+    Rule engine that indexes rules by seller and item.
+    Each change is checked only against rules that can match it, so evaluation
+    cost scales with the number of changes rather than rules x items.
+    """
+    
+    # Extracts price from NEW_ITEM values like "Price: 100.0, Quantity: 5"
+    _PRICE_PATTERN = re.compile(r'Price:\s*(-?\d+(?:\.\d+)?)')
+    
+    def __init__(self, sinks: Optional[List[EventSink]] = None):
+        """
+        Initialize alert engine.
+        
+        Args:
+            sinks: Event sinks that receive triggered alerts
+        """
+        self.logger = logging.getLogger(__name__)
+        self.sinks: List[EventSink] = list(sinks or [])
+        self._lock = threading.Lock()
+        
+        # Rule storage and (seller, item) index; None in a key means wildcard
+        self._rules: Dict[str, AlertRule] = {}
+        self._index: Dict[Tuple[Optional[str], Optional[str]], Dict[str, AlertRule]] = {}
+        
+        # Last trigger time per (rule_id, seller, item) for cooldowns
+        self._last_triggered: Dict[Tuple[str, str, str], float] = {}
+        
+        # Statistics
+        self._stats = {
+            'total_changes_evaluated': 0,
+            'total_rule_checks': 0,
+            'total_alerts_triggered': 0,
+            'alerts_suppressed_by_cooldown': 0,
+            'delivery_errors': 0,
+            'last_alert_time': None
+        }
+    
+    @staticmethod
+    def _normalize(name: Optional[str]) -> Optional[str]:
+        """Normalize seller/item name for index lookups."""
+        if name is None:
+            return None
+        normalized = name.strip().casefold()
+        return normalized or None
+    
+    def _index_key(self, rule: AlertRule) -> Tuple[Optional[str], Optional[str]]:
+        """Get index key for a rule."""
+        return (self._normalize(rule.seller_name), self._normalize(rule.item_name))
+    
+    def add_rule(self, rule: AlertRule) -> None:
+        """
+        Add or replace an alert rule.
+        
+        Args:
+            rule: Rule to add
+        
+        Raises:
+            AlertEngineError: If rule definition is invalid
+        """
+        if not rule.rule_id:
+            raise AlertEngineError("Alert rule must have a rule_id")
+        if (rule.price_below is not None and rule.price_above is not None
+                and rule.price_above >= rule.price_below):
+            raise AlertEngineError(
+                f"Alert rule '{rule.rule_id}': price_above must be lower than price_below"
+            )
+        if rule.relist and rule.change_types:
+            raise AlertEngineError(
+                f"Alert rule '{rule.rule_id}': relist rules cannot also set change_types"
+            )
+        
+        with self._lock:
+            self._remove_rule_locked(rule.rule_id)
+            self._rules[rule.rule_id] = rule
+            self._index.setdefault(self._index_key(rule), {})[rule.rule_id] = rule
+        
+        self.logger.debug(f"Added alert rule {rule.rule_id}")
+    
+    def remove_rule(self, rule_id: str) -> bool:
+        """
+        Remove an alert rule.
+        
+        Args:
+            rule_id: ID of the rule to remove
+        
+        Returns:
+            True if rule existed and was removed
+        """
+        with self._lock:
+            return self._remove_rule_locked(rule_id)
+    
+    def _remove_rule_locked(self, rule_id: str) -> bool:
+        """Remove rule from storage and index (caller holds lock)."""
+        rule = self._rules.pop(rule_id, None)
+        if rule is None:
+            return False
+        
+        key = self._index_key(rule)
+        bucket = self._index.get(key)
+        if bucket is not None:
+            bucket.pop(rule_id, None)
+            if not bucket:
+                del self._index[key]
+        return True
+    
+    def get_rules(self) -> List[AlertRule]:
+        """Get all registered rules."""
+        with self._lock:
+            return list(self._rules.values())
+    
+    def load_rules_from_file(self, rules_file: Path) -> int:
+        """
+        Load alert rules from JSON file.
+        
+        Expected format: {"rules": [{"rule_id": "...", "item_name": "...", ...}]}
+        
+        Args:
+            rules_file: Path to rules file
+        
+        Returns:
+            Number of rules loaded
+        
+        Raises:
+            AlertEngineError: If file cannot be read or contains invalid rules
+        """
+        rules_file = Path(rules_file)
+        if not rules_file.exists():
+            self.logger.warning(f"Alert rules file not found: {rules_file}")
+            return 0
+        
+        try:
+            with open(rules_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise AlertEngineError(f"Invalid JSON in alert rules file: {e}")
+        
+        loaded = 0
+        for rule_data in data.get('rules', []):
+            try:
+                self.add_rule(AlertRule(**rule_data))
+                loaded += 1
+            except TypeError as e:
+                raise AlertEngineError(f"Invalid alert rule {rule_data.get('rule_id')}: {e}")
+        
+        self.logger.info(f"Loaded {loaded} alert rules from {rules_file}")
+        return loaded
+    
+    def _candidate_rules(self, change: ChangeLogEntry) -> List[AlertRule]:
+        """Get rules that can match the change using the seller/item index."""
+        seller = self._normalize(change.seller_name)
+        item = self._normalize(change.item_name)
+        
+        candidates = []
+        for key in ((seller, item), (seller, None), (None, item), (None, None)):
+            bucket = self._index.get(key)
+            if bucket:
+                candidates.extend(bucket.values())
+        return candidates
+    
+    def _extract_price(self, change: ChangeLogEntry) -> Optional[float]:
+        """Extract the new price carried by a change, if any."""
+        if not change.new_value:
+            return None
+        
+        if change.change_type in ('PRICE_INCREASE', 'PRICE_DECREASE'):
+            try:
+                return float(change.new_value)
+            except ValueError:
+                return None
+        
+        match = self._PRICE_PATTERN.search(change.new_value)
+        if match:
+            return float(match.group(1))
+        return None
+    
+    def _rule_matches(self, rule: AlertRule, change: ChangeLogEntry,
+                      price: Optional[float]) -> bool:
+        """Check rule conditions that are not covered by the index."""
+        if not rule.enabled:
+            return False
+        
+        if rule.change_types and change.change_type not in rule.change_types:
+            return False
+        
+        if rule.relist and change.change_type not in RELIST_CHANGE_TYPES:
+            return False
+        
+        if rule.price_below is not None or rule.price_above is not None:
+            if price is None:
+                return False
+            if rule.price_below is not None and price >= rule.price_below:
+                return False
+            if rule.price_above is not None and price <= rule.price_above:
+                return False
+        
+        return True
+    
+    def evaluate(self, changes: List[ChangeLogEntry]) -> List[Alert]:
+        """
+        Evaluate changes against indexed rules without delivering alerts.
+        
+        Args:
+            changes: Detected change log entries
+        
+        Returns:
+            List of triggered alerts
+        """
+        alerts = []
+        now = time.time()
+        
+        with self._lock:
+            for change in changes:
+                self._stats['total_changes_evaluated'] += 1
+                candidates = self._candidate_rules(change)
+                if not candidates:
+                    continue
+                
+                price = self._extract_price(change)
+                
+                for rule in candidates:
+                    self._stats['total_rule_checks'] += 1
+                    if not self._rule_matches(rule, change, price):
+                        continue
+                    
+                    # Apply per-combination cooldown
+                    if rule.cooldown_seconds > 0:
+                        cooldown_key = (rule.rule_id, change.seller_name, change.item_name)
+                        last_time = self._last_triggered.get(cooldown_key)
+                        if last_time is not None and now - last_time < rule.cooldown_seconds:
+                            self._stats['alerts_suppressed_by_cooldown'] += 1
+                            continue
+                        self._last_triggered[cooldown_key] = now
+                    
+                    alerts.append(Alert(
+                        rule_id=rule.rule_id,
+                        description=rule.description,
+                        seller_name=change.seller_name,
+                        item_name=change.item_name,
+                        change_type=change.change_type,
+                        old_value=change.old_value,
+                        new_value=change.new_value,
+                        price=price
+                    ))
+            
+            if alerts:
+                self._stats['total_alerts_triggered'] += len(alerts)
+                self._stats['last_alert_time'] = datetime.now().isoformat()
+        
+        return alerts
+    
+    def process_changes(self, changes: List[ChangeLogEntry]) -> List[Alert]:
+        """
+        Evaluate changes and deliver triggered alerts to all sinks.
+        
+        Args:
+            changes: Detected change log entries
+        
+        Returns:
+            List of triggered alerts
+        """
+        if not changes:
+            return []
+        
+        alerts = self.evaluate(changes)
+        if alerts:
+            self.deliver_alerts(alerts)
+            self.logger.info(f"Triggered {len(alerts)} alerts from {len(changes)} changes")
+        
+        return alerts
+    
+    def deliver_alerts(self, alerts: List[Alert]) -> None:
+        """
+        Deliver alerts to all sinks. Sink failures are logged and counted.
+        
+        Args:
+            alerts: Alerts to deliver
+        """
+        records = [alert.to_dict() for alert in alerts]
+        
+        for sink in self.sinks:
+            try:
+                sink.deliver(records)
+            except EventSinkError as e:
+                with self._lock:
+                    self._stats['delivery_errors'] += 1
+                self.logger.error(f"Failed to deliver {len(records)} alerts: {e}")
+    
+    def add_sink(self, sink: EventSink) -> None:
+        """Register an additional alert sink."""
+        self.sinks.append(sink)
+    
+    def get_alert_statistics(self) -> Dict[str, Any]:
+        """
+        Get alert engine statistics.
+        
+        Returns:
+            Dictionary with alert statistics
+        """
+        with self._lock:
+            stats = self._stats.copy()
+            stats['total_rules'] = len(self._rules)
+            stats['index_buckets'] = len(self._index)
+        
+        stats['sinks'] = [sink.get_sink_statistics() for sink in self.sinks]
+        return stats
+    
+    def close(self) -> None:
+        """Close all alert sinks."""
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                self.logger.warning(f"Error closing alert sink: {e}")
\ No newline at end of file
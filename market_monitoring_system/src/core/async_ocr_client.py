@@ -0,0 +1,308 @@
+"""
+Asyncio Yandex OCR client for market monitoring system.
+Sends concurrent OCR requests over a pooled keep-alive session with bounded in-flight requests.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Optional, Dict, Any, List, Union
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError as e:
+    AIOHTTP_AVAILABLE = False
+    AIOHTTP_ERROR = str(e)
+
+from .ocr_image_encoder import sniff_mime_type
+from .simple_ocr_client import SimpleYandexOCRClient, OCRRateLimitError, parse_retry_after
+
+
+DEFAULT_OCR_URL = "https://ocr.api.cloud.yandex.net/ocr/v1/recognizeText"
+
+STREAM_CHUNK_SIZE = 3 * 16384  # Multiple of 3 so chunks base64-encode without padding
+
+
+class AsyncOCRError(Exception):
+    """Exception raised for async OCR client errors."""
+    pass
+
+
+class AsyncYandexOCRClient:
+    """
+    Asyncio Yandex OCR client for many concurrent requests on one event loop.
+    Requests share a keep-alive connection pool, a semaphore caps the requests
+    in flight, file images are streamed into the JSON body in base64 chunks and
+    every request has a deadline covering the wait for a slot and the response.
+    """
+    
+    def __init__(self, api_key: str, api_url: str = DEFAULT_OCR_URL, timeout: float = 30.0,
+                 max_in_flight: int = 8, keepalive_timeout: float = 30.0):
+        """
+        Initialize async OCR client.
+        
+        Args:
+            api_key: Yandex OCR API key
+            api_url: OCR recognizeText endpoint
+            timeout: Default seconds per request, including the wait for a free slot
+            max_in_flight: Maximum concurrent requests
+            keepalive_timeout: Seconds idle pooled connections are kept open
+        
+        Raises:
+            AsyncOCRError: If aiohttp is missing or the API key is invalid
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise AsyncOCRError(f"aiohttp library not available: {AIOHTTP_ERROR}")
+        
+        if not api_key or api_key == "your_api_key_here":
+            raise AsyncOCRError("Valid Yandex OCR API key is required")
+        
+        self.api_key = api_key
+        self.api_url = api_url or DEFAULT_OCR_URL
+        self.timeout = timeout
+        self.max_in_flight = max(1, max_in_flight)
+        self.keepalive_timeout = keepalive_timeout
+        self.logger = logging.getLogger(__name__)
+        
+        # Created in start() because they are bound to the running event loop
+        self._session: Optional['aiohttp.ClientSession'] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        
+        # Statistics
+        self._stats = {
+            'total_requests': 0,
+            'successful_requests': 0,
+            'failed_requests': 0,
+            'timeouts': 0,
+            'rate_limit_hits': 0,
+            'in_flight': 0,
+            'max_in_flight_reached': 0,
+            'bytes_sent': 0,
+            'total_processing_time': 0.0,
+            'total_slot_wait_time': 0.0,
+            'last_request_time': None,
+            'api_errors': {}
+        }
+    
+    @property
+    def is_open(self) -> bool:
+        """Whether the session is open."""
+        return self._session is not None and not self._session.closed
+    
+    async def start(self) -> None:
+        """Open the pooled HTTP session on the running event loop."""
+        if self.is_open:
+            return
+        
+        connector = aiohttp.TCPConnector(
+            limit=self.max_in_flight,
+            keepalive_timeout=self.keepalive_timeout
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers={
+                'Content-Type': 'application/json',
+                'Authorization': f'Api-Key {self.api_key}',
+                'User-Agent': 'MarketMonitoring-AsyncOCR/1.0'
+            }
+        )
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self.logger.info(f"Async OCR client started with {self.max_in_flight} concurrent requests")
+    
+    async def close(self) -> None:
+        """Close the session and its pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self.logger.info("Async OCR client closed")
+    
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+    
+    @staticmethod
+    def _payload_parts(mime_type: str, language_codes: Optional[List[str]]) -> List[bytes]:
+        """JSON body before and after the base64 content, in the format of the sync client."""
+        head = json.dumps(SimpleYandexOCRClient._build_payload('', mime_type, language_codes))
+        prefix, suffix = head.rsplit('""', 1)
+        return [f'{prefix}"'.encode('utf-8'), f'"{suffix}'.encode('utf-8')]
+    
+    async def _stream_body(self, prefix: bytes, suffix: bytes,
+                           image: Union[Path, bytes]) -> AsyncIterator[bytes]:
+        """Yield the JSON body with the image base64-encoded chunk by chunk."""
+        yield prefix
+        if isinstance(image, Path):
+            with open(image, 'rb') as f:
+                while True:
+                    chunk = f.read(STREAM_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield base64.b64encode(chunk)
+        else:
+            view = memoryview(image)
+            for offset in range(0, len(view), STREAM_CHUNK_SIZE):
+                yield base64.b64encode(view[offset:offset + STREAM_CHUNK_SIZE])
+        yield suffix
+    
+    async def _send(self, image: Union[Path, bytes], mime_type: str,
+                    language_codes: Optional[List[str]], session_id: str) -> Dict[str, Any]:
+        """
+        Post one OCR request once a slot is free.
+        
+        Returns:
+            textAnnotation part of the response
+        
+        Raises:
+            OCRRateLimitError: On HTTP 429
+            AsyncOCRError: On other HTTP errors
+        """
+        size = image.stat().st_size if isinstance(image, Path) else len(image)
+        prefix, suffix = self._payload_parts(mime_type, language_codes)
+        content_length = len(prefix) + 4 * ((size + 2) // 3) + len(suffix)
+        
+        wait_start = time.perf_counter()
+        async with self._semaphore:
+            self._stats['total_slot_wait_time'] += time.perf_counter() - wait_start
+            self._stats['in_flight'] += 1
+            self._stats['max_in_flight_reached'] = max(self._stats['max_in_flight_reached'], self._stats['in_flight'])
+            try:
+                self.logger.debug(f"Sending OCR request {session_id} ({size / 1024:.0f}KB)")
+                async with self._session.post(
+                    self.api_url,
+                    data=self._stream_body(prefix, suffix, image),
+                    headers={'Content-Length': str(content_length)}
+                ) as response:
+                    self._stats['bytes_sent'] += content_length
+                    if response.status != SimpleYandexOCRClient.STATUS_SUCCESS:
+                        errors = self._stats['api_errors']
+                        errors[response.status] = errors.get(response.status, 0) + 1
+                        body = await response.text()
+                        if response.status == SimpleYandexOCRClient.STATUS_TOO_MANY_REQUESTS:
+                            self._stats['rate_limit_hits'] += 1
+                            raise OCRRateLimitError(
+                                f"OCR API rate limit exceeded: HTTP 429: {body[:200]}",
+                                retry_after=parse_retry_after(response.headers.get('Retry-After'))
+                            )
+                        raise AsyncOCRError(f"OCR API error: HTTP {response.status}: {body[:200]}")
+                    
+                    response_data = await response.json(content_type=None)
+                    return response_data.get('result', {}).get('textAnnotation', {})
+            finally:
+                self._stats['in_flight'] -= 1
+    
+    async def recognize(self, image: Union[Path, bytes],
+                        language_codes: Optional[List[str]] = None,
+                        layout: bool = False,
+                        mime_type: Optional[str] = None,
+                        deadline: Optional[float] = None) -> Optional[Any]:
+        """
+        Recognize an image file or in-memory encoded image.
+        
+        Args:
+            image: Image file path or encoded image bytes
+            language_codes: Optional language codes
+            layout: Whether to return line positions together with text
+            mime_type: OCR API mime type, detected from the data or file suffix when None
+            deadline: time.monotonic() by which the request must finish (default now + timeout)
+        
+        Returns:
+            Extracted text, layout dictionary when layout is set, or None if failed
+        
+        Raises:
+            AsyncOCRError: If the client was not started
+            OCRRateLimitError: If the API rejected the request for rate limiting
+        """
+        if not self.is_open:
+            raise AsyncOCRError("Async OCR client is not started")
+        
+        start_time = time.time()
+        session_id = uuid.uuid4().hex[:8]
+        deadline = deadline if deadline is not None else time.monotonic() + self.timeout
+        
+        try:
+            if isinstance(image, Path):
+                size_mb = image.stat().st_size / (1024 * 1024)
+                if mime_type is None:
+                    mime_type = {'.png': 'PNG', '.pdf': 'PDF'}.get(image.suffix.lower(), 'JPEG')
+            else:
+                size_mb = len(image) / (1024 * 1024)
+                mime_type = mime_type or sniff_mime_type(image)
+            if size_mb > 20:  # 20MB limit
+                raise AsyncOCRError(f"Image too large: {size_mb:.1f}MB (max: 20MB)")
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            
+            text_annotation = await asyncio.wait_for(
+                self._send(image, mime_type, language_codes, session_id), timeout=remaining
+            )
+            extracted_text = (text_annotation.get('fullText') or '').strip()
+            
+            if layout:
+                result = {'text': extracted_text, 'lines': SimpleYandexOCRClient._extract_layout_lines(text_annotation)}
+            elif extracted_text:
+                result = extracted_text
+            else:
+                self.logger.warning("No text found in OCR response")
+                return None
+            
+            processing_time = time.time() - start_time
+            self._stats['successful_requests'] += 1
+            self._stats['total_processing_time'] += processing_time
+            self.logger.info(f"Async OCR request {session_id} completed successfully in {processing_time:.3f}s")
+            
+            return result
+        
+        except OCRRateLimitError:
+            self._stats['failed_requests'] += 1
+            raise
+        except asyncio.TimeoutError:
+            self._stats['timeouts'] += 1
+            self._stats['failed_requests'] += 1
+            self.logger.error(f"Async OCR request {session_id} missed its deadline after {time.time() - start_time:.3f}s")
+            return None
+        except Exception as e:
+            self._stats['failed_requests'] += 1
+            self.logger.error(f"Async OCR request {session_id} failed: {e} (failed after {time.time() - start_time:.3f}s)")
+            return None
+        finally:
+            self._stats['total_requests'] += 1
+            self._stats['last_request_time'] = datetime.now().isoformat()
+    
+    def get_ocr_statistics(self) -> Dict[str, Any]:
+        """
+        Get async OCR client statistics.
+        
+        Returns:
+            Dictionary with client statistics
+        """
+        stats = self._stats.copy()
+        stats['api_errors'] = dict(stats['api_errors'])
+        
+        total_requests = stats['total_requests']
+        if total_requests > 0:
+            stats['success_rate'] = stats['successful_requests'] / total_requests
+            stats['average_slot_wait_time'] = stats['total_slot_wait_time'] / total_requests
+        else:
+            stats['success_rate'] = 0.0
+            stats['average_slot_wait_time'] = 0.0
+        
+        stats['config_summary'] = {
+            'api_url': self.api_url,
+            'timeout': self.timeout,
+            'max_in_flight': self.max_in_flight,
+            'keepalive_timeout': self.keepalive_timeout
+        }
+        return stats
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""
+Capture executor for market monitoring system.
+Decouples hotkey hook callbacks from screen grabbing with a dedicated capture worker.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+
+@dataclass
+class CaptureRequest:
+    """Timestamped capture request enqueued by a hotkey press."""
+    hotkey: str
+    coordinates: Tuple[int, int, int, int]
+    description: str = ""
+    requested_at: float = field(default_factory=time.monotonic)
+    presses: int = 1  # Hotkey presses coalesced into this request
+
+
+class CaptureExecutorError(Exception):
+    """Exception raised for capture executor errors."""
+    pass
+
+
+class CaptureExecutor:
+    """
+    Single worker thread executing capture requests in press order.
+    The hotkey hook only appends a request; the worker owns the screen grabber.
+    A press for a hotkey whose previous request has not started yet is coalesced
+    into it, since that pending grab will already see the current screen.
+    With a batch handler the worker takes every queued request at once, so
+    areas requested in the same tick can share one grab.
+    """
+    
+    def __init__(self, capture_handler: Callable[[CaptureRequest], bool],
+                 max_queue_size: int = 64, coalesce_bursts: bool = True,
+                 on_worker_exit: Optional[Callable[[], None]] = None,
+                 batch_handler: Optional[Callable[[List[CaptureRequest]], List[bool]]] = None):
+        """
+        Initialize capture executor.
+        
+        Args:
+            capture_handler: Function performing the capture, returns success flag
+            max_queue_size: Maximum pending requests; further presses are dropped
+            coalesce_bursts: Merge presses of a hotkey that already has a pending request
+            on_worker_exit: Optional cleanup run in the worker thread when it stops
+            batch_handler: Optional function capturing all queued requests together,
+                returns success flag per request
+        """
+        self.capture_handler = capture_handler
+        self.batch_handler = batch_handler
+        self.max_queue_size = max_queue_size
+        self.coalesce_bursts = coalesce_bursts
+        self.on_worker_exit = on_worker_exit
+        self.logger = logging.getLogger(__name__)
+        
+        self._queue: deque = deque()
+        self._pending: Dict[str, CaptureRequest] = {}
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._is_running = False
+        
+        # Statistics
+        self._stats = {
+            'requests_submitted': 0,
+            'requests_coalesced': 0,
+            'requests_dropped': 0,
+            'captures_completed': 0,
+            'captures_failed': 0,
+            'queue_depth': 0,
+            'max_queue_depth': 0,
+            'total_queue_wait': 0.0,
+            'max_queue_wait': 0.0,
+            'total_submit_time': 0.0,
+            'max_submit_time': 0.0
+        }
+    
+    def start(self) -> None:
+        """Start the capture worker thread."""
+        with self._condition:
+            if self._is_running:
+                return
+            self._is_running = True
+        
+        self._worker = threading.Thread(target=self._worker_loop, name="CaptureWorker", daemon=True)
+        self._worker.start()
+        self.logger.info("Capture executor started")
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the worker after finishing queued requests.
+        
+        Args:
+            timeout: Maximum time to wait for the worker
+        """
+        with self._condition:
+            if not self._is_running:
+                return
+            self._is_running = False
+            self._condition.notify_all()
+        
+        if self._worker:
+            self._worker.join(timeout=timeout)
+            if self._worker.is_alive():
+                self.logger.warning("Capture worker did not stop gracefully")
+            self._worker = None
+        
+        self.logger.info("Capture executor stopped")
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the worker accepts requests."""
+        return self._is_running
+    
+    def submit(self, hotkey: str, coordinates: Tuple[int, int, int, int],
+               description: str = "") -> bool:
+        """
+        Enqueue capture request. Safe to call from the keyboard hook.
+        
+        Args:
+            hotkey: Hotkey name
+            coordinates: Screen area (x1, y1, x2, y2)
+            description: Optional description for logging
+        
+        Returns:
+            True if a new request was queued, False if coalesced or dropped
+        
+        Raises:
+            CaptureExecutorError: If executor is not running
+        """
+        submit_start = time.perf_counter()
+        
+        with self._condition:
+            if not self._is_running:
+                raise CaptureExecutorError("Capture executor is not running")
+            
+            self._stats['requests_submitted'] += 1
+            pending = self._pending.get(hotkey) if self.coalesce_bursts else None
+            
+            if pending is not None:
+                pending.presses += 1
+                self._stats['requests_coalesced'] += 1
+                queued = False
+            elif len(self._queue) >= self.max_queue_size:
+                self._stats['requests_dropped'] += 1
+                queued = False
+            else:
+                request = CaptureRequest(hotkey=hotkey, coordinates=tuple(coordinates), description=description)
+                self._queue.append(request)
+                self._pending[hotkey] = request
+                depth = len(self._queue)
+                self._stats['queue_depth'] = depth
+                self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], depth)
+                self._condition.notify()
+                queued = True
+            
+            submit_time = time.perf_counter() - submit_start
+            self._stats['total_submit_time'] += submit_time
+            self._stats['max_submit_time'] = max(self._stats['max_submit_time'], submit_time)
+        
+        return queued
+    
+    def _next_requests(self) -> List[CaptureRequest]:
+        """Wait for next request (all queued ones in batch mode); empty once stopped."""
+        with self._condition:
+            while not self._queue and self._is_running:
+                self._condition.wait(timeout=1.0)
+            
+            count = len(self._queue) if self.batch_handler else min(1, len(self._queue))
+            requests = [self._queue.popleft() for _ in range(count)]
+            
+            now = time.monotonic()
+            for request in requests:
+                if self._pending.get(request.hotkey) is request:
+                    del self._pending[request.hotkey]
+                wait_time = now - request.requested_at
+                self._stats['total_queue_wait'] += wait_time
+                self._stats['max_queue_wait'] = max(self._stats['max_queue_wait'], wait_time)
+            
+            self._stats['queue_depth'] = len(self._queue)
+            return requests
+    
+    def _worker_loop(self) -> None:
+        """Execute capture requests until stopped."""
+        try:
+            while True:
+                requests = self._next_requests()
+                if not requests:
+                    break
+                
+                try:
+                    if self.batch_handler:
+                        results = self.batch_handler(requests)
+                    else:
+                        results = [self.capture_handler(requests[0])]
+                except Exception as e:
+                    self.logger.error(f"Capture for {', '.join(r.hotkey for r in requests)} failed: {e}")
+                    results = [False] * len(requests)
+                
+                with self._condition:
+                    for success in results:
+                        self._stats['captures_completed' if success else 'captures_failed'] += 1
+        finally:
+            if self.on_worker_exit:
+                try:
+                    self.on_worker_exit()
+                except Exception as e:
+                    self.logger.error(f"Capture worker cleanup failed: {e}")
+    
+    def get_executor_statistics(self) -> Dict[str, Any]:
+        """
+        Get capture executor statistics.
+        
+        Returns:
+            Dictionary with executor statistics
+        """
+        with self._condition:
+            stats = self._stats.copy()
+            stats['is_running'] = self._is_running
+        
+        dequeued = stats['captures_completed'] + stats['captures_failed']
+        queued = stats['requests_submitted'] - stats['requests_coalesced'] - stats['requests_dropped']
+        stats['average_queue_wait'] = stats['total_queue_wait'] / dequeued if dequeued else 0.0
+        stats['average_submit_time'] = (
+            stats['total_submit_time'] / stats['requests_submitted'] if stats['requests_submitted'] else 0.0
+        )
+        stats['requests_queued'] = queued
+        return stats
\ No newline at end of file
@@ -0,0 +1,173 @@
+"""
+Capture planning for market monitoring system.
+Groups hotkey areas requested together into union-region grabs sliced as NumPy views.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import List, Tuple, Dict, Any
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError as e:
+    NUMPY_AVAILABLE = False
+    NUMPY_ERROR = str(e)
+
+
+Box = Tuple[int, int, int, int]  # x1, y1, x2, y2
+
+
+@dataclass
+class CaptureRegion:
+    """Screen area requested for one hotkey."""
+    hotkey: str
+    coordinates: Box
+    description: str = ""
+    
+    @property
+    def area(self) -> int:
+        """Area in pixels."""
+        x1, y1, x2, y2 = self.coordinates
+        return (x2 - x1) * (y2 - y1)
+
+
+@dataclass
+class CapturePlan:
+    """Single grab covering one or more regions."""
+    bbox: Box
+    regions: List[CaptureRegion] = field(default_factory=list)
+    
+    @property
+    def area(self) -> int:
+        """Grabbed area in pixels."""
+        x1, y1, x2, y2 = self.bbox
+        return (x2 - x1) * (y2 - y1)
+    
+    @property
+    def monitor(self) -> Dict[str, int]:
+        """Grab area in mss monitor format."""
+        x1, y1, x2, y2 = self.bbox
+        return {"top": y1, "left": x1, "width": x2 - x1, "height": y2 - y1}
+
+
+def union_box(a: Box, b: Box) -> Box:
+    """Bounding box of two boxes."""
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+class CapturePlanner:
+    """
+    Plans screen grabs for regions requested in the same tick.
+    Regions are merged into one union grab as long as the union does not read
+    much more screen than the regions themselves; far apart areas get their own grab.
+    """
+    
+    def __init__(self, max_waste_ratio: float = 2.0):
+        """
+        Initialize capture planner.
+        
+        Args:
+            max_waste_ratio: Maximum union area relative to the summed region areas
+        """
+        self.max_waste_ratio = max_waste_ratio
+        self.logger = logging.getLogger(__name__)
+        
+        # Statistics
+        self._stats = {
+            'plans': 0,
+            'grabs': 0,
+            'regions': 0,
+            'pixels_requested': 0,
+            'pixels_grabbed': 0
+        }
+    
+    def plan(self, regions: List[CaptureRegion]) -> List[CapturePlan]:
+        """
+        Group regions into as few grabs as possible.
+        
+        Args:
+            regions: Regions requested together
+        
+        Returns:
+            List of capture plans, each with its union bounding box
+        """
+        groups: List[Tuple[CapturePlan, int]] = []  # (plan, summed region area)
+        
+        for region in sorted(regions, key=lambda r: r.area, reverse=True):
+            best_index = None
+            best_area = None
+            
+            if NUMPY_AVAILABLE:
+                for index, (group, covered) in enumerate(groups):
+                    bbox = union_box(group.bbox, region.coordinates)
+                    area = (bbox[2] - bbox[0]) * (bbox[3] - bbox[1])
+                    if area <= self.max_waste_ratio * (covered + region.area):
+                        if best_area is None or area < best_area:
+                            best_index, best_area = index, area
+            
+            if best_index is None:
+                groups.append((CapturePlan(bbox=tuple(region.coordinates), regions=[region]), region.area))
+            else:
+                group, covered = groups[best_index]
+                group.bbox = union_box(group.bbox, region.coordinates)
+                group.regions.append(region)
+                groups[best_index] = (group, covered + region.area)
+        
+        plans = [group for group, _ in groups]
+        
+        self._stats['plans'] += 1
+        self._stats['grabs'] += len(plans)
+        self._stats['regions'] += len(regions)
+        self._stats['pixels_requested'] += sum(region.area for region in regions)
+        self._stats['pixels_grabbed'] += sum(plan.area for plan in plans)
+        
+        return plans
+    
+    @staticmethod
+    def frame_array(bgra: bytes, size: Tuple[int, int]) -> 'np.ndarray':
+        """
+        Wrap raw BGRA grab data as an array without copying.
+        
+        Args:
+            bgra: Raw BGRA pixel data from mss
+            size: Grab (width, height)
+        
+        Returns:
+            Read-only array of shape (height, width, 4)
+        """
+        width, height = size
+        return np.frombuffer(bgra, dtype=np.uint8).reshape(height, width, 4)
+    
+    @staticmethod
+    def slice_region(frame: 'np.ndarray', plan: CapturePlan, region: CaptureRegion) -> 'np.ndarray':
+        """
+        Get region pixels from a union grab as a zero-copy RGB view.
+        
+        Args:
+            frame: BGRA array of the plan grab
+            plan: Plan the frame was grabbed for
+            region: Region inside the plan
+        
+        Returns:
+            Array view of shape (height, width, 3) in RGB channel order
+        """
+        left, top = plan.bbox[0], plan.bbox[1]
+        x1, y1, x2, y2 = region.coordinates
+        return frame[y1 - top:y2 - top, x1 - left:x2 - left, 2::-1]
+    
+    def get_planner_statistics(self) -> Dict[str, Any]:
+        """
+        Get capture planner statistics.
+        
+        Returns:
+            Dictionary with planner statistics
+        """
+        stats = self._stats.copy()
+        stats['numpy_available'] = NUMPY_AVAILABLE
+        stats['grabs_saved'] = stats['regions'] - stats['grabs']
+        if stats['pixels_requested'] > 0:
+            stats['overscan_ratio'] = stats['pixels_grabbed'] / stats['pixels_requested']
+        else:
+            stats['overscan_ratio'] = 0.0
+        return stats
\ No newline at end of file
@@ -0,0 +1,229 @@
+"""
+Batched change publication for market monitoring system.
+Streams detected changes to local consumers without blocking ingestion.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import List, Dict, Optional, Any
+
+from .database_manager import ChangeLogEntry
+from .event_sinks import EventSink, EventSinkError
+
+
+class ChangePublisherError(Exception):
+    """Exception raised for change publisher errors."""
+    pass
+
+
+class ChangePublisher:
+    """
+    Publishes detected changes to event sinks in coalesced batches.
+    publish() never blocks: changes go into a bounded buffer and, when the
+    buffer is full, the oldest pending changes are dropped and counted.
+    A background thread flushes a batch when it reaches max_batch_size or
+    when the oldest pending change has waited max_batch_delay seconds.
+    """
+    
+    def __init__(self, sinks: List[EventSink], max_batch_size: int = 100,
+                 max_batch_delay: float = 0.2, max_buffer_size: int = 10000):
+        """
+        Initialize change publisher.
+        
+        Args:
+            sinks: Event sinks receiving change batches
+            max_batch_size: Maximum number of changes per batch
+            max_batch_delay: Maximum time in seconds a change waits before flush
+            max_buffer_size: Maximum number of pending changes kept in memory
+        """
+        if max_batch_size <= 0:
+            raise ChangePublisherError("max_batch_size must be positive")
+        if max_buffer_size < max_batch_size:
+            raise ChangePublisherError("max_buffer_size must be at least max_batch_size")
+        
+        self.sinks = list(sinks)
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.max_buffer_size = max_buffer_size
+        self.logger = logging.getLogger(__name__)
+        
+        # Bounded buffer of (enqueue_time, record)
+        self._buffer: deque = deque()
+        self._condition = threading.Condition()
+        self._sequence = 0
+        
+        # Publisher thread
+        self._thread: Optional[threading.Thread] = None
+        self.is_running = False
+        
+        # Statistics
+        self._stats = {
+            'changes_published': 0,
+            'changes_delivered': 0,
+            'changes_dropped': 0,
+            'changes_failed': 0,
+            'batches_delivered': 0,
+            'delivery_errors': 0,
+            'max_buffer_depth': 0,
+            'last_batch_time': None
+        }
+    
+    def start(self) -> None:
+        """Start the background publisher thread."""
+        if self.is_running:
+            self.logger.warning("Change publisher is already running")
+            return
+        
+        self.is_running = True
+        self._thread = threading.Thread(
+            target=self._publisher_loop,
+            name="ChangePublisher",
+            daemon=True
+        )
+        self._thread.start()
+        self.logger.info(
+            f"Change publisher started with {len(self.sinks)} sinks "
+            f"(batch {self.max_batch_size}, delay {self.max_batch_delay}s)"
+        )
+    
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop the publisher, flushing pending changes first.
+        
+        Args:
+            timeout: Maximum time to wait for the final flush
+        """
+        if not self.is_running:
+            return
+        
+        self.logger.info("Stopping change publisher...")
+        with self._condition:
+            self.is_running = False
+            self._condition.notify_all()
+        
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                self.logger.warning("Change publisher did not stop gracefully")
+            self._thread = None
+        
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                self.logger.warning(f"Error closing change sink: {e}")
+        
+        self.logger.info("Change publisher stopped")
+    
+    def publish(self, changes: List[ChangeLogEntry], hotkey: Optional[str] = None) -> int:
+        """
+        Add changes to the publication buffer without blocking.
+        
+        Args:
+            changes: Detected change log entries
+            hotkey: Hotkey that produced the changes
+        
+        Returns:
+            Number of older pending changes dropped to make room
+        """
+        if not changes:
+            return 0
+        
+        detected_at = datetime.now().isoformat()
+        now = time.monotonic()
+        dropped = 0
+        
+        with self._condition:
+            for change in changes:
+                self._sequence += 1
+                self._buffer.append((now, {
+                    'sequence': self._sequence,
+                    'seller_name': change.seller_name,
+                    'item_name': change.item_name,
+                    'change_type': change.change_type,
+                    'old_value': change.old_value,
+                    'new_value': change.new_value,
+                    'hotkey': hotkey,
+                    'detected_at': detected_at
+                }))
+            
+            # Backpressure: drop oldest pending changes instead of blocking ingestion
+            while len(self._buffer) > self.max_buffer_size:
+                self._buffer.popleft()
+                dropped += 1
+            
+            self._stats['changes_published'] += len(changes)
+            self._stats['changes_dropped'] += dropped
+            self._stats['max_buffer_depth'] = max(self._stats['max_buffer_depth'], len(self._buffer))
+            self._condition.notify()
+        
+        if dropped:
+            self.logger.warning(f"Change buffer full, dropped {dropped} oldest changes")
+        
+        return dropped
+    
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        """Wait until a batch is ready and take it from the buffer."""
+        with self._condition:
+            while True:
+                if self._buffer:
+                    if len(self._buffer) >= self.max_batch_size or not self.is_running:
+                        break
+                    wait_time = self._buffer[0][0] + self.max_batch_delay - time.monotonic()
+                    if wait_time <= 0:
+                        break
+                    self._condition.wait(timeout=wait_time)
+                elif not self.is_running:
+                    return []
+                else:
+                    self._condition.wait()
+            
+            batch_size = min(self.max_batch_size, len(self._buffer))
+            return [self._buffer.popleft()[1] for _ in range(batch_size)]
+    
+    def _publisher_loop(self) -> None:
+        """Background loop delivering batches until stopped and drained."""
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                break
+            self._deliver_batch(batch)
+    
+    def _deliver_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Deliver batch to every sink; a failing sink does not affect others."""
+        delivered = False
+        for sink in self.sinks:
+            try:
+                sink.deliver(batch)
+                delivered = True
+            except EventSinkError as e:
+                with self._condition:
+                    self._stats['delivery_errors'] += 1
+                self.logger.error(f"Failed to deliver {len(batch)} changes: {e}")
+        
+        # Per-sink counts are in each sink's statistics; a batch counts once any sink took it
+        with self._condition:
+            if delivered:
+                self._stats['changes_delivered'] += len(batch)
+                self._stats['batches_delivered'] += 1
+            else:
+                self._stats['changes_failed'] += len(batch)
+            self._stats['last_batch_time'] = datetime.now().isoformat()
+    
+    def get_publisher_statistics(self) -> Dict[str, Any]:
+        """
+        Get change publisher statistics.
+        
+        Returns:
+            Dictionary with publisher statistics
+        """
+        with self._condition:
+            stats = self._stats.copy()
+            stats['buffer_depth'] = len(self._buffer)
+        
+        stats['is_running'] = self.is_running
+        stats['sinks'] = [sink.get_sink_statistics() for sink in self.sinks]
+        return stats
\ No newline at end of file
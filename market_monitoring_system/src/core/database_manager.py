@@ -9,11 +9,12 @@ import threading
 import time
 from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Set
 from dataclasses import dataclass
 from pathlib import Path
 import json
 import random
+import zlib
 
 
 @dataclass
@@ -126,9 +127,46 @@ class DatabaseManager:
                 error_message TEXT,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
+        ''',
+        'ocr_texts': '''
+            CREATE TABLE IF NOT EXISTS ocr_texts (
+                session_id INTEGER PRIMARY KEY REFERENCES ocr_sessions(id) ON DELETE CASCADE,
+                hotkey TEXT NOT NULL,
+                processing_type TEXT CHECK(processing_type IN ('full', 'minimal')) DEFAULT 'full',
+                screenshot_type TEXT,
+                text BLOB NOT NULL,
+                layout BLOB,
+                text_length INTEGER,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''',
+        'ocr_texts_index': '''
+            CREATE INDEX IF NOT EXISTS idx_ocr_texts_time
+            ON ocr_texts(created_at)
+        ''',
+        'name_aliases': '''
+            CREATE TABLE IF NOT EXISTS name_aliases (
+                kind TEXT CHECK(kind IN ('seller', 'item')) NOT NULL,
+                alias TEXT NOT NULL,
+                canonical TEXT NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (kind, alias)
+            )
         '''
     }
     
+    # Columns added to existing tables after their first release: (table, column, definition)
+    MIGRATIONS = [
+        ('items', 'session_id', 'INTEGER'),
+    ]
+    
+    MIGRATION_INDEXES = [
+        'CREATE INDEX IF NOT EXISTS idx_items_session ON items(session_id)',
+    ]
+    
+    # Change types rebuilt from item history by reprocessing
+    ITEM_CHANGE_TYPES = ('NEW_ITEM', 'PRICE_INCREASE', 'PRICE_DECREASE', 'QUANTITY_INCREASE', 'QUANTITY_DECREASE')
+    
     
 
     def __init__(self, db_path: str, connection_timeout: int = 30):
@@ -232,6 +270,8 @@ class DatabaseManager:
                 # Create all tables and indexes
                 for table_name, sql in self.SCHEMA_SQL.items():
                     conn.execute(sql)
+                
+                self._migrate_schema(conn)
                     
             self.logger.info("Database schema initialized successfully")
             
@@ -239,6 +279,17 @@ class DatabaseManager:
             self.logger.error(f"Failed to initialize database: {e}")
             raise
     
+    def _migrate_schema(self, conn: sqlite3.Connection) -> None:
+        """Add columns missing from databases created by earlier versions."""
+        for table, column, definition in self.MIGRATIONS:
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                self.logger.info(f"Migrated database: added {table}.{column}")
+        
+        for sql in self.MIGRATION_INDEXES:
+            conn.execute(sql)
+    
     def save_items_data(self, items: List[ItemData], session_id: Optional[int] = None) -> int:
         """
         Save items data to database.
@@ -258,19 +309,19 @@ class DatabaseManager:
                 cursor = conn.cursor()
                 
                 # Insert items
-                for item in items:
-                    cursor.execute('''
-                        INSERT INTO items (seller_name, item_name, price, quantity, item_id, hotkey, processing_type)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        item.seller_name,
-                        item.item_name,
-                        item.price,
-                        item.quantity,
-                        item.item_id,
-                        item.hotkey,
-                        item.processing_type
-                    ))
+                cursor.executemany('''
+                    INSERT INTO items (seller_name, item_name, price, quantity, item_id, hotkey, processing_type, session_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [(
+                    item.seller_name,
+                    item.item_name,
+                    item.price,
+                    item.quantity,
+                    item.item_id,
+                    item.hotkey,
+                    item.processing_type,
+                    session_id
+                ) for item in items])
                 
                 saved_count = len(items)
                 
@@ -516,6 +567,277 @@ class DatabaseManager:
         except Exception as e:
             self.logger.error(f"Failed to update OCR session: {e}")
     
+    def save_ocr_text(self, session_id: int, hotkey: str, text: str,
+                      layout_lines: Optional[List[Dict[str, Any]]] = None,
+                      processing_type: str = 'full',
+                      screenshot_type: Optional[str] = None,
+                      compression_level: int = 6) -> None:
+        """
+        Archive raw OCR text of a session, zlib-compressed.
+        
+        Args:
+            session_id: OCR session ID
+            hotkey: Hotkey that produced the text
+            text: Recognized text
+            layout_lines: Optional OCR lines with bounding boxes
+            processing_type: Processing type of the hotkey (full, minimal)
+            screenshot_type: Screenshot type of the hotkey
+            compression_level: zlib compression level
+        """
+        layout_blob = None
+        if layout_lines:
+            layout_blob = zlib.compress(json.dumps(layout_lines, separators=(',', ':')).encode('utf-8'), compression_level)
+        
+        try:
+            with self._transaction() as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO ocr_texts
+                    (session_id, hotkey, processing_type, screenshot_type, text, layout, text_length)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    session_id,
+                    hotkey,
+                    processing_type,
+                    screenshot_type,
+                    zlib.compress(text.encode('utf-8'), compression_level),
+                    layout_blob,
+                    len(text)
+                ))
+        
+        except Exception as e:
+            self.logger.error(f"Failed to archive OCR text of session {session_id}: {e}")
+    
+    def get_ocr_text(self, session_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get archived OCR text of a session.
+        
+        Args:
+            session_id: OCR session ID
+        
+        Returns:
+            Dictionary with hotkey, processing_type, screenshot_type, text, lines and created_at, or None
+        """
+        row = self._get_connection().execute('''
+            SELECT hotkey, processing_type, screenshot_type, text, layout, created_at
+            FROM ocr_texts WHERE session_id = ?
+        ''', (session_id,)).fetchone()
+        
+        if not row:
+            return None
+        return {
+            'hotkey': row[0],
+            'processing_type': row[1],
+            'screenshot_type': row[2],
+            'text': zlib.decompress(row[3]).decode('utf-8'),
+            'lines': json.loads(zlib.decompress(row[4])) if row[4] else None,
+            'created_at': row[5]
+        }
+    
+    def iter_ocr_texts(self, since: str, until: str, hotkey: Optional[str] = None,
+                       batch_size: int = 200):
+        """
+        Stream archived OCR texts of a time range in batches, still compressed.
+        
+        Args:
+            since: Start of the range, inclusive ('YYYY-MM-DD HH:MM:SS', UTC like CURRENT_TIMESTAMP)
+            until: End of the range, exclusive
+            hotkey: Optional hotkey filter
+            batch_size: Rows per batch
+        
+        Yields:
+            Lists of tuples (session_id, hotkey, processing_type, screenshot_type, created_at, text, layout)
+        """
+        query = '''
+            SELECT session_id, hotkey, processing_type, screenshot_type, created_at, text, layout
+            FROM ocr_texts
+            WHERE created_at >= ? AND created_at < ? AND session_id > ?
+        '''
+        filters: List[Any] = []
+        if hotkey:
+            query += ' AND hotkey = ?'
+            filters.append(hotkey)
+        query += ' ORDER BY session_id LIMIT ?'
+        
+        # Keyset pagination keeps each read short, so live writers are not blocked
+        last_id = 0
+        conn = self._get_connection()
+        while True:
+            rows = conn.execute(query, [since, until, last_id] + filters + [batch_size]).fetchall()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1][0]
+    
+    def replace_session_items(self, session_items: List[Tuple[int, str, List[ItemData]]]) -> int:
+        """
+        Replace items of archived sessions with reparsed ones in one bulk transaction.
+        
+        Args:
+            session_items: Tuples of (session_id, created_at, items); items keep the session time
+        
+        Returns:
+            Number of items written
+        """
+        if not session_items:
+            return 0
+        
+        rows = [
+            (item.seller_name, item.item_name, item.price, item.quantity, item.item_id,
+             item.hotkey, item.processing_type, session_id, created_at)
+            for session_id, created_at, items in session_items
+            for item in items
+        ]
+        
+        with self._transaction(timeout_seconds=120) as conn:
+            cursor = conn.cursor()
+            cursor.executemany('DELETE FROM items WHERE session_id = ?',
+                               [(session_id,) for session_id, _, _ in session_items])
+            cursor.executemany('''
+                INSERT INTO items (seller_name, item_name, price, quantity, item_id, hotkey, processing_type,
+                                   session_id, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            cursor.executemany(
+                'UPDATE ocr_sessions SET processed_items = ? WHERE id = ?',
+                [(len(items), session_id) for session_id, _, items in session_items]
+            )
+        
+        return len(rows)
+    
+    def rebuild_item_changes(self, since: str, until: str) -> int:
+        """
+        Rebuild price, quantity and new item changes of a time range from item history.
+        Each full processing item is compared with the previous record of the same
+        seller and item, as detect_and_log_changes does when the item is saved.
+        Combination and sale changes depend on live monitoring state and are kept,
+        including combination NEW_ITEM rows (new value "seller/item" instead of "Price: ...").
+        
+        Args:
+            since: Start of the range, inclusive
+            until: End of the range, exclusive
+        
+        Returns:
+            Number of changes written
+        """
+        conn = self._get_connection()
+        previous: Dict[Tuple[str, str], Tuple[Optional[float], Optional[int]]] = {}
+        
+        # Latest record before the range seeds the comparison
+        for seller_name, item_name, price, quantity in conn.execute('''
+            SELECT seller_name, item_name, price, quantity FROM items
+            WHERE id IN (
+                SELECT MAX(id) FROM items WHERE created_at < ? GROUP BY seller_name, item_name
+            )
+        ''', (since,)):
+            previous[(seller_name, item_name)] = (price, quantity)
+        
+        changes = []
+        for seller_name, item_name, price, quantity, processing_type, created_at in conn.execute('''
+            SELECT seller_name, item_name, price, quantity, processing_type, created_at FROM items
+            WHERE created_at >= ? AND created_at < ?
+            ORDER BY created_at, id
+        ''', (since, until)):
+            key = (seller_name, item_name)
+            last = previous.get(key)
+            previous[key] = (price, quantity)
+            if processing_type != 'full':
+                continue
+            
+            if last is None:
+                changes.append((seller_name, item_name, 'NEW_ITEM', None,
+                                f"Price: {price}, Quantity: {quantity}", created_at))
+                continue
+            
+            last_price, last_quantity = last
+            if price is not None and last_price is not None and price != last_price:
+                changes.append((seller_name, item_name,
+                                'PRICE_INCREASE' if price > last_price else 'PRICE_DECREASE',
+                                str(last_price), str(price), created_at))
+            if quantity is not None and last_quantity is not None and quantity != last_quantity:
+                changes.append((seller_name, item_name,
+                                'QUANTITY_INCREASE' if quantity > last_quantity else 'QUANTITY_DECREASE',
+                                str(last_quantity), str(quantity), created_at))
+        
+        placeholders = ', '.join('?' * len(self.ITEM_CHANGE_TYPES))
+        with self._transaction(timeout_seconds=120) as conn:
+            conn.execute(f'''
+                DELETE FROM changes_log
+                WHERE detected_at >= ? AND detected_at < ? AND change_type IN ({placeholders})
+                  AND (change_type != 'NEW_ITEM' OR new_value LIKE 'Price: %')
+            ''', (since, until) + self.ITEM_CHANGE_TYPES)
+            conn.executemany('''
+                INSERT INTO changes_log (seller_name, item_name, change_type, old_value, new_value, detected_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', changes)
+        
+        self.logger.info(f"Rebuilt {len(changes)} item changes between {since} and {until}")
+        return len(changes)
+    
+    def get_known_names(self) -> Dict[str, Set[str]]:
+        """
+        Get seller and item names in current state and alias targets.
+        
+        Returns:
+            Dictionary with 'seller' and 'item' name sets
+        """
+        conn = self._get_connection()
+        names = {'seller': set(), 'item': set()}
+        
+        for seller_name, item_name in conn.execute("SELECT seller_name, item_name FROM sellers_current"):
+            names['seller'].add(seller_name)
+            names['item'].add(item_name)
+        for kind, canonical in conn.execute("SELECT DISTINCT kind, canonical FROM name_aliases"):
+            names[kind].add(canonical)
+        
+        return names
+    
+    def get_name_alias(self, kind: str, alias: str) -> Optional[str]:
+        """
+        Get canonical name of a learned alias.
+        
+        Args:
+            kind: 'seller' or 'item'
+            alias: Name variant
+        
+        Returns:
+            Canonical name or None
+        """
+        row = self._get_connection().execute(
+            "SELECT canonical FROM name_aliases WHERE kind = ? AND alias = ?", (kind, alias)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def save_name_aliases(self, aliases: List[Tuple[str, str, str]]) -> None:
+        """
+        Save learned name aliases.
+        
+        Args:
+            aliases: Tuples of (kind, alias, canonical)
+        """
+        try:
+            with self._transaction() as conn:
+                conn.executemany('''
+                    INSERT OR REPLACE INTO name_aliases (kind, alias, canonical)
+                    VALUES (?, ?, ?)
+                ''', aliases)
+        
+        except Exception as e:
+            self.logger.error(f"Failed to save {len(aliases)} name aliases: {e}")
+    
+    def delete_name_aliases(self, aliases: List[Tuple[str, str]]) -> None:
+        """
+        Delete learned name aliases found to be distinct names.
+        
+        Args:
+            aliases: Tuples of (kind, alias)
+        """
+        try:
+            with self._transaction() as conn:
+                conn.executemany("DELETE FROM name_aliases WHERE kind = ? AND alias = ?", aliases)
+        
+        except Exception as e:
+            self.logger.error(f"Failed to delete {len(aliases)} name aliases: {e}")
+    
     def cleanup_expired_records(self, days: int = 30) -> int:
         """
         Clean up records older than specified days.
@@ -640,7 +962,7 @@ class DatabaseManager:
                 
                 # Check for large tables
                 cursor.execute("""
-                    SELECT name, COUNT(*) as row_count 
+                    SELECT m.name, COUNT(*) as row_count 
                     FROM sqlite_master m, pragma_table_info(m.name)
                     WHERE m.type='table'
                     GROUP BY m.name
@@ -0,0 +1,325 @@
+"""
+Local event sinks for market monitoring system.
+Delivers JSON-serializable records to files, sockets, or in-process callbacks.
+"""
+
+import json
+import logging
+import os
+import select
+import socket
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Optional
+
+
+class EventSinkError(Exception):
+    """Exception raised for event sink delivery errors."""
+    pass
+
+
+class EventSink(ABC):
+    """
+    Base class for local event sinks.
+    A sink receives batches of JSON-serializable records and delivers them.
+    """
+    
+    sink_type = "base"
+    
+    def __init__(self):
+        """Initialize event sink."""
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._stats = {
+            'records_delivered': 0,
+            'batches_delivered': 0,
+            'delivery_errors': 0,
+            'last_delivery_time': None
+        }
+    
+    def deliver(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Deliver a batch of records.
+        
+        Args:
+            records: List of JSON-serializable dictionaries
+        
+        Raises:
+            EventSinkError: If delivery failed
+        """
+        if not records:
+            return
+        
+        with self._lock:
+            try:
+                self._deliver(records)
+                self._stats['records_delivered'] += len(records)
+                self._stats['batches_delivered'] += 1
+                self._stats['last_delivery_time'] = datetime.now().isoformat()
+            except Exception as e:
+                self._stats['delivery_errors'] += 1
+                raise EventSinkError(f"{self.sink_type} sink delivery failed: {e}")
+    
+    @abstractmethod
+    def _deliver(self, records: List[Dict[str, Any]]) -> None:
+        """Sink-specific delivery implementation."""
+    
+    def close(self) -> None:
+        """Release sink resources."""
+        pass
+    
+    def get_sink_statistics(self) -> Dict[str, Any]:
+        """Get sink delivery statistics."""
+        with self._lock:
+            stats = self._stats.copy()
+        stats['sink_type'] = self.sink_type
+        return stats
+
+
+class JSONLFileSink(EventSink):
+    """
+    Appends records to a JSON Lines file.
+    The file is flushed and optionally fsynced once per delivered batch.
+    """
+    
+    sink_type = "jsonl"
+    
+    def __init__(self, path: Path, fsync: bool = True):
+        """
+        Initialize JSONL file sink.
+        
+        Args:
+            path: Path to JSONL output file
+            fsync: Whether to fsync after every batch
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.fsync = fsync
+        self._file = None
+    
+    def _open(self):
+        """Open output file lazily in append mode."""
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        return self._file
+    
+    def _deliver(self, records: List[Dict[str, Any]]) -> None:
+        output = self._open()
+        output.write(''.join(
+            json.dumps(record, ensure_ascii=False, default=str) + '\n' for record in records
+        ))
+        output.flush()
+        if self.fsync:
+            os.fsync(output.fileno())
+    
+    def close(self) -> None:
+        """Close the output file."""
+        with self._lock:
+            if self._file is not None:
+                try:
+                    self._file.close()
+                except Exception as e:
+                    self.logger.warning(f"Error closing JSONL sink {self.path}: {e}")
+                finally:
+                    self._file = None
+
+
+class UnixSocketSink(EventSink):
+    """
+    Streams newline-delimited JSON records to a Unix domain socket.
+    Reconnects on the next batch if the consumer went away.
+    """
+    
+    sink_type = "unix_socket"
+    
+    def __init__(self, socket_path: str, timeout: float = 1.0):
+        """
+        Initialize Unix socket sink.
+        
+        Args:
+            socket_path: Path of the listening Unix socket
+            timeout: Send timeout in seconds
+        """
+        super().__init__()
+        if not hasattr(socket, 'AF_UNIX'):
+            raise EventSinkError("Unix domain sockets are not supported on this platform")
+        
+        self.socket_path = str(socket_path)
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+    
+    def _connect(self) -> socket.socket:
+        """Connect to the consumer socket lazily."""
+        if self._socket is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except Exception:
+                sock.close()
+                raise
+            self._socket = sock
+        return self._socket
+    
+    def _deliver(self, records: List[Dict[str, Any]]) -> None:
+        payload = ''.join(
+            json.dumps(record, ensure_ascii=False, default=str) + '\n' for record in records
+        ).encode('utf-8')
+        
+        try:
+            self._connect().sendall(payload)
+        except Exception:
+            # Drop broken connection, next batch will reconnect
+            self._disconnect()
+            raise
+    
+    def _disconnect(self) -> None:
+        """Close current socket connection."""
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except Exception:
+                pass
+            finally:
+                self._socket = None
+    
+    def close(self) -> None:
+        """Close the socket connection."""
+        with self._lock:
+            self._disconnect()
+
+
+class NamedPipeSink(EventSink):
+    """
+    Writes newline-delimited JSON records to a named pipe (FIFO).
+    The pipe is opened non-blocking, so a missing reader fails fast instead of stalling.
+    Each record goes out in one write of at most PIPE_BUF bytes, which the kernel
+    keeps atomic, so a full pipe never leaves half a line in the stream.
+    Records larger than PIPE_BUF are dropped.
+    """
+    
+    sink_type = "named_pipe"
+    
+    def __init__(self, pipe_path: Path, create: bool = True):
+        """
+        Initialize named pipe sink.
+        
+        Args:
+            pipe_path: Path of the FIFO
+            create: Create the FIFO if it does not exist
+        """
+        super().__init__()
+        if not hasattr(os, 'mkfifo'):
+            raise EventSinkError("Named pipes are not supported on this platform")
+        
+        self.pipe_path = Path(pipe_path)
+        self.max_record_bytes = getattr(select, 'PIPE_BUF', 512)
+        self._fd: Optional[int] = None
+        self._stats['records_too_large'] = 0
+        
+        if create and not self.pipe_path.exists():
+            self.pipe_path.parent.mkdir(parents=True, exist_ok=True)
+            os.mkfifo(self.pipe_path)
+    
+    def _open(self) -> int:
+        """Open FIFO for writing; raises if no reader is attached."""
+        if self._fd is None:
+            self._fd = os.open(self.pipe_path, os.O_WRONLY | os.O_NONBLOCK)
+        return self._fd
+    
+    def _deliver(self, records: List[Dict[str, Any]]) -> None:
+        lines = [
+            (json.dumps(record, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+            for record in records
+        ]
+        
+        try:
+            fd = self._open()
+            for line in lines:
+                if len(line) > self.max_record_bytes:
+                    self._stats['records_too_large'] += 1
+                    self.logger.warning(f"Dropped {len(line)} byte record larger than PIPE_BUF")
+                    continue
+                # Writes up to PIPE_BUF are all-or-nothing, a full pipe raises before any byte is written
+                os.write(fd, line)
+        except BlockingIOError:
+            # Pipe is full, the reader is still attached and gets whole lines only
+            raise
+        except Exception:
+            # Reader went away, reopen on next batch
+            self._close_fd()
+            raise
+    
+    def _close_fd(self) -> None:
+        """Close FIFO descriptor."""
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            finally:
+                self._fd = None
+    
+    def close(self) -> None:
+        """Close the FIFO descriptor."""
+        with self._lock:
+            self._close_fd()
+
+
+class CallbackSink(EventSink):
+    """Passes record batches to an in-process callback."""
+    
+    sink_type = "callback"
+    
+    def __init__(self, callback: Callable[[List[Dict[str, Any]]], None]):
+        """
+        Initialize callback sink.
+        
+        Args:
+            callback: Function receiving a list of records
+        """
+        super().__init__()
+        self.callback = callback
+    
+    def _deliver(self, records: List[Dict[str, Any]]) -> None:
+        self.callback(records)
+
+
+def create_sink(sink_config: Dict[str, Any]) -> EventSink:
+    """
+    Create event sink from configuration dictionary.
+    
+    Args:
+        sink_config: Sink definition, e.g. {"type": "jsonl", "path": "data/alerts.jsonl"}
+    
+    Returns:
+        Configured EventSink instance
+    
+    Raises:
+        EventSinkError: If sink type is unknown or configuration is invalid
+    """
+    sink_type = sink_config.get('type')
+    
+    try:
+        if sink_type == 'jsonl':
+            return JSONLFileSink(
+                path=Path(sink_config['path']),
+                fsync=sink_config.get('fsync', True)
+            )
+        if sink_type == 'unix_socket':
+            return UnixSocketSink(
+                socket_path=sink_config['path'],
+                timeout=sink_config.get('timeout', 1.0)
+            )
+        if sink_type == 'named_pipe':
+            return NamedPipeSink(
+                pipe_path=Path(sink_config['path']),
+                create=sink_config.get('create', True)
+            )
+    except KeyError as e:
+        raise EventSinkError(f"Missing required sink option {e} for '{sink_type}' sink")
+    
+    raise EventSinkError(f"Unknown event sink type: {sink_type}")
\ No newline at end of file
@@ -0,0 +1,275 @@
+"""
+Weighted fair job queue for market monitoring system.
+Shares OCR request capacity between hotkeys with priority aging and per-hotkey queue-wait SLOs.
+"""
+
+import itertools
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class _QueuedItem:
+    """Item waiting in a flow."""
+    item: Any
+    cost: float
+    sequence: int
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class FairJobQueue:
+    """
+    Thread-safe queue with weighted fair queueing between flows (hotkeys).
+    Each flow gets a share of dequeues proportional to its weight, charged by
+    job cost, so a hotkey submitting huge merges cannot starve the others.
+    Inside a flow, jobs are served by priority that rises with waiting time.
+    A job that has waited longer than its flow's max wait is served first.
+    Offers the put/get/qsize interface of queue.PriorityQueue.
+    """
+    
+    def __init__(self, maxsize: int = 0,
+                 weights: Optional[Dict[str, float]] = None,
+                 max_wait: Optional[Dict[str, float]] = None,
+                 default_weight: float = 1.0,
+                 default_max_wait: float = 0.0,
+                 aging_interval: float = 30.0,
+                 flow_key: Callable[[Any], str] = lambda job: job.hotkey,
+                 priority_key: Callable[[Any], int] = lambda job: job.priority.value,
+                 cost_function: Optional[Callable[[Any], float]] = None):
+        """
+        Initialize fair job queue.
+        
+        Args:
+            maxsize: Maximum queued items (0 = unbounded)
+            weights: Share weight per flow
+            max_wait: Queue-wait SLO in seconds per flow (0 = none)
+            default_weight: Weight of flows not in weights
+            default_max_wait: SLO of flows not in max_wait (0 = none)
+            aging_interval: Seconds of waiting that add one priority level (0 = no aging)
+            flow_key: Function returning the flow of an item
+            priority_key: Function returning the numeric priority of an item (higher first)
+            cost_function: Function returning the service cost of an item (default 1)
+        """
+        self.maxsize = maxsize
+        self.weights = dict(weights or {})
+        self.max_wait = dict(max_wait or {})
+        self.default_weight = default_weight
+        self.default_max_wait = default_max_wait
+        self.aging_interval = aging_interval
+        self.flow_key = flow_key
+        self.priority_key = priority_key
+        self.cost_function = cost_function
+        self.logger = logging.getLogger(__name__)
+        
+        self._flows: Dict[str, List[_QueuedItem]] = {}
+        self._start_tags: Dict[str, float] = {}  # Virtual start of the next service of each backlogged flow
+        self._finish_tags: Dict[str, float] = {}
+        self._virtual_time = 0.0
+        self._count = 0
+        self._sequence = itertools.count()
+        
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        
+        # Statistics per flow
+        self._flow_stats: Dict[str, Dict[str, Any]] = {}
+    
+    def weight_of(self, flow: str) -> float:
+        """Share weight of a flow."""
+        return max(self.weights.get(flow, self.default_weight), 1e-6)
+    
+    def max_wait_of(self, flow: str) -> float:
+        """Queue-wait SLO of a flow in seconds, 0 if none."""
+        return self.max_wait.get(flow, self.default_max_wait)
+    
+    def _stats_for(self, flow: str) -> Dict[str, Any]:
+        """Statistics record of a flow, created on first use."""
+        stats = self._flow_stats.get(flow)
+        if stats is None:
+            stats = self._flow_stats[flow] = {
+                'enqueued': 0,
+                'dequeued': 0,
+                'depth': 0,
+                'max_depth': 0,
+                'total_wait': 0.0,
+                'max_wait': 0.0,
+                'slo_promotions': 0,
+                'slo_violations': 0
+            }
+        return stats
+    
+    def qsize(self) -> int:
+        """Number of queued items."""
+        with self._lock:
+            return self._count
+    
+    def empty(self) -> bool:
+        """Whether no items are queued."""
+        return self.qsize() == 0
+    
+    def full(self) -> bool:
+        """Whether maxsize items are queued."""
+        with self._lock:
+            return 0 < self.maxsize <= self._count
+    
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Add item to the queue of its flow.
+        
+        Args:
+            item: Item to queue
+            block: Wait for free space when full
+            timeout: Maximum wait in seconds
+        
+        Raises:
+            queue.Full: If no space became free
+        """
+        flow = self.flow_key(item)
+        cost = max(float(self.cost_function(item)), 1e-6) if self.cost_function else 1.0
+        
+        with self._not_full:
+            if self.maxsize > 0:
+                deadline = None if timeout is None else time.monotonic() + timeout
+                while self._count >= self.maxsize:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if not block or (remaining is not None and remaining <= 0):
+                        raise queue.Full
+                    self._not_full.wait(remaining)
+            
+            if flow not in self._flows:
+                # Idle flow becoming backlogged starts at current virtual time, no earned credit
+                self._flows[flow] = []
+                self._start_tags[flow] = max(self._virtual_time, self._finish_tags.get(flow, 0.0))
+            self._flows[flow].append(_QueuedItem(item, cost, next(self._sequence)))
+            self._count += 1
+            
+            stats = self._stats_for(flow)
+            stats['enqueued'] += 1
+            stats['depth'] = len(self._flows[flow])
+            stats['max_depth'] = max(stats['max_depth'], stats['depth'])
+            self._not_empty.notify()
+    
+    def put_nowait(self, item: Any) -> None:
+        """Add item without waiting."""
+        self.put(item, block=False)
+    
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """
+        Remove and return the next item in fair order.
+        
+        Args:
+            block: Wait for an item when empty
+            timeout: Maximum wait in seconds
+        
+        Returns:
+            Next item
+        
+        Raises:
+            queue.Empty: If no item became available
+        """
+        with self._not_empty:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while self._count == 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if not block or (remaining is not None and remaining <= 0):
+                    raise queue.Empty
+                self._not_empty.wait(remaining)
+            
+            item = self._pop_next(time.monotonic())
+            self._not_full.notify()
+            return item
+    
+    def get_nowait(self) -> Any:
+        """Remove and return the next item without waiting."""
+        return self.get(block=False)
+    
+    def _aged_priority(self, entry: _QueuedItem, now: float) -> float:
+        """Priority raised by one level per aging interval waited."""
+        priority = float(self.priority_key(entry.item))
+        if self.aging_interval > 0:
+            priority += (now - entry.enqueued_at) / self.aging_interval
+        return priority
+    
+    def _flow_head(self, entries: List[_QueuedItem], now: float) -> int:
+        """Index of the entry a flow would serve next: highest aged priority, then oldest."""
+        return max(range(len(entries)),
+                   key=lambda index: (self._aged_priority(entries[index], now), -entries[index].sequence))
+    
+    def _pop_next(self, now: float) -> Any:
+        """Select, remove and account the next item. Caller holds the lock."""
+        # Flow with the oldest job past its SLO goes first
+        overdue: Optional[Tuple[float, str]] = None
+        for flow, entries in self._flows.items():
+            slo = self.max_wait_of(flow)
+            if entries and slo > 0:
+                lateness = now - entries[0].enqueued_at - slo
+                if lateness >= 0 and (overdue is None or lateness > overdue[0]):
+                    overdue = (lateness, flow)
+        
+        if overdue is not None:
+            flow = overdue[1]
+            index = 0
+            start = self._start_tags[flow]
+            finish = start + self._flows[flow][0].cost / self.weight_of(flow)
+            self._stats_for(flow)['slo_promotions'] += 1
+        else:
+            # Start-time fair queueing: smallest virtual finish tag among flow heads
+            best = None
+            for candidate, entries in self._flows.items():
+                if not entries:
+                    continue
+                head = self._flow_head(entries, now)
+                start = self._start_tags[candidate]
+                tag = start + entries[head].cost / self.weight_of(candidate)
+                key = (tag, entries[head].sequence)
+                if best is None or key < best[0]:
+                    best = (key, candidate, head, start)
+            (finish, _), flow, index, start = best
+        
+        entries = self._flows[flow]
+        entry = entries.pop(index)
+        self._count -= 1
+        self._finish_tags[flow] = finish
+        self._start_tags[flow] = finish
+        self._virtual_time = max(self._virtual_time, start)
+        
+        if not entries:
+            del self._flows[flow]
+            del self._start_tags[flow]
+        
+        wait = now - entry.enqueued_at
+        stats = self._stats_for(flow)
+        stats['dequeued'] += 1
+        stats['depth'] = len(entries)
+        stats['total_wait'] += wait
+        stats['max_wait'] = max(stats['max_wait'], wait)
+        slo = self.max_wait_of(flow)
+        if slo > 0 and wait > slo:
+            stats['slo_violations'] += 1
+        
+        return entry.item
+    
+    def get_scheduling_statistics(self) -> Dict[str, Any]:
+        """
+        Get per-flow queue depth and wait time statistics.
+        
+        Returns:
+            Dictionary with statistics per flow
+        """
+        now = time.monotonic()
+        result = {}
+        with self._lock:
+            for flow, flow_stats in self._flow_stats.items():
+                stats = flow_stats.copy()
+                entries = self._flows.get(flow, [])
+                stats['weight'] = self.weight_of(flow)
+                stats['max_wait_slo'] = self.max_wait_of(flow)
+                stats['oldest_wait'] = now - entries[0].enqueued_at if entries else 0.0
+                stats['average_wait'] = stats['total_wait'] / stats['dequeued'] if stats['dequeued'] else 0.0
+                result[flow] = stats
+        return result
\ No newline at end of file
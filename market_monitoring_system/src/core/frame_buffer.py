@@ -0,0 +1,122 @@
+"""
+In-memory frame buffer for market monitoring system.
+Holds raw captured frames per hotkey until the next merge cycle, replacing temp PNG files.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple, Any
+
+
+@dataclass
+class CapturedFrame:
+    """Raw screenshot frame as grabbed from the screen."""
+    hotkey: str
+    rgb: bytes = field(repr=False)  # Packed RGB pixel data, 3 bytes per pixel
+    size: Tuple[int, int]  # (width, height)
+    captured_at: float = field(default_factory=time.time)
+    
+    @property
+    def nbytes(self) -> int:
+        """Size of pixel data in bytes."""
+        return len(self.rgb)
+
+
+class FrameBuffer:
+    """
+    Bounded per-hotkey buffer of captured frames.
+    Capture threads append frames, the scheduler drains them once per merge cycle.
+    When a hotkey buffer is full the oldest frame is dropped.
+    """
+    
+    def __init__(self, max_frames_per_hotkey: int = 200):
+        """
+        Initialize frame buffer.
+        
+        Args:
+            max_frames_per_hotkey: Maximum frames kept per hotkey before dropping oldest
+        """
+        self.max_frames_per_hotkey = max_frames_per_hotkey
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._frames: Dict[str, deque] = {}
+        
+        # Statistics
+        self._stats = {
+            'frames_added': 0,
+            'frames_drained': 0,
+            'frames_dropped': 0,
+            'bytes_buffered': 0
+        }
+    
+    def add(self, frame: CapturedFrame) -> bool:
+        """
+        Add captured frame to its hotkey buffer.
+        
+        Args:
+            frame: Captured frame
+        
+        Returns:
+            True if an older frame had to be dropped to make room
+        """
+        dropped = False
+        with self._lock:
+            frames = self._frames.setdefault(frame.hotkey, deque())
+            if len(frames) >= self.max_frames_per_hotkey:
+                oldest = frames.popleft()
+                self._stats['frames_dropped'] += 1
+                self._stats['bytes_buffered'] -= oldest.nbytes
+                dropped = True
+            
+            frames.append(frame)
+            self._stats['frames_added'] += 1
+            self._stats['bytes_buffered'] += frame.nbytes
+        
+        if dropped:
+            self.logger.warning(f"Frame buffer for {frame.hotkey} full, oldest frame dropped")
+        return dropped
+    
+    def drain(self, hotkey: str) -> List[CapturedFrame]:
+        """
+        Remove and return all buffered frames of a hotkey.
+        
+        Args:
+            hotkey: Hotkey name
+        
+        Returns:
+            Frames in capture order
+        """
+        with self._lock:
+            frames = self._frames.pop(hotkey, None)
+            if not frames:
+                return []
+            
+            self._stats['frames_drained'] += len(frames)
+            self._stats['bytes_buffered'] -= sum(frame.nbytes for frame in frames)
+            return list(frames)
+    
+    def pending_count(self, hotkey: str) -> int:
+        """Get number of frames waiting for a hotkey."""
+        with self._lock:
+            return len(self._frames.get(hotkey, ()))
+    
+    def clear(self) -> None:
+        """Drop all buffered frames."""
+        with self._lock:
+            self._frames.clear()
+            self._stats['bytes_buffered'] = 0
+    
+    def get_buffer_statistics(self) -> Dict[str, Any]:
+        """
+        Get frame buffer statistics.
+        
+        Returns:
+            Dictionary with buffer statistics
+        """
+        with self._lock:
+            stats = self._stats.copy()
+            stats['pending_frames'] = {hotkey: len(frames) for hotkey, frames in self._frames.items()}
+        return stats
\ No newline at end of file
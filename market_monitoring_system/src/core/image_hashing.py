@@ -0,0 +1,150 @@
+"""
+Image hashing utilities for market monitoring system.
+Provides exact content hashes and perceptual difference hashes for screenshots.
+"""
+
+import hashlib
+import io
+from pathlib import Path
+from typing import Tuple, Union
+
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError as e:
+    PILLOW_AVAILABLE = False
+    PILLOW_ERROR = str(e)
+
+
+class ImageHashingError(Exception):
+    """Exception raised for image hashing errors."""
+    pass
+
+
+def content_hash(data: Union[Path, bytes], chunk_size: int = 65536) -> str:
+    """
+    Calculate SHA-256 hash of image file or raw bytes.
+    
+    Args:
+        data: Path to file or raw bytes
+        chunk_size: Read chunk size for files
+    
+    Returns:
+        Hex digest string
+    """
+    hash_obj = hashlib.sha256()
+    
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        hash_obj.update(data)
+    else:
+        with open(data, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                hash_obj.update(chunk)
+    
+    return hash_obj.hexdigest()
+
+
+def difference_hash(image: 'Image.Image', hash_size: int = 16,
+                    preserve_aspect: bool = True, max_rows: int = 256) -> int:
+    """
+    Calculate difference hash (dHash) of an image.
+    
+    The image is converted to grayscale and downscaled to (hash_size + 1) x rows;
+    each bit records whether a pixel is brighter than its right neighbour.
+    With preserve_aspect, tall images (merged columns) get proportionally more
+    rows so that a change in one listing is not averaged away.
+    
+    Args:
+        image: PIL image
+        hash_size: Number of columns compared per row
+        preserve_aspect: Scale row count with image height/width ratio
+        max_rows: Upper bound for row count
+    
+    Returns:
+        Hash as integer with rows * hash_size bits
+    """
+    if not PILLOW_AVAILABLE:
+        raise ImageHashingError(f"Pillow library not available: {PILLOW_ERROR}")
+    
+    rows = hash_size
+    if preserve_aspect and image.width > 0:
+        rows = max(hash_size, min(max_rows, round(hash_size * image.height / image.width)))
+    
+    small = image.convert('L').resize((hash_size + 1, rows), Image.BILINEAR)
+    pixels = small.tobytes()
+    row_width = hash_size + 1
+    
+    value = 0
+    for row in range(rows):
+        offset = row * row_width
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    
+    return value
+
+
+def rgb_difference_hash(rgb: bytes, size: Tuple[int, int], hash_size: int = 16) -> int:
+    """
+    Calculate difference hash directly from raw RGB frame bytes.
+    
+    Args:
+        rgb: Raw RGB pixel data (3 bytes per pixel)
+        size: Frame (width, height)
+        hash_size: dHash column count
+    
+    Returns:
+        Hash as integer
+    """
+    if not PILLOW_AVAILABLE:
+        raise ImageHashingError(f"Pillow library not available: {PILLOW_ERROR}")
+    
+    frame = Image.frombytes('RGB', tuple(size), bytes(rgb))
+    try:
+        return difference_hash(frame, hash_size=hash_size)
+    finally:
+        frame.close()
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """
+    Count differing bits between two hashes.
+    
+    Args:
+        first: First hash
+        second: Second hash
+    
+    Returns:
+        Number of differing bits
+    """
+    return bin(first ^ second).count('1')
+
+
+def compute_image_hashes(image_path: Union[Path, bytes],
+                         hash_size: int = 16) -> Tuple[str, int, Tuple[int, int]]:
+    """
+    Calculate exact and perceptual hashes of an image file or encoded image bytes.
+    
+    Args:
+        image_path: Path to image file or encoded image bytes
+        hash_size: dHash column count
+    
+    Returns:
+        Tuple of (sha256 hex digest, dHash, (width, height))
+    
+    Raises:
+        ImageHashingError: If image cannot be read
+    """
+    if not PILLOW_AVAILABLE:
+        raise ImageHashingError(f"Pillow library not available: {PILLOW_ERROR}")
+    
+    try:
+        exact = content_hash(image_path)
+        source = io.BytesIO(image_path) if isinstance(image_path, (bytes, bytearray)) else image_path
+        with Image.open(source) as img:
+            size = img.size
+            perceptual = difference_hash(img, hash_size=hash_size)
+    except Exception as e:
+        name = "in-memory image" if isinstance(image_path, (bytes, bytearray)) else image_path
+        raise ImageHashingError(f"Failed to hash image {name}: {e}")
+    
+    return exact, perceptual, size
\ No newline at end of file
@@ -3,6 +3,7 @@ Image processing and merging module for market monitoring system.
 Handles screenshot merging, optimization, and cleanup operations.
 """
 
+import io
 import logging
 import shutil
 from datetime import datetime
@@ -10,6 +11,7 @@ from pathlib import Path
 from typing import List, Optional, Tuple, Dict, Any
 import uuid
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from PIL import Image, ImageEnhance, ImageFilter
@@ -19,6 +21,11 @@ except ImportError as e:
     PILLOW_ERROR = str(e)
 
 from config.settings import SettingsManager, ImageProcessingConfig
+from .strip_tracker import ImageStrip, StripMergeResult, StripTracker, strip_pixel_hash
+from .frame_buffer import CapturedFrame, FrameBuffer
+from .numpy_imaging import NUMPY_AVAILABLE, compose_vertical, enhance_for_ocr
+from .image_worker_pool import ImageWorkerPool, ImageWorkerPoolError, MergeSource
+from .ocr_image_encoder import OCRImageEncoder, OCRImageEncoderError
 
 
 class ImageProcessingError(Exception):
@@ -53,8 +60,40 @@ class ImageProcessor:
             'failed_merges': 0,
             'files_cleaned': 0,
             'total_processing_time': 0.0,
-            'last_processing_time': None
+            'last_processing_time': None,
+            'pooled_merges': 0,
+            'pool_fallbacks': 0,
+            'chunked_merges': 0,
+            'chunks_created': 0
         }
+        
+        # Payload-minimizing encoder for merged images sent to OCR
+        self.encoder: Optional[OCRImageEncoder] = None
+        encoding_config = getattr(settings_manager, 'ocr_encoding', None)
+        if encoding_config and encoding_config.enabled:
+            try:
+                self.encoder = OCRImageEncoder(
+                    encodings=encoding_config.encodings,
+                    quality_ladder=encoding_config.quality_ladder,
+                    max_bytes=encoding_config.max_bytes,
+                    trim_margins=encoding_config.trim_margins,
+                    collapse_blank_rows=encoding_config.collapse_blank_rows,
+                    blank_row_gap=encoding_config.blank_row_gap,
+                    palette_colors=encoding_config.palette_colors
+                )
+            except OCRImageEncoderError as e:
+                self.logger.warning(f"OCR image encoder unavailable, saving plain JPEG: {e}")
+        
+        # Optional process pool running NumPy merges outside the calling thread
+        self.worker_pool: Optional[ImageWorkerPool] = None
+        if self.config.process_pool and self._use_numpy_engine():
+            try:
+                self.worker_pool = ImageWorkerPool(
+                    num_workers=self.config.process_pool_workers,
+                    chunk_rows=self.config.process_pool_chunk_rows
+                )
+            except ImageWorkerPoolError as e:
+                self.logger.warning(f"Image process pool unavailable, merging inline: {e}")
     
     def find_screenshots_in_folder(self, folder_path: Path, 
                                   hotkey_name: Optional[str] = None) -> List[Path]:
@@ -174,74 +213,108 @@ class ImageProcessor:
             # Ensure output directory exists
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
+            # Process pool: chunks are composed, enhanced and encoded by worker processes
+            if self.worker_pool:
+                heights, scaled_heights = self._path_heights(image_metadata, final_width, scale_factor)
+                sources = [
+                    MergeSource(height=height, scaled_height=scaled_height, path=str(metadata['path']))
+                    for metadata, height, scaled_height in zip(image_metadata, heights, scaled_heights)
+                ]
+                pooled = self._merge_in_pool(sources, final_width, output_path=output_path)
+                if pooled is not None:
+                    output_path = Path(pooled[2])
+                    processing_time = time.time() - start_time
+                    self._processing_stats['successful_merges'] += 1
+                    self._processing_stats['total_processing_time'] += processing_time
+                    self._processing_stats['last_processing_time'] = datetime.now().isoformat()
+                    
+                    self.logger.info(
+                        f"Merged {pooled[0]} images into {output_path.name} in process pool "
+                        f"({final_width}x{sum(heights)}) in {processing_time:.3f}s"
+                    )
+                    return output_path
+            
             # Create merged image
             merged_image = None
             try:
-                merged_image = Image.new('RGB', (final_width, total_height), 'white')
-                
-                # Second pass: stream process images one by one
-                current_y = 0
-                processed_count = 0
-                
-                for metadata in image_metadata:
-                    if current_y >= total_height:
-                        break
-                        
-                    try:
-                        # Load image in context manager for automatic cleanup
-                        with Image.open(metadata['path']) as img:
-                            # Calculate target dimensions
-                            target_width = final_width
-                            if scale_factor != 1.0:
-                                target_height = int(img.height * scale_factor)
-                            else:
-                                target_height = img.height
+                if self._use_numpy_engine():
+                    # Preallocated array merge with fused in-place OCR preprocessing
+                    merged_image, processed_count = self._merge_paths_numpy(
+                        image_metadata, final_width, scale_factor
+                    )
+                    total_height = merged_image.height
+                else:
+                    merged_image = Image.new('RGB', (final_width, total_height), 'white')
+                    
+                    # Second pass: stream process images one by one
+                    current_y = 0
+                    processed_count = 0
+                    
+                    for metadata in image_metadata:
+                        if current_y >= total_height:
+                            break
                             
-                            # Resize if necessary
-                            if img.width != target_width or (scale_factor != 1.0 and img.height != target_height):
+                        try:
+                            # Load image in context manager for automatic cleanup
+                            with Image.open(metadata['path']) as img:
+                                # Calculate target dimensions
+                                target_width = final_width
                                 if scale_factor != 1.0:
-                                    img = img.resize((target_width, target_height), Image.LANCZOS)
-                                else:
-                                    aspect_ratio = img.height / img.width
-                                    new_height = int(target_width * aspect_ratio)
-                                    img = img.resize((target_width, new_height), Image.LANCZOS)
-                                    target_height = new_height
-                            
-                            # Check if image fits in remaining space
-                            remaining_height = total_height - current_y
-                            if target_height > remaining_height:
-                                if remaining_height > 0:
-                                    # Crop image to fit
-                                    img = img.crop((0, 0, img.width, remaining_height))
-                                    target_height = remaining_height
+                                    target_height = int(img.height * scale_factor)
                                 else:
-                                    break
-                            
-                            # Paste image into merged image
-                            merged_image.paste(img, (0, current_y))
-                            current_y += target_height
-                            processed_count += 1
-                            
-                            # Log progress for large batches
-                            if processed_count % 5 == 0:
-                                self.logger.debug(f"Processed {processed_count}/{len(image_metadata)} images")
+                                    target_height = img.height
+                                
+                                # Resize if necessary
+                                if img.width != target_width or (scale_factor != 1.0 and img.height != target_height):
+                                    if scale_factor != 1.0:
+                                        img = img.resize((target_width, target_height), Image.LANCZOS)
+                                    else:
+                                        aspect_ratio = img.height / img.width
+                                        new_height = int(target_width * aspect_ratio)
+                                        img = img.resize((target_width, new_height), Image.LANCZOS)
+                                        target_height = new_height
+                                
+                                # Check if image fits in remaining space
+                                remaining_height = total_height - current_y
+                                if target_height > remaining_height:
+                                    if remaining_height > 0:
+                                        # Crop image to fit
+                                        img = img.crop((0, 0, img.width, remaining_height))
+                                        target_height = remaining_height
+                                    else:
+                                        break
+                                
+                                # Paste image into merged image
+                                merged_image.paste(img, (0, current_y))
+                                current_y += target_height
+                                processed_count += 1
+                                
+                                # Log progress for large batches
+                                if processed_count % 5 == 0:
+                                    self.logger.debug(f"Processed {processed_count}/{len(image_metadata)} images")
+                        
+                        except Exception as e:
+                            self.logger.error(f"Failed to process image {metadata['path']}: {e}")
+                            continue
                     
-                    except Exception as e:
-                        self.logger.error(f"Failed to process image {metadata['path']}: {e}")
-                        continue
-                
-                # Optimize image for OCR if requested
-                if self.config.optimize_for_ocr:
-                    optimized_image = self._optimize_for_ocr(merged_image)
-                    merged_image.close()
-                    merged_image = optimized_image
+                    # Optimize image for OCR if requested
+                    if self.config.optimize_for_ocr:
+                        optimized_image = self._optimize_for_ocr(merged_image)
+                        merged_image.close()
+                        merged_image = optimized_image
                 
                 # Save merged image
-                save_kwargs = {'format': 'JPEG', 'optimize': True}
-                if output_path.suffix.lower() in ['.jpg', '.jpeg']:
-                    save_kwargs['quality'] = self.config.jpeg_quality
-                
-                merged_image.save(output_path, **save_kwargs)
+                if self.encoder:
+                    # Smallest OCR-safe encoding, file suffix follows the chosen format
+                    encoded = self.encoder.encode(merged_image)
+                    output_path = output_path.with_suffix(encoded.extension)
+                    output_path.write_bytes(encoded.data)
+                else:
+                    save_kwargs = {'format': 'JPEG', 'optimize': True}
+                    if output_path.suffix.lower() in ['.jpg', '.jpeg']:
+                        save_kwargs['quality'] = self.config.jpeg_quality
+                    
+                    merged_image.save(output_path, **save_kwargs)
                 
                 # Update statistics
                 processing_time = time.time() - start_time
@@ -420,6 +493,577 @@ class ImageProcessor:
             self.logger.error(f"Failed to process hotkey folder {hotkey_name}: {e}")
             return None
     
+    def plan_chunks(self, heights: List[int]) -> List[List[int]]:
+        """
+        Split a column into OCR-sized chunks at screenshot boundaries.
+        A single screenshot taller than max_image_height gets a chunk of its own.
+        
+        Args:
+            heights: Height of each screenshot at merge width
+        
+        Returns:
+            Screenshot indexes of each chunk, in column order
+        """
+        chunks = []
+        current: List[int] = []
+        current_height = 0
+        
+        for index, height in enumerate(heights):
+            if current and current_height + height > self.config.max_image_height:
+                chunks.append(current)
+                current, current_height = [], 0
+            current.append(index)
+            current_height += height
+        
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    def _column_heights(self, sizes: List[Tuple[int, int]]) -> Tuple[int, List[int]]:
+        """Merge width and per-image heights at that width, as computed by the merges."""
+        final_width = min(max(width for width, _ in sizes), self.config.max_image_width)
+        heights = [
+            height if width == final_width else int(final_width * height / width)
+            for width, height in sizes
+        ]
+        return final_width, heights
+    
+    def process_hotkey_folder_chunks(self, hotkey_name: str,
+                                     auto_cleanup: bool = True) -> Optional[List[Path]]:
+        """
+        Process hotkey screenshots into one or more OCR-sized merged images.
+        Instead of scaling an oversize column down, it is split at screenshot
+        boundaries so every chunk keeps full resolution.
+        
+        Args:
+            hotkey_name: Name of the hotkey
+            auto_cleanup: Whether to automatically cleanup source files
+        
+        Returns:
+            Merged chunk paths in column order or None if nothing was merged
+        """
+        try:
+            screenshot_folder = self.settings.get_screenshot_path(hotkey_name)
+            if not screenshot_folder:
+                self.logger.error(f"No screenshot path configured for hotkey {hotkey_name}")
+                return None
+            
+            screenshot_files = self.find_screenshots_in_folder(screenshot_folder, hotkey_name)
+            if not screenshot_files:
+                self.logger.debug(f"No screenshots found for hotkey {hotkey_name}")
+                return None
+            
+            readable_files = []
+            sizes = []
+            for path in screenshot_files:
+                try:
+                    with Image.open(path) as img:
+                        sizes.append(img.size)
+                        readable_files.append(path)
+                except Exception as e:
+                    self.logger.error(f"Failed to read metadata from {path}: {e}")
+            
+            if not readable_files:
+                return None
+            
+            final_width, heights = self._column_heights(sizes)
+            chunks = self.plan_chunks(heights)
+            
+            merged_paths = []
+            for chunk in chunks:
+                merged_path = self.merge_to_vertical_column(
+                    [readable_files[index] for index in chunk], max_width=final_width
+                )
+                if not merged_path:
+                    for path in merged_paths:
+                        path.unlink(missing_ok=True)
+                    return None
+                merged_paths.append(merged_path)
+            
+            if len(chunks) > 1:
+                self._processing_stats['chunked_merges'] += 1
+                self._processing_stats['chunks_created'] += len(chunks)
+                self.logger.info(
+                    f"Split {len(readable_files)} screenshots of {hotkey_name} "
+                    f"({sum(heights)}px) into {len(chunks)} OCR chunks"
+                )
+            
+            if auto_cleanup:
+                self.cleanup_source_files(screenshot_files)
+            
+            self._processing_stats['total_processed'] += len(screenshot_files)
+            return merged_paths
+        
+        except Exception as e:
+            self.logger.error(f"Failed to process hotkey folder {hotkey_name} in chunks: {e}")
+            return None
+    
+    def split_into_strips(self, image_paths: List[Path], 
+                          strip_height: int = 0) -> List[ImageStrip]:
+        """
+        Split screenshots into horizontal strips and hash their pixels.
+        
+        Args:
+            image_paths: Screenshot paths in capture order
+            strip_height: Strip height in pixels (0 keeps each screenshot whole)
+        
+        Returns:
+            List of strips with loaded images (caller releases via merge_strips)
+        """
+        strips = []
+        
+        for img_path in image_paths:
+            try:
+                with Image.open(img_path) as img:
+                    img.load()
+                    rgb_image = img.convert('RGB')
+            except Exception as e:
+                self.logger.error(f"Failed to read screenshot {img_path}: {e}")
+                continue
+            
+            step = strip_height if strip_height > 0 else rgb_image.height
+            for top in range(0, rgb_image.height, step):
+                bottom = min(top + step, rgb_image.height)
+                strip_image = rgb_image if step >= rgb_image.height else rgb_image.crop((0, top, rgb_image.width, bottom))
+                strips.append(ImageStrip(
+                    source_path=img_path,
+                    index=len(strips),
+                    top=top,
+                    width=strip_image.width,
+                    height=strip_image.height,
+                    strip_hash=strip_pixel_hash(strip_image),
+                    image=strip_image
+                ))
+        
+        return strips
+    
+    def merge_strips(self, strips: List[ImageStrip], 
+                     output_path: Optional[Path] = None) -> Optional[Tuple[Path, List[Tuple[int, int]]]]:
+        """
+        Merge strips into a vertical column and report where each strip landed.
+        
+        Args:
+            strips: Strips to merge, in order
+            output_path: Optional output path (auto-generated if not provided)
+        
+        Returns:
+            Tuple of (merged image path, list of (top, bottom) per strip) or None if failed
+        """
+        if not strips:
+            return None
+        
+        start_time = time.time()
+        merged_image = None
+        
+        try:
+            final_width = min(max(strip.width for strip in strips), self.config.max_image_width)
+            heights = [int(strip.height * final_width / strip.width) for strip in strips]
+            total_height = sum(heights)
+            
+            # Scale everything down uniformly so strip offsets stay consistent
+            scale_factor = 1.0
+            if total_height > self.config.max_image_height:
+                scale_factor = self.config.max_image_height / total_height
+                final_width = max(1, int(final_width * scale_factor))
+                heights = [max(1, int(height * scale_factor)) for height in heights]
+                total_height = sum(heights)
+            
+            if output_path is None:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+                filename = f"merged_{timestamp}_{uuid.uuid4().hex[:8]}.jpg"
+                output_path = self.settings.paths.temp_merged / filename
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            offsets = []
+            current_y = 0
+            for target_height in heights:
+                offsets.append((current_y, current_y + target_height))
+                current_y += target_height
+            
+            if self._use_numpy_engine():
+                merged_image = self._compose_numpy((strip.image for strip in strips), final_width, heights)
+            else:
+                merged_image = Image.new('RGB', (final_width, total_height), 'white')
+                
+                for strip, target_height, (top, _) in zip(strips, heights, offsets):
+                    img = strip.image
+                    if img.width != final_width or img.height != target_height:
+                        img = img.resize((final_width, target_height), Image.LANCZOS)
+                    merged_image.paste(img, (0, top))
+                
+                if self.config.optimize_for_ocr:
+                    optimized_image = self._optimize_for_ocr(merged_image)
+                    merged_image.close()
+                    merged_image = optimized_image
+            
+            merged_image.save(output_path, format='JPEG', optimize=True, quality=self.config.jpeg_quality)
+            
+            processing_time = time.time() - start_time
+            self._processing_stats['successful_merges'] += 1
+            self._processing_stats['total_processing_time'] += processing_time
+            self._processing_stats['last_processing_time'] = datetime.now().isoformat()
+            
+            self.logger.info(
+                f"Merged {len(strips)} changed strips into {output_path.name} "
+                f"({final_width}x{total_height}) in {processing_time:.3f}s"
+            )
+            
+            return output_path, offsets
+        
+        except Exception as e:
+            self._processing_stats['failed_merges'] += 1
+            self.logger.error(f"Failed to merge strips: {e}")
+            return None
+        finally:
+            if merged_image:
+                merged_image.close()
+    
+    def process_hotkey_folder_strips(self, hotkey_name: str, strip_tracker: StripTracker,
+                                     auto_cleanup: bool = True) -> Optional[StripMergeResult]:
+        """
+        Process hotkey screenshots in strip mode: only strips not seen before are merged.
+        
+        Args:
+            hotkey_name: Name of the hotkey
+            strip_tracker: Tracker holding cached strip texts
+            auto_cleanup: Whether to automatically cleanup source files
+        
+        Returns:
+            StripMergeResult (merged_path is None if nothing changed) or None if no screenshots
+        """
+        strips = []
+        try:
+            screenshot_folder = self.settings.get_screenshot_path(hotkey_name)
+            if not screenshot_folder:
+                self.logger.error(f"No screenshot path configured for hotkey {hotkey_name}")
+                return None
+            
+            screenshot_files = self.find_screenshots_in_folder(screenshot_folder, hotkey_name)
+            if not screenshot_files:
+                self.logger.debug(f"No screenshots found for hotkey {hotkey_name}")
+                return None
+            
+            strips = self.split_into_strips(screenshot_files, self.config.strip_height)
+            if not strips:
+                return None
+            
+            changed_hashes = strip_tracker.find_changed(hotkey_name, strips)
+            result = StripMergeResult(hotkey=hotkey_name, strips=strips, changed_hashes=changed_hashes)
+            
+            if changed_hashes:
+                strips_by_hash = {}
+                for strip in strips:
+                    strips_by_hash.setdefault(strip.strip_hash, strip)
+                
+                merged = self.merge_strips([strips_by_hash[strip_hash] for strip_hash in changed_hashes])
+                if not merged:
+                    return None
+                result.merged_path, offsets = merged
+                result.offsets = dict(zip(changed_hashes, offsets))
+            
+            self.logger.info(
+                f"Strip mode {hotkey_name}: {len(changed_hashes)} of {len(strips)} strips changed"
+            )
+            
+            if auto_cleanup:
+                # No backup copies: they would match the hotkey glob and be re-read next cycle
+                self.cleanup_source_files(screenshot_files, backup_failed=False)
+            
+            self._processing_stats['total_processed'] += len(screenshot_files)
+            
+            return result
+        
+        except Exception as e:
+            self.logger.error(f"Failed to process hotkey folder {hotkey_name} in strip mode: {e}")
+            return None
+        finally:
+            # Release strip pixel data, hashes are all that is kept
+            for strip in strips:
+                strip.image = None
+    
+    def _use_numpy_engine(self) -> bool:
+        """Whether merges run on the NumPy engine."""
+        return getattr(self.config, 'merge_engine', 'pil') == 'numpy' and NUMPY_AVAILABLE
+    
+    def _compose_numpy(self, images, final_width: int, heights: List[int]) -> Image.Image:
+        """
+        Compose images into one preallocated array, enhancing it in place for OCR.
+        
+        Args:
+            images: Source images in order (None entries leave a blank slot)
+            final_width: Output width
+            heights: Target height per image
+        
+        Returns:
+            Merged PIL Image, grayscale when optimize_for_ocr is enabled
+        """
+        grayscale = self.config.optimize_for_ocr
+        array = compose_vertical(images, final_width, heights, grayscale=grayscale)
+        if grayscale:
+            # Grayscale JPEG is kept as is, no conversion back to RGB
+            enhance_for_ocr(array)
+        return Image.fromarray(array)
+    
+    def _path_heights(self, image_metadata: List[Dict[str, Any]], final_width: int,
+                      scale_factor: float) -> Tuple[List[int], List[int]]:
+        """
+        Compute merged rows per file, matching the PIL paste loop.
+        
+        Args:
+            image_metadata: Metadata collected in the first pass
+            final_width: Output width
+            scale_factor: Height scale applied when the column exceeds max_image_height
+        
+        Returns:
+            Tuple of (rows placed per image, rows after resizing before cropping)
+        """
+        heights = []
+        scaled_heights = []
+        remaining = self.config.max_image_height if scale_factor != 1.0 else None
+        for metadata in image_metadata:
+            if scale_factor != 1.0:
+                height = int(metadata['height'] * scale_factor)
+            elif metadata['width'] == final_width:
+                height = metadata['height']
+            else:
+                height = int(final_width * metadata['height'] / metadata['width'])
+            scaled_heights.append(height)
+            if remaining is not None:
+                # Last image is cropped to the remaining space, later ones are skipped
+                height = min(height, remaining)
+                remaining -= height
+            heights.append(height)
+        return heights, scaled_heights
+    
+    def _merge_in_pool(self, sources: List[MergeSource], final_width: int,
+                       output_path: Optional[Path] = None,
+                       frames: Optional[List[bytes]] = None) -> Optional[Tuple[int, Optional[bytes], Optional[str]]]:
+        """
+        Run a merge on the process pool.
+        
+        Args:
+            sources: Images in order with their target heights
+            final_width: Output width
+            output_path: File to write, encoded bytes are returned when None
+            frames: Raw RGB data of in-memory frames
+        
+        Returns:
+            Tuple of (images placed, encoded bytes, written path) or None to merge inline
+        """
+        if not self.worker_pool or not self.worker_pool.is_available:
+            return None
+        
+        try:
+            result = self.worker_pool.merge(
+                sources,
+                final_width,
+                grayscale=self.config.optimize_for_ocr,
+                enhance=self.config.optimize_for_ocr,
+                quality=self.config.jpeg_quality,
+                output_path=str(output_path) if output_path else None,
+                frames=frames,
+                encoder=self.encoder
+            )
+            self._processing_stats['pooled_merges'] += 1
+            return result
+        except ImageWorkerPoolError as e:
+            self._processing_stats['pool_fallbacks'] += 1
+            self.logger.warning(f"{e}, merging inline")
+            return None
+    
+    def _merge_paths_numpy(self, image_metadata: List[Dict[str, Any]], final_width: int,
+                           scale_factor: float) -> Tuple[Image.Image, int]:
+        """
+        Merge image files with the NumPy engine, using the same geometry as the PIL path.
+        
+        Args:
+            image_metadata: Metadata collected in the first pass
+            final_width: Output width
+            scale_factor: Height scale applied when the column exceeds max_image_height
+        
+        Returns:
+            Tuple of (merged image, number of images placed)
+        """
+        heights, scaled_heights = self._path_heights(image_metadata, final_width, scale_factor)
+        
+        placed = [0]
+        
+        def open_images():
+            for metadata, height, scaled_height in zip(image_metadata, heights, scaled_heights):
+                if height <= 0:
+                    yield None
+                    continue
+                try:
+                    with Image.open(metadata['path']) as img:
+                        if height < scaled_height:
+                            resized = img.resize((final_width, scaled_height), Image.LANCZOS)
+                            img = resized.crop((0, 0, final_width, height))
+                            resized.close()
+                        placed[0] += 1
+                        yield img
+                except Exception as e:
+                    self.logger.error(f"Failed to process image {metadata['path']}: {e}")
+                    yield None
+        
+        merged_image = self._compose_numpy(open_images(), final_width, heights)
+        return merged_image, placed[0]
+    
+    def merge_frames(self, frames: List[CapturedFrame]) -> Optional[bytes]:
+        """
+        Merge raw captured frames into a vertical column encoded once in memory.
+        
+        Args:
+            frames: Captured frames in capture order
+        
+        Returns:
+            JPEG bytes of the merged image or None if failed
+        """
+        if not frames:
+            return None
+        
+        start_time = time.time()
+        merged_image = None
+        
+        try:
+            final_width = min(max(frame.size[0] for frame in frames), self.config.max_image_width)
+            heights = [int(frame.size[1] * final_width / frame.size[0]) for frame in frames]
+            total_height = sum(heights)
+            
+            if total_height > self.config.max_image_height:
+                self.logger.warning(
+                    f"Merged image height ({total_height}) exceeds maximum "
+                    f"({self.config.max_image_height}), will be resized"
+                )
+                scale_factor = self.config.max_image_height / total_height
+                final_width = max(1, int(final_width * scale_factor))
+                heights = [max(1, int(height * scale_factor)) for height in heights]
+                total_height = sum(heights)
+            
+            if self.worker_pool:
+                sources = [
+                    MergeSource(height=height, scaled_height=height, size=frame.size)
+                    for frame, height in zip(frames, heights)
+                ]
+                pooled = self._merge_in_pool(sources, final_width, frames=[frame.rgb for frame in frames])
+                if pooled is not None:
+                    image_data = pooled[1]
+                    processing_time = time.time() - start_time
+                    self._processing_stats['successful_merges'] += 1
+                    self._processing_stats['total_processing_time'] += processing_time
+                    self._processing_stats['last_processing_time'] = datetime.now().isoformat()
+                    
+                    self.logger.info(
+                        f"Merged {len(frames)} frames in process pool ({final_width}x{total_height}, "
+                        f"{len(image_data) / 1024:.0f}KB) in {processing_time:.3f}s"
+                    )
+                    return image_data
+            
+            if self._use_numpy_engine():
+                sources = (
+                    Image.frombuffer('RGB', frame.size, frame.rgb, 'raw', 'RGB', 0, 1) for frame in frames
+                )
+                merged_image = self._compose_numpy(sources, final_width, heights)
+            else:
+                merged_image = Image.new('RGB', (final_width, total_height), 'white')
+                current_y = 0
+                
+                for frame, target_height in zip(frames, heights):
+                    img = Image.frombuffer('RGB', frame.size, frame.rgb, 'raw', 'RGB', 0, 1)
+                    if img.size != (final_width, target_height):
+                        img = img.resize((final_width, target_height), Image.LANCZOS)
+                    merged_image.paste(img, (0, current_y))
+                    current_y += target_height
+                
+                if self.config.optimize_for_ocr:
+                    optimized_image = self._optimize_for_ocr(merged_image)
+                    merged_image.close()
+                    merged_image = optimized_image
+            
+            if self.encoder:
+                image_data = self.encoder.encode(merged_image).data
+            else:
+                buffer = io.BytesIO()
+                merged_image.save(buffer, format='JPEG', optimize=True, quality=self.config.jpeg_quality)
+                image_data = buffer.getvalue()
+            
+            processing_time = time.time() - start_time
+            self._processing_stats['successful_merges'] += 1
+            self._processing_stats['total_processing_time'] += processing_time
+            self._processing_stats['last_processing_time'] = datetime.now().isoformat()
+            
+            self.logger.info(
+                f"Merged {len(frames)} frames in memory ({final_width}x{total_height}, "
+                f"{len(image_data) / 1024:.0f}KB) in {processing_time:.3f}s"
+            )
+            
+            return image_data
+        
+        except Exception as e:
+            self._processing_stats['failed_merges'] += 1
+            self.logger.error(f"Failed to merge frames: {e}")
+            return None
+        finally:
+            if merged_image:
+                merged_image.close()
+    
+    def process_hotkey_frames(self, hotkey_name: str, frame_buffer: FrameBuffer) -> Optional[bytes]:
+        """
+        Merge all buffered frames of a hotkey without touching disk.
+        
+        Args:
+            hotkey_name: Name of the hotkey
+            frame_buffer: Buffer holding captured frames
+        
+        Returns:
+            Encoded merged image bytes or None if no frames or merge failed
+        """
+        frames = frame_buffer.drain(hotkey_name)
+        if not frames:
+            self.logger.debug(f"No frames buffered for hotkey {hotkey_name}")
+            return None
+        
+        self.logger.info(f"Processing {len(frames)} buffered frames for {hotkey_name}")
+        
+        image_data = self.merge_frames(frames)
+        if image_data:
+            self._processing_stats['total_processed'] += len(frames)
+        return image_data
+    
+    def process_hotkey_frame_chunks(self, hotkey_name: str,
+                                    frame_buffer: FrameBuffer) -> Optional[List[bytes]]:
+        """
+        Merge buffered frames of a hotkey into one or more OCR-sized images in memory.
+        
+        Args:
+            hotkey_name: Name of the hotkey
+            frame_buffer: Buffer holding captured frames
+        
+        Returns:
+            Encoded chunk images in column order or None if no frames or a merge failed
+        """
+        frames = frame_buffer.drain(hotkey_name)
+        if not frames:
+            self.logger.debug(f"No frames buffered for hotkey {hotkey_name}")
+            return None
+        
+        _, heights = self._column_heights([frame.size for frame in frames])
+        chunks = self.plan_chunks(heights)
+        
+        chunk_data = []
+        for chunk in chunks:
+            image_data = self.merge_frames([frames[index] for index in chunk])
+            if not image_data:
+                return None
+            chunk_data.append(image_data)
+        
+        if len(chunks) > 1:
+            self._processing_stats['chunked_merges'] += 1
+            self._processing_stats['chunks_created'] += len(chunks)
+            self.logger.info(f"Split {len(frames)} frames of {hotkey_name} into {len(chunks)} OCR chunks")
+        
+        self._processing_stats['total_processed'] += len(frames)
+        return chunk_data
+    
     def batch_process_all_hotkeys(self, enabled_only: bool = True) -> Dict[str, Optional[Path]]:
         """
         Process screenshots for all configured hotkeys.
@@ -441,10 +1085,20 @@ class ImageProcessor:
             
             self.logger.info(f"Batch processing {len(hotkeys)} hotkeys")
             
+            # With the process pool, hotkeys are merged concurrently across all workers
+            pending = {}
+            if self.worker_pool and len(hotkeys) > 1:
+                executor = ThreadPoolExecutor(max_workers=len(hotkeys), thread_name_prefix="HotkeyMerge")
+                pending = {name: executor.submit(self.process_hotkey_folder, name) for name in hotkeys}
+                executor.shutdown(wait=False)
+            
             # Process each hotkey
             for hotkey_name in hotkeys:
                 try:
-                    result = self.process_hotkey_folder(hotkey_name)
+                    if hotkey_name in pending:
+                        result = pending[hotkey_name].result()
+                    else:
+                        result = self.process_hotkey_folder(hotkey_name)
                     results[hotkey_name] = result
                     
                     if result:
@@ -481,7 +1135,7 @@ class ImageProcessor:
             deleted_count = 0
             
             # Find and delete old merged images
-            for file_path in merged_path.glob("merged_*.jpg"):
+            for file_path in merged_path.glob("merged_*.*"):
                 try:
                     if file_path.stat().st_mtime < cutoff_time:
                         file_path.unlink()
@@ -522,8 +1176,18 @@ class ImageProcessor:
         else:
             stats['success_rate'] = 0.0
         
+        if self.worker_pool:
+            stats['worker_pool'] = self.worker_pool.get_pool_statistics()
+        if self.encoder:
+            stats['encoder'] = self.encoder.get_encoder_statistics()
+        
         return stats
     
+    def close(self) -> None:
+        """Stop the process pool if one is running."""
+        if self.worker_pool:
+            self.worker_pool.shutdown()
+    
     def validate_image_file(self, file_path: Path) -> bool:
         """
         Validate that a file is a valid image.
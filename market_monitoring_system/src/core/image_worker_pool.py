@@ -0,0 +1,356 @@
+"""
+Process pool backend for image merging in market monitoring system.
+Runs merge chunks in worker processes that exchange pixel buffers through shared memory.
+"""
+
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import List, Optional, Tuple, Dict, Any
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError as e:
+    NUMPY_AVAILABLE = False
+    NUMPY_ERROR = str(e)
+
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError as e:
+    PILLOW_AVAILABLE = False
+    PILLOW_ERROR = str(e)
+
+from .numpy_imaging import compose_vertical, enhance_rows
+from .ocr_image_encoder import OCRImageEncoder
+
+
+@dataclass
+class MergeSource:
+    """One image placed into a pooled merge."""
+    height: int  # Rows occupied in the merged image
+    scaled_height: int  # Rows after resizing; cropped to height when larger
+    path: Optional[str] = None  # Screenshot file, decoded by the worker
+    size: Tuple[int, int] = (0, 0)  # (width, height) of raw RGB frame data
+    offset: int = field(default=-1, repr=False)  # Frame data offset in the input block
+
+
+class ImageWorkerPoolError(Exception):
+    """Exception raised for image worker pool errors."""
+    pass
+
+
+def _attach(name: str, shape: Tuple[int, ...]) -> Tuple[shared_memory.SharedMemory, 'np.ndarray']:
+    """Attach to a shared memory block and view it as a uint8 array."""
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=np.uint8, buffer=block.buf)
+
+
+def _compose_chunk(canvas_name: str, shape: Tuple[int, ...], top: int, sources: List[MergeSource],
+                   input_name: Optional[str] = None) -> Tuple[int, int]:
+    """
+    Worker task: compose a run of consecutive sources into the shared canvas.
+    
+    Returns:
+        Tuple of (images placed, sum of written pixel values)
+    """
+    canvas_block, canvas = _attach(canvas_name, shape)
+    input_block = shared_memory.SharedMemory(name=input_name) if input_name else None
+    rows = sum(source.height for source in sources)
+    placed = [0]
+    
+    def open_sources():
+        for source in sources:
+            try:
+                if source.path is None:
+                    width, height = source.size
+                    data = input_block.buf[source.offset:source.offset + width * height * 3]
+                    img = Image.frombuffer('RGB', source.size, data, 'raw', 'RGB', 0, 1)
+                    if source.height < source.scaled_height:
+                        img = img.resize((shape[1], source.scaled_height), Image.LANCZOS)
+                        img = img.crop((0, 0, shape[1], source.height))
+                    else:
+                        img = img.copy()  # Release the shared buffer export before the next frame
+                    placed[0] += 1
+                    yield img
+                    img.close()
+                    continue
+                
+                with Image.open(source.path) as img:
+                    if source.height < source.scaled_height:
+                        resized = img.resize((shape[1], source.scaled_height), Image.LANCZOS)
+                        img = resized.crop((0, 0, shape[1], source.height))
+                        resized.close()
+                    placed[0] += 1
+                    yield img
+            except OSError:
+                yield None
+    
+    try:
+        region = canvas[top:top + rows]
+        region.fill(255)
+        compose_vertical(open_sources(), shape[1], [source.height for source in sources],
+                         grayscale=len(shape) == 2, output=region)
+        pixel_sum = int(region.sum(dtype=np.uint64))
+        del region
+        return placed[0], pixel_sum
+    finally:
+        del canvas
+        canvas_block.close()
+        if input_block:
+            input_block.close()
+
+
+def _enhance_chunk(canvas_name: str, output_name: str, shape: Tuple[int, int],
+                   top: int, bottom: int, mean: int) -> None:
+    """Worker task: enhance a row range of the shared canvas into the output block."""
+    canvas_block, canvas = _attach(canvas_name, shape)
+    output_block, output = _attach(output_name, shape)
+    try:
+        enhance_rows(canvas, output, top, bottom, mean)
+    finally:
+        del canvas, output
+        canvas_block.close()
+        output_block.close()
+
+
+def _encode_output(name: str, shape: Tuple[int, ...], output_path: Optional[str], quality: int,
+                   encoder: Optional[OCRImageEncoder] = None) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    Worker task: encode the shared image into a file or return the bytes.
+    
+    Returns:
+        Tuple of (encoded bytes when no output_path, written path otherwise)
+    """
+    block, array = _attach(name, shape)
+    try:
+        image = Image.fromarray(array)
+        if encoder:
+            encoded = encoder.encode(image)
+            data, extension = encoded.data, encoded.extension
+        else:
+            buffer = io.BytesIO()
+            image.save(buffer, format='JPEG', optimize=True, quality=quality)
+            data, extension = buffer.getvalue(), '.jpg'
+        
+        if not output_path:
+            return data, None
+        path = Path(output_path).with_suffix(extension)
+        path.write_bytes(data)
+        return None, str(path)
+    finally:
+        image = None
+        del array
+        block.close()
+
+
+class ImageWorkerPool:
+    """
+    Process pool running the NumPy merge stage outside the scheduler threads.
+    A merge is split into chunks of consecutive screenshots composed into one
+    shared memory canvas, enhanced in row ranges and encoded by a worker, so
+    pixel data never passes through pickling. Merges of several hotkeys
+    submitted together from scheduler threads share the pool and use all cores.
+    """
+    
+    def __init__(self, num_workers: int = 0, chunk_rows: int = 2048):
+        """
+        Initialize image worker pool.
+        
+        Args:
+            num_workers: Worker processes (0 = one per CPU core)
+            chunk_rows: Target rows per chunk of one merge
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImageWorkerPoolError(f"NumPy library not available: {NUMPY_ERROR}")
+        if not PILLOW_AVAILABLE:
+            raise ImageWorkerPoolError(f"Pillow library not available: {PILLOW_ERROR}")
+        
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.chunk_rows = max(1, chunk_rows)
+        self.logger = logging.getLogger(__name__)
+        
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._is_broken = False
+        
+        # Statistics
+        self._stats = {
+            'merges': 0,
+            'failed_merges': 0,
+            'chunks': 0,
+            'bytes_shared': 0,
+            'total_merge_time': 0.0
+        }
+    
+    @property
+    def is_available(self) -> bool:
+        """Whether merges can be submitted (pool not shut down or broken)."""
+        return not self._is_broken
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the process pool on first use."""
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers do not inherit hook and scheduler threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.num_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                self.logger.info(f"Image worker pool started with {self.num_workers} processes")
+            return self._executor
+    
+    def _split_chunks(self, sources: List[MergeSource]) -> List[Tuple[int, List[MergeSource]]]:
+        """Split sources into runs of roughly chunk_rows rows as (top row, sources)."""
+        chunks = []
+        top = 0
+        current: List[MergeSource] = []
+        current_rows = 0
+        
+        for source in sources:
+            current.append(source)
+            current_rows += source.height
+            if current_rows >= self.chunk_rows:
+                chunks.append((top, current))
+                top += current_rows
+                current, current_rows = [], 0
+        
+        if current:
+            chunks.append((top, current))
+        return chunks
+    
+    def merge(self, sources: List[MergeSource], final_width: int, grayscale: bool = True,
+              enhance: bool = True, quality: int = 85, output_path: Optional[str] = None,
+              frames: Optional[List[bytes]] = None,
+              encoder: Optional[OCRImageEncoder] = None) -> Tuple[int, Optional[bytes], Optional[str]]:
+        """
+        Merge sources into a vertical column image using the worker processes.
+        
+        Args:
+            sources: Images in order with their target heights
+            final_width: Output width
+            grayscale: Compose single channel data instead of RGB
+            enhance: Apply OCR enhancement (grayscale only)
+            quality: JPEG quality when no encoder is given
+            output_path: File to write (suffix follows the encoding); bytes are returned when None
+            frames: Raw RGB data for sources without a path, in source order
+            encoder: Optional OCR image encoder run in the worker instead of plain JPEG
+        
+        Returns:
+            Tuple of (images placed, encoded bytes or None, written path or None)
+        
+        Raises:
+            ImageWorkerPoolError: If the pool is unavailable or a worker task failed
+        """
+        if self._is_broken:
+            raise ImageWorkerPoolError("Image worker pool is not available")
+        
+        start_time = time.time()
+        total_height = sum(source.height for source in sources)
+        shape = (total_height, final_width) if grayscale else (total_height, final_width, 3)
+        nbytes = max(1, int(np.prod(shape)))
+        blocks: List[shared_memory.SharedMemory] = []
+        
+        try:
+            executor = self._get_executor()
+            
+            canvas = shared_memory.SharedMemory(create=True, size=nbytes)
+            blocks.append(canvas)
+            
+            # Raw frames are copied once into a shared input block
+            input_name = None
+            if frames:
+                input_block = shared_memory.SharedMemory(create=True, size=max(1, sum(len(data) for data in frames)))
+                blocks.append(input_block)
+                input_name = input_block.name
+                offset = 0
+                for source, data in zip((source for source in sources if source.path is None), frames):
+                    input_block.buf[offset:offset + len(data)] = data
+                    source.offset = offset
+                    offset += len(data)
+                with self._lock:
+                    self._stats['bytes_shared'] += offset
+            
+            chunks = self._split_chunks(sources)
+            futures = [
+                executor.submit(_compose_chunk, canvas.name, shape, top, chunk, input_name)
+                for top, chunk in chunks
+            ]
+            results = [future.result() for future in futures]
+            placed = sum(count for count, _ in results)
+            
+            result_name = canvas.name
+            enhance_chunks = 0
+            if enhance and grayscale and total_height > 0:
+                mean = int(sum(pixel_sum for _, pixel_sum in results) / (total_height * final_width) + 0.5)
+                enhanced = shared_memory.SharedMemory(create=True, size=nbytes)
+                blocks.append(enhanced)
+                rows = max(self.chunk_rows, -(-total_height // self.num_workers))
+                futures = [
+                    executor.submit(_enhance_chunk, canvas.name, enhanced.name, shape,
+                                    top, min(top + rows, total_height), mean)
+                    for top in range(0, total_height, rows)
+                ]
+                for future in futures:
+                    future.result()
+                enhance_chunks = len(futures)
+                result_name = enhanced.name
+            
+            image_data, written_path = executor.submit(
+                _encode_output, result_name, shape, output_path, quality, encoder
+            ).result()
+            
+            with self._lock:
+                self._stats['merges'] += 1
+                self._stats['chunks'] += len(chunks) + enhance_chunks
+                self._stats['total_merge_time'] += time.time() - start_time
+            
+            return placed, image_data, written_path
+        
+        except BrokenProcessPool as e:
+            self._is_broken = True
+            with self._lock:
+                self._stats['failed_merges'] += 1
+            raise ImageWorkerPoolError(f"Image worker pool broken: {e}")
+        except Exception as e:
+            with self._lock:
+                self._stats['failed_merges'] += 1
+            raise ImageWorkerPoolError(f"Pooled merge failed: {e}")
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+    
+    def shutdown(self) -> None:
+        """Stop worker processes; later merges raise ImageWorkerPoolError."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._is_broken = True
+        
+        if executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.logger.info("Image worker pool stopped")
+    
+    def get_pool_statistics(self) -> Dict[str, Any]:
+        """
+        Get image worker pool statistics.
+        
+        Returns:
+            Dictionary with pool statistics
+        """
+        with self._lock:
+            stats = self._stats.copy()
+            stats['workers'] = self.num_workers
+            stats['is_available'] = not self._is_broken
+        
+        stats['average_merge_time'] = stats['total_merge_time'] / stats['merges'] if stats['merges'] else 0.0
+        return stats
\ No newline at end of file
@@ -88,12 +88,15 @@ class MonitoringEngine:
             'change_type_counts': {}
         }
     
-    def process_parsing_results(self, parsing_results: List[ParsingResult]) -> ChangeDetection:
+    def process_parsing_results(self, parsing_results: List[ParsingResult],
+                                save_items: bool = True) -> ChangeDetection:
         """
         Process parsing results with support for different processing types.
         
         Args:
             parsing_results: List of parsing results from OCR processing
+            save_items: Save full processing items to history; False if the caller
+                already saved them with their OCR session
             
         Returns:
             ChangeDetection object with detected changes and transitions
@@ -132,7 +135,8 @@ class MonitoringEngine:
                 self.logger.info(f"Processing {len(full_processing_items)} full processing items")
                 
                 # Save all full processing items to history
-                self.db.save_items_data(full_processing_items)
+                if save_items:
+                    self.db.save_items_data(full_processing_items)
                 
                 # Detect changes for full processing items
                 full_changes = self.db.detect_and_log_changes(full_processing_items)
@@ -556,24 +560,25 @@ class MonitoringEngine:
                 ''', (self.STATUS_CHECKED, delay_cutoff))
                 
                 checked_to_unchecked = cursor.fetchall()
-                
-                # Process NEW -> CHECKED transitions
-                for seller_name, item_name, old_status, status_changed_at in new_to_checked:
-                    transition = self._execute_status_transition(
-                        seller_name, item_name, old_status, self.STATUS_CHECKED,
-                        "Found data in items table"
-                    )
-                    if transition:
-                        transitions.append(transition)
-                
-                # Process CHECKED -> UNCHECKED transitions
-                for seller_name, item_name, old_status, status_changed_at in checked_to_unchecked:
-                    transition = self._execute_status_transition(
-                        seller_name, item_name, old_status, self.STATUS_UNCHECKED,
-                        f"Status transition delay ({self.config.status_transition_delay}s) elapsed"
-                    )
-                    if transition:
-                        transitions.append(transition)
+            
+            # Each transition runs in its own transaction, after the candidate query has committed
+            # Process NEW -> CHECKED transitions
+            for seller_name, item_name, old_status, status_changed_at in new_to_checked:
+                transition = self._execute_status_transition(
+                    seller_name, item_name, old_status, self.STATUS_CHECKED,
+                    "Found data in items table"
+                )
+                if transition:
+                    transitions.append(transition)
+            
+            # Process CHECKED -> UNCHECKED transitions
+            for seller_name, item_name, old_status, status_changed_at in checked_to_unchecked:
+                transition = self._execute_status_transition(
+                    seller_name, item_name, old_status, self.STATUS_UNCHECKED,
+                    f"Status transition delay ({self.config.status_transition_delay}s) elapsed"
+                )
+                if transition:
+                    transitions.append(transition)
             
             if transitions:
                 self.logger.info(f"Processed {len(transitions)} status transitions")
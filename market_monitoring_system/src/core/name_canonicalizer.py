@@ -0,0 +1,326 @@
+"""
+Name canonicalization for market monitoring system.
+Maps OCR spelling variants of seller and item names to known names before items are stored or compared.
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from .database_manager import DatabaseManager, ItemData
+
+
+class NameCanonicalizerError(Exception):
+    """Exception raised for name canonicalization errors."""
+    pass
+
+
+# Tokens whose characters identify a different item or seller and are never folded:
+# enchant level (+12), stack size (x20), grade ((A), (S80)) and standalone numbers
+PROTECTED_TOKEN = re.compile(r'\+\d+|\b[xX]\d+\b|\(\w{1,3}\)|\b\d+\b')
+
+# OCR-confusable character groups folded to one representative
+CONFUSABLE_UNIT = re.compile(r'rn|.', re.DOTALL)
+CONFUSABLE_FOLD = {'rn': 'm', '1': 'l', 'I': 'l', '|': 'l', '0': 'o', 'O': 'o'}
+
+
+def ocr_units(name: str) -> List[Tuple[str, str]]:
+    """
+    Split a name into (folded, original) units.
+    Protected tokens are single units folded to themselves, other characters
+    fold OCR-confusable spellings (l/1/I, O/0, rn/m) to one representative.
+    
+    Args:
+        name: Seller or item name
+    
+    Returns:
+        List of (folded, original) tuples
+    """
+    units = []
+    position = 0
+    for match in PROTECTED_TOKEN.finditer(name):
+        units.extend(_fold_units(name[position:match.start()]))
+        units.append(('#' + match.group(), match.group()))
+        position = match.end()
+    units.extend(_fold_units(name[position:]))
+    return units
+
+
+def _fold_units(text: str) -> List[Tuple[str, str]]:
+    """Fold unprotected text unit by unit."""
+    return [(CONFUSABLE_FOLD.get(unit, unit), unit) for unit in CONFUSABLE_UNIT.findall(text)]
+
+
+def ocr_skeleton(name: str) -> Tuple[str, ...]:
+    """Key shared by names that differ only in OCR-confusable characters."""
+    return tuple(folded for folded, _ in ocr_units(name))
+
+
+def confusable_substitutions(a: str, b: str) -> Optional[int]:
+    """
+    Count OCR-confusable substitutions turning one name into the other.
+    
+    Returns:
+        Number of substituted units, or None if the names differ in anything else
+    """
+    units_a, units_b = ocr_units(a), ocr_units(b)
+    if len(units_a) != len(units_b):
+        return None
+    substitutions = 0
+    for (folded_a, original_a), (folded_b, original_b) in zip(units_a, units_b):
+        if folded_a != folded_b:
+            return None
+        substitutions += original_a != original_b
+    return substitutions
+
+
+class NameCanonicalizer:
+    """
+    Maps OCR variants of seller and item names to canonical names.
+    Names already known are kept. An unknown name is looked up in an LRU
+    cache of resolved variants, then in the learned alias table, and then
+    matched against known names of the same kind sharing its OCR skeleton.
+    A variant may differ from its canonical name only by substitutions of
+    OCR-confusable characters, never in numbers, enchant levels, stack
+    sizes or grades. Anything else becomes a new canonical name. The
+    canonical name is the id stored in all tables.
+    """
+    
+    KINDS = ('seller', 'item')
+    
+    def __init__(self, database_manager: Optional[DatabaseManager] = None,
+                 max_seller_substitutions: int = 1,
+                 max_item_substitutions: int = 2,
+                 min_name_length: int = 5,
+                 cache_size: int = 4096,
+                 learn_aliases: bool = False):
+        """
+        Initialize name canonicalizer.
+        
+        Args:
+            database_manager: Database with known names and the alias table (None keeps everything in memory)
+            max_seller_substitutions: Most confusable substitutions between a seller variant and its canonical name
+            max_item_substitutions: Most confusable substitutions between an item variant and its canonical name
+            min_name_length: Names shorter than this are never matched fuzzily
+            cache_size: Resolved variants kept in the LRU cache
+            learn_aliases: Whether matched variants are saved to the alias table
+        """
+        self.db = database_manager
+        self.max_substitutions = {'seller': max_seller_substitutions, 'item': max_item_substitutions}
+        self.min_name_length = min_name_length
+        self.cache_size = cache_size
+        self.learn_aliases = learn_aliases
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        self._canonical: Dict[str, Set[str]] = {kind: set() for kind in self.KINDS}
+        self._skeletons: Dict[str, Dict[Tuple[str, ...], Set[str]]] = {kind: {} for kind in self.KINDS}
+        self._cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        
+        # Statistics
+        self._stats = {
+            'names_resolved': 0,
+            'exact_hits': 0,
+            'cache_hits': 0,
+            'alias_hits': 0,
+            'fuzzy_matches': 0,
+            'new_names': 0,
+            'kept_distinct': 0,
+            'items_renamed': 0
+        }
+        
+        if self.db:
+            self._load_known_names()
+    
+    def _load_known_names(self) -> None:
+        """Index names already stored in the database."""
+        try:
+            known = self.db.get_known_names()
+        except Exception as e:
+            raise NameCanonicalizerError(f"Failed to load known names: {e}")
+        
+        for kind in self.KINDS:
+            for name in known.get(kind, ()):
+                self._add_canonical(kind, name)
+        
+        self.logger.info(
+            f"Indexed {len(self._canonical['seller'])} seller and {len(self._canonical['item'])} item names"
+        )
+    
+    def _add_canonical(self, kind: str, name: str) -> None:
+        """Register a canonical name in the indexes."""
+        if name in self._canonical[kind]:
+            return
+        self._canonical[kind].add(name)
+        self._skeletons[kind].setdefault(ocr_skeleton(name), set()).add(name)
+    
+    def _cache_put(self, kind: str, name: str, canonical: str) -> None:
+        """Remember a resolved variant, evicting the least recently used."""
+        self._cache[(kind, name)] = canonical
+        self._cache.move_to_end((kind, name))
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+    
+    def _find_match(self, kind: str, name: str) -> Optional[str]:
+        """
+        Find the known name with the same OCR skeleton and fewest confusable substitutions.
+        
+        Returns:
+            Canonical name, or None if no known name is an OCR variant of name
+        """
+        if len(name) < self.min_name_length:
+            return None
+        
+        matches = []
+        for candidate in self._skeletons[kind].get(ocr_skeleton(name), ()):
+            substitutions = confusable_substitutions(name, candidate)
+            if substitutions is not None and 0 < substitutions <= self.max_substitutions[kind]:
+                matches.append((substitutions, candidate))
+        
+        return min(matches)[1] if matches else None
+    
+    def _resolve(self, kind: str, name: str) -> Tuple[str, bool]:
+        """
+        Resolve a name without registering new canonical names.
+        
+        Returns:
+            Tuple of (canonical name, whether it was found by fuzzy matching)
+        """
+        self._stats['names_resolved'] += 1
+        
+        if name in self._canonical[kind]:
+            self._stats['exact_hits'] += 1
+            return name, False
+        
+        cached = self._cache.get((kind, name))
+        if cached is not None:
+            self._cache.move_to_end((kind, name))
+            self._stats['cache_hits'] += 1
+            return cached, False
+        
+        if self.db:
+            alias = self.db.get_name_alias(kind, name)
+            if alias is not None:
+                self._add_canonical(kind, alias)
+                self._cache_put(kind, name, alias)
+                self._stats['alias_hits'] += 1
+                return alias, False
+        
+        match = self._find_match(kind, name)
+        if match is not None:
+            return match, True
+        return name, False
+    
+    def _accept(self, kind: str, name: str, canonical: str, fuzzy: bool,
+                new_aliases: List[Tuple[str, str, str]]) -> str:
+        """Register the outcome of a resolution and return the name to use."""
+        if canonical == name:
+            if name not in self._canonical[kind]:
+                self._add_canonical(kind, name)
+                self._stats['new_names'] += 1
+        elif fuzzy:
+            self._cache_put(kind, name, canonical)
+            self._stats['fuzzy_matches'] += 1
+            if self.learn_aliases:
+                new_aliases.append((kind, name, canonical))
+        return canonical
+    
+    def _keep_distinct(self, kind: str, name: str, dropped_aliases: List[Tuple[str, str]]) -> Tuple[str, bool]:
+        """Forget a variant mapping contradicted by the current batch."""
+        self._stats['kept_distinct'] += 1
+        if self._cache.pop((kind, name), None) is not None:
+            dropped_aliases.append((kind, name))
+        elif self.db and self.db.get_name_alias(kind, name) is not None:
+            dropped_aliases.append((kind, name))
+        return name, False
+    
+    def canonicalize(self, kind: str, name: str) -> str:
+        """
+        Get canonical name of a seller or item name.
+        
+        Args:
+            kind: 'seller' or 'item'
+            name: Name as recognized by OCR
+        
+        Returns:
+            Canonical name
+        
+        Raises:
+            NameCanonicalizerError: If kind is unknown
+        """
+        if kind not in self.KINDS:
+            raise NameCanonicalizerError(f"Unknown name kind: {kind}")
+        
+        new_aliases = []
+        with self._lock:
+            canonical, fuzzy = self._resolve(kind, name)
+            canonical = self._accept(kind, name, canonical, fuzzy, new_aliases)
+        self._save_aliases(new_aliases)
+        return canonical
+    
+    def canonicalize_items(self, items: List[ItemData]) -> int:
+        """
+        Replace seller and item names of parsed items with canonical names in place.
+        A variant is kept as a distinct name when its match appears verbatim with
+        the same partner in the same batch, since one screenshot never lists a
+        seller-item pair twice.
+        
+        Args:
+            items: Parsed items of one OCR result
+        
+        Returns:
+            Number of items whose seller or item name changed
+        """
+        raw_pairs = {(item.seller_name, item.item_name) for item in items}
+        new_aliases = []
+        dropped_aliases = []
+        renamed = 0
+        
+        with self._lock:
+            for item in items:
+                seller, seller_fuzzy = self._resolve('seller', item.seller_name)
+                if seller != item.seller_name and (seller, item.item_name) in raw_pairs:
+                    seller, seller_fuzzy = self._keep_distinct('seller', item.seller_name, dropped_aliases)
+                seller = self._accept('seller', item.seller_name, seller, seller_fuzzy, new_aliases)
+                
+                item_name, item_fuzzy = self._resolve('item', item.item_name)
+                if item_name != item.item_name and (item.seller_name, item_name) in raw_pairs:
+                    item_name, item_fuzzy = self._keep_distinct('item', item.item_name, dropped_aliases)
+                item_name = self._accept('item', item.item_name, item_name, item_fuzzy, new_aliases)
+                
+                if seller != item.seller_name or item_name != item.item_name:
+                    item.seller_name = seller
+                    item.item_name = item_name
+                    renamed += 1
+            
+            self._stats['items_renamed'] += renamed
+        
+        self._save_aliases(new_aliases)
+        if dropped_aliases and self.db:
+            self.db.delete_name_aliases(dropped_aliases)
+        if renamed:
+            self.logger.debug(f"Canonicalized names of {renamed} of {len(items)} items")
+        return renamed
+    
+    def _save_aliases(self, aliases: List[Tuple[str, str, str]]) -> None:
+        """Persist newly learned aliases."""
+        if aliases and self.db:
+            self.db.save_name_aliases(aliases)
+            for kind, alias, canonical in aliases:
+                self.logger.info(f"Learned {kind} alias '{alias}' -> '{canonical}'")
+    
+    def get_canonicalizer_statistics(self) -> Dict[str, int]:
+        """
+        Get name canonicalization statistics.
+        
+        Returns:
+            Dictionary with resolution counts and index sizes
+        """
+        with self._lock:
+            stats = self._stats.copy()
+            stats['known_sellers'] = len(self._canonical['seller'])
+            stats['known_items'] = len(self._canonical['item'])
+            stats['cached_variants'] = len(self._cache)
+        return stats
\ No newline at end of file
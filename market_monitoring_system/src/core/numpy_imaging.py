@@ -0,0 +1,211 @@
+"""
+NumPy-backed image merging and OCR preprocessing for market monitoring system.
+Composes screenshots into one preallocated array and enhances it band by band in place.
+"""
+
+from typing import Iterable, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError as e:
+    NUMPY_AVAILABLE = False
+    NUMPY_ERROR = str(e)
+
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError as e:
+    PILLOW_AVAILABLE = False
+    PILLOW_ERROR = str(e)
+
+
+class NumpyImagingError(Exception):
+    """Exception raised for NumPy imaging errors."""
+    pass
+
+
+def _require_dependencies() -> None:
+    """Raise if NumPy or Pillow is missing."""
+    if not NUMPY_AVAILABLE:
+        raise NumpyImagingError(f"NumPy library not available: {NUMPY_ERROR}")
+    if not PILLOW_AVAILABLE:
+        raise NumpyImagingError(f"Pillow library not available: {PILLOW_ERROR}")
+
+
+def compose_vertical(images: Iterable['Image.Image'], final_width: int,
+                     heights: List[int], grayscale: bool = True,
+                     output: Optional['np.ndarray'] = None) -> 'np.ndarray':
+    """
+    Write images top to bottom into a single preallocated array.
+    
+    Each source is resized only when its size differs from its slot and
+    converted straight to the output mode, so no full-size intermediate is made.
+    
+    Args:
+        images: Source images in order (may be a lazy generator); None leaves its slot blank
+        final_width: Output width
+        heights: Target height per source
+        grayscale: Produce single channel 'L' data instead of RGB
+        output: Optional white-filled array to write into instead of allocating one
+    
+    Returns:
+        uint8 array of shape (sum(heights), final_width[, 3])
+    """
+    _require_dependencies()
+    
+    mode = 'L' if grayscale else 'RGB'
+    if output is None:
+        shape = (sum(heights), final_width) if grayscale else (sum(heights), final_width, 3)
+        output = np.full(shape, 255, dtype=np.uint8)
+    
+    current_y = 0
+    for img, target_height in zip(images, heights):
+        if img is None or target_height <= 0:
+            current_y += max(target_height, 0)
+            continue
+        
+        converted = img if img.mode == mode else img.convert(mode)
+        if converted.size != (final_width, target_height):
+            resized = converted.resize((final_width, target_height), Image.LANCZOS)
+            if converted is not img:
+                converted.close()
+            converted = resized
+        
+        output[current_y:current_y + target_height] = np.asarray(converted)
+        if converted is not img:
+            converted.close()
+        current_y += target_height
+    
+    return output
+
+
+def _neighbour_views(padded: 'np.ndarray') -> List['np.ndarray']:
+    """Nine shifted 3x3 neighbourhood views of a padded 2-D array."""
+    height, width = padded.shape[0] - 2, padded.shape[1] - 2
+    return [padded[dy:dy + height, dx:dx + width] for dy in range(3) for dx in range(3)]
+
+
+def contrast_mean(gray: 'np.ndarray') -> int:
+    """Mean level the contrast enhancement pivots around, rounded like PIL."""
+    return int(gray.mean() + 0.5)
+
+
+def _contrast_lut(mean: int, contrast: float) -> 'np.ndarray':
+    """Lookup table applying contrast around the mean level."""
+    levels = np.arange(256, dtype=np.float32)
+    return np.clip(np.rint(mean + contrast * (levels - mean)), 0, 255).astype(np.uint8)
+
+
+def _enhance_block(block: 'np.ndarray', pad_top: int, pad_bottom: int,
+                   sharpness: float, denoise: bool, halo: int) -> 'np.ndarray':
+    """
+    Sharpen and denoise contrast-adjusted rows.
+    
+    Args:
+        block: Rows to produce plus the available halo rows above and below
+        pad_top: Missing halo rows above (image edge), filled by edge replication
+        pad_bottom: Missing halo rows below
+        sharpness: Sharpness enhancement factor
+        denoise: Whether to apply the median filter
+        halo: Halo rows required on each side
+    
+    Returns:
+        Enhanced rows without halo
+    """
+    padded = np.pad(block, ((pad_top, pad_bottom), (halo, halo)), mode='edge').astype(np.int16)
+    
+    # Sharpness: blend with the SMOOTH kernel (all ones, centre 5, divisor 13)
+    views = _neighbour_views(padded)
+    centre = views[4]
+    smooth = (sum(view.astype(np.int32) for view in views) + 4 * centre + 6) // 13
+    sharpened = np.clip(np.rint(smooth + sharpness * (centre - smooth)), 0, 255).astype(np.int16)
+    
+    if denoise:
+        return np.partition(np.stack(_neighbour_views(sharpened)), 4, axis=0)[4]
+    return sharpened
+
+
+def enhance_for_ocr(gray: 'np.ndarray', contrast: float = 1.2, sharpness: float = 1.1,
+                    denoise: bool = True, band_rows: int = 256) -> 'np.ndarray':
+    """
+    Apply contrast, sharpening and 3x3 median denoising to a grayscale array in place.
+    
+    Follows the PIL pipeline of ImageProcessor._optimize_for_ocr (Contrast,
+    Sharpness with the SMOOTH kernel, MedianFilter(3)) up to rounding, but processes
+    the image in horizontal bands so temporaries are bounded by band size.
+    
+    Args:
+        gray: 2-D uint8 array, modified in place
+        contrast: Contrast enhancement factor
+        sharpness: Sharpness enhancement factor
+        denoise: Whether to apply the median filter
+        band_rows: Rows processed per band
+    
+    Returns:
+        The same array
+    """
+    _require_dependencies()
+    
+    height = gray.shape[0]
+    if height == 0 or gray.shape[1] == 0:
+        return gray
+    
+    # Contrast is a point operation around the mean: apply it as a lookup table
+    lut = _contrast_lut(contrast_mean(gray), contrast)
+    
+    halo = 2 if denoise else 1
+    band_rows = max(band_rows, halo)
+    saved_rows = None  # Contrast-adjusted rows above the current band, before overwrite
+    
+    for top in range(0, height, band_rows):
+        bottom = min(top + band_rows, height)
+        read_bottom = min(height, bottom + halo)
+        
+        current = lut[gray[top:read_bottom]]
+        block = current if saved_rows is None else np.concatenate([saved_rows, current])
+        pad_top = halo - (0 if saved_rows is None else len(saved_rows))
+        pad_bottom = halo - (read_bottom - bottom)
+        saved_rows = current[max(0, bottom - top - halo):bottom - top].copy()
+        
+        gray[top:bottom] = _enhance_block(block, pad_top, pad_bottom, sharpness, denoise, halo)
+    
+    return gray
+
+
+def enhance_rows(source: 'np.ndarray', output: 'np.ndarray', top: int, bottom: int, mean: int,
+                 contrast: float = 1.2, sharpness: float = 1.1, denoise: bool = True,
+                 band_rows: int = 256) -> None:
+    """
+    Enhance rows [top, bottom) of a grayscale array into another array.
+    
+    The source is only read, so disjoint row ranges of one image can be
+    enhanced concurrently and give the same result as enhance_for_ocr.
+    
+    Args:
+        source: 2-D uint8 array with the composed image
+        output: Array of the same shape receiving the enhanced rows
+        top: First row to enhance
+        bottom: Row after the last row to enhance
+        mean: Whole image mean from contrast_mean
+        contrast: Contrast enhancement factor
+        sharpness: Sharpness enhancement factor
+        denoise: Whether to apply the median filter
+        band_rows: Rows processed per band
+    """
+    _require_dependencies()
+    
+    height = source.shape[0]
+    lut = _contrast_lut(mean, contrast)
+    halo = 2 if denoise else 1
+    band_rows = max(band_rows, 1)
+    
+    for band_top in range(top, bottom, band_rows):
+        band_bottom = min(band_top + band_rows, bottom)
+        read_top = max(0, band_top - halo)
+        read_bottom = min(height, band_bottom + halo)
+        
+        block = lut[source[read_top:read_bottom]]
+        output[band_top:band_bottom] = _enhance_block(
+            block, halo - (band_top - read_top), halo - (read_bottom - band_bottom), sharpness, denoise, halo
+        )
\ No newline at end of file
@@ -0,0 +1,586 @@
+"""
+Pluggable OCR backends for market monitoring system.
+Puts the Yandex cloud client and a local Tesseract engine behind one interface with latency-aware routing.
+"""
+
+import asyncio
+import io
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Union
+
+try:
+    import pytesseract
+    PYTESSERACT_AVAILABLE = True
+except ImportError as e:
+    PYTESSERACT_AVAILABLE = False
+    PYTESSERACT_ERROR = str(e)
+
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError as e:
+    PILLOW_AVAILABLE = False
+    PILLOW_ERROR = str(e)
+
+from .simple_ocr_client import OCRRateLimitError
+
+
+class OCRBackendError(Exception):
+    """Exception raised for OCR backend errors."""
+    pass
+
+
+class OCRBackend(ABC):
+    """
+    Base class for OCR engines.
+    A backend recognizes an image file or encoded bytes and returns text, or
+    a dictionary with 'text' and 'lines' when layout is requested.
+    """
+    
+    name = "base"
+    
+    @property
+    def async_available(self) -> bool:
+        """Whether recognize_async runs natively on the event loop."""
+        return False
+    
+    @abstractmethod
+    def recognize(self, image: Union[Path, bytes], language_codes: Optional[List[str]] = None,
+                  layout: bool = False) -> Optional[Any]:
+        """
+        Recognize an image.
+        
+        Args:
+            image: Image file path or encoded image bytes
+            language_codes: Optional language codes
+            layout: Whether to return line positions together with text
+        
+        Returns:
+            Extracted text, layout dictionary when layout is set, or None if failed
+        
+        Raises:
+            OCRRateLimitError: If the engine rejected the request for rate limiting
+        """
+    
+    async def recognize_async(self, image: Union[Path, bytes], language_codes: Optional[List[str]] = None,
+                              layout: bool = False) -> Optional[Any]:
+        """Recognize an image from the event loop, in a worker thread unless overridden."""
+        return await asyncio.to_thread(self.recognize, image, language_codes, layout)
+    
+    def get_cached_result(self, image: Union[Path, bytes], language_codes: Optional[List[str]] = None,
+                          layout: bool = False) -> Optional[Any]:
+        """Previously recognized result of an image, None if the backend keeps no cache."""
+        return None
+    
+    async def open_async_session(self) -> None:
+        """Open async resources on the running event loop."""
+        pass
+    
+    async def close_async_session(self) -> None:
+        """Close async resources."""
+        pass
+    
+    def close(self) -> None:
+        """Release backend resources."""
+        pass
+
+
+class YandexOCRBackend(OCRBackend):
+    """Yandex cloud OCR through the YandexOCRClient adapter."""
+    
+    name = "yandex"
+    
+    def __init__(self, client):
+        """
+        Initialize Yandex OCR backend.
+        
+        Args:
+            client: YandexOCRClient instance
+        """
+        self.client = client
+    
+    @property
+    def async_available(self) -> bool:
+        """Whether the adapter has its asyncio client."""
+        return self.client.async_available
+    
+    def recognize(self, image: Union[Path, bytes], language_codes: Optional[List[str]] = None,
+                  layout: bool = False) -> Optional[Any]:
+        """Recognize an image with the cloud API; files are never deleted here."""
+        if isinstance(image, bytes):
+            return self.client.process_image_bytes(image_data=image, language_codes=language_codes, layout=layout)
+        if layout:
+            return self.client.process_image_with_layout(
+                image_path=image, cleanup_image=False, language_codes=language_codes
+            )
+        return self.client.process_image_full_pipeline(
+            image_path=image, cleanup_image=False, language_codes=language_codes
+        )
+    
+    def get_cached_result(self, image: Union[Path, bytes], language_codes: Optional[List[str]] = None,
+                          layout: bool = False) -> Optional[Any]:
+        """Look up the adapter's result cache."""
+        if isinstance(image, bytes):
+            return self.client.get_cached_result(image_data=image, language_codes=language_codes, layout=layout)
+        return self.client.get_cached_result(image_path=image, language_codes=language_codes, layout=layout)
+    
+    async def recognize_async(self, image: Union[Path, bytes], language_codes: Optional[List[str]] = None,
+                              layout: bool = False) -> Optional[Any]:
+        """Recognize an image with the asyncio client when available."""
+        if not self.client.async_available:
+            return await super().recognize_async(image, language_codes, layout)
+        
+        if isinstance(image, bytes):
+            return await self.client.process_image_async(
+                image_data=image, cleanup_image=False, language_codes=language_codes, layout=layout
+            )
+        return await self.client.process_image_async(
+            image_path=image, cleanup_image=False, language_codes=language_codes, layout=layout
+        )
+    
+    async def open_async_session(self) -> None:
+        """Open the adapter's async session."""
+        await self.client.open_async_session()
+    
+    async def close_async_session(self) -> None:
+        """Close the adapter's async session."""
+        await self.client.close_async_session()
+    
+    def close(self) -> None:
+        """Close the adapter."""
+        self.client.close()
+
+
+class TesseractOCRBackend(OCRBackend):
+    """
+    Local Tesseract engine through pytesseract.
+    Small captures are upscaled before recognition, and line positions are
+    mapped back to the original image.
+    """
+    
+    name = "tesseract"
+    
+    LANGUAGES = {'ru': 'rus', 'en': 'eng'}
+    
+    def __init__(self, tesseract_cmd: Optional[str] = None, oem: int = 3, psm: int = 6,
+                 default_language: str = 'rus+eng', min_height: int = 32, max_upscale: float = 3.0):
+        """
+        Initialize Tesseract OCR backend.
+        
+        Args:
+            tesseract_cmd: Path of the tesseract executable (None = search PATH)
+            oem: Tesseract OCR engine mode
+            psm: Tesseract page segmentation mode
+            default_language: Tesseract languages when none are requested
+            min_height: Images lower than this are upscaled
+            max_upscale: Largest upscale factor
+        
+        Raises:
+            OCRBackendError: If pytesseract, Pillow or the tesseract executable is missing
+        """
+        if not PYTESSERACT_AVAILABLE:
+            raise OCRBackendError(f"pytesseract library not available: {PYTESSERACT_ERROR}")
+        if not PILLOW_AVAILABLE:
+            raise OCRBackendError(f"Pillow library not available: {PILLOW_ERROR}")
+        
+        if tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+        
+        self.config = f'--oem {oem} --psm {psm} -c preserve_interword_spaces=1'
+        self.default_language = default_language
+        self.min_height = min_height
+        self.max_upscale = max(1.0, max_upscale)
+        self.logger = logging.getLogger(__name__)
+        
+        try:
+            version = pytesseract.get_tesseract_version()
+        except Exception as e:
+            raise OCRBackendError(f"Tesseract executable not available: {e}")
+        
+        self.logger.info(f"Tesseract OCR backend initialized (version {version})")
+    
+    def _language(self, language_codes: Optional[List[str]]) -> str:
+        """Tesseract language string for API language codes."""
+        if not language_codes:
+            return self.default_language
+        languages = [self.LANGUAGES[code] for code in language_codes if code in self.LANGUAGES]
+        return '+'.join(languages) if languages else self.default_language
+    
+    def _load(self, image: Union[Path, bytes]) -> 'Image.Image':
+        """Decode image as grayscale."""
+        source = io.BytesIO(image) if isinstance(image, bytes) else image
+        with Image.open(source) as opened:
+            return opened.convert('L')
+    
+    def recognize(self, image: Union[Path, bytes], language_codes: Optional[List[str]] = None,
+                  layout: bool = False) -> Optional[Any]:
+        """Recognize an image with the local engine."""
+        try:
+            gray = self._load(image)
+        except Exception as e:
+            self.logger.error(f"Tesseract cannot read image: {e}")
+            return None
+        
+        scale = 1.0
+        if 0 < gray.height < self.min_height:
+            scale = min(self.max_upscale, self.min_height / gray.height)
+            gray = gray.resize((round(gray.width * scale), round(gray.height * scale)), Image.Resampling.LANCZOS)
+        
+        language = self._language(language_codes)
+        try:
+            if not layout:
+                return pytesseract.image_to_string(gray, lang=language, config=self.config).strip() or None
+            
+            data = pytesseract.image_to_data(gray, lang=language, config=self.config,
+                                             output_type=pytesseract.Output.DICT)
+        except Exception as e:
+            self.logger.error(f"Tesseract recognition failed: {e}")
+            return None
+        finally:
+            gray.close()
+        
+        return self._layout_from_data(data, scale)
+    
+    def _layout_from_data(self, data: Dict[str, List[Any]], scale: float) -> Dict[str, Any]:
+        """Group recognized words into lines with positions in original image pixels."""
+        lines: Dict[tuple, Dict[str, Any]] = {}
+        for index, word in enumerate(data['text']):
+            if not word.strip() or float(data['conf'][index]) < 0:
+                continue
+            
+            key = (data['block_num'][index], data['par_num'][index], data['line_num'][index])
+            box = {
+                'text': word,
+                'left': round(data['left'][index] / scale),
+                'top': round(data['top'][index] / scale),
+                'right': round((data['left'][index] + data['width'][index]) / scale),
+                'bottom': round((data['top'][index] + data['height'][index]) / scale)
+            }
+            line = lines.get(key)
+            if line is None:
+                lines[key] = dict(box, block=data['block_num'][index], words=[box])
+            else:
+                line['words'].append(box)
+                for edge, pick in (('left', min), ('top', min), ('right', max), ('bottom', max)):
+                    line[edge] = pick(line[edge], box[edge])
+        
+        result_lines = list(lines.values())
+        for line in result_lines:
+            line['text'] = ' '.join(word['text'] for word in line['words'])
+        return {'text': '\n'.join(line['text'] for line in result_lines), 'lines': result_lines}
+
+
+@dataclass
+class BackendHealth:
+    """Observed request health of one backend."""
+    latency_ewma: Optional[float] = None  # Seconds per successful request
+    error_ewma: float = 0.0  # Smoothed share of failed requests
+    requests: int = 0
+    failures: int = 0
+    rate_limited: int = 0
+    rate_limited_until: float = 0.0  # Monotonic time the API asked to be left alone until
+    last_request: float = 0.0  # Monotonic time of the last request
+
+
+class OCRBackendRouter:
+    """
+    Routes OCR requests between a cloud and a local backend.
+    Each backend's latency and error rate are tracked as EWMAs. Small images,
+    where the round trip dominates, go to the local engine; so does
+    everything while the cloud is rate limited, failing or slow. An avoided
+    cloud gets one probe request per probe interval so it can recover.
+    A failed request is retried once on the other backend.
+    Offers the request interface OCRQueue expects of its OCR client.
+    """
+    
+    def __init__(self, cloud: OCRBackend, local: Optional[OCRBackend] = None,
+                 small_image_bytes: int = 16384,
+                 max_cloud_latency: float = 3.0,
+                 max_cloud_error_rate: float = 0.5,
+                 rate_limit_cooldown: float = 30.0,
+                 probe_interval: float = 15.0,
+                 ewma_alpha: float = 0.2):
+        """
+        Initialize OCR backend router.
+        
+        Args:
+            cloud: Remote backend used by default
+            local: Optional local backend
+            small_image_bytes: Images up to this size go to the local backend (0 = never)
+            max_cloud_latency: Cloud latency EWMA in seconds above which the local backend is used
+            max_cloud_error_rate: Cloud error EWMA above which the local backend is used
+            rate_limit_cooldown: Seconds to avoid the cloud after a rate limit without Retry-After
+            probe_interval: Seconds between probe requests to an avoided cloud
+            ewma_alpha: Weight of the newest request in the EWMAs
+        """
+        self.cloud = cloud
+        self.local = local
+        self.small_image_bytes = small_image_bytes
+        self.max_cloud_latency = max_cloud_latency
+        self.max_cloud_error_rate = max_cloud_error_rate
+        self.rate_limit_cooldown = rate_limit_cooldown
+        self.probe_interval = probe_interval
+        self.ewma_alpha = min(1.0, max(0.01, ewma_alpha))
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        self._health: Dict[str, BackendHealth] = {cloud.name: BackendHealth()}
+        if local:
+            self._health[local.name] = BackendHealth()
+        
+        # Statistics
+        self._stats = {
+            'routed': {},  # Requests per routing reason
+            'fallbacks': 0,
+            'cloud_probes': 0
+        }
+    
+    @property
+    def async_available(self) -> bool:
+        """Whether the cloud backend runs requests natively on an event loop."""
+        return self.cloud.async_available
+    
+    def choose_backend(self, payload_size: int) -> OCRBackend:
+        """
+        Select the backend for a request.
+        
+        Args:
+            payload_size: Image size in bytes
+        
+        Returns:
+            Backend to send the request to first
+        """
+        reason = self._route(payload_size)
+        with self._lock:
+            self._stats['routed'][reason] = self._stats['routed'].get(reason, 0) + 1
+        return self.cloud if reason in ('cloud', 'probe') else self.local
+    
+    def _route(self, payload_size: int) -> str:
+        """Routing reason of a request."""
+        if self.local is None:
+            return 'cloud'
+        if 0 < payload_size <= self.small_image_bytes:
+            return 'small_image'
+        
+        now = time.monotonic()
+        with self._lock:
+            health = self._health[self.cloud.name]
+            if now < health.rate_limited_until:
+                return 'rate_limited'
+            
+            if health.error_ewma > self.max_cloud_error_rate:
+                reason = 'cloud_errors'
+            elif health.latency_ewma is not None and health.latency_ewma > self.max_cloud_latency:
+                reason = 'cloud_slow'
+            else:
+                return 'cloud'
+            
+            if now - health.last_request >= self.probe_interval:
+                # Claim the probe so concurrent workers do not all go
+                health.last_request = now
+                self._stats['cloud_probes'] += 1
+                return 'probe'
+            return reason
+    
+    def _record(self, backend: OCRBackend, elapsed: float, success: bool,
+                rate_limit: Optional[OCRRateLimitError] = None) -> None:
+        """Fold a request outcome into the backend's EWMAs."""
+        alpha = self.ewma_alpha
+        with self._lock:
+            health = self._health[backend.name]
+            health.requests += 1
+            health.last_request = time.monotonic()
+            health.error_ewma = (1 - alpha) * health.error_ewma + alpha * (0.0 if success else 1.0)
+            if success:
+                health.latency_ewma = elapsed if health.latency_ewma is None else \
+                    (1 - alpha) * health.latency_ewma + alpha * elapsed
+            else:
+                health.failures += 1
+            if rate_limit is not None:
+                health.rate_limited += 1
+                health.rate_limited_until = health.last_request + (rate_limit.retry_after or self.rate_limit_cooldown)
+    
+    def _candidates(self, image: Union[Path, bytes]) -> List[OCRBackend]:
+        """Routed backend followed by the fallback backend, if any."""
+        backend = self.choose_backend(self._payload_size(image))
+        other = self.local if backend is self.cloud else self.cloud
+        return [backend, other] if other is not None else [backend]
+    
+    @staticmethod
+    def _payload_size(image: Union[Path, bytes]) -> int:
+        """Size of an image in bytes, 0 if unknown."""
+        if isinstance(image, bytes):
+            return len(image)
+        try:
+            return image.stat().st_size
+        except OSError:
+            return 0
+    
+    def _record_error(self, backend: OCRBackend, start_time: float,
+                      error: Exception) -> Optional[OCRRateLimitError]:
+        """Record a raised request error; returns it if it was a rate limit."""
+        elapsed = time.perf_counter() - start_time
+        if isinstance(error, OCRRateLimitError):
+            self.logger.warning(f"OCR backend {backend.name} rate limited: {error}")
+            self._record(backend, elapsed, False, rate_limit=error)
+            return error
+        
+        self.logger.error(f"OCR backend {backend.name} failed: {error}")
+        self._record(backend, elapsed, False)
+        return None
+    
+    def _count_fallback(self, backend: OCRBackend) -> None:
+        """Count a request retried on the other backend."""
+        self.logger.info(f"Retrying OCR request on {backend.name} backend")
+        with self._lock:
+            self._stats['fallbacks'] += 1
+    
+    def recognize(self, image: Union[Path, bytes], language_codes: Optional[List[str]] = None,
+                  layout: bool = False) -> Optional[Any]:
+        """
+        Recognize an image on the routed backend, falling back to the other once.
+        
+        Raises:
+            OCRRateLimitError: If the cloud was rate limited and the other backend produced no result
+        """
+        rate_limit_error = None
+        for attempt, backend in enumerate(self._candidates(image)):
+            if attempt:
+                self._count_fallback(backend)
+            start_time = time.perf_counter()
+            try:
+                result = backend.recognize(image, language_codes, layout)
+            except Exception as e:
+                rate_limit_error = self._record_error(backend, start_time, e) or rate_limit_error
+                continue
+            
+            self._record(backend, time.perf_counter() - start_time, bool(result))
+            if result:
+                return result
+        
+        if rate_limit_error:
+            raise rate_limit_error
+        return None
+    
+    async def recognize_async(self, image: Union[Path, bytes], language_codes: Optional[List[str]] = None,
+                              layout: bool = False) -> Optional[Any]:
+        """Recognize an image from the event loop with the same routing and fallback."""
+        rate_limit_error = None
+        for attempt, backend in enumerate(self._candidates(image)):
+            if attempt:
+                self._count_fallback(backend)
+            start_time = time.perf_counter()
+            try:
+                result = await backend.recognize_async(image, language_codes, layout)
+            except Exception as e:
+                rate_limit_error = self._record_error(backend, start_time, e) or rate_limit_error
+                continue
+            
+            self._record(backend, time.perf_counter() - start_time, bool(result))
+            if result:
+                return result
+        
+        if rate_limit_error:
+            raise rate_limit_error
+        return None
+    
+    # OCR client interface used by OCRQueue
+    
+    def _cleanup(self, image_path: Path, result: Optional[Any], cleanup_image: bool) -> None:
+        """Delete an image file after successful recognition."""
+        if result and cleanup_image:
+            try:
+                image_path.unlink(missing_ok=True)
+            except OSError as e:
+                self.logger.warning(f"Failed to cleanup image {image_path}: {e}")
+    
+    def process_image_full_pipeline(self, image_path: Path, cleanup_image: bool = True,
+                                    language_codes: Optional[List[str]] = None) -> Optional[str]:
+        """Recognize an image file and return its text."""
+        result = self.recognize(image_path, language_codes)
+        self._cleanup(image_path, result, cleanup_image)
+        return result
+    
+    def process_image_with_layout(self, image_path: Path, cleanup_image: bool = True,
+                                  language_codes: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Recognize an image file and return text with line positions."""
+        result = self.recognize(image_path, language_codes, layout=True)
+        self._cleanup(image_path, result, cleanup_image)
+        return result
+    
+    def process_image_bytes(self, image_data: bytes, language_codes: Optional[List[str]] = None,
+                            layout: bool = False) -> Optional[Any]:
+        """Recognize an in-memory encoded image."""
+        return self.recognize(image_data, language_codes, layout)
+    
+    def get_cached_result(self, image_path: Optional[Path] = None, image_data: Optional[bytes] = None,
+                          language_codes: Optional[List[str]] = None, layout: bool = False) -> Optional[Any]:
+        """Look up the cloud backend's result cache without routing a request."""
+        image = image_data if image_data is not None else image_path
+        return self.cloud.get_cached_result(image, language_codes, layout)
+    
+    async def process_image_async(self, image_path: Optional[Path] = None,
+                                  image_data: Optional[bytes] = None,
+                                  cleanup_image: bool = True,
+                                  language_codes: Optional[List[str]] = None,
+                                  layout: bool = False) -> Optional[Any]:
+        """Recognize an image file or in-memory image from the event loop."""
+        if image_data is not None:
+            return await self.recognize_async(image_data, language_codes, layout)
+        
+        result = await self.recognize_async(image_path, language_codes, layout)
+        self._cleanup(image_path, result, cleanup_image)
+        return result
+    
+    async def open_async_session(self) -> None:
+        """Open async sessions of the backends."""
+        await self.cloud.open_async_session()
+        if self.local:
+            await self.local.open_async_session()
+    
+    async def close_async_session(self) -> None:
+        """Close async sessions of the backends."""
+        await self.cloud.close_async_session()
+        if self.local:
+            await self.local.close_async_session()
+    
+    def get_routing_statistics(self) -> Dict[str, Any]:
+        """
+        Get per-backend health and routing statistics.
+        
+        Returns:
+            Dictionary with routing statistics
+        """
+        now = time.monotonic()
+        with self._lock:
+            stats = {
+                'routed': dict(self._stats['routed']),
+                'fallbacks': self._stats['fallbacks'],
+                'cloud_probes': self._stats['cloud_probes'],
+                'backends': {}
+            }
+            for name, health in self._health.items():
+                stats['backends'][name] = {
+                    'requests': health.requests,
+                    'failures': health.failures,
+                    'rate_limited': health.rate_limited,
+                    'latency_ewma': health.latency_ewma,
+                    'error_ewma': health.error_ewma,
+                    'rate_limited_for': max(0.0, health.rate_limited_until - now)
+                }
+        return stats
+    
+    def close(self) -> None:
+        """Close all backends."""
+        for backend in (self.cloud, self.local):
+            if backend is None:
+                continue
+            try:
+                backend.close()
+            except Exception as e:
+                self.logger.error(f"Error closing OCR backend {backend.name}: {e}")
\ No newline at end of file
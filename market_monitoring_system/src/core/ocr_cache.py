@@ -0,0 +1,355 @@
+"""
+OCR result cache for market monitoring system.
+Skips OCR API calls for merged images identical or visually identical to recent scans.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Union
+
+from .image_hashing import compute_image_hashes, hamming_distance, ImageHashingError
+
+
+# Variant suffix of keys whose result is a layout dictionary instead of text
+LAYOUT_VARIANT = "|layout"
+
+
+@dataclass(frozen=True)
+class OCRCacheKey:
+    """Cache key combining exact and perceptual image hashes."""
+    content_hash: str
+    perceptual_hash: int
+    width: int
+    height: int
+    variant: str = ""  # Request options affecting OCR output, e.g. language codes
+    
+    @property
+    def exact_key(self) -> str:
+        """Key for exact content lookups."""
+        return f"{self.content_hash}:{self.variant}"
+    
+    @property
+    def layout(self) -> bool:
+        """Whether the cached result is a layout dictionary."""
+        return self.variant.endswith(LAYOUT_VARIANT)
+
+
+@dataclass
+class OCRCacheEntry:
+    """Cached OCR result."""
+    key: OCRCacheKey
+    text: str  # Recognized text, or JSON of the layout dictionary for layout keys
+    created_at: float
+    last_access: float
+    hit_count: int = 0
+
+
+class OCRCacheError(Exception):
+    """Exception raised for OCR cache errors."""
+    pass
+
+
+class OCRResultCache:
+    """
+    Two-level OCR result cache with TTL and LRU eviction.
+    Lookups use the exact SHA-256 content hash. Perceptual dHash matching
+    (same dimensions and request variant) is opt-in: the dHash does not see
+    a few changed price digits, so a near match can return stale text.
+    Entries are mirrored to SQLite so the cache survives restarts.
+    """
+    
+    SCHEMA_SQL = '''
+        CREATE TABLE IF NOT EXISTS ocr_cache (
+            exact_key TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            perceptual_hash TEXT NOT NULL,
+            width INTEGER NOT NULL,
+            height INTEGER NOT NULL,
+            variant TEXT NOT NULL,
+            text TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            last_access REAL NOT NULL,
+            hit_count INTEGER DEFAULT 0
+        )
+    '''
+    
+    def __init__(self, db_path: Optional[Path] = None, ttl_seconds: int = 3600,
+                 max_entries: int = 500, max_hamming_distance: int = 0,
+                 perceptual_matching: bool = False, hash_size: int = 16):
+        """
+        Initialize OCR result cache.
+        
+        Args:
+            db_path: SQLite file for the on-disk store (None keeps cache in memory only)
+            ttl_seconds: Entry lifetime in seconds
+            max_entries: Maximum number of cached results (LRU eviction)
+            max_hamming_distance: Maximum dHash distance for perceptual hits
+            perceptual_matching: Whether to serve perceptual hash hits (may return stale text)
+            hash_size: dHash column count
+        """
+        self.db_path = Path(db_path) if db_path else None
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_hamming_distance = max_hamming_distance
+        self.perceptual_matching = perceptual_matching
+        self.hash_size = hash_size
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, OCRCacheEntry]" = OrderedDict()
+        self._connection: Optional[sqlite3.Connection] = None
+        
+        # Statistics
+        self._stats = {
+            'exact_hits': 0,
+            'perceptual_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'hash_errors': 0,
+            'disk_errors': 0
+        }
+        
+        if self.db_path:
+            self._open_store()
+            self._load_from_store()
+    
+    def _open_store(self) -> None:
+        """Open SQLite backing store."""
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(
+                str(self.db_path),
+                check_same_thread=False,
+                isolation_level=None
+            )
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+            self._connection.execute(self.SCHEMA_SQL)
+        except sqlite3.Error as e:
+            raise OCRCacheError(f"Failed to open OCR cache store {self.db_path}: {e}")
+    
+    def _load_from_store(self) -> None:
+        """Load non-expired entries from disk, most recently used last."""
+        cutoff = time.time() - self.ttl_seconds
+        
+        try:
+            self._connection.execute("DELETE FROM ocr_cache WHERE created_at < ?", (cutoff,))
+            rows = self._connection.execute('''
+                SELECT content_hash, perceptual_hash, width, height, variant,
+                       text, created_at, last_access, hit_count
+                FROM ocr_cache ORDER BY last_access DESC LIMIT ?
+            ''', (self.max_entries,)).fetchall()
+        except sqlite3.Error as e:
+            self._stats['disk_errors'] += 1
+            self.logger.warning(f"Failed to load OCR cache from disk: {e}")
+            return
+        
+        for row in reversed(rows):
+            key = OCRCacheKey(
+                content_hash=row[0],
+                perceptual_hash=int(row[1], 16),
+                width=row[2],
+                height=row[3],
+                variant=row[4]
+            )
+            self._entries[key.exact_key] = OCRCacheEntry(
+                key=key, text=row[5], created_at=row[6], last_access=row[7], hit_count=row[8]
+            )
+        
+        self.logger.info(f"Loaded {len(self._entries)} OCR cache entries from {self.db_path}")
+    
+    def compute_key(self, image_path: Union[Path, bytes],
+                    language_codes: Optional[List[str]] = None,
+                    layout: bool = False) -> Optional[OCRCacheKey]:
+        """
+        Compute cache key for an image.
+        
+        Args:
+            image_path: Path to image file or encoded image bytes
+            language_codes: OCR language codes (part of the key)
+            layout: Whether the result is a layout dictionary (part of the key)
+        
+        Returns:
+            OCRCacheKey or None if image could not be hashed
+        """
+        try:
+            exact, perceptual, (width, height) = compute_image_hashes(image_path, self.hash_size)
+        except ImageHashingError as e:
+            with self._lock:
+                self._stats['hash_errors'] += 1
+            self.logger.warning(f"OCR cache bypassed: {e}")
+            return None
+        
+        return OCRCacheKey(
+            content_hash=exact,
+            perceptual_hash=perceptual,
+            width=width,
+            height=height,
+            variant=','.join(language_codes or []) + (LAYOUT_VARIANT if layout else '')
+        )
+    
+    def get(self, key: OCRCacheKey, record_miss: bool = True) -> Optional[Union[str, Dict[str, Any]]]:
+        """
+        Look up cached OCR result.
+        
+        Args:
+            key: Cache key of the image
+            record_miss: Whether a miss is counted (off for a pre-check followed by a counted lookup)
+        
+        Returns:
+            Cached text, layout dictionary for layout keys, or None on miss
+        """
+        now = time.time()
+        
+        with self._lock:
+            entry = self._entries.get(key.exact_key)
+            hit_type = 'exact_hits'
+            
+            if entry is None and self.perceptual_matching:
+                entry = self._find_perceptual_match(key)
+                hit_type = 'perceptual_hits'
+            
+            if entry is not None and now - entry.created_at > self.ttl_seconds:
+                self._remove_entry(entry.key.exact_key)
+                self._stats['expirations'] += 1
+                entry = None
+            
+            if entry is None:
+                if record_miss:
+                    self._stats['misses'] += 1
+                return None
+            
+            entry.last_access = now
+            entry.hit_count += 1
+            self._entries.move_to_end(entry.key.exact_key)
+            self._stats[hit_type] += 1
+            text = entry.text
+        
+        self.logger.debug(f"OCR cache {hit_type[:-5]} hit for {key.content_hash[:12]}")
+        return json.loads(text) if key.layout else text
+    
+    def _find_perceptual_match(self, key: OCRCacheKey) -> Optional[OCRCacheEntry]:
+        """Find closest entry with same dimensions and variant (caller holds lock)."""
+        best_entry = None
+        best_distance = self.max_hamming_distance + 1
+        
+        for entry in self._entries.values():
+            cached = entry.key
+            if (cached.width, cached.height, cached.variant) != (key.width, key.height, key.variant):
+                continue
+            distance = hamming_distance(cached.perceptual_hash, key.perceptual_hash)
+            if distance < best_distance:
+                best_entry = entry
+                best_distance = distance
+                if distance == 0:
+                    break
+        
+        return best_entry
+    
+    def put(self, key: OCRCacheKey, result: Union[str, Dict[str, Any]]) -> None:
+        """
+        Store OCR result.
+        
+        Args:
+            key: Cache key of the image
+            result: Recognized text, or layout dictionary for layout keys
+        """
+        if not result:
+            return
+        
+        text = json.dumps(result, ensure_ascii=False) if key.layout else result
+        now = time.time()
+        entry = OCRCacheEntry(key=key, text=text, created_at=now, last_access=now)
+        
+        with self._lock:
+            self._entries[key.exact_key] = entry
+            self._entries.move_to_end(key.exact_key)
+            self._stats['stores'] += 1
+            
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                self._remove_entry(oldest_key)
+                self._stats['evictions'] += 1
+            
+            self._write_entry(entry)
+    
+    def _write_entry(self, entry: OCRCacheEntry) -> None:
+        """Persist entry to disk store (caller holds lock)."""
+        if self._connection is None:
+            return
+        
+        key = entry.key
+        try:
+            self._connection.execute('''
+                INSERT OR REPLACE INTO ocr_cache
+                (exact_key, content_hash, perceptual_hash, width, height, variant,
+                 text, created_at, last_access, hit_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (key.exact_key, key.content_hash, format(key.perceptual_hash, 'x'),
+                  key.width, key.height, key.variant, entry.text,
+                  entry.created_at, entry.last_access, entry.hit_count))
+        except sqlite3.Error as e:
+            self._stats['disk_errors'] += 1
+            self.logger.warning(f"Failed to persist OCR cache entry: {e}")
+    
+    def _remove_entry(self, exact_key: str) -> None:
+        """Remove entry from memory and disk (caller holds lock)."""
+        self._entries.pop(exact_key, None)
+        
+        if self._connection is not None:
+            try:
+                self._connection.execute("DELETE FROM ocr_cache WHERE exact_key = ?", (exact_key,))
+            except sqlite3.Error as e:
+                self._stats['disk_errors'] += 1
+                self.logger.warning(f"Failed to delete OCR cache entry: {e}")
+    
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries.clear()
+            if self._connection is not None:
+                try:
+                    self._connection.execute("DELETE FROM ocr_cache")
+                except sqlite3.Error as e:
+                    self._stats['disk_errors'] += 1
+                    self.logger.warning(f"Failed to clear OCR cache store: {e}")
+    
+    def get_cache_statistics(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with cache statistics
+        """
+        with self._lock:
+            stats = self._stats.copy()
+            stats['entries'] = len(self._entries)
+        
+        lookups = stats['exact_hits'] + stats['perceptual_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['exact_hits'] + stats['perceptual_hits']) / lookups if lookups else 0.0
+        return stats
+    
+    def close(self) -> None:
+        """Close disk store, flushing access times."""
+        with self._lock:
+            if self._connection is None:
+                return
+            try:
+                self._connection.executemany(
+                    "UPDATE ocr_cache SET last_access = ?, hit_count = ? WHERE exact_key = ?",
+                    [(entry.last_access, entry.hit_count, exact_key)
+                     for exact_key, entry in self._entries.items()]
+                )
+                self._connection.close()
+            except sqlite3.Error as e:
+                self.logger.warning(f"Error closing OCR cache store: {e}")
+            finally:
+                self._connection = None
\ No newline at end of file
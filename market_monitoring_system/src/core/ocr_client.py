@@ -5,10 +5,12 @@ Uses simplified OCR client while maintaining backward compatibility.
 
 import logging
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 from config.settings import SettingsManager, YandexOCRConfig
-from .simple_ocr_client import SimpleYandexOCRClient, SimpleOCRError
+from .simple_ocr_client import SimpleYandexOCRClient, SimpleOCRError, OCRRateLimitError
+from .ocr_cache import OCRResultCache, OCRCacheKey, OCRCacheError
+from .async_ocr_client import AsyncYandexOCRClient, AsyncOCRError
 
 
 class OCRError(Exception):
@@ -42,13 +44,44 @@ class YandexOCRClient:
             self.simple_client = SimpleYandexOCRClient(
                 api_key=self.config.api_key,
                 timeout=self.config.timeout,
-                max_retries=self.config.max_retries
+                max_retries=self.config.max_retries,
+                api_url=self.config.api_url
             )
         except SimpleOCRError as e:
             raise OCRError(f"Failed to initialize OCR client: {e}")
         
         self.logger.info(f"OCR client adapter initialized with simplified client")
         
+        # Initialize OCR result cache
+        self.cache: Optional[OCRResultCache] = None
+        cache_config = settings_manager.ocr_cache
+        if cache_config and cache_config.enabled:
+            try:
+                self.cache = OCRResultCache(
+                    db_path=Path(cache_config.db_path),
+                    ttl_seconds=cache_config.ttl_seconds,
+                    max_entries=cache_config.max_entries,
+                    max_hamming_distance=cache_config.max_hamming_distance,
+                    perceptual_matching=cache_config.perceptual_matching,
+                    hash_size=cache_config.hash_size
+                )
+            except OCRCacheError as e:
+                self.logger.warning(f"OCR result cache disabled: {e}")
+        
+        # Optional asyncio client for the async OCR queue dispatcher
+        self.async_client: Optional[AsyncYandexOCRClient] = None
+        if getattr(self.config, 'async_requests', False):
+            try:
+                self.async_client = AsyncYandexOCRClient(
+                    api_key=self.config.api_key,
+                    api_url=self.config.api_url,
+                    timeout=self.config.timeout,
+                    max_in_flight=self.config.max_in_flight,
+                    keepalive_timeout=self.config.keepalive_timeout
+                )
+            except AsyncOCRError as e:
+                self.logger.warning(f"Async OCR client disabled, using threaded requests: {e}")
+        
         # Initialize statistics for backward compatibility
         self._stats = {
             'total_requests': 0,
@@ -145,16 +178,213 @@ class YandexOCRClient:
             Extracted text or None if failed
         """
         try:
+            # Check result cache before calling the API
+            cache_key, cached_text = self._cache_lookup(image_path, language_codes, cleanup_image)
+            if cached_text is not None:
+                return cached_text
+            
             # Delegate to simplified client
-            return self.simple_client.process_image_full_pipeline(
+            text_result = self.simple_client.process_image_full_pipeline(
                 image_path=image_path,
                 cleanup_image=cleanup_image,
                 language_codes=language_codes
             )
+            
+            if text_result and cache_key:
+                self.cache.put(cache_key, text_result)
+            
+            return text_result
+        except OCRRateLimitError:
+            raise
         except Exception as e:
             self.logger.error(f"OCR pipeline adapter error: {e}")
             return None
     
+    def process_image_with_layout(self, image_path: Path,
+                                  cleanup_image: bool = True,
+                                  language_codes: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Send image for OCR and return text with line positions (adapter method).
+        
+        Args:
+            image_path: Path to image file
+            cleanup_image: Whether to delete image after processing
+            language_codes: Optional language codes
+        
+        Returns:
+            Dictionary with 'text' and 'lines' or None if failed
+        """
+        try:
+            cache_key, cached_layout = self._cache_lookup(image_path, language_codes, cleanup_image, layout=True)
+            if cached_layout is not None:
+                return cached_layout
+            
+            layout = self.simple_client.process_image_with_layout(
+                image_path=image_path,
+                cleanup_image=cleanup_image,
+                language_codes=language_codes
+            )
+            
+            if layout and cache_key:
+                self.cache.put(cache_key, layout)
+            
+            return layout
+        except OCRRateLimitError:
+            raise
+        except Exception as e:
+            self.logger.error(f"OCR layout adapter error: {e}")
+            return None
+    
+    def _cache_lookup(self, image_path: Path, language_codes: Optional[List[str]],
+                      cleanup_image: bool, layout: bool = False) -> Tuple[Optional[OCRCacheKey], Optional[Any]]:
+        """
+        Look up the result cache for an image file, deleting the file on a hit if requested.
+        
+        Returns:
+            Tuple of cache key (None if caching is off) and cached result (None on miss)
+        """
+        if not self.cache or not image_path.exists():
+            return None, None
+        
+        cache_key = self.cache.compute_key(image_path, language_codes, layout=layout)
+        cached = self.cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            self.logger.info(f"OCR cache hit for {image_path.name}, API call skipped")
+            if cleanup_image:
+                try:
+                    image_path.unlink()
+                except Exception as e:
+                    self.logger.warning(f"Failed to cleanup image {image_path}: {e}")
+        return cache_key, cached
+    
+    def get_cached_result(self, image_path: Optional[Path] = None,
+                          image_data: Optional[bytes] = None,
+                          language_codes: Optional[List[str]] = None,
+                          layout: bool = False) -> Optional[Any]:
+        """
+        Look up the result cache without contacting the API.
+        Lets OCRQueue complete cache hits before it takes a request slot.
+        
+        Args:
+            image_path: Path to image file (None when image_data is given)
+            image_data: Encoded image bytes
+            language_codes: Optional language codes
+            layout: Whether a layout dictionary is wanted
+        
+        Returns:
+            Cached text or layout dictionary, None on miss or with the cache off
+        """
+        image = image_data if image_data is not None else image_path
+        if not self.cache or image is None or (image_data is None and not image_path.exists()):
+            return None
+        
+        cache_key = self.cache.compute_key(image, language_codes, layout=layout)
+        return self.cache.get(cache_key, record_miss=False) if cache_key else None
+    
+    def process_image_bytes(self, image_data: bytes,
+                            language_codes: Optional[List[str]] = None,
+                            layout: bool = False) -> Optional[Any]:
+        """
+        Recognize in-memory encoded image (adapter method).
+        
+        Args:
+            image_data: Encoded image bytes
+            language_codes: Optional language codes
+            layout: Whether to return line positions together with text
+        
+        Returns:
+            Extracted text, layout dictionary when layout is set, or None if failed
+        """
+        try:
+            cache_key = None
+            if self.cache:
+                cache_key = self.cache.compute_key(image_data, language_codes, layout=layout)
+                cached = self.cache.get(cache_key) if cache_key else None
+                if cached is not None:
+                    self.logger.info("OCR cache hit for in-memory image, API call skipped")
+                    return cached
+            
+            result = self.simple_client.process_image_bytes(
+                image_data=image_data,
+                language_codes=language_codes,
+                layout=layout
+            )
+            
+            if result and cache_key:
+                self.cache.put(cache_key, result)
+            
+            return result
+        except OCRRateLimitError:
+            raise
+        except Exception as e:
+            self.logger.error(f"OCR bytes adapter error: {e}")
+            return None
+    
+    @property
+    def async_available(self) -> bool:
+        """Whether jobs can be processed with process_image_async."""
+        return self.async_client is not None
+    
+    async def open_async_session(self) -> None:
+        """Open the async client session on the running event loop."""
+        if self.async_client:
+            await self.async_client.start()
+    
+    async def close_async_session(self) -> None:
+        """Close the async client session."""
+        if self.async_client:
+            await self.async_client.close()
+    
+    async def process_image_async(self, image_path: Optional[Path] = None,
+                                  image_data: Optional[bytes] = None,
+                                  cleanup_image: bool = True,
+                                  language_codes: Optional[List[str]] = None,
+                                  layout: bool = False) -> Optional[Any]:
+        """
+        Recognize an image file or in-memory image with the async client (adapter method).
+        
+        Args:
+            image_path: Path to image file (None when image_data is given)
+            image_data: Encoded image bytes
+            cleanup_image: Whether to delete the image file after successful processing
+            language_codes: Optional language codes
+            layout: Whether to return line positions together with text
+        
+        Returns:
+            Extracted text, layout dictionary when layout is set, or None if failed
+        """
+        if not self.async_client:
+            raise OCRError("Async OCR client not available")
+        
+        image = image_data if image_data is not None else image_path
+        try:
+            cache_key = None
+            cached = None
+            if self.cache:
+                cache_key = self.cache.compute_key(image, language_codes, layout=layout)
+                cached = self.cache.get(cache_key) if cache_key else None
+            
+            if cached is not None:
+                self.logger.info("OCR cache hit, API call skipped")
+                result = cached
+            else:
+                result = await self.async_client.recognize(image, language_codes, layout=layout)
+                if result and cache_key:
+                    self.cache.put(cache_key, result)
+            
+            if result and cleanup_image and image_data is None:
+                try:
+                    image_path.unlink()
+                except Exception as e:
+                    self.logger.warning(f"Failed to cleanup image {image_path}: {e}")
+            
+            return result
+        except OCRRateLimitError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Async OCR adapter error: {e}")
+            return None
+    
     def get_ocr_statistics(self) -> Dict[str, Any]:
         """
         Get OCR processing statistics (adapter method).
@@ -177,6 +407,11 @@ class YandexOCRClient:
             combined_stats['success_rate'] = simple_stats.get('success_rate', 0.0)
             combined_stats['failure_rate'] = simple_stats.get('failure_rate', 0.0)
             
+            if self.cache:
+                combined_stats['cache'] = self.cache.get_cache_statistics()
+            if self.async_client:
+                combined_stats['async_client'] = self.async_client.get_ocr_statistics()
+            
             # Add configuration summary
             combined_stats['config_summary'] = {
                 'primary_api_format': 'ocr',
@@ -222,6 +457,8 @@ class YandexOCRClient:
         try:
             if hasattr(self, 'simple_client'):
                 self.simple_client.close()
+            if getattr(self, 'cache', None):
+                self.cache.close()
             self.logger.info("OCR client adapter closed")
         except Exception as e:
             self.logger.error(f"Error closing OCR client adapter: {e}")
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+Structured OCR document for market monitoring system.
+Represents recognized blocks, lines and words with bounding boxes and groups lines into columns and rows.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Pattern
+
+
+def shift_layout_line(line: Dict[str, Any], dy: int, scale: float = 1.0) -> Dict[str, Any]:
+    """
+    Copy a layout line or word box into other image pixels.
+    
+    Args:
+        line: Layout dictionary with left, top, bottom and optional right and words
+        dy: Pixels to move the box down after scaling (negative moves up)
+        scale: Factor the source image was scaled by
+    
+    Returns:
+        Shifted copy, words included
+    """
+    shifted = dict(line)
+    for key in ('left', 'right'):
+        if key in line:
+            shifted[key] = round(line[key] / scale)
+    for key in ('top', 'bottom'):
+        if key in line:
+            shifted[key] = round(line[key] / scale) + dy
+    if 'words' in line:
+        shifted['words'] = [shift_layout_line(word, dy, scale) for word in line['words']]
+    return shifted
+
+
+@dataclass
+class BoundingBox:
+    """Axis-aligned box in image pixels."""
+    left: int
+    top: int
+    right: int
+    bottom: int
+    
+    @property
+    def height(self) -> int:
+        """Box height in pixels."""
+        return self.bottom - self.top
+    
+    @property
+    def center_y(self) -> float:
+        """Vertical center of the box."""
+        return (self.top + self.bottom) / 2
+    
+    @classmethod
+    def from_dict(cls, box: Dict[str, Any]) -> 'BoundingBox':
+        """Build box from a layout dictionary; a missing right edge collapses to the left one."""
+        return cls(int(box['left']), int(box['top']), int(box.get('right', box['left'])), int(box['bottom']))
+
+
+@dataclass
+class OCRWord:
+    """Recognized word."""
+    text: str
+    bbox: BoundingBox
+
+
+@dataclass
+class OCRLine:
+    """Recognized line of text."""
+    text: str
+    bbox: BoundingBox
+    words: List[OCRWord] = field(default_factory=list)
+    block: int = 0  # Index of the block holding the line
+
+
+@dataclass
+class OCRBlock:
+    """Block of lines recognized as one text region."""
+    index: int
+    lines: List[OCRLine] = field(default_factory=list)
+    
+    @property
+    def bbox(self) -> Optional[BoundingBox]:
+        """Box enclosing all lines of the block."""
+        if not self.lines:
+            return None
+        return BoundingBox(
+            min(line.bbox.left for line in self.lines),
+            min(line.bbox.top for line in self.lines),
+            max(line.bbox.right for line in self.lines),
+            max(line.bbox.bottom for line in self.lines)
+        )
+
+
+@dataclass
+class OCRDocument:
+    """
+    Recognized page with block, line and word geometry.
+    Built from the layout result of an OCR request ('text' and 'lines' with
+    boxes). Lines can be split into columns under anchor lines and grouped
+    into rows of lines sharing a vertical band, so parsers can read fields
+    by position instead of by the order lines were returned in.
+    """
+    text: str
+    blocks: List[OCRBlock] = field(default_factory=list)
+    
+    @classmethod
+    def from_layout(cls, layout: Dict[str, Any]) -> 'OCRDocument':
+        """
+        Build document from an OCR layout result.
+        
+        Args:
+            layout: Dictionary with 'text' and 'lines' (text, left, top, bottom and
+                optional right, block and words)
+        
+        Returns:
+            OCRDocument with lines grouped by block
+        
+        Raises:
+            KeyError: If a line has no box
+        """
+        blocks: Dict[int, OCRBlock] = {}
+        for line in layout.get('lines', []):
+            if not line.get('text'):
+                continue
+            block_index = int(line.get('block', 0))
+            block = blocks.get(block_index)
+            if block is None:
+                block = blocks[block_index] = OCRBlock(block_index)
+            block.lines.append(OCRLine(
+                text=line['text'],
+                bbox=BoundingBox.from_dict(line),
+                words=[OCRWord(word['text'], BoundingBox.from_dict(word)) for word in line.get('words', [])],
+                block=block_index
+            ))
+        
+        return cls(text=layout.get('text') or '', blocks=[blocks[index] for index in sorted(blocks)])
+    
+    @property
+    def lines(self) -> List[OCRLine]:
+        """All lines in block order."""
+        return [line for block in self.blocks for line in block.lines]
+    
+    def columns(self, anchor: Pattern, tolerance: int = 40) -> List[List[OCRLine]]:
+        """
+        Split lines into columns starting at the left edges of anchor lines.
+        
+        Args:
+            anchor: Pattern matching lines that head a column, like a window title
+            tolerance: Pixels a line may start left of its column
+        
+        Returns:
+            Lines of each column, left to right; one column if anchors share an edge
+        """
+        lines = self.lines
+        starts: List[int] = []
+        for left in sorted(line.bbox.left for line in lines if anchor.search(line.text)):
+            if not starts or left - starts[-1] > tolerance:
+                starts.append(left)
+        
+        if len(starts) < 2:
+            return [lines] if lines else []
+        
+        columns: List[List[OCRLine]] = [[] for _ in starts]
+        for line in lines:
+            index = 0
+            for position, start in enumerate(starts):
+                if line.bbox.left + tolerance >= start:
+                    index = position
+            columns[index].append(line)
+        return [column for column in columns if column]
+    
+    @staticmethod
+    def rows(lines: List[OCRLine]) -> List[List[OCRLine]]:
+        """
+        Group lines into rows, top to bottom.
+        A line joins a row when its vertical center lies inside the row's first
+        line; lines in a row are ordered left to right.
+        
+        Args:
+            lines: Lines to group
+        
+        Returns:
+            List of rows
+        """
+        rows: List[List[OCRLine]] = []
+        for line in sorted(lines, key=lambda l: (l.bbox.center_y, l.bbox.left)):
+            if rows and rows[-1][0].bbox.top <= line.bbox.center_y <= rows[-1][0].bbox.bottom:
+                rows[-1].append(line)
+            else:
+                rows.append([line])
+        
+        for row in rows:
+            row.sort(key=lambda l: l.bbox.left)
+        return rows
\ No newline at end of file
@@ -0,0 +1,338 @@
+"""
+OCR payload encoder for market monitoring system.
+Picks the smallest OCR-safe encoding of merged screenshots within a per-request byte cap.
+"""
+
+import io
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple, Dict, Any
+
+try:
+    from PIL import Image, ImageChops
+    PILLOW_AVAILABLE = True
+except ImportError as e:
+    PILLOW_AVAILABLE = False
+    PILLOW_ERROR = str(e)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError as e:
+    NUMPY_AVAILABLE = False
+    NUMPY_ERROR = str(e)
+
+
+# Encoding name -> (PIL format, OCR API mime type, file extension)
+ENCODINGS = {
+    'png_gray': ('PNG', 'PNG', '.png'),
+    'png_palette': ('PNG', 'PNG', '.png'),
+    'jpeg': ('JPEG', 'JPEG', '.jpg'),
+    'webp': ('WEBP', 'WEBP', '.webp')
+}
+
+LOSSY_ENCODINGS = ('jpeg', 'webp')
+
+OCR_API_MAX_BYTES = 20 * 1024 * 1024  # Request limit of the OCR API
+
+
+@dataclass
+class EncodedImage:
+    """Image encoded for an OCR request."""
+    data: bytes = field(repr=False)
+    encoding: str  # Key of ENCODINGS
+    size: Tuple[int, int]  # Encoded (width, height)
+    quality: Optional[int] = None  # Lossy quality, None for PNG
+    scale: float = 1.0  # Downscale applied to meet the byte cap
+    encode_time: float = 0.0
+    candidates: Dict[str, int] = field(default_factory=dict)  # Candidate name -> bytes
+    
+    @property
+    def nbytes(self) -> int:
+        """Encoded size in bytes."""
+        return len(self.data)
+    
+    @property
+    def mime_type(self) -> str:
+        """OCR API mime type."""
+        return ENCODINGS[self.encoding][1]
+    
+    @property
+    def extension(self) -> str:
+        """File extension including the dot."""
+        return ENCODINGS[self.encoding][2]
+
+
+class OCRImageEncoderError(Exception):
+    """Exception raised for OCR image encoding errors."""
+    pass
+
+
+def sniff_mime_type(image_data: bytes) -> str:
+    """
+    Detect OCR API mime type of encoded image data.
+    
+    Args:
+        image_data: Encoded image bytes
+    
+    Returns:
+        'PNG', 'WEBP' or 'JPEG' (default)
+    """
+    if image_data[:8] == b'\x89PNG\r\n\x1a\n':
+        return 'PNG'
+    if image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP':
+        return 'WEBP'
+    return 'JPEG'
+
+
+class OCRImageEncoder:
+    """
+    Encodes merged screenshots for OCR with the smallest payload.
+    Uniform margins are trimmed and long blank row runs collapsed, then
+    grayscale PNG and lossy formats at the preferred quality compete on size.
+    Palette PNG quantizes to a few gray levels and softens anti-aliased glyph
+    edges, so it is lossy too and only used when listed in encodings.
+    Lossy quality only drops further along the ladder, and the image is only
+    downscaled, when no candidate fits the byte cap.
+    Trimming changes geometry, so results with line positions must not be encoded.
+    """
+    
+    def __init__(self, encodings: Sequence[str] = ('png_gray', 'jpeg'),
+                 quality_ladder: Sequence[int] = (85, 70, 55, 40),
+                 max_bytes: int = 4 * 1024 * 1024,
+                 trim_margins: bool = True,
+                 trim_padding: int = 4,
+                 collapse_blank_rows: bool = True,
+                 blank_row_gap: int = 8,
+                 background_tolerance: int = 12,
+                 palette_colors: int = 16,
+                 png_compress_level: int = 6):
+        """
+        Initialize OCR image encoder.
+        
+        Args:
+            encodings: Candidate encodings (keys of ENCODINGS); 'png_palette' is lossy and opt-in
+            quality_ladder: Lossy qualities, preferred first
+            max_bytes: Maximum encoded bytes per request
+            trim_margins: Crop uniform margins
+            trim_padding: Background pixels kept around the content when trimming
+            collapse_blank_rows: Shorten runs of blank rows inside the image
+            blank_row_gap: Rows kept from each collapsed blank run
+            background_tolerance: Max level difference still counted as background
+            palette_colors: Gray levels of the opt-in palette PNG candidate
+            png_compress_level: zlib level of PNG candidates
+        
+        Raises:
+            OCRImageEncoderError: If Pillow is missing or an encoding is unknown
+        """
+        if not PILLOW_AVAILABLE:
+            raise OCRImageEncoderError(f"Pillow library not available: {PILLOW_ERROR}")
+        
+        unknown = [name for name in encodings if name not in ENCODINGS]
+        if unknown or not encodings:
+            raise OCRImageEncoderError(f"Unknown OCR encodings: {unknown or 'none given'}")
+        
+        self.encodings = list(encodings)
+        self.quality_ladder = sorted(quality_ladder, reverse=True) or [85]
+        self.max_bytes = min(max_bytes, OCR_API_MAX_BYTES)
+        self.trim_margins = trim_margins
+        self.trim_padding = max(0, trim_padding)
+        self.collapse_blank_rows = collapse_blank_rows
+        self.blank_row_gap = max(1, blank_row_gap)
+        self.background_tolerance = background_tolerance
+        self.palette_colors = palette_colors
+        self.png_compress_level = png_compress_level
+        self.logger = logging.getLogger(__name__)
+        
+        # Statistics
+        self._stats = {
+            'images_encoded': 0,
+            'raw_bytes': 0,
+            'encoded_bytes': 0,
+            'rows_trimmed': 0,
+            'downscaled': 0,
+            'total_encode_time': 0.0,
+            'encodings_chosen': {}
+        }
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle without the logger so encoders can be sent to worker processes."""
+        state = self.__dict__.copy()
+        state.pop('logger', None)
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore logger after unpickling."""
+        self.__dict__.update(state)
+        self.logger = logging.getLogger(__name__)
+    
+    def _content_mask(self, gray: 'Image.Image') -> 'Image.Image':
+        """Binary mask of pixels differing from the top-left background level."""
+        background = Image.new('L', gray.size, gray.getpixel((0, 0)))
+        difference = ImageChops.difference(gray, background)
+        tolerance = self.background_tolerance
+        return difference.point(lambda level: 255 if level > tolerance else 0)
+    
+    def trim(self, image: 'Image.Image') -> 'Image.Image':
+        """
+        Crop uniform margins and collapse long blank row runs.
+        
+        Args:
+            image: Merged image
+        
+        Returns:
+            Trimmed image (the input itself when nothing was removed)
+        """
+        if not (self.trim_margins or self.collapse_blank_rows) or image.width == 0 or image.height == 0:
+            return image
+        
+        gray = image if image.mode == 'L' else image.convert('L')
+        mask = self._content_mask(gray)
+        
+        trimmed = image
+        if self.trim_margins:
+            bbox = mask.getbbox()
+            if bbox is None:
+                # Blank image: keep a single row so it still encodes
+                return image.crop((0, 0, image.width, 1))
+            pad = self.trim_padding
+            bbox = (max(0, bbox[0] - pad), max(0, bbox[1] - pad),
+                    min(image.width, bbox[2] + pad), min(image.height, bbox[3] + pad))
+            if bbox != (0, 0, image.width, image.height):
+                trimmed = image.crop(bbox)
+                mask = mask.crop(bbox)
+        
+        if self.collapse_blank_rows and NUMPY_AVAILABLE:
+            rows = np.asarray(mask).any(axis=1)
+            keep = rows.copy()
+            blank_run = 0
+            for y, has_content in enumerate(rows):
+                blank_run = 0 if has_content else blank_run + 1
+                if not has_content and blank_run <= self.blank_row_gap:
+                    keep[y] = True
+            
+            if not keep.all():
+                array = np.asarray(trimmed)[keep]
+                trimmed = Image.fromarray(np.ascontiguousarray(array))
+        
+        self._stats['rows_trimmed'] += image.height - trimmed.height
+        return trimmed
+    
+    def _encode_candidate(self, image: 'Image.Image', encoding: str,
+                          quality: Optional[int] = None) -> bytes:
+        """Encode image with one candidate encoding."""
+        buffer = io.BytesIO()
+        if encoding == 'png_gray':
+            gray = image if image.mode == 'L' else image.convert('L')
+            gray.save(buffer, format='PNG', compress_level=self.png_compress_level)
+        elif encoding == 'png_palette':
+            gray = image if image.mode == 'L' else image.convert('L')
+            palette = gray.quantize(colors=self.palette_colors)
+            palette.save(buffer, format='PNG', compress_level=self.png_compress_level,
+                         bits=max(1, (self.palette_colors - 1).bit_length()))
+        else:
+            source = image if image.mode in ('L', 'RGB') else image.convert('RGB')
+            source.save(buffer, format=ENCODINGS[encoding][0], quality=quality)
+        return buffer.getvalue()
+    
+    def encode(self, image: 'Image.Image') -> EncodedImage:
+        """
+        Encode image for OCR with the smallest candidate within the byte cap.
+        
+        Args:
+            image: Merged image (L or RGB)
+        
+        Returns:
+            EncodedImage with the chosen encoding
+        
+        Raises:
+            OCRImageEncoderError: If no candidate fits max_bytes even downscaled
+        """
+        start_time = time.perf_counter()
+        raw_bytes = image.width * image.height * len(image.getbands())
+        
+        working = self.trim(image)
+        scale = 1.0
+        candidates: Dict[str, int] = {}
+        best: Optional[Tuple[bytes, str, Optional[int]]] = None
+        
+        for _ in range(4):
+            # Grayscale PNG, opt-in palette PNG and lossy formats at the preferred quality compete on size
+            for encoding in self.encodings:
+                quality = self.quality_ladder[0] if encoding in LOSSY_ENCODINGS else None
+                data = self._encode_candidate(working, encoding, quality)
+                candidates[encoding if quality is None else f"{encoding}@{quality}"] = len(data)
+                if best is None or len(data) < len(best[0]):
+                    best = (data, encoding, quality)
+            
+            # Over the cap: walk lossy qualities down before giving up resolution
+            for encoding in [name for name in self.encodings if name in LOSSY_ENCODINGS]:
+                for quality in self.quality_ladder[1:]:
+                    if len(best[0]) <= self.max_bytes:
+                        break
+                    data = self._encode_candidate(working, encoding, quality)
+                    candidates[f"{encoding}@{quality}"] = len(data)
+                    if len(data) < len(best[0]):
+                        best = (data, encoding, quality)
+            
+            if len(best[0]) <= self.max_bytes:
+                break
+            
+            scale *= 0.75
+            self._stats['downscaled'] += 1
+            self.logger.warning(
+                f"Encoded image {len(best[0]) / 1024:.0f}KB exceeds cap "
+                f"{self.max_bytes / 1024:.0f}KB, downscaling to {scale:.2f}"
+            )
+            target = (max(1, int(working.width * 0.75)), max(1, int(working.height * 0.75)))
+            working = working.resize(target, Image.LANCZOS)
+            best = None
+        else:
+            raise OCRImageEncoderError(
+                f"Image cannot be encoded within {self.max_bytes} bytes"
+            )
+        
+        data, encoding, quality = best
+        encode_time = time.perf_counter() - start_time
+        
+        self._stats['images_encoded'] += 1
+        self._stats['raw_bytes'] += raw_bytes
+        self._stats['encoded_bytes'] += len(data)
+        self._stats['total_encode_time'] += encode_time
+        chosen = self._stats['encodings_chosen']
+        chosen[encoding] = chosen.get(encoding, 0) + 1
+        
+        self.logger.debug(
+            f"Encoded {image.width}x{image.height} as {encoding}"
+            f"{'' if quality is None else f'@{quality}'}: {len(data) / 1024:.0f}KB in {encode_time:.3f}s"
+        )
+        
+        return EncodedImage(
+            data=data,
+            encoding=encoding,
+            size=working.size,
+            quality=quality,
+            scale=scale,
+            encode_time=encode_time,
+            candidates=candidates
+        )
+    
+    def get_encoder_statistics(self) -> Dict[str, Any]:
+        """
+        Get OCR image encoder statistics.
+        
+        Returns:
+            Dictionary with encoder statistics
+        """
+        stats = self._stats.copy()
+        stats['encodings_chosen'] = dict(stats['encodings_chosen'])
+        if stats['raw_bytes'] > 0:
+            stats['compression_ratio'] = stats['encoded_bytes'] / stats['raw_bytes']
+        else:
+            stats['compression_ratio'] = 0.0
+        if stats['images_encoded'] > 0:
+            stats['average_encode_time'] = stats['total_encode_time'] / stats['images_encoded']
+        else:
+            stats['average_encode_time'] = 0.0
+        return stats
\ No newline at end of file
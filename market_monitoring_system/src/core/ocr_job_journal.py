@@ -0,0 +1,322 @@
+"""
+OCR job journal for market monitoring system.
+Persists OCR job submissions, state transitions and results in SQLite so unfinished jobs survive restarts.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+
+@dataclass
+class JournalRecord:
+    """Journaled state of one OCR job."""
+    job_id: str
+    hotkey: str
+    priority: int
+    image_path: Optional[Path]
+    image_data: Optional[bytes] = field(repr=False)
+    language_codes: Optional[List[str]]
+    cleanup_image: bool
+    layout: bool
+    status: str
+    attempts: int
+    max_attempts: int
+    result: Optional[Any]
+    error: Optional[str]
+    context: Dict[str, Any]
+    group_id: Optional[str]
+    chunk_index: Optional[int]
+    chunk_count: Optional[int]
+    created_at: float
+    finished: bool = False  # Outcome committed, the callback has run
+
+
+class OCRJobJournalError(Exception):
+    """Exception raised for OCR job journal errors."""
+    pass
+
+
+class OCRJobJournal:
+    """
+    Durable SQLite journal of OCR jobs.
+    A job is written at submission, updated on every state change and marked
+    finished once its result callback has run. Unfinished rows are found
+    through a partial index, so recovery reads only the jobs still to do.
+    In-memory images are kept as blobs until the job finishes.
+    """
+    
+    SCHEMA_SQL = '''
+        CREATE TABLE IF NOT EXISTS ocr_jobs (
+            job_id TEXT PRIMARY KEY,
+            hotkey TEXT NOT NULL,
+            priority INTEGER NOT NULL,
+            image_path TEXT,
+            image_data BLOB,
+            language_codes TEXT,
+            cleanup_image INTEGER NOT NULL,
+            layout INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER DEFAULT 0,
+            max_attempts INTEGER DEFAULT 3,
+            result TEXT,
+            error TEXT,
+            context TEXT,
+            group_id TEXT,
+            chunk_index INTEGER,
+            chunk_count INTEGER,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            finished INTEGER DEFAULT 0,
+            finished_at REAL
+        )
+    '''
+    
+    INDEX_SQL = [
+        "CREATE INDEX IF NOT EXISTS idx_ocr_jobs_unfinished ON ocr_jobs(created_at) WHERE finished = 0",
+        "CREATE INDEX IF NOT EXISTS idx_ocr_jobs_status ON ocr_jobs(status)",
+        "CREATE INDEX IF NOT EXISTS idx_ocr_jobs_group ON ocr_jobs(group_id) WHERE group_id IS NOT NULL",
+        "CREATE INDEX IF NOT EXISTS idx_ocr_jobs_finished_at ON ocr_jobs(finished_at) WHERE finished = 1"
+    ]
+    
+    COLUMNS = '''
+        job_id, hotkey, priority, image_path, image_data, language_codes, cleanup_image,
+        layout, status, attempts, max_attempts, result, error, context, group_id,
+        chunk_index, chunk_count, created_at, finished
+    '''
+    
+    def __init__(self, db_path: Path, retention_hours: float = 24.0):
+        """
+        Initialize OCR job journal.
+        
+        Args:
+            db_path: SQLite journal file
+            retention_hours: Hours finished jobs are kept for inspection
+        
+        Raises:
+            OCRJobJournalError: If the journal could not be opened
+        """
+        self.db_path = Path(db_path)
+        self.retention_hours = retention_hours
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        
+        # Statistics
+        self._stats = {
+            'submissions': 0,
+            'transitions': 0,
+            'results': 0,
+            'finished': 0,
+            'pruned': 0,
+            'disk_errors': 0
+        }
+        
+        self._open()
+    
+    def _open(self) -> None:
+        """Open SQLite journal and create schema."""
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(
+                str(self.db_path),
+                check_same_thread=False,
+                isolation_level=None
+            )
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+            self._connection.execute(self.SCHEMA_SQL)
+            for index_sql in self.INDEX_SQL:
+                self._connection.execute(index_sql)
+        except sqlite3.Error as e:
+            raise OCRJobJournalError(f"Failed to open OCR job journal {self.db_path}: {e}")
+    
+    def _execute(self, sql: str, params: tuple, stat: str) -> None:
+        """Run a write statement, counting instead of raising disk errors."""
+        with self._lock:
+            if self._connection is None:
+                return
+            try:
+                self._connection.execute(sql, params)
+                self._stats[stat] += 1
+            except sqlite3.Error as e:
+                self._stats['disk_errors'] += 1
+                self.logger.warning(f"Failed to write OCR job journal: {e}")
+    
+    def record_submission(self, job, group_id: Optional[str] = None,
+                          chunk_index: Optional[int] = None,
+                          chunk_count: Optional[int] = None) -> None:
+        """
+        Record a submitted job.
+        
+        Args:
+            job: Submitted OCRJob
+            group_id: Group of a chunk job
+            chunk_index: Position of a chunk job in its group
+            chunk_count: Number of chunks in the group
+        """
+        now = time.time()
+        self._execute('''
+            INSERT OR REPLACE INTO ocr_jobs
+            (job_id, hotkey, priority, image_path, image_data, language_codes, cleanup_image,
+             layout, status, attempts, max_attempts, context, group_id, chunk_index, chunk_count,
+             created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (job.job_id, job.hotkey, job.priority.value,
+              str(job.image_path) if job.image_path else None, job.image_data,
+              json.dumps(job.language_codes) if job.language_codes else None,
+              int(job.cleanup_image), int(job.layout), job.status.value, job.attempts,
+              job.max_attempts, json.dumps(job.context), group_id, chunk_index, chunk_count,
+              job.created_at.timestamp(), now), 'submissions')
+    
+    def record_transition(self, job) -> None:
+        """Record status, attempts and error of a job."""
+        self._execute(
+            "UPDATE ocr_jobs SET status = ?, attempts = ?, error = ?, updated_at = ? WHERE job_id = ?",
+            (job.status.value, job.attempts, job.error, time.time(), job.job_id), 'transitions'
+        )
+    
+    def record_result(self, job) -> None:
+        """Record the OCR result of a completed job before its callback runs."""
+        self._execute(
+            "UPDATE ocr_jobs SET status = ?, attempts = ?, result = ?, updated_at = ? WHERE job_id = ?",
+            (job.status.value, job.attempts, json.dumps(job.result, ensure_ascii=False),
+             time.time(), job.job_id), 'results'
+        )
+    
+    def mark_finished(self, job) -> None:
+        """Mark a job as finished once its outcome is committed; drops the image blob."""
+        now = time.time()
+        self._execute('''
+            UPDATE ocr_jobs SET status = ?, error = ?, image_data = NULL,
+                   finished = 1, finished_at = ?, updated_at = ?
+            WHERE job_id = ?
+        ''', (job.status.value, job.error, now, now, job.job_id), 'finished')
+    
+    def _row_to_record(self, row: tuple) -> JournalRecord:
+        """Convert a selected row to a journal record."""
+        return JournalRecord(
+            job_id=row[0],
+            hotkey=row[1],
+            priority=row[2],
+            image_path=Path(row[3]) if row[3] else None,
+            image_data=row[4],
+            language_codes=json.loads(row[5]) if row[5] else None,
+            cleanup_image=bool(row[6]),
+            layout=bool(row[7]),
+            status=row[8],
+            attempts=row[9],
+            max_attempts=row[10],
+            result=json.loads(row[11]) if row[11] is not None else None,
+            error=row[12],
+            context=json.loads(row[13]) if row[13] else {},
+            group_id=row[14],
+            chunk_index=row[15],
+            chunk_count=row[16],
+            created_at=row[17],
+            finished=bool(row[18])
+        )
+    
+    def _select(self, where: str, params: tuple) -> List[JournalRecord]:
+        """Select journal records matching a condition."""
+        with self._lock:
+            if self._connection is None:
+                return []
+            try:
+                rows = self._connection.execute(
+                    f"SELECT {self.COLUMNS} FROM ocr_jobs WHERE {where} ORDER BY created_at", params
+                ).fetchall()
+            except sqlite3.Error as e:
+                self._stats['disk_errors'] += 1
+                self.logger.warning(f"Failed to read OCR job journal: {e}")
+                return []
+        return [self._row_to_record(row) for row in rows]
+    
+    def load_unfinished(self) -> List[JournalRecord]:
+        """
+        Load jobs whose outcome was never committed, oldest first.
+        
+        Returns:
+            List of unfinished journal records
+        """
+        return self._select("finished = 0", ())
+    
+    def load_group(self, group_id: str) -> List[JournalRecord]:
+        """
+        Load all chunk jobs of a group, finished or not.
+        
+        Args:
+            group_id: Group ID
+        
+        Returns:
+            List of chunk journal records
+        """
+        return self._select("group_id = ?", (group_id,))
+    
+    def count_unfinished(self) -> int:
+        """Number of jobs not yet finished."""
+        with self._lock:
+            if self._connection is None:
+                return 0
+            try:
+                return self._connection.execute("SELECT COUNT(*) FROM ocr_jobs WHERE finished = 0").fetchone()[0]
+            except sqlite3.Error as e:
+                self._stats['disk_errors'] += 1
+                self.logger.warning(f"Failed to read OCR job journal: {e}")
+                return 0
+    
+    def prune(self) -> int:
+        """
+        Delete finished jobs older than the retention period.
+        
+        Returns:
+            Number of deleted jobs
+        """
+        cutoff = time.time() - self.retention_hours * 3600
+        with self._lock:
+            if self._connection is None:
+                return 0
+            try:
+                deleted = self._connection.execute(
+                    "DELETE FROM ocr_jobs WHERE finished = 1 AND finished_at < ?", (cutoff,)
+                ).rowcount
+                self._stats['pruned'] += deleted
+            except sqlite3.Error as e:
+                self._stats['disk_errors'] += 1
+                self.logger.warning(f"Failed to prune OCR job journal: {e}")
+                return 0
+        
+        if deleted:
+            self.logger.debug(f"Pruned {deleted} finished jobs from OCR job journal")
+        return deleted
+    
+    def get_journal_statistics(self) -> Dict[str, Any]:
+        """
+        Get journal statistics.
+        
+        Returns:
+            Dictionary with journal statistics
+        """
+        with self._lock:
+            stats = self._stats.copy()
+        stats['unfinished_jobs'] = self.count_unfinished()
+        stats['db_path'] = str(self.db_path)
+        return stats
+    
+    def close(self) -> None:
+        """Close the journal."""
+        with self._lock:
+            if self._connection is None:
+                return
+            try:
+                self._connection.close()
+            except sqlite3.Error as e:
+                self.logger.warning(f"Error closing OCR job journal: {e}")
+            finally:
+                self._connection = None
\ No newline at end of file
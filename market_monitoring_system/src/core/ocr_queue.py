@@ -3,17 +3,25 @@ OCR processing queue for market monitoring system.
 Handles asynchronous OCR requests with priority queuing and retry logic.
 """
 
+import asyncio
 import logging
 import threading
 import queue
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Callable
+from typing import Optional, Dict, Any, List, Callable, Union, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 
+from .fair_job_queue import FairJobQueue
+from .ocr_job_journal import OCRJobJournal, JournalRecord
+from .ocr_request_packer import OCRRequestPacker, PackedImage
+from .rate_limiter import TokenBucket, CircuitBreaker, RetryScheduler
+from .simple_ocr_client import OCRRateLimitError
+
 
 class OCRJobStatus(Enum):
     """Status of OCR processing job."""
@@ -36,21 +44,38 @@ class OCRJobPriority(Enum):
 class OCRJob:
     """OCR processing job."""
     job_id: str
-    image_path: Path
+    image_path: Optional[Path]  # None for in-memory jobs
     hotkey: str
     priority: OCRJobPriority = OCRJobPriority.NORMAL
     language_codes: Optional[List[str]] = None
     cleanup_image: bool = True
     callback: Optional[Callable] = None
+    layout: bool = False  # Request line positions; result is then a dict with 'text' and 'lines'
+    image_data: Optional[bytes] = field(default=None, repr=False)  # Encoded image for in-memory jobs
     created_at: datetime = field(default_factory=datetime.now)
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     status: OCRJobStatus = OCRJobStatus.PENDING
     attempts: int = 0
     max_attempts: int = 3
-    result: Optional[str] = None
+    rate_limit_hits: int = 0  # Rejections with HTTP 429, not counted as attempts
+    context: Dict[str, Any] = field(default_factory=dict)  # Submitter data journaled to rebuild the callback
+    group_id: Optional[str] = None  # Group of a chunk job
+    chunk_index: Optional[int] = None  # Position of a chunk job in its group
+    allow_packing: bool = True  # Cleared after a failed packed request so the retry goes alone
+    result: Optional[Any] = None
     error: Optional[str] = None
     
+    @property
+    def payload_size(self) -> int:
+        """Encoded image size in bytes, 0 if the file is gone."""
+        if self.image_data is not None:
+            return len(self.image_data)
+        try:
+            return self.image_path.stat().st_size
+        except (AttributeError, OSError):
+            return 0
+    
     def __lt__(self, other):
         """Compare jobs for priority queue ordering."""
         if not isinstance(other, OCRJob):
@@ -61,6 +86,21 @@ class OCRJob:
         return self.created_at < other.created_at
 
 
+@dataclass
+class OCRJobGroup:
+    """OCR jobs for the chunks of one oversize merge, completed as a unit."""
+    job_id: str
+    hotkey: str
+    job_ids: List[str] = field(default_factory=list)
+    callback: Optional[Callable] = None
+    chunk_results: List[Optional[str]] = field(default_factory=list)
+    created_at: datetime = field(default_factory=datetime.now)
+    completed_at: Optional[datetime] = None
+    status: OCRJobStatus = OCRJobStatus.PENDING
+    result: Optional[str] = None  # Chunk texts joined in chunk order
+    error: Optional[str] = None
+
+
 class OCRProcessingError(Exception):
     """Exception raised for OCR processing errors."""
     pass
@@ -70,25 +110,60 @@ class OCRQueue:
     """
     Asynchronous OCR processing queue with worker threads.
     Handles job queuing, prioritization, retry logic, and result callbacks.
+    In async dispatch mode a single event loop thread keeps up to max_in_flight
+    requests open through the client's asyncio session instead of blocking
+    one worker thread per request; callbacks then run on num_workers threads.
+    Requests are paced by an optional token bucket and held back while an
+    optional circuit breaker is open, so jobs wait in the queue instead of
+    failing; retries wait on one delay heap instead of a thread each.
+    With an optional journal every job is persisted from submission until its
+    callback has run, and recover_jobs() replays what a crash left unfinished.
+    With an optional packer, small images waiting in a backed-up queue share
+    one composite OCR request.
     """
     
-    def __init__(self, ocr_client, num_workers: int = 2, max_queue_size: int = 100):
+    def __init__(self, ocr_client, num_workers: int = 2, max_queue_size: int = 100,
+                 async_dispatch: bool = False, max_in_flight: int = 8,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 max_rate_limit_retries: int = 10,
+                 job_queue: Optional[FairJobQueue] = None,
+                 journal: Optional[OCRJobJournal] = None,
+                 packer: Optional[OCRRequestPacker] = None):
         """
         Initialize OCR queue.
         
         Args:
             ocr_client: OCR client instance
-            num_workers: Number of worker threads
+            num_workers: Number of worker threads (callback threads in async mode)
             max_queue_size: Maximum queue size before blocking
+            async_dispatch: Dispatch jobs with ocr_client.process_image_async on an event loop
+            max_in_flight: Maximum concurrent requests in async mode
+            rate_limiter: Optional token bucket matching the API request quota
+            circuit_breaker: Optional breaker pausing requests on consecutive errors or 429s
+            max_rate_limit_retries: Rate limit rejections after which a job fails
+            job_queue: Optional fair queue sharing capacity between hotkeys, replaces the priority queue
+            journal: Optional durable job journal; images are then kept until their job is committed
+            packer: Optional packer combining small images into one request under backlog
         """
         self.ocr_client = ocr_client
         self.num_workers = num_workers
         self.max_queue_size = max_queue_size
+        self.async_dispatch = async_dispatch
+        self.max_in_flight = max(1, max_in_flight)
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.journal = journal
+        self.packer = packer
         self.logger = logging.getLogger(__name__)
         
         # Queue and threading
-        self.job_queue = queue.PriorityQueue(maxsize=max_queue_size)
+        self.job_queue = job_queue if job_queue is not None else queue.PriorityQueue(maxsize=max_queue_size)
         self.workers = []
+        self._dispatcher: Optional[threading.Thread] = None
+        self.retry_scheduler = RetryScheduler(self._requeue_job, name="OCRRetryScheduler")
+        self._throttle_lock = threading.Lock()
         self.is_running = False
         self._shutdown_event = threading.Event()
         self._lock = threading.Lock()
@@ -97,22 +172,38 @@ class OCRQueue:
         self.active_jobs: Dict[str, OCRJob] = {}
         self.completed_jobs: Dict[str, OCRJob] = {}
         self.failed_jobs: Dict[str, OCRJob] = {}
+        self.job_groups: Dict[str, OCRJobGroup] = {}
+        self._group_lock = threading.Lock()
         
         # Statistics
         self.stats = {
             'total_jobs_queued': 0,
             'total_jobs_completed': 0,
             'total_jobs_failed': 0,
+            'total_jobs_cancelled': 0,
             'jobs_in_queue': 0,
             'active_workers': 0,
             'average_processing_time': 0.0,
             'queue_wait_time': 0.0,
-            'last_activity': None
+            'last_activity': None,
+            'total_groups_submitted': 0,
+            'total_groups_completed': 0,
+            'total_groups_failed': 0,
+            'requests_in_flight': 0,
+            'max_requests_in_flight': 0,
+            'retries_scheduled': 0,
+            'rate_limited_attempts': 0,
+            'total_throttle_wait': 0.0,
+            'jobs_recovered': 0,
+            'packed_requests': 0,
+            'packed_jobs': 0,
+            'cache_hits': 0
         }
         
         # Cleanup old completed/failed jobs periodically
         self.max_job_history = 1000
         self.job_cleanup_interval = 3600  # 1 hour
+        self.max_retry_delay = 30.0  # Cap of the exponential retry backoff in seconds
         self.last_cleanup = time.time()
     
     def start(self) -> None:
@@ -123,6 +214,17 @@ class OCRQueue:
         
         self.is_running = True
         self._shutdown_event.clear()
+        self.retry_scheduler.start()
+        
+        if self.async_dispatch:
+            self._dispatcher = threading.Thread(
+                target=self._dispatcher_main,
+                name="OCRDispatcher",
+                daemon=True
+            )
+            self._dispatcher.start()
+            self.logger.info(f"OCR queue started with async dispatcher ({self.max_in_flight} requests in flight)")
+            return
         
         # Start worker threads
         for i in range(self.num_workers):
@@ -145,6 +247,9 @@ class OCRQueue:
         self.is_running = False
         self._shutdown_event.set()
         
+        # Jobs waiting for a retry are pending again and cancelled below
+        self.retry_scheduler.stop()
+        
         # Cancel all pending jobs
         self._cancel_pending_jobs()
         
@@ -155,23 +260,36 @@ class OCRQueue:
                 self.logger.warning(f"Worker {worker.name} did not stop gracefully")
         
         self.workers.clear()
+        
+        if self._dispatcher:
+            self._dispatcher.join(timeout=timeout)
+            if self._dispatcher.is_alive():
+                self.logger.warning("OCR dispatcher did not stop gracefully")
+            self._dispatcher = None
+        
         self.logger.info("OCR queue stopped")
     
-    def submit_job(self, image_path: Path, hotkey: str,
+    def submit_job(self, image_path: Optional[Path], hotkey: str,
                    priority: OCRJobPriority = OCRJobPriority.NORMAL,
                    language_codes: Optional[List[str]] = None,
                    cleanup_image: bool = True,
-                   callback: Optional[Callable] = None) -> str:
+                   callback: Optional[Callable] = None,
+                   layout: bool = False,
+                   image_data: Optional[bytes] = None,
+                   context: Optional[Dict[str, Any]] = None) -> str:
         """
         Submit OCR job to queue.
         
         Args:
-            image_path: Path to image file
+            image_path: Path to image file (None when image_data is given)
             hotkey: Hotkey that triggered the job
             priority: Job priority
             language_codes: Optional language codes
             cleanup_image: Whether to cleanup image after processing
             callback: Optional callback function for results
+            layout: Whether to request text with line positions
+            image_data: Encoded image bytes for in-memory processing
+            context: JSON-serializable data journaled with the job for recover_jobs()
             
         Returns:
             Job ID string
@@ -179,39 +297,191 @@ class OCRQueue:
         Raises:
             OCRProcessingError: If queue is full or system is not running
         """
+        job = self._create_job(image_path, hotkey, priority, language_codes,
+                               cleanup_image, callback, layout, image_data, context)
+        self._enqueue_job(job)
+        return job.job_id
+    
+    def _create_job(self, image_path: Optional[Path], hotkey: str, priority: OCRJobPriority,
+                    language_codes: Optional[List[str]], cleanup_image: bool,
+                    callback: Optional[Callable], layout: bool,
+                    image_data: Optional[bytes], context: Optional[Dict[str, Any]]) -> OCRJob:
+        """
+        Validate submission and create job.
+        
+        Raises:
+            OCRProcessingError: If system is not running or the image is missing
+        """
         if not self.is_running:
             raise OCRProcessingError("OCR queue is not running")
         
-        if not image_path.exists():
-            raise OCRProcessingError(f"Image file not found: {image_path}")
+        if image_data is None:
+            if image_path is None or not image_path.exists():
+                raise OCRProcessingError(f"Image file not found: {image_path}")
+        elif not image_data:
+            raise OCRProcessingError("Empty image data")
         
         # Create job
         job_id = f"ocr_{hotkey}_{int(time.time())}_{uuid.uuid4().hex[:8]}"
-        job = OCRJob(
+        return OCRJob(
             job_id=job_id,
             image_path=image_path,
             hotkey=hotkey,
             priority=priority,
             language_codes=language_codes,
             cleanup_image=cleanup_image,
-            callback=callback
+            callback=callback,
+            layout=layout,
+            image_data=image_data,
+            context=dict(context or {})
         )
+    
+    def _enqueue_job(self, job: OCRJob, chunk_count: Optional[int] = None) -> None:
+        """
+        Journal job and add it to the queue.
+        
+        Raises:
+            OCRProcessingError: If queue is full
+        """
+        if self.journal:
+            self.journal.record_submission(job, job.group_id, job.chunk_index, chunk_count)
         
         try:
             # Add to queue (this may block if queue is full)
             self.job_queue.put(job, timeout=5.0)
             
             with self._lock:
-                self.active_jobs[job_id] = job
+                self.active_jobs[job.job_id] = job
                 self.stats['total_jobs_queued'] += 1
                 self.stats['jobs_in_queue'] = self.job_queue.qsize()
             
-            self.logger.debug(f"Queued OCR job {job_id} for {hotkey} with priority {priority.name}")
-            return job_id
+            self.logger.debug(f"Queued OCR job {job.job_id} for {job.hotkey} with priority {job.priority.name}")
             
         except queue.Full:
+            if self.journal:
+                job.status = OCRJobStatus.CANCELLED
+                job.error = "OCR queue is full"
+                self.journal.mark_finished(job)
             raise OCRProcessingError("OCR queue is full, try again later")
     
+    def submit_job_group(self, images: List[Union[Path, bytes]], hotkey: str,
+                         priority: OCRJobPriority = OCRJobPriority.NORMAL,
+                         language_codes: Optional[List[str]] = None,
+                         cleanup_image: bool = True,
+                         callback: Optional[Callable] = None,
+                         context: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Submit chunk images of one merge as parallel OCR jobs.
+        The callback is called once with an OCRJobGroup: completed with the chunk
+        texts joined in order, or failed as soon as one chunk fails for good.
+        
+        Args:
+            images: Chunk image paths or encoded bytes, in column order
+            hotkey: Hotkey that triggered the jobs
+            priority: Job priority
+            language_codes: Optional language codes
+            cleanup_image: Whether to cleanup chunk images after processing
+            callback: Optional callback receiving the finished OCRJobGroup
+            context: JSON-serializable data journaled with every chunk for recover_jobs()
+        
+        Returns:
+            Group ID string
+        
+        Raises:
+            OCRProcessingError: If a chunk could not be queued
+        """
+        if not images:
+            raise OCRProcessingError("No chunk images to submit")
+        
+        group = OCRJobGroup(
+            job_id=f"ocrgroup_{hotkey}_{int(time.time())}_{uuid.uuid4().hex[:8]}",
+            hotkey=hotkey,
+            callback=callback,
+            chunk_results=[None] * len(images)
+        )
+        with self._group_lock:
+            self.job_groups[group.job_id] = group
+        
+        try:
+            for index, image in enumerate(images):
+                in_memory = isinstance(image, (bytes, bytearray))
+                job = self._create_job(
+                    image_path=None if in_memory else image,
+                    hotkey=hotkey,
+                    priority=priority,
+                    language_codes=language_codes,
+                    cleanup_image=cleanup_image,
+                    callback=lambda job, index=index: self._handle_group_chunk(group, index, job),
+                    layout=False,
+                    image_data=image if in_memory else None,
+                    context=context
+                )
+                job.group_id = group.job_id
+                job.chunk_index = index
+                self._enqueue_job(job, chunk_count=len(images))
+                with self._group_lock:
+                    group.job_ids.append(job.job_id)
+        except OCRProcessingError:
+            with self._group_lock:
+                group.status = OCRJobStatus.CANCELLED
+                self.job_groups.pop(group.job_id, None)
+                submitted = list(group.job_ids)
+            self._cancel_group_jobs(submitted)
+            if cleanup_image:
+                for image in images[len(submitted):]:
+                    if isinstance(image, Path):
+                        image.unlink(missing_ok=True)
+            raise
+        
+        with self._lock:
+            self.stats['total_groups_submitted'] += 1
+        
+        self.logger.debug(f"Queued OCR job group {group.job_id} with {len(images)} chunks for {hotkey}")
+        return group.job_id
+    
+    def _handle_group_chunk(self, group: OCRJobGroup, index: int, job: OCRJob) -> None:
+        """Record a finished chunk job and complete its group when possible."""
+        with self._group_lock:
+            if group.status != OCRJobStatus.PENDING:
+                return
+            
+            if job.status == OCRJobStatus.COMPLETED:
+                result = job.result
+                group.chunk_results[index] = result['text'] if isinstance(result, dict) else result
+                if any(text is None for text in group.chunk_results):
+                    return
+                group.status = OCRJobStatus.COMPLETED
+                group.result = "\n".join(group.chunk_results)
+                siblings = []
+            else:
+                group.status = OCRJobStatus.FAILED
+                group.error = f"Chunk {index + 1}/{len(group.chunk_results)} failed: {job.error}"
+                siblings = [job_id for job_id in group.job_ids if job_id != job.job_id]
+            
+            group.completed_at = datetime.now()
+            self.job_groups.pop(group.job_id, None)
+        
+        # Remaining chunks of a failed group are useless
+        self._cancel_group_jobs(siblings)
+        
+        with self._lock:
+            key = 'total_groups_completed' if group.status == OCRJobStatus.COMPLETED else 'total_groups_failed'
+            self.stats[key] += 1
+        
+        if group.callback:
+            try:
+                group.callback(group)
+            except Exception as e:
+                self.logger.error(f"Job group callback failed for {group.job_id}: {e}")
+    
+    def _cancel_group_jobs(self, job_ids: List[str]) -> None:
+        """Cancel pending chunk jobs and remove their chunk files."""
+        for job_id in job_ids:
+            if self.cancel_job(job_id):
+                job = self.get_job_status(job_id)
+                if job and job.cleanup_image and job.image_path:
+                    job.image_path.unlink(missing_ok=True)
+    
     def get_job_status(self, job_id: str) -> Optional[OCRJob]:
         """Get job status by ID."""
         with self._lock:
@@ -230,17 +500,168 @@ class OCRQueue:
         return None
     
     def cancel_job(self, job_id: str) -> bool:
-        """Cancel a job if it's still pending."""
+        """
+        Cancel a job if it's still pending.
+        The job leaves the active jobs for the failed job history; its queue
+        entry is skipped by the workers.
+        """
         with self._lock:
-            if job_id in self.active_jobs:
-                job = self.active_jobs[job_id]
-                if job.status == OCRJobStatus.PENDING:
+            job = self.active_jobs.get(job_id)
+            if job is None or job.status != OCRJobStatus.PENDING:
+                return False
+            job.status = OCRJobStatus.CANCELLED
+            job.completed_at = datetime.now()
+            job.image_data = None
+            self.active_jobs.pop(job_id)
+            self.failed_jobs[job_id] = job
+            self.stats['total_jobs_cancelled'] += 1
+        
+        if self.journal:
+            self.journal.record_transition(job)
+            self.journal.mark_finished(job)
+        self.logger.info(f"Cancelled OCR job {job_id}")
+        return True
+    
+    def recover_jobs(self, resolve_callback: Optional[Callable[[str, Dict[str, Any]], Optional[Callable]]] = None) -> int:
+        """
+        Replay jobs a crash or restart left unfinished in the journal.
+        Jobs whose outcome was recorded only run their callback again, the others
+        are queued again. Reads only unfinished jobs and the groups they belong to.
+        
+        Args:
+            resolve_callback: Function building the job or group callback from hotkey and journaled context
+        
+        Returns:
+            Number of recovered jobs
+        
+        Raises:
+            OCRProcessingError: If system is not running
+        """
+        if not self.journal:
+            return 0
+        if not self.is_running:
+            raise OCRProcessingError("OCR queue is not running")
+        
+        self.journal.prune()
+        records = self.journal.load_unfinished()
+        if not records:
+            return 0
+        
+        groups: Dict[str, Optional[OCRJobGroup]] = {}
+        recovered = 0
+        
+        for record in records:
+            job = self._job_from_record(record)
+            
+            if record.group_id:
+                if record.group_id not in groups:
+                    callback = resolve_callback(record.hotkey, record.context) if resolve_callback else None
+                    groups[record.group_id] = self._recover_group(record, callback)
+                group = groups[record.group_id]
+                
+                if group is None or group.status != OCRJobStatus.PENDING:
+                    # Group already failed or was never fully submitted, its chunks are useless
                     job.status = OCRJobStatus.CANCELLED
                     job.completed_at = datetime.now()
-                    self.logger.info(f"Cancelled OCR job {job_id}")
-                    return True
+                    self.journal.mark_finished(job)
+                    if job.cleanup_image and job.image_path:
+                        job.image_path.unlink(missing_ok=True)
+                    continue
+                job.callback = lambda job, group=group, index=record.chunk_index: self._handle_group_chunk(group, index, job)
+            else:
+                job.callback = resolve_callback(record.hotkey, record.context) if resolve_callback else None
+            
+            if self._resume_job(job):
+                recovered += 1
+        
+        with self._lock:
+            self.stats['jobs_recovered'] += recovered
         
-        return False
+        self.logger.info(f"Recovered {recovered} of {len(records)} unfinished OCR jobs from journal")
+        return recovered
+    
+    def _job_from_record(self, record: JournalRecord) -> OCRJob:
+        """Rebuild job from its journal record."""
+        job = OCRJob(
+            job_id=record.job_id,
+            image_path=record.image_path,
+            hotkey=record.hotkey,
+            priority=OCRJobPriority(record.priority),
+            language_codes=record.language_codes,
+            cleanup_image=record.cleanup_image,
+            layout=record.layout,
+            image_data=record.image_data,
+            created_at=datetime.fromtimestamp(record.created_at),
+            status=OCRJobStatus(record.status),
+            attempts=record.attempts,
+            max_attempts=record.max_attempts,
+            result=record.result,
+            error=record.error,
+            context=record.context,
+            group_id=record.group_id,
+            chunk_index=record.chunk_index
+        )
+        
+        if job.status == OCRJobStatus.PROCESSING:
+            # The interrupted attempt never got an answer
+            job.attempts = max(0, job.attempts - 1)
+        return job
+    
+    def _recover_group(self, record: JournalRecord, callback: Optional[Callable]) -> Optional[OCRJobGroup]:
+        """Rebuild job group with the chunk results already recorded, None if it cannot complete."""
+        chunks = self.journal.load_group(record.group_id)
+        if len(chunks) != record.chunk_count:
+            return None
+        
+        group = OCRJobGroup(
+            job_id=record.group_id,
+            hotkey=record.hotkey,
+            job_ids=[chunk.job_id for chunk in chunks],
+            callback=callback,
+            chunk_results=[None] * record.chunk_count
+        )
+        
+        for chunk in chunks:
+            if chunk.finished and chunk.status in (OCRJobStatus.FAILED.value, OCRJobStatus.CANCELLED.value):
+                # Group failure was already committed
+                return None
+            if chunk.status == OCRJobStatus.COMPLETED.value and chunk.result:
+                result = chunk.result
+                group.chunk_results[chunk.chunk_index] = result['text'] if isinstance(result, dict) else result
+        
+        with self._group_lock:
+            self.job_groups[group.job_id] = group
+        return group
+    
+    def _resume_job(self, job: OCRJob) -> bool:
+        """Commit a recorded outcome or queue job again; False if it stays in the journal."""
+        with self._lock:
+            self.active_jobs[job.job_id] = job
+        
+        if job.status == OCRJobStatus.COMPLETED:
+            self._complete_job(job, job.result, time.time())
+            return True
+        if job.status == OCRJobStatus.FAILED:
+            self._handle_failed_job(job, job.error or "Unknown error")
+            return True
+        
+        if job.image_data is None and (job.image_path is None or not job.image_path.exists()):
+            self._handle_failed_job(job, f"Image lost before recovery: {job.image_path}")
+            return True
+        
+        job.status = OCRJobStatus.PENDING
+        try:
+            self.job_queue.put(job, timeout=5.0)
+        except queue.Full:
+            with self._lock:
+                self.active_jobs.pop(job.job_id, None)
+            self.logger.warning(f"OCR queue full, job {job.job_id} stays in journal for next recovery")
+            return False
+        
+        with self._lock:
+            self.stats['total_jobs_queued'] += 1
+            self.stats['jobs_in_queue'] = self.job_queue.qsize()
+        return True
     
     def _worker_loop(self) -> None:
         """Main worker thread loop."""
@@ -256,7 +677,16 @@ class OCRQueue:
                     if job.status == OCRJobStatus.CANCELLED:
                         continue
                     
-                    self._process_job(job, worker_name)
+                    # Cache hits never take a request slot
+                    if self._complete_from_cache(job, worker_name):
+                        continue
+                    
+                    # Packing may fall through to single requests, so it happens before a slot is taken
+                    batch = self._collect_batch(job)
+                    if len(batch) > 1:
+                        self._process_packed_jobs(batch, worker_name)
+                    elif self._wait_for_request_slot():
+                        self._process_job(job, worker_name)
                     
                 except queue.Empty:
                     # Normal timeout, continue loop
@@ -275,91 +705,507 @@ class OCRQueue:
         job_start_time = time.time()
         
         try:
-            # Update job status
-            job.status = OCRJobStatus.PROCESSING
-            job.started_at = datetime.now()
-            job.attempts += 1
+            self._begin_job(job, worker_name)
             
+            # Process image through OCR
+            if job.image_data is not None:
+                result = self.ocr_client.process_image_bytes(
+                    image_data=job.image_data,
+                    language_codes=job.language_codes,
+                    layout=job.layout
+                )
+            elif job.layout:
+                result = self.ocr_client.process_image_with_layout(
+                    image_path=job.image_path,
+                    cleanup_image=self._client_cleanup(job),
+                    language_codes=job.language_codes
+                )
+            else:
+                result = self.ocr_client.process_image_full_pipeline(
+                    image_path=job.image_path,
+                    cleanup_image=self._client_cleanup(job),
+                    language_codes=job.language_codes
+                )
+            
+            self._complete_job(job, result, job_start_time)
+        
+        except Exception as e:
+            self._handle_job_error(job, e)
+        
+        finally:
+            self._update_activity_stats()
+    
+    def _complete_from_cache(self, job: OCRJob, worker_name: str) -> bool:
+        """
+        Complete job from the OCR client's result cache without contacting the API.
+        Cache hits neither use a rate limiter token nor count towards the circuit breaker.
+        
+        Returns:
+            True if the job was answered from the cache
+        """
+        lookup = getattr(self.ocr_client, 'get_cached_result', None)
+        if lookup is None:
+            return False
+        
+        try:
+            result = lookup(image_path=job.image_path, image_data=job.image_data,
+                            language_codes=job.language_codes, layout=job.layout)
+        except Exception as e:
+            self.logger.debug(f"Cache lookup failed for job {job.job_id}: {e}")
+            return False
+        
+        if not result:
+            return False
+        
+        job_start_time = time.time()
+        try:
+            self._begin_job(job, worker_name)
+            self._complete_job(job, result, job_start_time, record_breaker=False)
+            if self.journal is None:
+                self._delete_image(job)
             with self._lock:
-                self.stats['active_workers'] = len([j for j in self.active_jobs.values() 
-                                                  if j.status == OCRJobStatus.PROCESSING])
+                self.stats['cache_hits'] += 1
+        except Exception as e:
+            self._handle_job_error(job, e, record_breaker=False)
+        finally:
+            self._update_activity_stats()
+        return True
+    
+    def _collect_batch(self, job: OCRJob) -> List[OCRJob]:
+        """Take further small queued jobs to pack with job while the queue is backed up."""
+        if (not self.packer or not self.packer.can_pack(job)
+                or self.job_queue.qsize() + 1 < self.packer.min_backlog):
+            return [job]
+        
+        batch = [job]
+        while len(batch) < self.packer.max_images:
+            try:
+                candidate = self.job_queue.get_nowait()
+            except queue.Empty:
+                break
             
-            self.logger.info(f"Worker {worker_name} processing job {job.job_id} (attempt {job.attempts})")
+            if candidate.status == OCRJobStatus.CANCELLED:
+                continue
+            if self.packer.can_pack(candidate) and candidate.language_codes == job.language_codes:
+                batch.append(candidate)
+            else:
+                # Back in line for a request of its own
+                self._requeue_job(candidate)
+                break
+        
+        return batch
+    
+    def _pack_jobs(self, batch: List[OCRJob]) -> Tuple[Optional[PackedImage], List[OCRJob]]:
+        """Compose batch into one image and requeue the jobs left out."""
+        packed, leftover = self.packer.pack(batch)
+        if packed is None:
+            # Send the head job alone next time instead of packing the same batch again
+            batch[0].allow_packing = False
+        for job in leftover:
+            self._requeue_job(job)
+        
+        if packed is None:
+            return None, []
+        
+        packed_ids = set(packed.job_ids)
+        return packed, [job for job in batch if job.job_id in packed_ids]
+    
+    def _process_packed_jobs(self, batch: List[OCRJob], worker_name: str) -> None:
+        """Recognize several small jobs with one composite OCR request."""
+        job_start_time = time.time()
+        
+        try:
+            # No request slot is taken unless a composite is actually sent
+            packed, jobs = self._pack_jobs(batch)
+            if packed is None or not self._wait_for_request_slot():
+                return
             
-            # Process image through OCR
-            result = self.ocr_client.process_image_full_pipeline(
-                image_path=job.image_path,
-                cleanup_image=job.cleanup_image,
-                language_codes=job.language_codes
-            )
+            for job in jobs:
+                self._begin_job(job, worker_name)
+            try:
+                result = self.ocr_client.process_image_bytes(
+                    image_data=packed.data,
+                    language_codes=jobs[0].language_codes,
+                    layout=True
+                )
+                error = None
+            except Exception as e:
+                result, error = None, e
             
-            if result:
-                # Job completed successfully
-                job.status = OCRJobStatus.COMPLETED
-                job.result = result
-                job.completed_at = datetime.now()
-                
-                # Call callback if provided
-                if job.callback:
-                    try:
-                        job.callback(job)
-                    except Exception as e:
-                        self.logger.error(f"Job callback failed for {job.job_id}: {e}")
-                
-                # Move to completed jobs
+            self._finish_packed_jobs(jobs, packed, result, error, job_start_time)
+        
+        finally:
+            self._update_activity_stats()
+    
+    async def _process_packed_jobs_async(self, batch: List[OCRJob], slots: asyncio.Semaphore,
+                                         callbacks: ThreadPoolExecutor) -> None:
+        """Recognize several small jobs with one composite OCR request on the dispatcher event loop."""
+        loop = asyncio.get_running_loop()
+        job_start_time = time.time()
+        
+        try:
+            # Decoding and composing is CPU work, keep it off the event loop
+            packed, jobs = await loop.run_in_executor(callbacks, self._pack_jobs, batch)
+            if packed is None or not await self._wait_for_request_slot_async():
+                return
+            
+            for job in jobs:
+                self._begin_job(job, "OCRDispatcher")
+            with self._lock:
+                self.stats['requests_in_flight'] += 1
+                self.stats['max_requests_in_flight'] = max(
+                    self.stats['max_requests_in_flight'], self.stats['requests_in_flight']
+                )
+            try:
+                result = await self.ocr_client.process_image_async(
+                    image_data=packed.data,
+                    cleanup_image=False,
+                    language_codes=jobs[0].language_codes,
+                    layout=True
+                )
+                error = None
+            except Exception as e:
+                result, error = None, e
+            finally:
                 with self._lock:
-                    self.active_jobs.pop(job.job_id, None)
-                    self.completed_jobs[job.job_id] = job
-                    self.stats['total_jobs_completed'] += 1
-                    self._update_processing_time_stats(time.time() - job_start_time)
-                
-                self.logger.info(f"Job {job.job_id} completed successfully in {time.time() - job_start_time:.3f}s")
+                    self.stats['requests_in_flight'] -= 1
             
-            else:
-                # OCR returned no result
-                raise OCRProcessingError("OCR processing returned no result")
+            await loop.run_in_executor(callbacks, self._finish_packed_jobs, jobs, packed, result, error, job_start_time)
         
-        except Exception as e:
-            self.logger.error(f"Job {job.job_id} failed on attempt {job.attempts}: {e}")
+        finally:
+            self._update_activity_stats()
+            slots.release()
+    
+    def _finish_packed_jobs(self, jobs: List[OCRJob], packed: PackedImage, result: Optional[Dict[str, Any]],
+                            error: Optional[Exception], job_start_time: float) -> None:
+        """Split a composite result back to its jobs, or fail the attempt of every packed job."""
+        if error is None and not result:
+            error = OCRProcessingError("Packed OCR request returned no result")
+        
+        if error is not None:
+            for index, job in enumerate(jobs):
+                if not isinstance(error, OCRRateLimitError):
+                    # Retry alone so one unreadable image cannot fail the others again
+                    job.allow_packing = False
+                self._handle_job_error(job, error, record_breaker=index == 0)
+            return
+        
+        with self._lock:
+            self.stats['packed_requests'] += 1
+            self.stats['packed_jobs'] += len(jobs)
+        
+        results = self.packer.split(packed, result, [job.job_id for job in jobs if job.layout])
+        for job in jobs:
+            try:
+                self._complete_job(job, results[job.job_id], job_start_time)
+                if self.journal is None:
+                    self._delete_image(job)
+            except Exception as e:
+                job.allow_packing = False
+                self._handle_job_error(job, e, record_breaker=False)
+    
+    def _client_cleanup(self, job: OCRJob) -> bool:
+        """Whether the OCR client deletes the image; journaled images wait for the commit."""
+        return job.cleanup_image and self.journal is None
+    
+    def _finish_job(self, job: OCRJob) -> None:
+        """Commit job outcome to the journal and delete its retained image."""
+        if not self.journal:
+            return
+        
+        self.journal.mark_finished(job)
+        self._delete_image(job)
+    
+    def _delete_image(self, job: OCRJob) -> None:
+        """Delete image file of a completed job submitted with cleanup_image."""
+        if job.status == OCRJobStatus.COMPLETED and job.cleanup_image and job.image_path:
+            try:
+                job.image_path.unlink(missing_ok=True)
+            except OSError as e:
+                self.logger.warning(f"Failed to cleanup image {job.image_path}: {e}")
+    
+    def _request_delay(self) -> float:
+        """
+        Seconds to wait before the next OCR request, 0 once it may be sent.
+        A returned 0 has taken the breaker probe and a rate limiter token.
+        """
+        # Workers and the dispatcher check and take the token atomically
+        with self._throttle_lock:
+            if self.rate_limiter:
+                wait = self.rate_limiter.time_until_available()
+                if wait > 0:
+                    return wait
             
-            # Check if we should retry
-            if job.attempts < job.max_attempts:
-                # Requeue for retry with exponential backoff
-                retry_delay = min(30, 2 ** job.attempts)
-                self.logger.info(f"Requeuing job {job.job_id} for retry in {retry_delay}s")
-                
-                def requeue_job():
-                    time.sleep(retry_delay)
-                    if self.is_running:
-                        job.status = OCRJobStatus.PENDING
-                        try:
-                            self.job_queue.put(job, timeout=1.0)
-                        except queue.Full:
-                            self._handle_failed_job(job, "Failed to requeue: queue full")
+            if self.circuit_breaker and not self.circuit_breaker.allow_request():
+                # Open circuit, or half-open with the probe request still running
+                return self.circuit_breaker.retry_after() or 0.1
+            
+            if self.rate_limiter:
+                self.rate_limiter.try_acquire()
+            return 0.0
+    
+    def _wait_for_request_slot(self) -> bool:
+        """Block until an OCR request may be sent; False when the queue is stopping."""
+        wait_start = time.time()
+        try:
+            while True:
+                delay = self._request_delay()
+                if delay <= 0:
+                    return True
+                if self._shutdown_event.wait(min(delay, 1.0)):
+                    return False
+        finally:
+            with self._lock:
+                self.stats['total_throttle_wait'] += time.time() - wait_start
+    
+    async def _wait_for_request_slot_async(self) -> bool:
+        """Wait on the event loop until an OCR request may be sent; False when stopping."""
+        wait_start = time.time()
+        try:
+            while self.is_running:
+                delay = self._request_delay()
+                if delay <= 0:
+                    return True
+                await asyncio.sleep(min(delay, 1.0))
+            return False
+        finally:
+            with self._lock:
+                self.stats['total_throttle_wait'] += time.time() - wait_start
+    
+    def _dispatcher_main(self) -> None:
+        """Async dispatcher thread entry point."""
+        self.logger.debug("OCR dispatcher started")
+        try:
+            asyncio.run(self._dispatch_loop())
+        except Exception as e:
+            self.logger.error(f"OCR dispatcher crashed: {e}")
+        finally:
+            self.logger.debug("OCR dispatcher stopped")
+    
+    def _next_job(self) -> Optional[OCRJob]:
+        """Take next job from the queue, None after a short idle wait."""
+        try:
+            return self.job_queue.get(timeout=1.0)
+        except queue.Empty:
+            return None
+    
+    async def _dispatch_loop(self) -> None:
+        """Start a request task for each queued job while a request slot is free."""
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.max_in_flight)
+        tasks = set()
+        
+        # Jobs are taken only when a slot is free, so the priority queue keeps ordering the backlog
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="OCRFetch") as fetcher, \
+                ThreadPoolExecutor(max_workers=max(1, self.num_workers), thread_name_prefix="OCRCallback") as callbacks:
+            await self.ocr_client.open_async_session()
+            try:
+                while self.is_running and not self._shutdown_event.is_set():
+                    await slots.acquire()
+                    job = await loop.run_in_executor(fetcher, self._next_job)
+                    
+                    if job is None or job.status == OCRJobStatus.CANCELLED:
+                        slots.release()
+                        continue
+                    
+                    # Hashing for the cache lookup is CPU work, keep it off the event loop
+                    if await loop.run_in_executor(callbacks, self._complete_from_cache, job, "OCRDispatcher"):
+                        slots.release()
+                        continue
+                    
+                    batch = self._collect_batch(job)
+                    if len(batch) > 1:
+                        task = loop.create_task(self._process_packed_jobs_async(batch, slots, callbacks))
+                    elif await self._wait_for_request_slot_async():
+                        task = loop.create_task(self._process_job_async(job, slots, callbacks))
+                    else:
+                        slots.release()
+                        continue
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
                 
-                retry_thread = threading.Thread(target=requeue_job, daemon=True)
-                retry_thread.start()
-            else:
-                # Max attempts reached, mark as failed
-                self._handle_failed_job(job, str(e))
+                # Let requests already sent finish before closing the session
+                if tasks:
+                    await asyncio.wait(tasks)
+            finally:
+                await self.ocr_client.close_async_session()
+    
+    async def _process_job_async(self, job: OCRJob, slots: asyncio.Semaphore,
+                                 callbacks: ThreadPoolExecutor) -> None:
+        """Process a single OCR job on the dispatcher event loop."""
+        loop = asyncio.get_running_loop()
+        job_start_time = time.time()
+        
+        try:
+            self._begin_job(job, "OCRDispatcher")
+            
+            with self._lock:
+                self.stats['requests_in_flight'] += 1
+                self.stats['max_requests_in_flight'] = max(
+                    self.stats['max_requests_in_flight'], self.stats['requests_in_flight']
+                )
+            try:
+                result = await self.ocr_client.process_image_async(
+                    image_path=job.image_path,
+                    image_data=job.image_data,
+                    cleanup_image=self._client_cleanup(job),
+                    language_codes=job.language_codes,
+                    layout=job.layout
+                )
+            finally:
+                with self._lock:
+                    self.stats['requests_in_flight'] -= 1
+            
+            # Callbacks parse and store results, keep them off the event loop
+            await loop.run_in_executor(callbacks, self._complete_job, job, result, job_start_time)
+        
+        except Exception as e:
+            await loop.run_in_executor(callbacks, self._handle_job_error, job, e)
         
         finally:
-            # Update statistics
+            self._update_activity_stats()
+            slots.release()
+    
+    def _begin_job(self, job: OCRJob, worker_name: str) -> None:
+        """Mark job as processing and count the attempt."""
+        job.status = OCRJobStatus.PROCESSING
+        job.started_at = datetime.now()
+        job.attempts += 1
+        
+        if self.journal:
+            self.journal.record_transition(job)
+        
+        with self._lock:
+            self.stats['active_workers'] = len([j for j in self.active_jobs.values() 
+                                              if j.status == OCRJobStatus.PROCESSING])
+        
+        self.logger.info(f"Worker {worker_name} processing job {job.job_id} (attempt {job.attempts})")
+    
+    def _complete_job(self, job: OCRJob, result: Optional[Any], job_start_time: float,
+                      record_breaker: bool = True) -> None:
+        """
+        Complete job with its OCR result and run the callback.
+        A result served from the cache passes record_breaker=False.
+        
+        Raises:
+            OCRProcessingError: If OCR returned no result
+        """
+        if not result:
+            # OCR returned no result
+            raise OCRProcessingError("OCR processing returned no result")
+        
+        if self.circuit_breaker and record_breaker:
+            self.circuit_breaker.record_success()
+        
+        # Job completed successfully
+        job.status = OCRJobStatus.COMPLETED
+        job.result = result
+        job.completed_at = datetime.now()
+        job.image_data = None  # Do not keep image bytes in job history
+        
+        # Result is durable before the callback, a crash then only replays the callback
+        if self.journal:
+            self.journal.record_result(job)
+        
+        # Call callback if provided
+        if job.callback:
+            try:
+                job.callback(job)
+            except Exception as e:
+                self.logger.error(f"Job callback failed for {job.job_id}: {e}")
+        
+        self._finish_job(job)
+        
+        # Move to completed jobs
+        with self._lock:
+            self.active_jobs.pop(job.job_id, None)
+            self.completed_jobs[job.job_id] = job
+            self.stats['total_jobs_completed'] += 1
+            self._update_processing_time_stats(time.time() - job_start_time)
+        
+        self.logger.info(f"Job {job.job_id} completed successfully in {time.time() - job_start_time:.3f}s")
+    
+    def _handle_job_error(self, job: OCRJob, error: Exception, record_breaker: bool = True) -> None:
+        """
+        Schedule retry of a failed attempt with backoff or fail the job for good.
+        
+        Args:
+            job: Job whose attempt failed
+            error: Error of the attempt
+            record_breaker: Count the error in the circuit breaker (once per request)
+        """
+        self.logger.error(f"Job {job.job_id} failed on attempt {job.attempts}: {error}")
+        
+        rate_limited = isinstance(error, OCRRateLimitError)
+        if self.circuit_breaker and record_breaker:
+            self.circuit_breaker.record_failure(
+                rate_limited=rate_limited,
+                retry_after=error.retry_after if rate_limited else None
+            )
+        
+        if rate_limited:
+            # The API did not process the request, so it does not use up an attempt
+            job.attempts -= 1
+            job.rate_limit_hits += 1
             with self._lock:
-                self.stats['jobs_in_queue'] = self.job_queue.qsize()
-                self.stats['active_workers'] = len([j for j in self.active_jobs.values() 
-                                                  if j.status == OCRJobStatus.PROCESSING])
-                self.stats['last_activity'] = datetime.now().isoformat()
+                self.stats['rate_limited_attempts'] += 1
             
-            # Cleanup old jobs periodically
-            if time.time() - self.last_cleanup > self.job_cleanup_interval:
-                self._cleanup_old_jobs()
+            if job.rate_limit_hits <= self.max_rate_limit_retries:
+                backoff = min(self.max_retry_delay, 2 ** job.rate_limit_hits)
+                self._schedule_retry(job, max(error.retry_after or 0.0, backoff))
+            else:
+                self._handle_failed_job(job, f"Rate limited {job.rate_limit_hits} times: {error}")
+            return
+        
+        # Check if we should retry
+        if job.attempts < job.max_attempts:
+            # Requeue for retry with exponential backoff
+            self._schedule_retry(job, min(self.max_retry_delay, 2 ** job.attempts))
+        else:
+            # Max attempts reached, mark as failed
+            self._handle_failed_job(job, str(error))
+    
+    def _schedule_retry(self, job: OCRJob, retry_delay: float) -> None:
+        """Put job on the retry delay heap; it waits as pending and can be cancelled."""
+        self.logger.info(f"Requeuing job {job.job_id} for retry in {retry_delay:.0f}s")
+        job.status = OCRJobStatus.PENDING
+        if self.journal:
+            self.journal.record_transition(job)
+        self.retry_scheduler.schedule(job, retry_delay)
+        with self._lock:
+            self.stats['retries_scheduled'] += 1
+    
+    def _requeue_job(self, job: OCRJob) -> None:
+        """Put job back on the queue once its retry delay has passed."""
+        if not self.is_running or job.status == OCRJobStatus.CANCELLED:
+            return
+        
+        try:
+            self.job_queue.put(job, timeout=1.0)
+        except queue.Full:
+            self._handle_failed_job(job, "Failed to requeue: queue full")
+    
+    def _update_activity_stats(self) -> None:
+        """Update queue statistics after an attempt and clean up old jobs periodically."""
+        with self._lock:
+            self.stats['jobs_in_queue'] = self.job_queue.qsize()
+            self.stats['active_workers'] = len([j for j in self.active_jobs.values() 
+                                              if j.status == OCRJobStatus.PROCESSING])
+            self.stats['last_activity'] = datetime.now().isoformat()
+        
+        # Cleanup old jobs periodically
+        if time.time() - self.last_cleanup > self.job_cleanup_interval:
+            self._cleanup_old_jobs()
     
     def _handle_failed_job(self, job: OCRJob, error_message: str) -> None:
         """Handle permanently failed job."""
         job.status = OCRJobStatus.FAILED
         job.error = error_message
         job.completed_at = datetime.now()
+        job.image_data = None
+        
+        if self.journal:
+            self.journal.record_transition(job)
         
         # Call callback if provided
         if job.callback:
@@ -368,6 +1214,8 @@ class OCRQueue:
             except Exception as e:
                 self.logger.error(f"Failed job callback failed for {job.job_id}: {e}")
         
+        self._finish_job(job)
+        
         # Move to failed jobs
         with self._lock:
             self.active_jobs.pop(job.job_id, None)
@@ -452,8 +1300,11 @@ class OCRQueue:
                 'completed_jobs_count': len(self.completed_jobs),
                 'failed_jobs_count': len(self.failed_jobs),
                 'worker_threads': len(self.workers),
+                'dispatch_mode': 'async' if self.async_dispatch else 'threads',
                 'queue_size': self.job_queue.qsize(),
-                'queue_maxsize': self.max_queue_size
+                'queue_maxsize': self.max_queue_size,
+                'active_groups_count': len(self.job_groups),
+                'retries_pending': self.retry_scheduler.pending_count
             })
             
             # Calculate success rate
@@ -472,6 +1323,17 @@ class OCRQueue:
                 ])
             stats['job_status_counts'] = status_counts
         
+        if isinstance(self.job_queue, FairJobQueue):
+            stats['hotkeys'] = self.job_queue.get_scheduling_statistics()
+        if self.rate_limiter:
+            stats['rate_limiter'] = self.rate_limiter.get_statistics()
+        if self.circuit_breaker:
+            stats['circuit_breaker'] = self.circuit_breaker.get_statistics()
+        if self.journal:
+            stats['journal'] = self.journal.get_journal_statistics()
+        if self.packer:
+            stats['packer'] = self.packer.get_packer_statistics()
+        
         return stats
     
     def get_recent_jobs(self, limit: int = 20) -> List[Dict[str, Any]]:
@@ -0,0 +1,202 @@
+"""
+Offline OCR text reprocessing for market monitoring system.
+Streams archived session texts through the text parser on a process pool and rebuilds items and changes with bulk writes.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .database_manager import DatabaseManager, ItemData
+from .name_canonicalizer import NameCanonicalizer
+from .text_parser import TextParser
+
+
+# Parser of a worker process, created once by the pool initializer
+_worker_parser: Optional[TextParser] = None
+
+
+class OCRReprocessorError(Exception):
+    """Exception raised for OCR reprocessing errors."""
+    pass
+
+
+def _init_worker() -> None:
+    """Worker initializer: one parser per process, without per-text info logs."""
+    global _worker_parser
+    logging.disable(logging.INFO)
+    _worker_parser = TextParser()
+
+
+def _parse_rows(rows: List[Tuple], parser: Optional[TextParser] = None) -> List[Tuple[int, str, List[ItemData]]]:
+    """
+    Worker task: decompress and parse a batch of archived texts.
+    
+    Args:
+        rows: Archive rows as yielded by DatabaseManager.iter_ocr_texts
+        parser: Parser to use in-process; the worker's own parser when None
+    
+    Returns:
+        Tuples of (session_id, created_at, items)
+    """
+    parser = parser or _worker_parser or TextParser()
+    results = []
+    
+    for session_id, hotkey, processing_type, screenshot_type, created_at, text_blob, layout_blob in rows:
+        text = zlib.decompress(text_blob).decode('utf-8')
+        processing_type = processing_type or 'full'
+        screenshot_type = screenshot_type or 'individual_seller_items'
+        
+        if layout_blob:
+            layout = {'text': text, 'lines': json.loads(zlib.decompress(layout_blob))}
+            result = parser.parse_layout(layout, hotkey, screenshot_type=screenshot_type,
+                                         processing_type=processing_type)
+        else:
+            result = parser.parse_items_data(text, hotkey, screenshot_type=screenshot_type,
+                                             processing_type=processing_type)
+        results.append((session_id, created_at, result.items))
+    
+    return results
+
+
+class OCRReprocessor:
+    """
+    Rebuilds item history of a time range from archived OCR text.
+    Batches of compressed texts are read with keyset pagination and parsed
+    in worker processes while earlier batches are written; every batch
+    replaces the items of its sessions in one transaction. Price, quantity
+    and new item changes of the range are then recomputed from the rebuilt
+    history, so no screenshot is captured or sent to OCR again.
+    """
+    
+    def __init__(self, database_manager: DatabaseManager, num_workers: int = 0, batch_size: int = 200,
+                 name_canonicalizer: Optional[NameCanonicalizer] = None):
+        """
+        Initialize OCR reprocessor.
+        
+        Args:
+            database_manager: Database manager with the OCR text archive
+            num_workers: Parser processes, 0 for CPU count, 1 to parse in-process
+            batch_size: Sessions per worker task and per bulk write
+            name_canonicalizer: Optional mapper of OCR name variants, applied before items are written
+        """
+        self.db = database_manager
+        self.name_canonicalizer = name_canonicalizer
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.batch_size = max(1, batch_size)
+        self.logger = logging.getLogger(__name__)
+        
+        # Statistics of the last run
+        self._stats = {
+            'sessions': 0,
+            'items_written': 0,
+            'changes_written': 0,
+            'batches': 0,
+            'parse_time': 0.0,
+            'write_time': 0.0,
+            'total_time': 0.0
+        }
+    
+    @staticmethod
+    def format_time(value: datetime) -> str:
+        """Format datetime like SQLite CURRENT_TIMESTAMP for range queries."""
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    
+    def reprocess(self, since: datetime, until: datetime, hotkey: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Reparse archived sessions of a time range and rebuild their items and changes.
+        
+        Args:
+            since: Start of the range, inclusive (UTC, like stored timestamps)
+            until: End of the range, exclusive
+            hotkey: Optional hotkey filter; changes are still rebuilt for the whole range
+        
+        Returns:
+            Dictionary with run statistics
+        
+        Raises:
+            OCRReprocessorError: If the range is empty or a worker process died
+        """
+        if until <= since:
+            raise OCRReprocessorError(f"Empty reprocessing range: {since} - {until}")
+        
+        start_time = time.perf_counter()
+        self._stats = {key: 0.0 if isinstance(value, float) else 0 for key, value in self._stats.items()}
+        since_text, until_text = self.format_time(since), self.format_time(until)
+        batches = self.db.iter_ocr_texts(since_text, until_text, hotkey, self.batch_size)
+        
+        try:
+            if self.num_workers == 1:
+                parser = TextParser()
+                for rows in batches:
+                    parse_start = time.perf_counter()
+                    results = _parse_rows(rows, parser)
+                    self._stats['parse_time'] += time.perf_counter() - parse_start
+                    self._write(results)
+            else:
+                self._reprocess_pooled(batches)
+        except BrokenProcessPool as e:
+            raise OCRReprocessorError(f"Reprocessing worker died: {e}")
+        
+        write_start = time.perf_counter()
+        self._stats['changes_written'] = self.db.rebuild_item_changes(since_text, until_text)
+        self._stats['write_time'] += time.perf_counter() - write_start
+        self._stats['total_time'] = time.perf_counter() - start_time
+        
+        self.logger.info(
+            f"Reprocessed {self._stats['sessions']} sessions from {since_text} to {until_text}: "
+            f"{self._stats['items_written']} items, {self._stats['changes_written']} changes "
+            f"in {self._stats['total_time']:.1f}s"
+        )
+        return self.get_reprocess_statistics()
+    
+    def _reprocess_pooled(self, batches) -> None:
+        """Parse batches on worker processes, keeping a bounded number in flight."""
+        max_in_flight = self.num_workers * 2
+        pending: List[Future] = []
+        
+        with ProcessPoolExecutor(max_workers=self.num_workers, initializer=_init_worker,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            for rows in batches:
+                pending.append(executor.submit(_parse_rows, rows))
+                if len(pending) >= max_in_flight:
+                    self._write(self._wait(pending.pop(0)))
+            
+            while pending:
+                self._write(self._wait(pending.pop(0)))
+    
+    def _wait(self, future: Future) -> List[Tuple[int, str, List[ItemData]]]:
+        """Wait for a worker result, counting the wait as parse time."""
+        wait_start = time.perf_counter()
+        results = future.result()
+        self._stats['parse_time'] += time.perf_counter() - wait_start
+        return results
+    
+    def _write(self, results: List[Tuple[int, str, List[ItemData]]]) -> None:
+        """Replace items of one parsed batch."""
+        write_start = time.perf_counter()
+        if self.name_canonicalizer:
+            for _, _, items in results:
+                self.name_canonicalizer.canonicalize_items(items)
+        self._stats['items_written'] += self.db.replace_session_items(results)
+        self._stats['write_time'] += time.perf_counter() - write_start
+        self._stats['sessions'] += len(results)
+        self._stats['batches'] += 1
+    
+    def get_reprocess_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics of the last reprocessing run.
+        
+        Returns:
+            Dictionary with reprocessing statistics
+        """
+        stats = self._stats.copy()
+        stats['sessions_per_second'] = stats['sessions'] / stats['total_time'] if stats['total_time'] else 0.0
+        return stats
\ No newline at end of file
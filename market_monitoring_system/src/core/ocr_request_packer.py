@@ -0,0 +1,263 @@
+"""
+OCR request packing for market monitoring system.
+Stacks small pending images into one composite OCR request and splits the recognized lines back per image.
+"""
+
+import io
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError as e:
+    PILLOW_AVAILABLE = False
+    PILLOW_ERROR = str(e)
+
+from .ocr_image_encoder import OCRImageEncoder, OCRImageEncoderError
+from .ocr_document import shift_layout_line
+
+
+@dataclass
+class PackedRegion:
+    """Placement of one job image in a composite."""
+    job_id: str
+    top: int
+    height: int
+    width: int
+
+
+@dataclass
+class PackedImage:
+    """Composite of several job images sent as one OCR request."""
+    data: bytes = field(repr=False)
+    regions: List[PackedRegion]
+    size: Tuple[int, int]  # Composite (width, height) before encoding
+    scale: float = 1.0  # Downscale applied by the encoder
+    
+    @property
+    def job_ids(self) -> List[str]:
+        """IDs of packed jobs in composite order."""
+        return [region.job_id for region in self.regions]
+
+
+class OCRRequestPackerError(Exception):
+    """Exception raised for OCR request packer errors."""
+    pass
+
+
+class OCRRequestPacker:
+    """
+    Packs small queued OCR images into one composite request.
+    Images are stacked top to bottom, left aligned, with white gaps so no
+    recognized line spans two of them. The request asks for line positions,
+    and each line is returned to the image holding its vertical center,
+    with coordinates relative to that image.
+    """
+    
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024,
+                 max_image_bytes: int = 512 * 1024,
+                 max_images: int = 8,
+                 max_height: int = 8000,
+                 min_backlog: int = 3,
+                 gap: int = 32,
+                 encoder: Optional[OCRImageEncoder] = None):
+        """
+        Initialize OCR request packer.
+        
+        Args:
+            max_bytes: Maximum encoded composite bytes
+            max_image_bytes: Largest job payload still considered small enough to pack
+            max_images: Maximum images per composite
+            max_height: Maximum composite height in pixels
+            min_backlog: Queued jobs from which packing starts
+            gap: White rows between images
+            encoder: Optional encoder for the composite; must not trim or collapse rows
+        
+        Raises:
+            OCRRequestPackerError: If Pillow is missing or the encoder changes geometry
+        """
+        if not PILLOW_AVAILABLE:
+            raise OCRRequestPackerError(f"Pillow library not available: {PILLOW_ERROR}")
+        
+        if encoder and (encoder.trim_margins or encoder.collapse_blank_rows):
+            raise OCRRequestPackerError("Composite encoder must keep image geometry")
+        
+        self.max_bytes = max_bytes
+        self.max_image_bytes = max_image_bytes
+        self.max_images = max(2, max_images)
+        self.max_height = max_height
+        self.min_backlog = max(1, min_backlog)
+        self.gap = max(0, gap)
+        self.encoder = encoder
+        self.logger = logging.getLogger(__name__)
+        
+        # Statistics, updated by concurrent OCR workers
+        self._lock = threading.Lock()
+        self._stats = {
+            'composites': 0,
+            'images_packed': 0,
+            'images_rejected': 0,
+            'composite_bytes': 0,
+            'lines_unassigned': 0,
+            'total_pack_time': 0.0
+        }
+    
+    def can_pack(self, job) -> bool:
+        """Whether a job's image is small enough to share a request."""
+        return job.allow_packing and 0 < job.payload_size <= self.max_image_bytes
+    
+    def _load(self, job) -> 'Image.Image':
+        """Decode job image as grayscale."""
+        source = io.BytesIO(job.image_data) if job.image_data is not None else job.image_path
+        with Image.open(source) as image:
+            return image.convert('L')
+    
+    def pack(self, jobs: List[Any]) -> Tuple[Optional[PackedImage], List[Any]]:
+        """
+        Compose job images into one encoded composite.
+        
+        Args:
+            jobs: Packable jobs in queue order
+        
+        Returns:
+            Tuple of composite (None if fewer than two images fit) and jobs left out
+        """
+        start_time = time.perf_counter()
+        images: List[Tuple[Any, 'Image.Image']] = []
+        leftover = []
+        height = 0
+        payload = 0
+        
+        for job in jobs:
+            if len(images) >= self.max_images:
+                leftover.append(job)
+                continue
+            try:
+                image = self._load(job)
+            except Exception as e:
+                self.logger.warning(f"Cannot pack image of job {job.job_id}: {e}")
+                with self._lock:
+                    self._stats['images_rejected'] += 1
+                job.allow_packing = False  # Its own request reports the error
+                leftover.append(job)
+                continue
+            
+            needed = image.height + (self.gap if images else 0)
+            if height + needed > self.max_height or payload + job.payload_size > self.max_bytes:
+                image.close()
+                leftover.append(job)
+                continue
+            
+            images.append((job, image))
+            height += needed
+            payload += job.payload_size
+        
+        if len(images) < 2:
+            for job, image in images:
+                image.close()
+                leftover.insert(0, job)
+            return None, leftover
+        
+        width = max(image.width for _, image in images)
+        composite = Image.new('L', (width, height), 255)
+        regions = []
+        top = 0
+        for job, image in images:
+            composite.paste(image, (0, top))
+            regions.append(PackedRegion(job.job_id, top, image.height, image.width))
+            top += image.height + self.gap
+            image.close()
+        
+        try:
+            data, scale = self._encode(composite)
+        except OCRImageEncoderError as e:
+            self.logger.warning(f"Composite of {len(images)} images not packed: {e}")
+            return None, [job for job, _ in images] + leftover
+        finally:
+            composite.close()
+        
+        with self._lock:
+            self._stats['composites'] += 1
+            self._stats['images_packed'] += len(regions)
+            self._stats['composite_bytes'] += len(data)
+            self._stats['total_pack_time'] += time.perf_counter() - start_time
+        
+        self.logger.debug(f"Packed {len(regions)} images into {width}x{height} composite ({len(data) / 1024:.0f}KB)")
+        return PackedImage(data=data, regions=regions, size=(width, height), scale=scale), leftover
+    
+    def _encode(self, composite: 'Image.Image') -> Tuple[bytes, float]:
+        """
+        Encode composite within max_bytes.
+        
+        Raises:
+            OCRImageEncoderError: If the composite does not fit
+        """
+        if self.encoder:
+            encoded = self.encoder.encode(composite)
+            data, scale = encoded.data, encoded.scale
+        else:
+            buffer = io.BytesIO()
+            composite.save(buffer, format='PNG', compress_level=6)
+            data, scale = buffer.getvalue(), 1.0
+        
+        if len(data) > self.max_bytes:
+            raise OCRImageEncoderError(f"Composite is {len(data)} bytes, cap is {self.max_bytes}")
+        return data, scale
+    
+    def split(self, packed: PackedImage, layout: Dict[str, Any],
+              layout_jobs: Optional[List[str]] = None) -> Dict[str, Optional[Any]]:
+        """
+        Split a composite layout result back to its jobs.
+        
+        Args:
+            packed: Composite that was recognized
+            layout: Layout result with 'lines' in composite pixels
+            layout_jobs: IDs of jobs expecting a layout dictionary instead of text
+        
+        Returns:
+            Dictionary of job ID to text, layout dictionary, or None when nothing was recognized
+        """
+        layout_jobs = set(layout_jobs or [])
+        lines_by_job: Dict[str, List[Dict[str, Any]]] = {region.job_id: [] for region in packed.regions}
+        unassigned = 0
+        
+        # Response order is kept, it follows the reading order of the full text
+        for line in layout.get('lines', []):
+            center = (line['top'] + line['bottom']) / 2 / packed.scale
+            for region in packed.regions:
+                if region.top <= center < region.top + region.height:
+                    lines_by_job[region.job_id].append(shift_layout_line(line, -region.top, packed.scale))
+                    break
+            else:
+                unassigned += 1
+        
+        if unassigned:
+            with self._lock:
+                self._stats['lines_unassigned'] += unassigned
+        
+        results = {}
+        for job_id, lines in lines_by_job.items():
+            text = '\n'.join(line['text'] for line in lines if line['text'])
+            if job_id in layout_jobs:
+                results[job_id] = {'text': text, 'lines': lines}
+            else:
+                results[job_id] = text or None
+        return results
+    
+    def get_packer_statistics(self) -> Dict[str, Any]:
+        """
+        Get OCR request packer statistics.
+        
+        Returns:
+            Dictionary with packer statistics
+        """
+        with self._lock:
+            stats = self._stats.copy()
+        composites = stats['composites']
+        stats['average_images_per_composite'] = stats['images_packed'] / composites if composites else 0.0
+        stats['average_composite_bytes'] = stats['composite_bytes'] / composites if composites else 0.0
+        return stats
\ No newline at end of file
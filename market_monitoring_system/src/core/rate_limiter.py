@@ -0,0 +1,371 @@
+"""
+Request rate control for market monitoring system.
+Token bucket limiter, circuit breaker and single-thread delayed retry scheduler for OCR requests.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class CircuitState(Enum):
+    """State of a circuit breaker."""
+    CLOSED = "closed"  # Requests flow normally
+    OPEN = "open"  # Requests are held back until the reset timeout passes
+    HALF_OPEN = "half_open"  # A probe request decides whether to close again
+
+
+class RateLimiterError(Exception):
+    """Exception raised for rate limiter errors."""
+    pass
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing rate requests per second with bursts up to capacity.
+    """
+    
+    def __init__(self, rate: float, capacity: int = 1):
+        """
+        Initialize token bucket.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum stored tokens (burst size)
+        
+        Raises:
+            RateLimiterError: If rate is not positive
+        """
+        if rate <= 0:
+            raise RateLimiterError("Token bucket rate must be positive")
+        
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        
+        # Statistics
+        self._stats = {
+            'tokens_granted': 0,
+            'requests_delayed': 0
+        }
+    
+    def _refill(self, now: float) -> None:
+        """Add tokens for the time since the last update."""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """
+        Take tokens if available without waiting.
+        
+        Args:
+            tokens: Tokens to take
+        
+        Returns:
+            True if the tokens were taken
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                self._stats['tokens_granted'] += tokens
+                return True
+            self._stats['requests_delayed'] += 1
+            return False
+    
+    def time_until_available(self, tokens: int = 1) -> float:
+        """Seconds until the tokens are available, 0 if available now."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, (tokens - self._tokens) / self.rate)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get token bucket statistics.
+        
+        Returns:
+            Dictionary with bucket statistics
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            stats = self._stats.copy()
+            stats['tokens_available'] = round(self._tokens, 3)
+        stats['rate'] = self.rate
+        stats['capacity'] = self.capacity
+        return stats
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for an external API.
+    Opens after consecutive failures or consecutive rate limit responses, holds
+    requests back for the reset timeout and then lets a single probe through.
+    Each failed probe doubles the open period up to max_reset_timeout.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, rate_limit_threshold: int = 2,
+                 reset_timeout: float = 30.0, max_reset_timeout: float = 300.0):
+        """
+        Initialize circuit breaker.
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            rate_limit_threshold: Consecutive rate limit responses that open the circuit
+            reset_timeout: Seconds the circuit stays open after the first trip
+            max_reset_timeout: Upper bound of the doubled open period
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.rate_limit_threshold = max(1, rate_limit_threshold)
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max(reset_timeout, max_reset_timeout)
+        self.logger = logging.getLogger(__name__)
+        
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._rate_limits = 0
+        self._open_until = 0.0
+        self._current_timeout = reset_timeout
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        
+        # Statistics
+        self._stats = {
+            'trips': 0,
+            'rejected_requests': 0,
+            'failures_recorded': 0,
+            'rate_limits_recorded': 0
+        }
+    
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open once the timeout has passed."""
+        with self._lock:
+            self._update_state(time.monotonic())
+            return self._state
+    
+    def _update_state(self, now: float) -> None:
+        """Move an expired open circuit to half-open."""
+        if self._state == CircuitState.OPEN and now >= self._open_until:
+            self._state = CircuitState.HALF_OPEN
+            self._probe_in_flight = False
+    
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent now.
+        In half-open state only one probe request is allowed at a time.
+        
+        Returns:
+            True if the request may be sent
+        """
+        with self._lock:
+            self._update_state(time.monotonic())
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._stats['rejected_requests'] += 1
+            return False
+    
+    def retry_after(self) -> float:
+        """Seconds until a request may be allowed again, 0 if closed."""
+        with self._lock:
+            now = time.monotonic()
+            self._update_state(now)
+            if self._state == CircuitState.OPEN:
+                return max(0.0, self._open_until - now)
+            return 0.0
+    
+    def record_success(self) -> None:
+        """Record a successful request; closes a half-open circuit."""
+        with self._lock:
+            if self._state != CircuitState.CLOSED:
+                self.logger.info("Circuit breaker closed, API requests resumed")
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._rate_limits = 0
+            self._current_timeout = self.reset_timeout
+            self._probe_in_flight = False
+    
+    def record_failure(self, rate_limited: bool = False, retry_after: Optional[float] = None) -> None:
+        """
+        Record a failed request.
+        
+        Args:
+            rate_limited: Whether the API answered with a rate limit response
+            retry_after: Server requested wait in seconds, keeps the circuit open at least that long
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._update_state(now)
+            
+            if rate_limited:
+                self._rate_limits += 1
+                self._stats['rate_limits_recorded'] += 1
+            else:
+                self._failures += 1
+                self._rate_limits = 0
+                self._stats['failures_recorded'] += 1
+            
+            if self._state == CircuitState.HALF_OPEN:
+                # Failed probe: open again for twice as long
+                self._current_timeout = min(self._current_timeout * 2, self.max_reset_timeout)
+                self._trip(now, retry_after)
+            elif self._state == CircuitState.CLOSED and (
+                    self._failures >= self.failure_threshold or self._rate_limits >= self.rate_limit_threshold):
+                self._trip(now, retry_after)
+    
+    def _trip(self, now: float, retry_after: Optional[float]) -> None:
+        """Open the circuit."""
+        timeout = max(self._current_timeout, retry_after or 0.0)
+        self._state = CircuitState.OPEN
+        self._open_until = now + timeout
+        self._probe_in_flight = False
+        self._stats['trips'] += 1
+        self.logger.warning(
+            f"Circuit breaker opened for {timeout:.0f}s "
+            f"({self._failures} failures, {self._rate_limits} rate limit responses in a row)"
+        )
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get circuit breaker statistics.
+        
+        Returns:
+            Dictionary with breaker statistics
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._update_state(now)
+            stats = self._stats.copy()
+            stats['state'] = self._state.value
+            stats['consecutive_failures'] = self._failures
+            stats['consecutive_rate_limits'] = self._rate_limits
+            stats['open_for'] = max(0.0, self._open_until - now) if self._state == CircuitState.OPEN else 0.0
+        return stats
+
+
+class RetryScheduler:
+    """
+    Single thread releasing delayed items in due order from a heap.
+    Replaces one sleeping thread per retry with one timer for all of them.
+    """
+    
+    def __init__(self, handler: Callable[[Any], None], name: str = "RetryScheduler"):
+        """
+        Initialize retry scheduler.
+        
+        Args:
+            handler: Function called with each item when it is due
+            name: Scheduler thread name
+        """
+        self.handler = handler
+        self.name = name
+        self.logger = logging.getLogger(__name__)
+        
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._is_running = False
+        
+        # Statistics
+        self._stats = {
+            'scheduled': 0,
+            'released': 0,
+            'handler_errors': 0
+        }
+    
+    def start(self) -> None:
+        """Start the scheduler thread."""
+        with self._condition:
+            if self._is_running:
+                return
+            self._is_running = True
+        
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 5.0) -> List[Any]:
+        """
+        Stop the scheduler without releasing pending items.
+        
+        Args:
+            timeout: Maximum time to wait for the thread
+        
+        Returns:
+            Items that were still waiting
+        """
+        with self._condition:
+            self._is_running = False
+            pending = [item for _, _, item in sorted(self._heap)]
+            self._heap.clear()
+            self._condition.notify_all()
+        
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        return pending
+    
+    def schedule(self, item: Any, delay: float) -> None:
+        """
+        Release item to the handler after delay seconds.
+        
+        Args:
+            item: Item passed to the handler
+            delay: Delay in seconds
+        """
+        with self._condition:
+            heapq.heappush(self._heap, (time.monotonic() + max(0.0, delay), next(self._sequence), item))
+            self._stats['scheduled'] += 1
+            self._condition.notify()
+    
+    @property
+    def pending_count(self) -> int:
+        """Number of items waiting."""
+        with self._condition:
+            return len(self._heap)
+    
+    def _run(self) -> None:
+        """Release due items until stopped."""
+        while True:
+            with self._condition:
+                while self._is_running:
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    wait = self._heap[0][0] - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._condition.wait(timeout=wait)
+                
+                if not self._is_running:
+                    return
+                _, _, item = heapq.heappop(self._heap)
+                self._stats['released'] += 1
+            
+            try:
+                self.handler(item)
+            except Exception as e:
+                with self._condition:
+                    self._stats['handler_errors'] += 1
+                self.logger.error(f"Retry handler failed: {e}")
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get retry scheduler statistics.
+        
+        Returns:
+            Dictionary with scheduler statistics
+        """
+        with self._condition:
+            stats = self._stats.copy()
+            stats['pending'] = len(self._heap)
+            stats['next_due_in'] = max(0.0, self._heap[0][0] - time.monotonic()) if self._heap else None
+        return stats
\ No newline at end of file
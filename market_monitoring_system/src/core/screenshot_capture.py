@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, Dict, Callable, Tuple, List
 import uuid
+from collections import deque
 
 try:
     import keyboard
@@ -20,6 +21,10 @@ except ImportError as e:
     IMPORT_ERROR = str(e)
 
 from config.settings import SettingsManager, HotkeyConfig
+from .image_hashing import content_hash, rgb_difference_hash, hamming_distance, ImageHashingError
+from .frame_buffer import FrameBuffer, CapturedFrame
+from .capture_executor import CaptureExecutor, CaptureRequest
+from .capture_planner import CapturePlanner, CaptureRegion, NUMPY_AVAILABLE
 
 
 class ScreenshotCaptureError(Exception):
@@ -33,12 +38,14 @@ class ScreenshotCapture:
     Thread-safe with proper error handling and resource management.
     """
     
-    def __init__(self, settings_manager: SettingsManager):
+    def __init__(self, settings_manager: SettingsManager, 
+                 frame_buffer: Optional[FrameBuffer] = None):
         """
         Initialize screenshot capture system.
         
         Args:
             settings_manager: Configuration manager instance
+            frame_buffer: Optional in-memory frame buffer used instead of PNG files
         """
         if not DEPENDENCIES_AVAILABLE:
             raise ScreenshotCaptureError(f"Required dependencies not available: {IMPORT_ERROR}")
@@ -54,6 +61,30 @@ class ScreenshotCapture:
         
         # Screenshot engine
         self._mss_instance: Optional[mss.mss] = None
+        self.frame_buffer = frame_buffer
+        
+        # Union-region grabs for areas requested together
+        self._planner_config = getattr(settings_manager, 'capture_planner', None)
+        self.planner = CapturePlanner(
+            max_waste_ratio=self._planner_config.max_waste_ratio if self._planner_config else 2.0
+        )
+        union_grabs = bool(self._planner_config and self._planner_config.enabled and NUMPY_AVAILABLE)
+        
+        # Capture worker owning the MSS instance; hotkey hook only enqueues requests
+        self.executor: Optional[CaptureExecutor] = None
+        executor_config = getattr(settings_manager, 'capture_executor', None)
+        if executor_config and executor_config.enabled:
+            self.executor = CaptureExecutor(
+                capture_handler=self._execute_capture_request,
+                max_queue_size=executor_config.max_queue_size,
+                coalesce_bursts=executor_config.coalesce_bursts,
+                on_worker_exit=self._cleanup_mss_instance,
+                batch_handler=self._execute_capture_batch if union_grabs else None
+            )
+        
+        # Recent frame hashes per hotkey for duplicate suppression: (dhash, monotonic time)
+        self._dedup_config = settings_manager.screenshot_dedup
+        self._recent_frames: Dict[str, deque] = {}
         
         # Initialize capture statistics
         self._initialize_stats()
@@ -67,7 +98,9 @@ class ScreenshotCapture:
                 'failed_captures': 0,
                 'last_capture_time': None,
                 'last_capture_duration': 0.0,
-                'average_capture_time': 0.0
+                'average_capture_time': 0.0,
+                'duplicates_detected': 0,
+                'duplicates_suppressed': 0
             }
     
     def _get_mss_instance(self) -> mss.mss:
@@ -125,6 +158,14 @@ class ScreenshotCapture:
             for hotkey_name, config in enabled_hotkeys.items():
                 self._register_single_hotkey(hotkey_name, config)
             
+            # Optional trigger capturing every enabled area at once
+            capture_all_hotkey = self._planner_config.capture_all_hotkey if self._planner_config else ""
+            if capture_all_hotkey:
+                handler = self._handle_capture_all_press
+                keyboard.add_hotkey(capture_all_hotkey.lower(), handler, suppress=False)
+                self._hotkey_handlers[capture_all_hotkey] = handler
+                self.logger.info(f"Registered capture-all hotkey {capture_all_hotkey}")
+            
             self.logger.info(f"Registered {len(enabled_hotkeys)} global hotkeys")
             
         except Exception as e:
@@ -176,6 +217,11 @@ class ScreenshotCapture:
                 # Update statistics
                 self._capture_stats[hotkey_name]['total_captures'] += 1
             
+            if self.executor and self.executor.is_running:
+                # Runs inside the keyboard hook: enqueue only, the worker grabs
+                self.executor.submit(hotkey_name, config.area, config.description)
+                return
+            
             self.logger.info(f"Hotkey {hotkey_name} pressed - capturing screenshot")
             
             # Capture screenshot
@@ -197,6 +243,143 @@ class ScreenshotCapture:
             with self._lock:
                 self._capture_stats[hotkey_name]['failed_captures'] += 1
     
+    def _handle_capture_all_press(self) -> None:
+        """Handle capture-all hotkey press."""
+        try:
+            self.capture_all_enabled()
+        except Exception as e:
+            self.logger.error(f"Error handling capture-all hotkey: {e}")
+    
+    def _execute_capture_request(self, request: CaptureRequest) -> bool:
+        """
+        Perform a queued capture on the capture worker thread.
+        
+        Args:
+            request: Capture request from the hotkey hook
+        
+        Returns:
+            True if capture was successful
+        """
+        self.logger.info(
+            f"Capturing {request.hotkey} screenshot "
+            f"({request.presses} press(es), queued {time.monotonic() - request.requested_at:.3f}s)"
+        )
+        
+        success = self.capture_area(
+            coordinates=request.coordinates,
+            hotkey_name=request.hotkey,
+            description=request.description
+        )
+        
+        with self._lock:
+            stats = self._capture_stats.setdefault(request.hotkey, {})
+            key = 'successful_captures' if success else 'failed_captures'
+            stats[key] = stats.get(key, 0) + 1
+        
+        return success
+    
+    def _execute_capture_batch(self, requests: List[CaptureRequest]) -> List[bool]:
+        """
+        Perform all queued captures of a tick with union-region grabs.
+        
+        Args:
+            requests: Capture requests taken from the queue together
+        
+        Returns:
+            Success flag per request
+        """
+        if len(requests) == 1:
+            return [self._execute_capture_request(requests[0])]
+        
+        self.logger.info(f"Capturing {len(requests)} areas together: {', '.join(r.hotkey for r in requests)}")
+        
+        results = self.capture_areas([
+            CaptureRegion(hotkey=r.hotkey, coordinates=tuple(r.coordinates), description=r.description)
+            for r in requests
+        ])
+        
+        with self._lock:
+            for request, success in zip(requests, results):
+                stats = self._capture_stats.setdefault(request.hotkey, {})
+                key = 'successful_captures' if success else 'failed_captures'
+                stats[key] = stats.get(key, 0) + 1
+        
+        return results
+    
+    def capture_all_enabled(self) -> int:
+        """
+        Capture the areas of all enabled hotkeys in one tick.
+        
+        Returns:
+            Number of areas requested
+        """
+        enabled_hotkeys = self.settings.get_enabled_hotkeys()
+        
+        with self._lock:
+            for hotkey_name in enabled_hotkeys:
+                stats = self._capture_stats.setdefault(hotkey_name, {})
+                stats['total_captures'] = stats.get('total_captures', 0) + 1
+        
+        if self.executor and self.executor.is_running:
+            for hotkey_name, config in enabled_hotkeys.items():
+                self.executor.submit(hotkey_name, config.area, config.description)
+        else:
+            requests = [
+                CaptureRequest(hotkey=name, coordinates=tuple(config.area), description=config.description)
+                for name, config in enabled_hotkeys.items()
+            ]
+            self._execute_capture_batch(requests)
+        
+        return len(enabled_hotkeys)
+    
+    def _check_duplicate_frame(self, hotkey_name: str, rgb: bytes, 
+                               size: Tuple[int, int]) -> Tuple[bool, bool]:
+        """
+        Compare frame with recent frames of the same hotkey and remember it.
+        
+        The dHash only flags near-duplicates; it does not see a few changed
+        price digits, so only frames with an identical SHA-256 of the raw RGB
+        buffer are reported as identical (and may be dropped).
+        
+        Args:
+            hotkey_name: Name of the hotkey
+            rgb: Raw RGB frame data
+            size: Frame (width, height)
+        
+        Returns:
+            Tuple of (near-duplicate of a recent frame, byte-identical to it)
+        """
+        config = self._dedup_config
+        if not config or not config.enabled:
+            return False, False
+        
+        try:
+            frame_hash = rgb_difference_hash(rgb, size, config.hash_size)
+        except ImageHashingError as e:
+            self.logger.debug(f"Duplicate check skipped for {hotkey_name}: {e}")
+            return False, False
+        digest = content_hash(rgb)
+        
+        # Only frames from the current merge window count, so every cycle keeps one capture
+        max_age = config.max_age_seconds
+        if max_age <= 0:
+            hotkey_config = self.settings.get_hotkey_config(hotkey_name)
+            max_age = hotkey_config.merge_interval if hotkey_config else 60
+        
+        now = time.monotonic()
+        with self._lock:
+            history = self._recent_frames.setdefault(hotkey_name, deque(maxlen=config.history_size))
+            matches = [
+                previous_digest
+                for previous_hash, previous_digest, captured_at in history
+                if now - captured_at <= max_age and hamming_distance(previous_hash, frame_hash) <= config.max_hamming_distance
+            ]
+            is_identical = digest in matches
+            if not is_identical:
+                history.append((frame_hash, digest, now))
+        
+        return bool(matches), is_identical
+    
     def capture_area(self, coordinates: Tuple[int, int, int, int], 
                      hotkey_name: str, description: str = "") -> bool:
         """
@@ -218,19 +401,6 @@ class ScreenshotCapture:
             if x1 >= x2 or y1 >= y2:
                 raise ScreenshotCaptureError(f"Invalid coordinates: {coordinates}")
             
-            # Get screenshot path
-            screenshot_path = self._get_screenshot_path(hotkey_name)
-            if not screenshot_path:
-                raise ScreenshotCaptureError(f"Could not determine screenshot path for {hotkey_name}")
-            
-            # Ensure directory exists
-            screenshot_path.mkdir(parents=True, exist_ok=True)
-            
-            # Generate unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]  # Include milliseconds
-            filename = f"{hotkey_name}_{timestamp}_{uuid.uuid4().hex[:8]}.png"
-            filepath = screenshot_path / filename
-            
             # Capture screenshot with proper resource management
             monitor = {
                 "top": y1,
@@ -244,9 +414,8 @@ class ScreenshotCapture:
                 # Get MSS instance with thread safety
                 mss_instance = self._get_mss_instance()
                 screenshot = mss_instance.grab(monitor)
-                
-                # Save to file
-                mss.tools.to_png(screenshot.rgb, screenshot.size, output=str(filepath))
+                frame_rgb = screenshot.rgb
+                frame_size = tuple(screenshot.size)
                 
             except Exception as e:
                 # Re-create MSS instance on error as it might be corrupted
@@ -257,28 +426,11 @@ class ScreenshotCapture:
                 if screenshot:
                     del screenshot
             
-            # Calculate capture duration
-            capture_duration = time.time() - start_time
-            
-            # Update statistics
-            with self._lock:
-                stats = self._capture_stats[hotkey_name]
-                stats['last_capture_time'] = datetime.now().isoformat()
-                stats['last_capture_duration'] = capture_duration
-                
-                # Update average capture time
-                successful_count = stats['successful_captures']
-                if successful_count > 0:
-                    current_avg = stats['average_capture_time']
-                    stats['average_capture_time'] = (
-                        (current_avg * (successful_count - 1) + capture_duration) / successful_count
-                    )
-            
-            self.logger.info(
-                f"Screenshot captured successfully: {filepath.name} "
-                f"({x2-x1}x{y2-y1}) in {capture_duration:.3f}s"
-            )
+            target = self._store_frame(hotkey_name, frame_rgb, frame_size)
+            if target is None:
+                return True
             
+            self._record_capture_duration(hotkey_name, time.time() - start_time, target, frame_size)
             return True
             
         except Exception as e:
@@ -289,6 +441,136 @@ class ScreenshotCapture:
             )
             return False
     
+    def capture_areas(self, regions: List[CaptureRegion]) -> List[bool]:
+        """
+        Capture several hotkey areas with as few screen grabs as possible.
+        Each planned grab covers the union of its areas; areas are sliced out as views.
+        
+        Args:
+            regions: Areas requested together
+        
+        Returns:
+            Success flag per region, in input order
+        """
+        if not regions:
+            return []
+        
+        if not NUMPY_AVAILABLE or len(regions) == 1:
+            return [self.capture_area(r.coordinates, r.hotkey, r.description) for r in regions]
+        
+        results: Dict[int, bool] = {}
+        valid_regions = []
+        for region in regions:
+            x1, y1, x2, y2 = region.coordinates
+            if x1 >= x2 or y1 >= y2:
+                self.logger.error(f"Invalid coordinates for {region.hotkey}: {region.coordinates}")
+                results[id(region)] = False
+            else:
+                valid_regions.append(region)
+        
+        for plan in self.planner.plan(valid_regions):
+            start_time = time.time()
+            screenshot = None
+            try:
+                screenshot = self._get_mss_instance().grab(plan.monitor)
+                frame = CapturePlanner.frame_array(screenshot.bgra, screenshot.size)
+            except Exception as e:
+                self._recreate_mss_instance()
+                self.logger.error(f"Failed to grab union area {plan.bbox}: {e}")
+                for region in plan.regions:
+                    results[id(region)] = False
+                continue
+            finally:
+                if screenshot:
+                    del screenshot
+            
+            for region in plan.regions:
+                try:
+                    view = CapturePlanner.slice_region(frame, plan, region)
+                    frame_size = (view.shape[1], view.shape[0])
+                    # Single copy of region pixels at hand-off
+                    target = self._store_frame(region.hotkey, view.tobytes(), frame_size)
+                    if target is not None:
+                        self._record_capture_duration(region.hotkey, time.time() - start_time, target, frame_size)
+                    results[id(region)] = True
+                except Exception as e:
+                    self.logger.error(f"Failed to store capture for {region.hotkey}: {e}")
+                    results[id(region)] = False
+            
+            if len(plan.regions) > 1:
+                self.logger.debug(f"Captured {len(plan.regions)} areas with one grab of {plan.bbox}")
+        
+        return [results[id(region)] for region in regions]
+    
+    def _store_frame(self, hotkey_name: str, frame_rgb: bytes, 
+                     frame_size: Tuple[int, int]) -> Optional[str]:
+        """
+        Deduplicate grabbed frame and hand it to the frame buffer or a PNG file.
+        
+        Args:
+            hotkey_name: Name of the hotkey
+            frame_rgb: Raw RGB frame data
+            frame_size: Frame (width, height)
+        
+        Returns:
+            Name of the stored target, or None if frame was suppressed as duplicate
+        """
+        # Suppress byte-identical frames before they hit disk, only count near-duplicates
+        is_near_duplicate, is_identical = self._check_duplicate_frame(hotkey_name, frame_rgb, frame_size)
+        if is_near_duplicate:
+            suppress = is_identical and self._dedup_config.action == 'drop'
+            with self._lock:
+                stats = self._capture_stats.setdefault(hotkey_name, {})
+                stats['duplicates_detected'] = stats.get('duplicates_detected', 0) + 1
+                if suppress:
+                    stats['duplicates_suppressed'] = stats.get('duplicates_suppressed', 0) + 1
+            
+            if suppress:
+                self.logger.info(f"Duplicate screenshot for {hotkey_name} suppressed")
+                return None
+        
+        if self.frame_buffer is not None:
+            # Hand raw pixels to the merge stage, no PNG encode/decode round trip
+            self.frame_buffer.add(CapturedFrame(hotkey=hotkey_name, rgb=frame_rgb, size=frame_size))
+            return "frame buffer"
+        
+        # Get screenshot path
+        screenshot_path = self._get_screenshot_path(hotkey_name)
+        if not screenshot_path:
+            raise ScreenshotCaptureError(f"Could not determine screenshot path for {hotkey_name}")
+        
+        # Ensure directory exists
+        screenshot_path.mkdir(parents=True, exist_ok=True)
+        
+        # Generate unique filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]  # Include milliseconds
+        filename = f"{hotkey_name}_{timestamp}_{uuid.uuid4().hex[:8]}.png"
+        
+        # Save to file
+        mss.tools.to_png(frame_rgb, frame_size, output=str(screenshot_path / filename))
+        return filename
+    
+    def _record_capture_duration(self, hotkey_name: str, capture_duration: float,
+                                 target: str, frame_size: Tuple[int, int]) -> None:
+        """Update capture timing statistics after a stored capture."""
+        with self._lock:
+            stats = self._capture_stats[hotkey_name]
+            stats['last_capture_time'] = datetime.now().isoformat()
+            stats['last_capture_duration'] = capture_duration
+            
+            # Update average capture time
+            successful_count = stats['successful_captures']
+            if successful_count > 0:
+                current_avg = stats['average_capture_time']
+                stats['average_capture_time'] = (
+                    (current_avg * (successful_count - 1) + capture_duration) / successful_count
+                )
+        
+        self.logger.info(
+            f"Screenshot captured successfully: {target} "
+            f"({frame_size[0]}x{frame_size[1]}) in {capture_duration:.3f}s"
+        )
+    
     def _get_screenshot_path(self, hotkey_name: str) -> Optional[Path]:
         """
         Get screenshot directory path for specified hotkey.
@@ -387,6 +669,10 @@ class ScreenshotCapture:
                 self.logger.warning("Screenshot capture system is already running")
                 return
             
+            # Start capture worker before hotkeys can enqueue requests
+            if self.executor:
+                self.executor.start()
+            
             # Register global hotkeys
             self.register_global_hotkeys()
             
@@ -406,6 +692,10 @@ class ScreenshotCapture:
             # Clear hotkey handlers
             self._clear_hotkey_handlers()
             
+            # Finish queued captures; the worker closes its MSS instance on exit
+            if self.executor:
+                self.executor.stop()
+            
             # Close MSS instance with proper cleanup
             self._cleanup_mss_instance()
             
@@ -445,7 +735,9 @@ class ScreenshotCapture:
             'registered_hotkeys': list(self._hotkey_handlers.keys()),
             'enabled_hotkeys': list(enabled_hotkeys.keys()),
             'mss_instance_active': self._mss_instance is not None,
-            'capture_statistics': self.get_capture_statistics()
+            'capture_statistics': self.get_capture_statistics(),
+            'capture_executor': self.executor.get_executor_statistics() if self.executor else None,
+            'capture_planner': self.planner.get_planner_statistics()
         }
     
     def test_capture(self, hotkey_name: str) -> bool:
@@ -9,7 +9,7 @@ import logging
 import time
 import uuid
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 
 try:
@@ -20,6 +20,10 @@ except ImportError as e:
     REQUESTS_ERROR = str(e)
 
 from config.settings import SettingsManager
+from .ocr_image_encoder import sniff_mime_type
+
+
+DEFAULT_OCR_URL = "https://ocr.api.cloud.yandex.net/ocr/v1/recognizeText"
 
 
 class SimpleOCRError(Exception):
@@ -27,6 +31,22 @@ class SimpleOCRError(Exception):
     pass
 
 
+class OCRRateLimitError(Exception):
+    """Exception raised when the OCR API rejects a request with HTTP 429."""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after  # Seconds from the Retry-After header, if sent
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse Retry-After header given in seconds, None if missing or not numeric."""
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
 class SimpleYandexOCRClient:
     """
     Simplified Yandex OCR client using only working OCR API format.
@@ -45,7 +65,8 @@ class SimpleYandexOCRClient:
     # Retryable status codes
     RETRYABLE_CODES = {STATUS_TOO_MANY_REQUESTS, STATUS_INTERNAL_ERROR, STATUS_SERVICE_UNAVAILABLE}
     
-    def __init__(self, api_key: str, timeout: int = 30, max_retries: int = 3):
+    def __init__(self, api_key: str, timeout: int = 30, max_retries: int = 3,
+                 api_url: str = DEFAULT_OCR_URL):
         """
         Initialize simplified OCR client.
         
@@ -53,6 +74,7 @@ class SimpleYandexOCRClient:
             api_key: Yandex OCR API key
             timeout: Request timeout in seconds
             max_retries: Maximum retry attempts
+            api_url: OCR recognizeText endpoint, e.g. a local stand-in server for benchmarks
         """
         if not REQUESTS_AVAILABLE:
             raise SimpleOCRError(f"Requests library not available: {REQUESTS_ERROR}")
@@ -66,7 +88,7 @@ class SimpleYandexOCRClient:
         self.logger = logging.getLogger(__name__)
         
         # OCR API endpoint (not Vision API)
-        self.ocr_url = "https://ocr.api.cloud.yandex.net/ocr/v1/recognizeText"
+        self.ocr_url = api_url or DEFAULT_OCR_URL
         
         # Session for connection reuse
         self.session = requests.Session()
@@ -130,19 +152,22 @@ class SimpleYandexOCRClient:
             # Get MIME type
             mime_type = self._get_mime_type(image_path)
             
-            # Prepare OCR API request (exact format from working YANDEX_OCR.py)
-            payload = {
-                "mimeType": mime_type,
-                "languageCodes": language_codes or ["en"],
-                "model": "page",
-                "content": image_base64
-            }
-            
-            return payload
+            return self._build_payload(image_base64, mime_type, language_codes)
             
         except Exception as e:
             raise SimpleOCRError(f"Failed to prepare OCR request: {e}")
     
+    @staticmethod
+    def _build_payload(image_base64: str, mime_type: str,
+                       language_codes: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Build OCR API request payload (exact format from working YANDEX_OCR.py)."""
+        return {
+            "mimeType": mime_type,
+            "languageCodes": language_codes or ["en"],
+            "model": "page",
+            "content": image_base64
+        }
+    
     def process_image_full_pipeline(self, image_path: Path, 
                                   cleanup_image: bool = True,
                                   language_codes: Optional[List[str]] = None) -> Optional[str]:
@@ -181,6 +206,8 @@ class SimpleYandexOCRClient:
                 timeout=self.timeout
             )
             
+            self._check_rate_limit(response)
+            
             if response.status_code == self.STATUS_SUCCESS:
                 # Process successful response
                 response_data = response.json()
@@ -215,6 +242,143 @@ class SimpleYandexOCRClient:
                 self._stats['failed_requests'] += 1
                 return None
             
+        except OCRRateLimitError:
+            raise
+        except Exception as e:
+            processing_time = time.time() - start_time
+            self._stats['failed_requests'] += 1
+            self.logger.error(f"OCR request {session_id} failed: {e} (failed after {processing_time:.3f}s)")
+            return None
+        finally:
+            self._stats['total_requests'] += 1
+            self._stats['last_request_time'] = datetime.now().isoformat()
+    def process_image_with_layout(self, image_path: Path,
+                                  cleanup_image: bool = True,
+                                  language_codes: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Send image for OCR and return text together with line positions.
+        
+        Args:
+            image_path: Path to image file
+            cleanup_image: Whether to delete image after processing
+            language_codes: Optional language codes
+        
+        Returns:
+            Dictionary with 'text' and 'lines' (text, box, block and words) or None if failed
+        """
+        if not image_path.exists():
+            self.logger.error(f"Image file not found: {image_path}")
+            return None
+        
+        start_time = time.time()
+        session_id = uuid.uuid4().hex[:8]
+        
+        try:
+            file_size_mb = image_path.stat().st_size / (1024 * 1024)
+            if file_size_mb > 20:  # 20MB limit
+                raise SimpleOCRError(f"Image file too large: {file_size_mb:.1f}MB (max: 20MB)")
+            
+            self.logger.info(f"Starting layout OCR request {session_id} for {image_path.name} ({file_size_mb:.1f}MB)")
+            
+            payload = self._prepare_ocr_request(image_path, language_codes)
+            response = self.session.post(self.ocr_url, json=payload, timeout=self.timeout)
+            self._check_rate_limit(response)
+            
+            if response.status_code != self.STATUS_SUCCESS:
+                self.logger.error(f"OCR API error: HTTP {response.status_code}: {response.text[:200]}")
+                self._stats['failed_requests'] += 1
+                return None
+            
+            text_annotation = response.json().get('result', {}).get('textAnnotation', {})
+            layout = {
+                'text': (text_annotation.get('fullText') or '').strip(),
+                'lines': self._extract_layout_lines(text_annotation)
+            }
+            
+            processing_time = time.time() - start_time
+            self._stats['successful_requests'] += 1
+            self._stats['total_processing_time'] += processing_time
+            self.logger.info(
+                f"Layout OCR request {session_id} completed with {len(layout['lines'])} lines "
+                f"in {processing_time:.3f}s"
+            )
+            
+            if cleanup_image:
+                try:
+                    image_path.unlink()
+                except Exception as e:
+                    self.logger.warning(f"Failed to cleanup image {image_path}: {e}")
+            
+            return layout
+        
+        except OCRRateLimitError:
+            raise
+        except Exception as e:
+            processing_time = time.time() - start_time
+            self._stats['failed_requests'] += 1
+            self.logger.error(f"Layout OCR request {session_id} failed: {e} (failed after {processing_time:.3f}s)")
+            return None
+        finally:
+            self._stats['total_requests'] += 1
+            self._stats['last_request_time'] = datetime.now().isoformat()
+    
+    def process_image_bytes(self, image_data: bytes,
+                            language_codes: Optional[List[str]] = None,
+                            mime_type: Optional[str] = None,
+                            layout: bool = False) -> Optional[Any]:
+        """
+        Send in-memory encoded image for OCR.
+        
+        Args:
+            image_data: Encoded image bytes
+            language_codes: Optional language codes
+            mime_type: OCR API mime type of the data ('JPEG' or 'PNG'), detected when None
+            layout: Whether to return line positions together with text
+        
+        Returns:
+            Extracted text, layout dictionary when layout is set, or None if failed
+        """
+        start_time = time.time()
+        session_id = uuid.uuid4().hex[:8]
+        
+        try:
+            size_mb = len(image_data) / (1024 * 1024)
+            if size_mb > 20:  # 20MB limit
+                raise SimpleOCRError(f"Image data too large: {size_mb:.1f}MB (max: 20MB)")
+            
+            self.logger.info(f"Starting OCR request {session_id} for in-memory image ({size_mb:.2f}MB)")
+            
+            payload = self._build_payload(
+                base64.b64encode(image_data).decode('ascii'), mime_type or sniff_mime_type(image_data), language_codes
+            )
+            response = self.session.post(self.ocr_url, json=payload, timeout=self.timeout)
+            self._check_rate_limit(response)
+            
+            if response.status_code != self.STATUS_SUCCESS:
+                self.logger.error(f"OCR API error: HTTP {response.status_code}: {response.text[:200]}")
+                self._stats['failed_requests'] += 1
+                return None
+            
+            text_annotation = response.json().get('result', {}).get('textAnnotation', {})
+            extracted_text = (text_annotation.get('fullText') or '').strip()
+            
+            if layout:
+                result = {'text': extracted_text, 'lines': self._extract_layout_lines(text_annotation)}
+            elif extracted_text:
+                result = extracted_text
+            else:
+                self.logger.warning("No text found in OCR response")
+                return None
+            
+            processing_time = time.time() - start_time
+            self._stats['successful_requests'] += 1
+            self._stats['total_processing_time'] += processing_time
+            self.logger.info(f"OCR request {session_id} completed successfully in {processing_time:.3f}s")
+            
+            return result
+        
+        except OCRRateLimitError:
+            raise
         except Exception as e:
             processing_time = time.time() - start_time
             self._stats['failed_requests'] += 1
@@ -224,6 +388,73 @@ class SimpleYandexOCRClient:
             self._stats['total_requests'] += 1
             self._stats['last_request_time'] = datetime.now().isoformat()
     
+    def _check_rate_limit(self, response) -> None:
+        """
+        Raise OCRRateLimitError for HTTP 429 so callers can back off.
+        
+        Raises:
+            OCRRateLimitError: If the API rejected the request for rate limiting
+        """
+        if response.status_code != self.STATUS_TOO_MANY_REQUESTS:
+            return
+        
+        self._stats['failed_requests'] += 1
+        self._stats['rate_limit_hits'] += 1
+        raise OCRRateLimitError(
+            f"OCR API rate limit exceeded: HTTP 429: {response.text[:200]}",
+            retry_after=parse_retry_after(response.headers.get('Retry-After'))
+        )
+    
+    @staticmethod
+    def _bounds(element: Dict[str, Any]) -> Optional[Tuple[int, int, int, int]]:
+        """Left, top, right and bottom of an element's bounding box, None if it has none."""
+        vertices = element.get('boundingBox', {}).get('vertices', [])
+        if not vertices:
+            return None
+        xs = [int(vertex.get('x', 0)) for vertex in vertices]
+        ys = [int(vertex.get('y', 0)) for vertex in vertices]
+        return min(xs), min(ys), max(xs), max(ys)
+    
+    @staticmethod
+    def _extract_layout_lines(text_annotation: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Extract lines with bounding boxes from textAnnotation.
+        
+        Args:
+            text_annotation: textAnnotation part of OCR API response
+        
+        Returns:
+            List of dictionaries with text, left, top, right and bottom pixel coordinates,
+            the index of the block holding the line and its words with their boxes
+        """
+        lines = []
+        for block_index, block in enumerate(text_annotation.get('blocks', [])):
+            for line in block.get('lines', []):
+                bounds = SimpleYandexOCRClient._bounds(line)
+                if bounds is None:
+                    continue
+                words = []
+                for word in line.get('words', []):
+                    word_bounds = SimpleYandexOCRClient._bounds(word)
+                    if word_bounds and word.get('text'):
+                        word_left, word_top, word_right, word_bottom = word_bounds
+                        words.append({'text': word['text'], 'left': word_left, 'top': word_top,
+                                      'right': word_right, 'bottom': word_bottom})
+                text = line.get('text')
+                if text is None:
+                    text = ' '.join(word.get('text', '') for word in line.get('words', []))
+                left, top, right, bottom = bounds
+                lines.append({
+                    'text': text.strip(),
+                    'left': left,
+                    'top': top,
+                    'right': right,
+                    'bottom': bottom,
+                    'block': block_index,
+                    'words': words
+                })
+        return lines
+    
     def get_ocr_statistics(self) -> Dict[str, Any]:
         """Get OCR processing statistics."""
         stats = self._stats.copy()
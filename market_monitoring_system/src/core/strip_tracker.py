@@ -0,0 +1,251 @@
+"""
+Strip-level change tracking for market monitoring system.
+Remembers OCR text per screenshot strip so only changed strips are sent to OCR.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Dict, Optional, Any, Tuple
+
+from .image_hashing import content_hash
+from .ocr_document import shift_layout_line
+
+
+@dataclass
+class ImageStrip:
+    """Horizontal strip of a source screenshot."""
+    source_path: Path
+    index: int  # Position in capture order
+    top: int  # Offset inside the source screenshot
+    width: int
+    height: int
+    strip_hash: str  # SHA-256 of raw pixel data
+    image: Any = field(default=None, repr=False)  # PIL image, released after merge
+
+
+@dataclass
+class StripMergeResult:
+    """Result of merging changed strips for OCR."""
+    hotkey: str
+    strips: List[ImageStrip]  # All strips of the cycle in capture order
+    changed_hashes: List[str]  # Unique hashes that need OCR, in merged order
+    merged_path: Optional[Path] = None  # None when nothing changed
+    offsets: Dict[str, Tuple[int, int]] = field(default_factory=dict)  # hash -> (top, bottom) in merged image
+
+
+def strip_pixel_hash(image) -> str:
+    """
+    Hash raw pixel data of a strip, independent of file encoding.
+    
+    Args:
+        image: PIL image
+    
+    Returns:
+        Hex digest string
+    """
+    return content_hash(f"{image.mode}:{image.width}x{image.height}:".encode('ascii') + image.tobytes())
+
+
+class StripTracker:
+    """
+    Per-hotkey cache of OCR text keyed by strip pixel hash.
+    A strip whose hash is known reuses its cached text; unknown strips are
+    OCR'd and their text is assigned back by line position in the merged image.
+    Line boxes are kept per strip too, so a cycle can be stitched as a layout.
+    """
+    
+    def __init__(self, max_strips_per_hotkey: int = 2000):
+        """
+        Initialize strip tracker.
+        
+        Args:
+            max_strips_per_hotkey: Maximum cached strip texts per hotkey (LRU)
+        """
+        self.max_strips_per_hotkey = max_strips_per_hotkey
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._texts: Dict[str, "OrderedDict[str, str]"] = {}
+        self._lines: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}  # Line boxes relative to strip top
+        
+        # Statistics
+        self._stats = {
+            'cycles': 0,
+            'cycles_skipped': 0,
+            'strips_total': 0,
+            'strips_reused': 0,
+            'strips_ocr': 0,
+            'evictions': 0
+        }
+    
+    def find_changed(self, hotkey: str, strips: List[ImageStrip]) -> List[str]:
+        """
+        Get unique strip hashes without cached text.
+        
+        Args:
+            hotkey: Hotkey name
+            strips: Strips of the current cycle
+        
+        Returns:
+            List of hashes needing OCR, in first-seen order
+        """
+        with self._lock:
+            cache = self._texts.get(hotkey, {})
+            changed = []
+            seen = set()
+            for strip in strips:
+                if strip.strip_hash not in cache and strip.strip_hash not in seen:
+                    seen.add(strip.strip_hash)
+                    changed.append(strip.strip_hash)
+            
+            self._stats['cycles'] += 1
+            self._stats['strips_total'] += len(strips)
+            self._stats['strips_ocr'] += len(changed)
+            self._stats['strips_reused'] += len(strips) - sum(
+                1 for strip in strips if strip.strip_hash in seen
+            )
+            if not changed:
+                self._stats['cycles_skipped'] += 1
+        
+        return changed
+    
+    def record_layout(self, merge_result: StripMergeResult, lines: List[Dict[str, Any]]) -> None:
+        """
+        Assign OCR lines of the merged image back to strips and cache their text.
+        
+        Args:
+            merge_result: Merge result with strip offsets
+            lines: OCR lines with 'text', 'top' and 'bottom' in merged image pixels
+        """
+        strip_lines: Dict[str, List[Dict[str, Any]]] = {strip_hash: [] for strip_hash in merge_result.changed_hashes}
+        ordered_offsets = sorted(merge_result.offsets.items(), key=lambda item: item[1][0])
+        
+        for line in sorted(lines, key=lambda l: (l['top'], l.get('left', 0))):
+            center = (line['top'] + line['bottom']) / 2
+            for strip_hash, (top, bottom) in ordered_offsets:
+                if top <= center < bottom:
+                    strip_lines[strip_hash].append(shift_layout_line(line, -top))
+                    break
+        
+        self.record_texts(merge_result.hotkey, {
+            strip_hash: '\n'.join(line['text'] for line in hash_lines)
+            for strip_hash, hash_lines in strip_lines.items()
+        }, strip_lines)
+    
+    def record_texts(self, hotkey: str, texts: Dict[str, str],
+                     lines: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> None:
+        """
+        Cache text for strip hashes.
+        
+        Args:
+            hotkey: Hotkey name
+            texts: Mapping of strip hash to recognized text (may be empty)
+            lines: Optional mapping of strip hash to its OCR lines relative to the strip top
+        """
+        lines = lines or {}
+        with self._lock:
+            cache = self._texts.setdefault(hotkey, OrderedDict())
+            line_cache = self._lines.setdefault(hotkey, {})
+            for strip_hash, text in texts.items():
+                cache[strip_hash] = text
+                cache.move_to_end(strip_hash)
+                if strip_hash in lines:
+                    line_cache[strip_hash] = lines[strip_hash]
+                else:
+                    line_cache.pop(strip_hash, None)
+            
+            while len(cache) > self.max_strips_per_hotkey:
+                evicted_hash, _ = cache.popitem(last=False)
+                line_cache.pop(evicted_hash, None)
+                self._stats['evictions'] += 1
+    
+    def stitch_text(self, hotkey: str, strips: List[ImageStrip]) -> Optional[str]:
+        """
+        Build full text of the cycle from cached strip texts.
+        
+        Args:
+            hotkey: Hotkey name
+            strips: Strips of the cycle in capture order
+        
+        Returns:
+            Stitched text or None if any strip has no cached text
+        """
+        with self._lock:
+            cache = self._texts.get(hotkey)
+            if cache is None:
+                return None
+            
+            parts = []
+            for strip in strips:
+                text = cache.get(strip.strip_hash)
+                if text is None:
+                    return None
+                cache.move_to_end(strip.strip_hash)
+                if text:
+                    parts.append(text)
+        
+        return '\n'.join(parts)
+    
+    def stitch_layout(self, hotkey: str, strips: List[ImageStrip]) -> Optional[Dict[str, Any]]:
+        """
+        Build full layout of the cycle from cached strip lines.
+        Strips are stacked in capture order, so line positions of the stitched
+        layout are those of the strips placed one under the other.
+        
+        Args:
+            hotkey: Hotkey name
+            strips: Strips of the cycle in capture order
+        
+        Returns:
+            Dictionary with 'text' and 'lines', or None if any strip has no cached lines
+        """
+        with self._lock:
+            cache = self._texts.get(hotkey)
+            line_cache = self._lines.get(hotkey, {})
+            if cache is None:
+                return None
+            
+            parts = []
+            lines = []
+            offset = 0
+            for strip in strips:
+                text = cache.get(strip.strip_hash)
+                strip_lines = line_cache.get(strip.strip_hash)
+                if text is None or strip_lines is None:
+                    return None
+                cache.move_to_end(strip.strip_hash)
+                if text:
+                    parts.append(text)
+                lines.extend(shift_layout_line(line, offset) for line in strip_lines)
+                offset += strip.height
+        
+        return {'text': '\n'.join(parts), 'lines': lines}
+    
+    def clear(self, hotkey: Optional[str] = None) -> None:
+        """Forget cached strips for one hotkey or all hotkeys."""
+        with self._lock:
+            if hotkey is None:
+                self._texts.clear()
+                self._lines.clear()
+            else:
+                self._texts.pop(hotkey, None)
+                self._lines.pop(hotkey, None)
+    
+    def get_strip_statistics(self) -> Dict[str, Any]:
+        """
+        Get strip tracking statistics.
+        
+        Returns:
+            Dictionary with strip statistics
+        """
+        with self._lock:
+            stats = self._stats.copy()
+            stats['cached_strips'] = {hotkey: len(cache) for hotkey, cache in self._texts.items()}
+        
+        if stats['strips_total'] > 0:
+            stats['reuse_rate'] = stats['strips_reused'] / stats['strips_total']
+        else:
+            stats['reuse_rate'] = 0.0
+        return stats
\ No newline at end of file
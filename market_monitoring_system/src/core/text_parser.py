@@ -5,12 +5,13 @@ Extracts structured data from OCR text using regex patterns.
 
 import logging
 import re
-from typing import List, Dict, Optional, Tuple, Any, Pattern
+from typing import List, Dict, Optional, Tuple, Any, Pattern, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
 import json
 
 from .database_manager import ItemData
+from .ocr_document import OCRDocument, OCRLine
 
 
 @dataclass
@@ -45,8 +46,31 @@ class TextParser:
     """
     Extracts structured data from OCR text using configurable regex patterns.
     Supports different parsing strategies for different hotkey contexts.
+    OCR layouts with line boxes are parsed by column and row position.
     """
     
+    # Line types of trade and broker windows for layout parsing
+    TRADE_WINDOW = re.compile(r'Items to Sell\s+(.+)', re.IGNORECASE)
+    TRADE_PRICE = re.compile(r'Unit Price\s*:?\s*([\d,]+)', re.IGNORECASE)
+    TRADE_QUANTITY = re.compile(r'Quantity\s*:?\s*(\d+)', re.IGNORECASE)
+    TRADE_TITLE = re.compile(r'^Trade\b', re.IGNORECASE)
+    BROKER_WINDOW = re.compile(r'Item Broke', re.IGNORECASE)
+    
+    # Line types of trade and broker text, tried in order at line start;
+    # the name of the matching group is the line type
+    LINE_TOKEN = re.compile(
+        r'(?P<broker>Item Broke.*)'
+        r'|(?:Trade\s+)?Items to Sell\s+(?P<seller>.+)'
+        r'|(?P<trade>Trade)\b'
+        r'|Unit Price\s*:?\s*(?P<price>[\d,]*)'
+        r'|Quantity\s*:?\s*(?P<quantity>\d*)'
+        r'|(?P<header>Name|Currency|Qty\.)$'
+        r'|(?P<artifact>[:#\d\s&|]+)$'
+    )
+    
+    # Constructs whose meaning depends on group numbering or position in the regex
+    UNCOMBINABLE = re.compile(r'\\[1-9]|\(\?P=|\(\?[aiLmsux]+\)')
+    
     def __init__(self):
         """Initialize text parser with default patterns."""
         self.logger = logging.getLogger(__name__)
@@ -54,6 +78,9 @@ class TextParser:
         # Compiled regex patterns for performance
         self._compiled_patterns: Dict[str, List[Tuple[Pattern, ParsingPattern]]] = {}
         
+        # Alternation of all patterns of a hotkey, None if they can't be combined
+        self._combined_patterns: Dict[str, Optional[Tuple[Pattern, Dict[str, Tuple[List[int], ParsingPattern]]]]] = {}
+        
         # Parsing statistics
         self._parsing_stats = {
             'total_texts_processed': 0,
@@ -100,159 +127,222 @@ class TextParser:
             return True
         return False
     
+    def _tokenize_lines(self, text_content: str) -> Iterator[Tuple[str, str, str]]:
+        """
+        Classify each non-empty OCR line once with the combined line pattern.
+        
+        Args:
+            text_content: OCR text
+        
+        Yields:
+            Tuples of (line type, captured value, stripped line)
+        """
+        for line in text_content.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            match = self.LINE_TOKEN.match(line)
+            if match:
+                yield match.lastgroup, match.group(match.lastgroup), line
+            else:
+                yield 'text', line, line
+    
+    def _iter_broker_items(self, text_content: str, hotkey: str) -> Iterator[ItemData]:
+        """
+        Yield seller-item pairs from broker OCR text in one pass over its lines.
+        Each 'Item Broke' line opens a window whose first clean line is the item
+        name; every clean line after the 'Name' header is a seller.
+        """
+        item_name = ''
+        in_sellers = False
+        
+        for kind, value, line in self._tokenize_lines(text_content):
+            if kind == 'broker':
+                # New broker window
+                item_name, in_sellers = '', False
+            elif kind == 'header':
+                if value == 'Name':
+                    in_sellers = True
+            elif kind == 'artifact':
+                continue
+            elif in_sellers:
+                if item_name:
+                    yield ItemData(
+                        seller_name=line,
+                        item_name=item_name,
+                        price=None,  # No price in minimal processing
+                        quantity=None,  # No quantity in minimal processing
+                        item_id=None,
+                        hotkey=hotkey,
+                        processing_type="minimal"
+                    )
+            elif not item_name:
+                item_name = self._clean_item_name_broker(line)
+    
+    def _iter_trade_items(self, text_content: str, hotkey: str) -> Iterator[ItemData]:
+        """
+        Yield trade entries from OCR text in one pass over its lines.
+        A 'Trade' or 'Items to Sell' line opens a window; the item name is the
+        last text line before its unit price, and an entry is emitted as soon as
+        seller, item, price and quantity are all known.
+        """
+        seller = ''
+        item_name = ''
+        price = ''
+        quantity = ''
+        
+        for kind, value, line in self._tokenize_lines(text_content):
+            if kind in ('seller', 'trade'):
+                # New trade window
+                seller = value.strip() if kind == 'seller' else ''
+                item_name, price, quantity = '', '', ''
+                continue
+            
+            if kind == 'price':
+                price = self._clean_price(value)
+            elif kind == 'quantity':
+                quantity = value
+            elif kind in ('text', 'broker') and not price:
+                item_name = self._clean_item_name_trade(line)
+            
+            if seller and item_name and price and quantity:
+                try:
+                    yield ItemData(
+                        seller_name=seller,
+                        item_name=item_name,
+                        price=float(price),
+                        quantity=int(quantity),
+                        item_id=None,
+                        hotkey=hotkey,
+                        processing_type="full"
+                    )
+                except (ValueError, TypeError) as e:
+                    self.logger.warning(f"Failed to convert price/quantity for trade data: {e}")
+                item_name, price, quantity = '', '', ''
+    
     def _extract_broker_data(self, text_content: str, hotkey: str) -> List[ItemData]:
         """
         Extract seller-item pairs from broker OCR text (minimal processing).
         Based on extract_broker_sellers.py logic.
         """
-        items = []
-        extraction_log = []
+        try:
+            items = list(self._iter_broker_items(text_content, hotkey))
+        except Exception as e:
+            self.logger.error(f"Failed to extract broker data: {e}")
+            items = []
         
+        self.logger.info(f"Extracted {len(items)} broker seller-item pairs")
+        return items
+    
+    def _extract_trade_data(self, text_content: str, hotkey: str) -> List[ItemData]:
+        """
+        Extract trade data with full details (seller, item, price, quantity).
+        Based on extract_trade_data.py logic.
+        """
         try:
-            # Split by "Item Broke" to get individual sections
-            sections = text_content.split('Item Broke')
+            items = list(self._iter_trade_items(text_content, hotkey))
+        except Exception as e:
+            self.logger.error(f"Failed to extract trade data: {e}")
+            items = []
+        
+        self.logger.info(f"Extracted {len(items)} trade entries")
+        return items
+    
+    def _extract_trade_layout(self, document: OCRDocument, hotkey: str) -> List[ItemData]:
+        """
+        Extract trade data from line geometry in one pass per trade window column.
+        Label and value lines on the same row are joined, and an item name is
+        the nearest text row above its price, whatever order OCR returned lines in.
+        """
+        items = []
+        
+        for column in document.columns(self.TRADE_WINDOW):
+            seller = ''
+            item_name = ''
+            price = None
+            quantity = None
             
-            for i, section in enumerate(sections):
-                if not section.strip():
+            for row in document.rows(column):
+                text = ' '.join(line.text for line in row)
+                
+                seller_match = self.TRADE_WINDOW.search(text)
+                if seller_match or self.TRADE_TITLE.match(text):
+                    # New trade window
+                    seller = seller_match.group(1).strip() if seller_match else ''
+                    item_name, price, quantity = '', None, None
                     continue
-                    
-                try:
-                    lines = [line.strip() for line in section.split('\n') if line.strip()]
-                    
-                    if not lines:
-                        continue
-                    
-                    # Extract item name (first clean line)
-                    item_name = ''
-                    for line in lines:
-                        if not self._is_ocr_artifact(line):
-                            item_name = self._clean_item_name_broker(line)
-                            if item_name:
-                                break
-                    
-                    if not item_name:
-                        continue
-                    
-                    # Find "Name" line and collect sellers after it
-                    name_found = False
-                    sellers = []
-                    
-                    for j, line in enumerate(lines):
-                        if line == 'Name':
-                            name_found = True
-                            # Collect all sellers after "Name"
-                            for seller_line in lines[j+1:]:
-                                if not self._is_ocr_artifact(seller_line) and seller_line.strip():
-                                    sellers.append(seller_line.strip())
-                            break
-                    
-                    if not name_found or not sellers:
-                        continue
-                    
-                    # Create ItemData objects for each seller-item pair
-                    for seller in sellers:
-                        item_data = ItemData(
+                
+                price_match = self.TRADE_PRICE.search(text)
+                quantity_match = self.TRADE_QUANTITY.search(text)
+                if price_match:
+                    price = self._clean_price(price_match.group(1))
+                if quantity_match:
+                    quantity = quantity_match.group(1)
+                if not price_match and not quantity_match and not self._is_ocr_artifact(text) and price is None:
+                    item_name = self._clean_item_name_trade(text)
+                
+                if seller and item_name and price and quantity:
+                    try:
+                        items.append(ItemData(
                             seller_name=seller,
                             item_name=item_name,
-                            price=None,  # No price in minimal processing
-                            quantity=None,  # No quantity in minimal processing
+                            price=float(price),
+                            quantity=int(quantity),
                             item_id=None,
                             hotkey=hotkey,
-                            processing_type="minimal"
-                        )
-                        items.append(item_data)
-                        
-                except Exception as e:
-                    self.logger.warning(f"Error processing broker section {i}: {e}")
-                    continue
-                    
-        except Exception as e:
-            self.logger.error(f"Failed to extract broker data: {e}")
+                            processing_type="full"
+                        ))
+                    except (ValueError, TypeError) as e:
+                        self.logger.warning(f"Failed to convert price/quantity for trade layout: {e}")
+                    item_name, price, quantity = '', None, None
         
-        self.logger.info(f"Extracted {len(items)} broker seller-item pairs")
+        self.logger.info(f"Extracted {len(items)} trade entries from layout")
         return items
     
-    def _extract_trade_data(self, text_content: str, hotkey: str) -> List[ItemData]:
+    def _extract_broker_layout(self, document: OCRDocument, hotkey: str) -> List[ItemData]:
         """
-        Extract trade data with full details (seller, item, price, quantity).
-        Based on extract_trade_data.py logic.
+        Extract seller-item pairs from line geometry in one pass per broker window column.
+        Sellers are read from the line under the 'Name' header, so quantity and
+        currency cells on the same row are never taken for a seller.
         """
         items = []
         
-        try:
-            # Split by "Trade" to get individual instances
-            sections = text_content.split('Trade')
+        for column in document.columns(self.BROKER_WINDOW):
+            item_name = ''
+            name_header: Optional[OCRLine] = None
             
-            for i, section in enumerate(sections):
-                if not section.strip():
+            for row in document.rows(column):
+                if any(self.BROKER_WINDOW.search(line.text) for line in row):
+                    # New broker window
+                    item_name, name_header = '', None
                     continue
-                    
-                try:
-                    lines = [line.strip() for line in section.split('\n') if line.strip()]
-                    
-                    seller = ''
-                    item_name = ''
-                    unit_price = ''
-                    quantity = ''
-                    
-                    # Extract seller from "Items to Sell SellerName" pattern
-                    for line in lines:
-                        if 'Items to Sell' in line:
-                            seller_match = re.search(r'Items to Sell\\s+(.+)', line)
-                            if seller_match:
-                                seller = seller_match.group(1).strip()
-                                break
-                    
-                    # Find Unit Price and preceding line for item name
-                    unit_price_index = -1
-                    for j, line in enumerate(lines):
-                        if 'Unit Price' in line:
-                            unit_price_index = j
-                            # Extract price
-                            unit_price = self._clean_price(line)
-                            
-                            # Item name should be in the line before Unit Price
-                            if j > 0:
-                                item_name = self._clean_item_name_trade(lines[j-1])
-                            break
-                    
-                    # Extract quantity
-                    for line in lines:
-                        if line.startswith('Quantity :'):
-                            quantity_match = re.search(r'Quantity\\s*:\\s*(\\d+)', line)
-                            if quantity_match:
-                                quantity = quantity_match.group(1)
-                                break
-                    
-                    # Only add if we have all required fields
-                    if seller and item_name and unit_price and quantity:
-                        try:
-                            price_float = float(unit_price) if unit_price else None
-                            quantity_int = int(quantity) if quantity else None
-                            
-                            item_data = ItemData(
-                                seller_name=seller,
-                                item_name=item_name,
-                                price=price_float,
-                                quantity=quantity_int,
-                                item_id=None,
-                                hotkey=hotkey,
-                                processing_type="full"
-                            )
-                            items.append(item_data)
-                            
-                        except (ValueError, TypeError) as e:
-                            self.logger.warning(f"Failed to convert price/quantity for trade data: {e}")
-                            continue
-                            
-                except Exception as e:
-                    self.logger.warning(f"Error processing trade section {i}: {e}")
+                
+                if name_header is not None:
+                    seller_line = min(row, key=lambda line: abs(line.bbox.left - name_header.bbox.left))
+                    seller = seller_line.text.strip()
+                    if item_name and seller and not self._is_ocr_artifact(seller):
+                        items.append(ItemData(
+                            seller_name=seller,
+                            item_name=item_name,
+                            price=None,
+                            quantity=None,
+                            item_id=None,
+                            hotkey=hotkey,
+                            processing_type="minimal"
+                        ))
                     continue
-                    
-        except Exception as e:
-            self.logger.error(f"Failed to extract trade data: {e}")
+                
+                header = next((line for line in row if line.text.strip() == 'Name'), None)
+                if header is not None:
+                    name_header = header
+                elif not item_name:
+                    for line in row:
+                        if not self._is_ocr_artifact(line.text):
+                            item_name = self._clean_item_name_broker(line.text)
+                            if item_name:
+                                break
         
-        self.logger.info(f"Extracted {len(items)} trade entries")
+        self.logger.info(f"Extracted {len(items)} broker seller-item pairs from layout")
         return items
     
     def _initialize_default_patterns(self) -> None:
@@ -450,6 +540,61 @@ class TextParser:
             self._parsing_stats['total_texts_processed'] += 1
             self._parsing_stats['last_parsing_time'] = datetime.now().isoformat()
     
+    def parse_layout(self, layout: Dict[str, Any], hotkey: str,
+                     screenshot_type: str = "individual_seller_items",
+                     processing_type: str = "full") -> ParsingResult:
+        """
+        Parse OCR layout result by line geometry, falling back to text parsing.
+        
+        Args:
+            layout: OCR result with 'text' and 'lines' with bounding boxes
+            hotkey: Context hotkey (F1, F2, etc.)
+            screenshot_type: Type of screenshot (individual_seller_items or item_overview)
+            processing_type: 'full' for complete data extraction, 'minimal' for seller-item pairs only
+        
+        Returns:
+            ParsingResult with extracted items and metadata
+        """
+        start_time = datetime.now()
+        text = layout.get('text') or ''
+        
+        try:
+            document = OCRDocument.from_layout(layout)
+            if processing_type == "minimal":
+                items = self._extract_broker_layout(document, hotkey)
+            elif processing_type == "full":
+                items = self._extract_trade_layout(document, hotkey)
+            else:
+                items = []
+        except (KeyError, TypeError, ValueError) as e:
+            self.logger.warning(f"Invalid OCR layout for {hotkey}, parsing text only: {e}")
+            items = []
+        
+        if not items:
+            return self.parse_items_data(text, hotkey, screenshot_type=screenshot_type,
+                                         processing_type=processing_type)
+        
+        result = ParsingResult(items=items, hotkey=hotkey, screenshot_type=screenshot_type,
+                               processing_type=processing_type)
+        result.parsing_stats = {
+            'items_extracted': len(items),
+            'processing_time_ms': int((datetime.now() - start_time).total_seconds() * 1000),
+            'text_length': len(text),
+            'lines': len(document.lines),
+            'processing_type': processing_type,
+            'extraction_method': 'layout'
+        }
+        
+        self._update_parsing_stats(result)
+        self._parsing_stats['total_texts_processed'] += 1
+        self._parsing_stats['last_parsing_time'] = datetime.now().isoformat()
+        
+        self.logger.info(
+            f"Parsed {hotkey} layout ({processing_type}): {len(items)} items from "
+            f"{len(document.lines)} lines in {result.parsing_stats['processing_time_ms']}ms"
+        )
+        return result
+    
     def _extract_with_regex_patterns(self, text: str, hotkey: str) -> List[ItemData]:
         """
         Fallback extraction using the original regex pattern method.
@@ -460,16 +605,17 @@ class TextParser:
             cleaned_text = self._clean_text(text)
             
             # Get patterns for this hotkey and general patterns
-            patterns_to_use = []
-            if hotkey in self._compiled_patterns:
-                patterns_to_use.extend(self._compiled_patterns[hotkey])
-            patterns_to_use.extend(self._compiled_patterns.get('general', []))
+            patterns_to_use = self._get_hotkey_patterns(hotkey)
             
             if not patterns_to_use:
                 return []
             
-            # Extract raw matches using all patterns
-            raw_matches = self._extract_raw_matches(cleaned_text, patterns_to_use)
+            # Extract raw matches in one scan, or pattern by pattern if they can't be combined
+            combined = self._get_combined_pattern(hotkey)
+            if combined:
+                raw_matches = self._extract_combined_matches(cleaned_text, *combined)
+            else:
+                raw_matches = self._extract_raw_matches(cleaned_text, patterns_to_use)
             
             # Convert matches to ItemData objects
             items = self._convert_matches_to_items(raw_matches, hotkey)
@@ -507,53 +653,124 @@ class TextParser:
         
         return text.strip()
     
+    def _get_hotkey_patterns(self, hotkey: str) -> List[Tuple[Pattern, ParsingPattern]]:
+        """Get compiled patterns of a hotkey followed by general patterns."""
+        patterns = []
+        if hotkey in self._compiled_patterns:
+            patterns.extend(self._compiled_patterns[hotkey])
+        if hotkey != 'general':
+            patterns.extend(self._compiled_patterns.get('general', []))
+        return patterns
+    
+    def _get_combined_pattern(self, hotkey: str) -> Optional[Tuple[Pattern, Dict[str, Tuple[List[int], ParsingPattern]]]]:
+        """
+        Get all patterns of a hotkey compiled into one alternation, built once per hotkey.
+        Each pattern is wrapped in a named group that identifies it in a match;
+        alternatives are ordered by priority, so the higher priority pattern wins
+        when several match at the same position.
+        
+        Args:
+            hotkey: Context hotkey
+        
+        Returns:
+            Tuple of combined regex and mapping of group name to the pattern's
+            group numbers and configuration, or None if patterns can't be combined
+        """
+        if hotkey in self._combined_patterns:
+            return self._combined_patterns[hotkey]
+        
+        patterns = sorted(self._get_hotkey_patterns(hotkey), key=lambda x: x[1].priority, reverse=True)
+        combined = None
+        
+        if patterns and not any(self.UNCOMBINABLE.search(config.pattern) for _, config in patterns):
+            alternatives = []
+            groups = {}
+            group_index = 1
+            for i, (compiled_pattern, pattern_config) in enumerate(patterns):
+                group_name = f"_pattern_{i}"
+                alternatives.append(f"(?P<{group_name}>{pattern_config.pattern})")
+                groups[group_name] = (list(range(group_index + 1, group_index + 1 + compiled_pattern.groups)),
+                                      pattern_config)
+                group_index += compiled_pattern.groups + 1
+            try:
+                combined = (re.compile('|'.join(alternatives), re.IGNORECASE | re.MULTILINE), groups)
+            except re.error as e:
+                self.logger.warning(f"Patterns for {hotkey} can't be combined, scanning one by one: {e}")
+        
+        self._combined_patterns[hotkey] = combined
+        return combined
+    
+    def _build_match_data(self, match: re.Match, pattern_config: ParsingPattern,
+                          groups: List[Optional[str]]) -> Dict[str, Any]:
+        """Build raw match dictionary and count pattern usage."""
+        match_data = {
+            'pattern_name': pattern_config.name,
+            'pattern_description': pattern_config.description,
+            'match_text': match.group(0),
+            'match_start': match.start(),
+            'match_end': match.end(),
+            'groups': groups,
+            'fields': pattern_config.fields,
+            'priority': pattern_config.priority
+        }
+        
+        # Map groups to field names
+        for field_name, value in zip(pattern_config.fields, groups):
+            match_data[field_name] = value
+        
+        # Update pattern usage statistics
+        pattern_usage = self._parsing_stats['pattern_usage']
+        pattern_usage[pattern_config.name] = pattern_usage.get(pattern_config.name, 0) + 1
+        
+        return match_data
+    
+    def _extract_combined_matches(self, text: str, combined_pattern: Pattern,
+                                  groups: Dict[str, Tuple[List[int], ParsingPattern]]) -> List[Dict[str, Any]]:
+        """
+        Extract raw matches in one scan of the combined pattern.
+        
+        Args:
+            text: Text to search
+            combined_pattern: Alternation of all patterns
+            groups: Group numbers and configuration by pattern group name
+        
+        Returns:
+            List of raw match dictionaries in positional order
+        """
+        matches = []
+        
+        for match in combined_pattern.finditer(text):
+            group_numbers, pattern_config = groups[match.lastgroup]
+            values = [match.group(number) for number in group_numbers]
+            matches.append(self._build_match_data(match, pattern_config, values))
+        
+        return matches
+    
     def _extract_raw_matches(self, text: str, 
                            patterns: List[Tuple[Pattern, ParsingPattern]]) -> List[Dict[str, Any]]:
         """
-        Extract raw matches using all provided patterns.
+        Extract raw matches pattern by pattern, for patterns that can't be combined.
         
         Args:
             text: Text to search
             patterns: List of compiled patterns
             
         Returns:
-            List of raw match dictionaries
+            List of raw match dictionaries in positional order
         """
         matches = []
         
         for compiled_pattern, pattern_config in patterns:
             try:
                 for match in compiled_pattern.finditer(text):
-                    match_data = {
-                        'pattern_name': pattern_config.name,
-                        'pattern_description': pattern_config.description,
-                        'match_text': match.group(0),
-                        'match_start': match.start(),
-                        'match_end': match.end(),
-                        'groups': list(match.groups()),
-                        'fields': pattern_config.fields,
-                        'priority': pattern_config.priority
-                    }
-                    
-                    # Map groups to field names
-                    for i, field_name in enumerate(pattern_config.fields):
-                        if i < len(match.groups()):
-                            match_data[field_name] = match.group(i + 1)
-                    
-                    matches.append(match_data)
-                    
-                    # Update pattern usage statistics
-                    pattern_name = pattern_config.name
-                    if pattern_name not in self._parsing_stats['pattern_usage']:
-                        self._parsing_stats['pattern_usage'][pattern_name] = 0
-                    self._parsing_stats['pattern_usage'][pattern_name] += 1
+                    matches.append(self._build_match_data(match, pattern_config, list(match.groups())))
                     
             except Exception as e:
                 self.logger.warning(f"Pattern '{pattern_config.name}' failed: {e}")
                 continue
         
-        # Sort by priority and position
-        matches.sort(key=lambda x: (-x['priority'], x['match_start']))
+        # Sort by position, higher priority first at the same position
+        matches.sort(key=lambda x: (x['match_start'], -x['priority']))
         
         return matches
     
@@ -872,8 +1089,9 @@ class TextParser:
             
             self._patterns[hotkey].append(pattern)
             
-            # Recompile patterns
+            # Recompile patterns and drop combined patterns built from the old set
             self._compile_patterns()
+            self._combined_patterns.clear()
             
             self.logger.info(f"Added custom pattern '{pattern.name}' for hotkey {hotkey}")
             return True
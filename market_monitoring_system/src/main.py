@@ -7,6 +7,7 @@ import sys
 import signal
 import logging
 import threading
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 import time
@@ -19,11 +20,23 @@ from utils.logger import setup_logging, LoggerManager
 from utils.file_utils import FileUtils
 from core.database_manager import DatabaseManager
 from core.screenshot_capture import ScreenshotCapture
+from core.frame_buffer import FrameBuffer
 from core.image_processor import ImageProcessor
 from core.ocr_client import YandexOCRClient
+from core.ocr_backends import YandexOCRBackend, TesseractOCRBackend, OCRBackendRouter, OCRBackendError
 from core.ocr_queue import OCRQueue
+from core.fair_job_queue import FairJobQueue
+from core.ocr_job_journal import OCRJobJournal
+from core.ocr_image_encoder import OCRImageEncoder, OCRImageEncoderError
+from core.ocr_request_packer import OCRRequestPacker, OCRRequestPackerError
+from core.ocr_reprocessor import OCRReprocessor
+from core.name_canonicalizer import NameCanonicalizer
+from core.rate_limiter import TokenBucket, CircuitBreaker
 from core.text_parser import TextParser
 from core.monitoring_engine import MonitoringEngine
+from core.alert_engine import AlertEngine
+from core.change_publisher import ChangePublisher
+from core.event_sinks import create_sink
 from utils.scheduler import TaskScheduler
 
 
@@ -49,11 +62,17 @@ class MarketMonitoringSystem:
         self.file_utils: Optional[FileUtils] = None
         self.database: Optional[DatabaseManager] = None
         self.screenshot_capture: Optional[ScreenshotCapture] = None
+        self.frame_buffer: Optional[FrameBuffer] = None
         self.image_processor: Optional[ImageProcessor] = None
         self.ocr_client: Optional[YandexOCRClient] = None
+        self.ocr_router: Optional[OCRBackendRouter] = None
         self.ocr_queue: Optional[OCRQueue] = None
+        self.ocr_journal: Optional[OCRJobJournal] = None
         self.text_parser: Optional[TextParser] = None
+        self.name_canonicalizer: Optional[NameCanonicalizer] = None
         self.monitoring_engine: Optional[MonitoringEngine] = None
+        self.alert_engine: Optional[AlertEngine] = None
+        self.change_publisher: Optional[ChangePublisher] = None
         self.scheduler: Optional[TaskScheduler] = None
         
         # System state
@@ -123,23 +142,130 @@ class MarketMonitoringSystem:
             self.logger.info("Initializing OCR client...")
             self.ocr_client = YandexOCRClient(self.settings)
             
+            backends_config = self.settings.ocr_backends
+            if backends_config and backends_config.enabled:
+                try:
+                    local_backend = TesseractOCRBackend(
+                        tesseract_cmd=backends_config.tesseract_cmd or None,
+                        oem=backends_config.tesseract_oem,
+                        psm=backends_config.tesseract_psm
+                    )
+                    self.ocr_router = OCRBackendRouter(
+                        cloud=YandexOCRBackend(self.ocr_client),
+                        local=local_backend,
+                        small_image_bytes=backends_config.small_image_bytes,
+                        max_cloud_latency=backends_config.max_cloud_latency,
+                        max_cloud_error_rate=backends_config.max_cloud_error_rate,
+                        rate_limit_cooldown=backends_config.rate_limit_cooldown,
+                        probe_interval=backends_config.probe_interval,
+                        ewma_alpha=backends_config.ewma_alpha
+                    )
+                    self.logger.info("OCR routing between Yandex and local Tesseract enabled")
+                except OCRBackendError as e:
+                    self.logger.info(f"Local OCR backend unavailable, using Yandex OCR only: {e}")
+            
             self.logger.info("Initializing OCR queue...")
+            rate_limiter = None
+            circuit_breaker = None
+            limit_config = self.settings.ocr_rate_limit
+            if limit_config and limit_config.enabled:
+                rate_limiter = TokenBucket(limit_config.requests_per_second, limit_config.burst)
+                circuit_breaker = CircuitBreaker(
+                    failure_threshold=limit_config.failure_threshold,
+                    rate_limit_threshold=limit_config.rate_limit_threshold,
+                    reset_timeout=limit_config.reset_timeout,
+                    max_reset_timeout=limit_config.max_reset_timeout
+                )
+            job_queue = None
+            scheduling_config = self.settings.ocr_scheduling
+            if scheduling_config and scheduling_config.enabled:
+                cost_unit = scheduling_config.cost_unit_bytes
+                job_queue = FairJobQueue(
+                    maxsize=100,
+                    weights={key: hotkey.ocr_weight for key, hotkey in self.settings.hotkeys.items()},
+                    max_wait={key: hotkey.ocr_max_wait for key, hotkey in self.settings.hotkeys.items()
+                              if hotkey.ocr_max_wait > 0},
+                    default_max_wait=scheduling_config.default_max_wait,
+                    aging_interval=scheduling_config.aging_interval,
+                    cost_function=lambda job: 1.0 + job.payload_size / cost_unit
+                )
+            journal_config = self.settings.ocr_journal
+            if journal_config and journal_config.enabled:
+                self.ocr_journal = OCRJobJournal(Path(journal_config.db_path), journal_config.retention_hours)
+            packer = None
+            packing_config = self.settings.ocr_packing
+            if packing_config and packing_config.enabled:
+                try:
+                    # Line positions are mapped back per image, so the composite keeps its geometry
+                    encoding_config = self.settings.ocr_encoding
+                    encoder = None
+                    if encoding_config and encoding_config.enabled:
+                        encoder = OCRImageEncoder(
+                            encodings=encoding_config.encodings,
+                            quality_ladder=encoding_config.quality_ladder,
+                            max_bytes=packing_config.max_bytes,
+                            trim_margins=False,
+                            collapse_blank_rows=False,
+                            palette_colors=encoding_config.palette_colors
+                        )
+                    packer = OCRRequestPacker(
+                        max_bytes=packing_config.max_bytes,
+                        max_image_bytes=packing_config.max_image_bytes,
+                        max_images=packing_config.max_images,
+                        max_height=packing_config.max_height,
+                        min_backlog=packing_config.min_backlog,
+                        gap=packing_config.gap,
+                        encoder=encoder
+                    )
+                except (OCRRequestPackerError, OCRImageEncoderError) as e:
+                    self.logger.warning(f"OCR request packing disabled: {e}")
             self.ocr_queue = OCRQueue(
-                ocr_client=self.ocr_client,
+                ocr_client=self.ocr_router or self.ocr_client,
                 num_workers=2,
-                max_queue_size=100
+                max_queue_size=100,
+                async_dispatch=self.ocr_client.async_available,
+                max_in_flight=self.settings.yandex_ocr.max_in_flight,
+                rate_limiter=rate_limiter,
+                circuit_breaker=circuit_breaker,
+                max_rate_limit_retries=limit_config.max_rate_limit_retries if limit_config else 10,
+                job_queue=job_queue,
+                journal=self.ocr_journal,
+                packer=packer
             )
             
             self.logger.info("Initializing text parser...")
             self.text_parser = TextParser()
             
+            self.name_canonicalizer = self._create_name_canonicalizer()
+            
             self.logger.info("Initializing monitoring engine...")
             self.monitoring_engine = MonitoringEngine(self.database, self.settings)
             
+            if self.settings.alerts.enabled:
+                self.logger.info("Initializing alert engine...")
+                self.alert_engine = AlertEngine(
+                    sinks=[create_sink(sink_config) for sink_config in self.settings.alerts.sinks]
+                )
+                self.alert_engine.load_rules_from_file(Path(self.settings.alerts.rules_file))
+            
+            if self.settings.change_publisher.enabled:
+                self.logger.info("Initializing change publisher...")
+                publisher_config = self.settings.change_publisher
+                self.change_publisher = ChangePublisher(
+                    sinks=[create_sink(sink_config) for sink_config in publisher_config.sinks],
+                    max_batch_size=publisher_config.max_batch_size,
+                    max_batch_delay=publisher_config.max_batch_delay_ms / 1000.0,
+                    max_buffer_size=publisher_config.max_buffer_size
+                )
+            
             # Step 6: Initialize screenshot capture (requires GUI dependencies)
+            if self.settings.image_processing.in_memory_pipeline:
+                self.logger.info("Using in-memory capture pipeline")
+                self.frame_buffer = FrameBuffer(self.settings.image_processing.frame_buffer_size)
+            
             self.logger.info("Initializing screenshot capture...")
             try:
-                self.screenshot_capture = ScreenshotCapture(self.settings)
+                self.screenshot_capture = ScreenshotCapture(self.settings, frame_buffer=self.frame_buffer)
             except Exception as e:
                 self.logger.error(f"Failed to initialize screenshot capture: {e}")
                 self.logger.warning("Screenshot capture disabled - system will run in processing-only mode")
@@ -153,7 +279,11 @@ class MarketMonitoringSystem:
                 image_processor=self.image_processor,
                 ocr_queue=self.ocr_queue,
                 text_parser=self.text_parser,
-                monitoring_engine=self.monitoring_engine
+                monitoring_engine=self.monitoring_engine,
+                alert_engine=self.alert_engine,
+                change_publisher=self.change_publisher,
+                frame_buffer=self.frame_buffer,
+                name_canonicalizer=self.name_canonicalizer
             )
             
             # Step 8: Perform system health checks
@@ -262,10 +392,19 @@ class MarketMonitoringSystem:
             
             self.logger.info("Starting Market Monitoring System...")
             
+            # Start change publisher before producers
+            if self.change_publisher:
+                self.logger.info("Starting change publisher...")
+                self.change_publisher.start()
+            
             # Start OCR queue
             self.logger.info("Starting OCR processing queue...")
             self.ocr_queue.start()
             
+            # Replay OCR jobs interrupted by the last shutdown or crash
+            if self.ocr_journal:
+                self.ocr_queue.recover_jobs(self.scheduler.resolve_recovered_callback)
+            
             # Start screenshot capture if available
             if self.screenshot_capture:
                 self.logger.info("Starting screenshot capture system...")
@@ -308,14 +447,27 @@ class MarketMonitoringSystem:
                 self.logger.info("Stopping screenshot capture...")
                 self.screenshot_capture.stop_monitoring()
             
+            if self.image_processor:
+                self.image_processor.close()
+            
             if self.ocr_queue:
                 self.logger.info("Stopping OCR queue...")
                 self.ocr_queue.stop()
             
+            if self.ocr_journal:
+                self.ocr_journal.close()
+            
             if self.ocr_client:
                 self.logger.info("Closing OCR client...")
                 self.ocr_client.close()
             
+            if self.change_publisher:
+                self.change_publisher.stop()
+            
+            if self.alert_engine:
+                self.logger.info("Closing alert sinks...")
+                self.alert_engine.close()
+            
             if self.database:
                 self.logger.info("Closing database connections...")
                 self.database.close_connection()
@@ -375,6 +527,51 @@ class MarketMonitoringSystem:
         except Exception as e:
             self.logger.warning(f"Periodic health check failed: {e}")
     
+    def _create_name_canonicalizer(self) -> Optional[NameCanonicalizer]:
+        """Create name canonicalizer over the database when enabled."""
+        names_config = self.settings.name_canonicalization
+        if not names_config or not names_config.enabled:
+            return None
+        
+        self.logger.info("Initializing name canonicalizer...")
+        return NameCanonicalizer(
+            self.database,
+            max_seller_substitutions=names_config.max_seller_substitutions,
+            max_item_substitutions=names_config.max_item_substitutions,
+            min_name_length=names_config.min_name_length,
+            cache_size=names_config.cache_size,
+            learn_aliases=names_config.learn_aliases
+        )
+    
+    def reprocess_archive(self, since: datetime, until: datetime,
+                          hotkey: Optional[str] = None, workers: Optional[int] = None) -> dict:
+        """
+        Reparse archived OCR text of a time range without starting monitoring.
+        
+        Args:
+            since: Start of the range, inclusive (UTC)
+            until: End of the range, exclusive (UTC)
+            hotkey: Optional hotkey filter
+            workers: Parser processes, taken from configuration when None
+        
+        Returns:
+            Dictionary with reprocessing statistics
+        """
+        self.settings = SettingsManager(self.config_file)
+        self.database = DatabaseManager(
+            str(self.settings.paths.database),
+            self.settings.database.connection_timeout
+        )
+        
+        archive_config = self.settings.ocr_archive
+        reprocessor = OCRReprocessor(
+            self.database,
+            num_workers=workers if workers is not None else archive_config.reprocess_workers,
+            batch_size=archive_config.reprocess_batch_size,
+            name_canonicalizer=self._create_name_canonicalizer()
+        )
+        return reprocessor.reprocess(since, until, hotkey)
+    
     def get_system_status(self) -> dict:
         """
         Get comprehensive system status.
@@ -415,6 +612,21 @@ class MarketMonitoringSystem:
             except Exception as e:
                 status['components']['monitoring_engine'] = {'error': str(e)}
         
+        if self.change_publisher:
+            try:
+                status['components']['change_publisher'] = self.change_publisher.get_publisher_statistics()
+            except Exception as e:
+                status['components']['change_publisher'] = {'error': str(e)}
+        
+        if self.alert_engine:
+            try:
+                status['components']['alert_engine'] = self.alert_engine.get_alert_statistics()
+            except Exception as e:
+                status['components']['alert_engine'] = {'error': str(e)}
+        
+        if self.name_canonicalizer:
+            status['components']['name_canonicalizer'] = self.name_canonicalizer.get_canonicalizer_statistics()
+        
         return status
     
     def __enter__(self):
@@ -437,12 +649,34 @@ def main():
     parser.add_argument('--config', '-c', help='Configuration file path')
     parser.add_argument('--test-only', action='store_true', help='Run initialization test only')
     parser.add_argument('--status', action='store_true', help='Show system status and exit')
+    parser.add_argument('--reprocess', action='store_true', help='Reparse archived OCR text of a time range and exit')
+    parser.add_argument('--since', help='Start of reprocessing range, UTC (YYYY-MM-DD[ HH:MM:SS])')
+    parser.add_argument('--until', help='End of reprocessing range, UTC, exclusive (default: now)')
+    parser.add_argument('--hotkey', help='Reprocess only sessions of this hotkey')
+    parser.add_argument('--workers', type=int, help='Parser processes for reprocessing (default: from configuration)')
     
     args = parser.parse_args()
     
     # Create and initialize system
     system = MarketMonitoringSystem(args.config)
     
+    if args.reprocess:
+        if not args.since:
+            parser.error("--reprocess requires --since")
+        try:
+            since = datetime.fromisoformat(args.since)
+            until = datetime.fromisoformat(args.until) if args.until else datetime.now(timezone.utc).replace(tzinfo=None)
+            stats = system.reprocess_archive(since, until, args.hotkey, args.workers)
+        except Exception as e:
+            print(f"Reprocessing failed: {e}")
+            return 1
+        print(
+            f"Reprocessed {stats['sessions']} sessions: {stats['items_written']} items, "
+            f"{stats['changes_written']} changes in {stats['total_time']:.1f}s "
+            f"({stats['sessions_per_second']:.0f} sessions/s)"
+        )
+        return 0
+    
     if args.test_only:
         print("Running initialization test...")
         if system.initialize():
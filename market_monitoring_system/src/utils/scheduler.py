@@ -26,6 +26,7 @@ from core.image_processor import ImageProcessor
 from core.ocr_client import YandexOCRClient
 from core.text_parser import TextParser
 from core.monitoring_engine import MonitoringEngine
+from core.strip_tracker import StripTracker
 
 
 class SchedulerError(Exception):
@@ -44,7 +45,11 @@ class TaskScheduler:
                  image_processor: ImageProcessor,
                  ocr_queue,  # OCRQueue instance
                  text_parser: TextParser,
-                 monitoring_engine: MonitoringEngine):
+                 monitoring_engine: MonitoringEngine,
+                 alert_engine=None,  # Optional AlertEngine instance
+                 change_publisher=None,  # Optional ChangePublisher instance
+                 frame_buffer=None,  # Optional FrameBuffer for in-memory pipeline
+                 name_canonicalizer=None):  # Optional NameCanonicalizer between parser and engine
         """
         Initialize task scheduler.
         
@@ -55,6 +60,10 @@ class TaskScheduler:
             ocr_queue: OCR queue instance for asynchronous processing
             text_parser: Text parser instance
             monitoring_engine: Monitoring engine instance
+            alert_engine: Optional alert engine evaluated on detected changes
+            change_publisher: Optional publisher streaming detected changes to consumers
+            frame_buffer: Optional buffer of captured frames, merged without temp files
+            name_canonicalizer: Optional mapper of OCR name variants to canonical names
         """
         if not SCHEDULER_AVAILABLE:
             raise SchedulerError(f"APScheduler not available: {SCHEDULER_ERROR}")
@@ -65,8 +74,22 @@ class TaskScheduler:
         self.ocr_queue = ocr_queue
         self.text_parser = text_parser
         self.monitoring_engine = monitoring_engine
+        self.alert_engine = alert_engine
+        self.change_publisher = change_publisher
+        self.frame_buffer = frame_buffer
+        self.name_canonicalizer = name_canonicalizer
         self.logger = logging.getLogger(__name__)
         
+        # Strip-level change tracking (only changed strips are OCR'd)
+        self.strip_tracker: Optional[StripTracker] = None
+        if self.settings.image_processing and self.settings.image_processing.strip_mode:
+            self.strip_tracker = StripTracker(self.settings.image_processing.strip_cache_size)
+        
+        # Oversize columns are split into OCR-sized chunks instead of scaled down
+        self.chunk_oversize = bool(
+            self.settings.image_processing and self.settings.image_processing.oversize_mode == 'chunk'
+        )
+        
         # Scheduler instance
         self.scheduler = BackgroundScheduler()
         
@@ -159,10 +182,25 @@ class TaskScheduler:
                 self.logger.info(f"Skipping disabled hotkey {hotkey_name}")
                 return
             
-            # Process images
-            merged_image_path = self.image_processor.process_hotkey_folder(hotkey_name)
+            # Strip mode: only changed screenshot strips are sent to OCR
+            if self.strip_tracker:
+                self._process_hotkey_strips(hotkey_name)
+                return
+            
+            # Process images (in-memory frames or screenshot files)
+            if self.chunk_oversize:
+                if self.frame_buffer is not None:
+                    merged_images = self.image_processor.process_hotkey_frame_chunks(hotkey_name, self.frame_buffer)
+                else:
+                    merged_images = self.image_processor.process_hotkey_folder_chunks(hotkey_name)
+            elif self.frame_buffer is not None:
+                merged_image_data = self.image_processor.process_hotkey_frames(hotkey_name, self.frame_buffer)
+                merged_images = [merged_image_data] if merged_image_data else None
+            else:
+                merged_image_path = self.image_processor.process_hotkey_folder(hotkey_name)
+                merged_images = [merged_image_path] if merged_image_path else None
             
-            if not merged_image_path:
+            if not merged_images:
                 self.logger.debug(f"No images to process for {hotkey_name}")
                 return
             
@@ -176,90 +214,43 @@ class TaskScheduler:
                 Callback function called when OCR job completes.
                 
                 Args:
-                    ocr_job: Completed OCRJob instance
+                    ocr_job: Completed OCRJob with layout, or OCRJobGroup with text for chunked merges
                 """
-                try:
-                    # Calculate OCR duration
-                    ocr_duration = time.time() - session_start_time
-                    
-                    if ocr_job.status.value == "completed" and ocr_job.result:
-                        # Get processing type from hotkey configuration
-                        hotkey_config = self.settings.hotkeys.get(hotkey_name.lower())
-                        processing_type = hotkey_config.processing_type if hotkey_config else 'full'
-                        screenshot_type = hotkey_config.screenshot_type if hotkey_config else "individual_seller_items"
-                        
-                        # Parse the extracted text
-                        parsing_result = self.text_parser.parse_items_data(
-                            ocr_job.result, 
-                            hotkey_name,
-                            screenshot_type=screenshot_type,
-                            processing_type=processing_type
-                        )
-                        
-                        if parsing_result.errors:
-                            self.logger.warning(
-                                f"Parsing errors for {hotkey_name}: {parsing_result.errors}"
-                            )
-                        
-                        # Save extracted items
-                        items_saved = 0
-                        if parsing_result.items:
-                            items_saved = self.db.save_items_data(parsing_result.items, session_id)
-                        
-                        # Update OCR session with success
-                        self.db.update_ocr_session(session_id, ocr_duration)
-                        
-                        # Process through monitoring engine
-                        if parsing_result.items:
-                            detection_result = self.monitoring_engine.process_parsing_results([parsing_result])
-                            
-                            self.logger.info(
-                                f"Processed {hotkey_name}: {items_saved} items saved, "
-                                f"{len(detection_result.detected_changes)} changes detected "
-                                f"(OCR job {ocr_job.job_id})"
-                            )
-                        else:
-                            self.logger.info(
-                                f"Processed {hotkey_name}: no items extracted "
-                                f"(OCR job {ocr_job.job_id})"
-                            )
-                    
-                    else:
-                        # OCR failed
-                        error_msg = ocr_job.error or "Unknown OCR error"
-                        self.logger.error(
-                            f"OCR failed for {hotkey_name}: {error_msg} "
-                            f"(OCR job {ocr_job.job_id})"
-                        )
-                        
-                        # Update OCR session with failure
-                        self.db.update_ocr_session(session_id, ocr_duration, error_msg)
-                
-                except Exception as callback_error:
-                    self.logger.error(
-                        f"Error in OCR callback for {hotkey_name}: {callback_error} "
-                        f"(OCR job {ocr_job.job_id})"
-                    )
-                    # Still update session to avoid orphaned records
-                    try:
-                        self.db.update_ocr_session(
-                            session_id, 
-                            time.time() - session_start_time, 
-                            f"Callback error: {callback_error}"
-                        )
-                    except Exception:
-                        pass
+                if ocr_job.status.value == "completed" and ocr_job.result:
+                    result = ocr_job.result
+                    layout = result if isinstance(result, dict) else None
+                    self._handle_ocr_text(hotkey_name, session_id, session_start_time,
+                                          layout['text'] if layout else result,
+                                          f"OCR job {ocr_job.job_id}", layout=layout)
+                else:
+                    self._handle_ocr_failure(hotkey_name, session_id, session_start_time, ocr_job)
             
             # Submit OCR job to queue
             from core.ocr_queue import OCRJobPriority
             
-            ocr_job_id = self.ocr_queue.submit_job(
-                image_path=merged_image_path,
-                hotkey=hotkey_name,
-                priority=OCRJobPriority.NORMAL,
-                cleanup_image=True,  # Clean up merged image after OCR
-                callback=ocr_completion_callback
-            )
+            if len(merged_images) > 1:
+                # Chunks are recognized in parallel, text is joined in column order
+                ocr_job_id = self.ocr_queue.submit_job_group(
+                    merged_images,
+                    hotkey=hotkey_name,
+                    priority=OCRJobPriority.NORMAL,
+                    cleanup_image=True,
+                    callback=ocr_completion_callback,
+                    context={'session_id': session_id, 'session_start_time': session_start_time}
+                )
+            else:
+                merged_image = merged_images[0]
+                in_memory = isinstance(merged_image, bytes)
+                ocr_job_id = self.ocr_queue.submit_job(
+                    image_path=None if in_memory else merged_image,
+                    hotkey=hotkey_name,
+                    priority=OCRJobPriority.NORMAL,
+                    cleanup_image=True,  # Clean up merged image after OCR
+                    callback=ocr_completion_callback,
+                    image_data=merged_image if in_memory else None,
+                    layout=True,
+                    context={'session_id': session_id, 'session_start_time': session_start_time}
+                )
             
             self.logger.info(
                 f"Submitted OCR job {ocr_job_id} for {hotkey_name} "
@@ -284,6 +275,243 @@ class TaskScheduler:
             duration = time.time() - start_time
             self._update_job_duration(job_id, duration)
     
+    def _process_hotkey_strips(self, hotkey_name: str) -> None:
+        """
+        Process hotkey screenshots in strip mode.
+        Unchanged strips reuse cached text; if nothing changed OCR is skipped entirely.
+        
+        Args:
+            hotkey_name: Name of the hotkey to process
+        """
+        merge_result = self.image_processor.process_hotkey_folder_strips(hotkey_name, self.strip_tracker)
+        
+        if not merge_result:
+            self.logger.debug(f"No images to process for {hotkey_name}")
+            return
+        
+        session_id = self.db.create_ocr_session(hotkey_name)
+        session_start_time = time.time()
+        
+        if merge_result.merged_path is None:
+            # Every strip is known, stitch text without calling OCR
+            layout = self.strip_tracker.stitch_layout(hotkey_name, merge_result.strips)
+            text = layout['text'] if layout else self.strip_tracker.stitch_text(hotkey_name, merge_result.strips)
+            self.logger.info(f"No strips changed for {hotkey_name}, OCR skipped")
+            self._handle_ocr_text(hotkey_name, session_id, session_start_time,
+                                  text or "", "cached strips", layout=layout)
+            return
+        
+        def ocr_completion_callback(ocr_job):
+            """
+            Callback assigning OCR lines to changed strips and stitching full layout.
+            
+            Args:
+                ocr_job: Completed OCRJob instance
+            """
+            if ocr_job.status.value == "completed" and ocr_job.result:
+                layout = None
+                try:
+                    self.strip_tracker.record_layout(merge_result, ocr_job.result['lines'])
+                    layout = self.strip_tracker.stitch_layout(hotkey_name, merge_result.strips)
+                    if layout is None:
+                        # Strips evicted meanwhile, fall back to text of the changed part
+                        text = ocr_job.result['text']
+                    else:
+                        text = layout['text']
+                except Exception as e:
+                    self.logger.error(f"Failed to stitch strip text for {hotkey_name}: {e}")
+                    text = ocr_job.result.get('text', '')
+                
+                self._handle_ocr_text(hotkey_name, session_id, session_start_time,
+                                      text, f"OCR job {ocr_job.job_id}", layout=layout)
+            else:
+                self._handle_ocr_failure(hotkey_name, session_id, session_start_time, ocr_job)
+        
+        from core.ocr_queue import OCRJobPriority
+        
+        ocr_job_id = self.ocr_queue.submit_job(
+            image_path=merge_result.merged_path,
+            hotkey=hotkey_name,
+            priority=OCRJobPriority.NORMAL,
+            cleanup_image=True,
+            callback=ocr_completion_callback,
+            layout=True,
+            context={'session_id': session_id, 'session_start_time': session_start_time}
+        )
+        
+        self.logger.info(
+            f"Submitted strip OCR job {ocr_job_id} for {hotkey_name} "
+            f"({len(merge_result.changed_hashes)}/{len(merge_result.strips)} strips, session {session_id})"
+        )
+    
+    def resolve_recovered_callback(self, hotkey_name: str, context: Dict[str, Any]) -> Optional[Callable]:
+        """
+        Build completion callback for an OCR job replayed from the job journal.
+        Strip state is not persisted, so recovered strip jobs use their full text.
+        
+        Args:
+            hotkey_name: Hotkey of the job
+            context: Context journaled at submission
+        
+        Returns:
+            Callback function, or None for jobs without OCR session
+        """
+        session_id = context.get('session_id')
+        if session_id is None:
+            return None
+        session_start_time = context.get('session_start_time', time.time())
+        
+        def recovered_completion_callback(ocr_job):
+            """
+            Callback for a recovered OCR job or job group.
+            
+            Args:
+                ocr_job: Finished OCRJob or OCRJobGroup
+            """
+            if ocr_job.status.value == "completed" and ocr_job.result:
+                result = ocr_job.result
+                layout = result if isinstance(result, dict) else None
+                self._handle_ocr_text(hotkey_name, session_id, session_start_time,
+                                      layout['text'] if layout else result,
+                                      f"recovered OCR job {ocr_job.job_id}", layout=layout)
+            else:
+                self._handle_ocr_failure(hotkey_name, session_id, session_start_time, ocr_job)
+        
+        return recovered_completion_callback
+    
+    def _handle_ocr_text(self, hotkey_name: str, session_id: int,
+                         session_start_time: float, text: str, source: str,
+                         layout: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Parse recognized text, save items and run change detection.
+        
+        Args:
+            hotkey_name: Hotkey that produced the text
+            session_id: OCR session ID
+            session_start_time: Time when OCR session started
+            text: Recognized text
+            source: Description of text origin for logging
+            layout: Optional OCR layout with line boxes, parsed by geometry when given
+        """
+        try:
+            # Calculate OCR duration
+            ocr_duration = time.time() - session_start_time
+            
+            # Get processing type from hotkey configuration
+            hotkey_config = self.settings.hotkeys.get(hotkey_name.lower())
+            processing_type = hotkey_config.processing_type if hotkey_config else 'full'
+            screenshot_type = hotkey_config.screenshot_type if hotkey_config else "individual_seller_items"
+            
+            # Archive raw text before parsing, so history can be reparsed later
+            archive_config = self.settings.ocr_archive
+            if archive_config and archive_config.enabled:
+                self.db.save_ocr_text(
+                    session_id,
+                    hotkey_name,
+                    text,
+                    layout_lines=layout.get('lines') if layout and archive_config.store_layout else None,
+                    processing_type=processing_type,
+                    screenshot_type=screenshot_type,
+                    compression_level=archive_config.compression_level
+                )
+            
+            # Parse the extracted layout, or plain text if no line boxes came back
+            if layout and layout.get('lines'):
+                parsing_result = self.text_parser.parse_layout(
+                    layout,
+                    hotkey_name,
+                    screenshot_type=screenshot_type,
+                    processing_type=processing_type
+                )
+            else:
+                parsing_result = self.text_parser.parse_items_data(
+                    text, 
+                    hotkey_name,
+                    screenshot_type=screenshot_type,
+                    processing_type=processing_type
+                )
+            
+            if parsing_result.errors:
+                self.logger.warning(
+                    f"Parsing errors for {hotkey_name}: {parsing_result.errors}"
+                )
+            
+            # Map OCR spelling variants to known names before anything is stored or compared
+            if self.name_canonicalizer and parsing_result.items:
+                self.name_canonicalizer.canonicalize_items(parsing_result.items)
+            
+            # Save extracted items
+            items_saved = 0
+            if parsing_result.items:
+                items_saved = self.db.save_items_data(parsing_result.items, session_id)
+            
+            # Update OCR session with success
+            self.db.update_ocr_session(session_id, ocr_duration)
+            
+            # Process through monitoring engine
+            if parsing_result.items:
+                detection_result = self.monitoring_engine.process_parsing_results([parsing_result], save_items=False)
+                
+                # Evaluate alert rules on the detected changes only
+                if self.alert_engine and detection_result.detected_changes:
+                    try:
+                        self.alert_engine.process_changes(detection_result.detected_changes)
+                    except Exception as alert_error:
+                        self.logger.error(f"Alert evaluation failed for {hotkey_name}: {alert_error}")
+                
+                # Hand changes to publisher; never blocks on slow consumers
+                if self.change_publisher and detection_result.detected_changes:
+                    self.change_publisher.publish(detection_result.detected_changes, hotkey=hotkey_name)
+                
+                self.logger.info(
+                    f"Processed {hotkey_name}: {items_saved} items saved, "
+                    f"{len(detection_result.detected_changes)} changes detected "
+                    f"({source})"
+                )
+            else:
+                self.logger.info(
+                    f"Processed {hotkey_name}: no items extracted "
+                    f"({source})"
+                )
+        
+        except Exception as callback_error:
+            self.logger.error(
+                f"Error in OCR callback for {hotkey_name}: {callback_error} "
+                f"({source})"
+            )
+            # Still update session to avoid orphaned records
+            try:
+                self.db.update_ocr_session(
+                    session_id, 
+                    time.time() - session_start_time, 
+                    f"Callback error: {callback_error}"
+                )
+            except Exception:
+                pass
+    
+    def _handle_ocr_failure(self, hotkey_name: str, session_id: int,
+                            session_start_time: float, ocr_job) -> None:
+        """
+        Record failed OCR job in session log.
+        
+        Args:
+            hotkey_name: Hotkey of the job
+            session_id: OCR session ID
+            session_start_time: Time when OCR session started
+            ocr_job: Failed OCRJob instance
+        """
+        error_msg = ocr_job.error or "Unknown OCR error"
+        self.logger.error(
+            f"OCR failed for {hotkey_name}: {error_msg} "
+            f"(OCR job {ocr_job.job_id})"
+        )
+        
+        # Update OCR session with failure
+        try:
+            self.db.update_ocr_session(session_id, time.time() - session_start_time, error_msg)
+        except Exception as e:
+            self.logger.error(f"Failed to update OCR session {session_id}: {e}")
+    
     def setup_status_check_cycle(self) -> None:
         """Setup periodic status check and transition processing."""
         try:
@@ -608,6 +836,15 @@ class TaskScheduler:
                 
                 status['job_statistics'][job.id] = job_info
         
+        if self.strip_tracker:
+            status['strip_tracking'] = self.strip_tracker.get_strip_statistics()
+        
+        if self.frame_buffer is not None:
+            status['frame_buffer'] = self.frame_buffer.get_buffer_statistics()
+        
+        if self.name_canonicalizer:
+            status['name_canonicalization'] = self.name_canonicalizer.get_canonicalizer_statistics()
+        
         return status
     
     def run_job_now(self, job_id: str) -> bool:
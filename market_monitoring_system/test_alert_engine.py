@@ -0,0 +1,171 @@
+"""
+Tests for alert rule engine and local event sinks.
+Verifies indexed rule matching, price thresholds, relist rules and cooldowns.
+"""
+
+import unittest
+import tempfile
+import json
+from pathlib import Path
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.database_manager import ChangeLogEntry
+from core.alert_engine import AlertEngine, AlertRule, AlertEngineError
+from core.event_sinks import EventSink, JSONLFileSink, CallbackSink, EventSinkError, create_sink
+
+
+class AlertEngineTest(unittest.TestCase):
+    """Test suite for AlertEngine."""
+    
+    def setUp(self):
+        """Set up alert engine with in-memory callback sink."""
+        self.delivered = []
+        self.engine = AlertEngine(sinks=[CallbackSink(self.delivered.extend)])
+    
+    def tearDown(self):
+        """Close alert engine sinks."""
+        self.engine.close()
+    
+    def test_1_index_limits_candidate_rules(self):
+        """Test 1: Only rules indexed for the changed seller/item are checked."""
+        print("\n=== Test 1: Indexed Rule Lookup ===")
+        
+        for i in range(100):
+            self.engine.add_rule(AlertRule(rule_id=f"rule_{i}", item_name=f"Item {i}"))
+        
+        changes = [ChangeLogEntry("PlayerA", "item 7", "PRICE_DECREASE", "100", "90")]
+        alerts = self.engine.evaluate(changes)
+        
+        self.assertEqual(len(alerts), 1)
+        self.assertEqual(alerts[0].rule_id, "rule_7")
+        self.assertEqual(self.engine.get_alert_statistics()['total_rule_checks'], 1)
+        print("✓ Only matching index bucket evaluated")
+    
+    def test_2_price_below_threshold(self):
+        """Test 2: Price threshold rules fire only below the threshold."""
+        print("\n=== Test 2: Price Threshold ===")
+        
+        self.engine.add_rule(AlertRule(
+            rule_id="cheap_sword",
+            item_name="Sword of Power",
+            change_types=["PRICE_DECREASE", "NEW_ITEM"],
+            price_below=1000
+        ))
+        
+        changes = [
+            ChangeLogEntry("PlayerA", "Sword of Power", "PRICE_DECREASE", "1500", "1200"),
+            ChangeLogEntry("PlayerB", "Sword of Power", "PRICE_DECREASE", "1200", "900"),
+            ChangeLogEntry("PlayerC", "Sword of Power", "NEW_ITEM", None, "Price: 800.0, Quantity: 1")
+        ]
+        alerts = self.engine.process_changes(changes)
+        
+        self.assertEqual([alert.seller_name for alert in alerts], ["PlayerB", "PlayerC"])
+        self.assertEqual(alerts[1].price, 800.0)
+        self.assertEqual(len(self.delivered), 2)
+        print("✓ Price threshold applied to price changes and new listings")
+    
+    def test_3_relist_and_cooldown(self):
+        """Test 3: Relist rule respects per-combination cooldown."""
+        print("\n=== Test 3: Relist Cooldown ===")
+        
+        self.engine.add_rule(AlertRule(
+            rule_id="relist",
+            seller_name="PlayerA",
+            change_types=["NEW_COMBINATION"],
+            cooldown_seconds=60
+        ))
+        
+        change = ChangeLogEntry("PlayerA", "Magic Staff", "NEW_COMBINATION", None, "Quantity: 1")
+        self.assertEqual(len(self.engine.evaluate([change])), 1)
+        self.assertEqual(len(self.engine.evaluate([change])), 0)
+        
+        other_item = ChangeLogEntry("PlayerA", "Health Potion", "NEW_COMBINATION", None, "Quantity: 5")
+        self.assertEqual(len(self.engine.evaluate([other_item])), 1)
+        
+        stats = self.engine.get_alert_statistics()
+        self.assertEqual(stats['alerts_suppressed_by_cooldown'], 1)
+        print("✓ Cooldown suppresses repeated alerts for same combination")
+    
+    def test_4_rule_management(self):
+        """Test 4: Rules can be replaced, removed and validated."""
+        print("\n=== Test 4: Rule Management ===")
+        
+        self.engine.add_rule(AlertRule(rule_id="r1", seller_name="PlayerA"))
+        self.engine.add_rule(AlertRule(rule_id="r1", seller_name="PlayerB"))
+        self.assertEqual(len(self.engine.get_rules()), 1)
+        
+        change = ChangeLogEntry("PlayerA", "Sword", "SELLER_NEW", None, None)
+        self.assertEqual(len(self.engine.evaluate([change])), 0)
+        
+        self.assertTrue(self.engine.remove_rule("r1"))
+        self.assertFalse(self.engine.remove_rule("r1"))
+        
+        with self.assertRaises(AlertEngineError):
+            self.engine.add_rule(AlertRule(rule_id="bad", price_below=10, price_above=20))
+        print("✓ Rule replacement, removal and validation work")
+    
+    def test_5_rules_file_and_jsonl_sink(self):
+        """Test 5: Rules loaded from file deliver alerts to JSONL sink."""
+        print("\n=== Test 5: Rules File and JSONL Sink ===")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            rules_path = Path(temp_dir) / "rules.json"
+            rules_path.write_text(json.dumps({"rules": [
+                {"rule_id": "any_drop", "change_types": ["PRICE_DECREASE"]},
+                {"rule_id": "disabled", "enabled": False}
+            ]}), encoding='utf-8')
+            
+            sink = create_sink({"type": "jsonl", "path": str(Path(temp_dir) / "out" / "alerts.jsonl")})
+            self.assertIsInstance(sink, JSONLFileSink)
+            
+            engine = AlertEngine(sinks=[sink])
+            self.assertEqual(engine.load_rules_from_file(rules_path), 2)
+            
+            engine.process_changes([
+                ChangeLogEntry("PlayerA", "Sword", "PRICE_DECREASE", "10", "9"),
+                ChangeLogEntry("PlayerB", "Shield", "PRICE_INCREASE", "10", "11")
+            ])
+            engine.close()
+            
+            lines = sink.path.read_text(encoding='utf-8').splitlines()
+            self.assertEqual(len(lines), 1)
+            record = json.loads(lines[0])
+            self.assertEqual(record['rule_id'], "any_drop")
+            self.assertEqual(record['seller_name'], "PlayerA")
+            self.assertEqual(sink.get_sink_statistics()['batches_delivered'], 1)
+        
+        with self.assertRaises(EventSinkError):
+            create_sink({"type": "carrier_pigeon"})
+        
+        class SilentSink(EventSink):
+            sink_type = "silent"
+        
+        # Missing _deliver fails on creation, not on the first alert
+        with self.assertRaises(TypeError):
+            SilentSink()
+        print("✓ Alerts appended to JSONL file")
+    
+    def test_6_relist_rule_type(self):
+        """Test 6: Relist rules match every relist change type and nothing else."""
+        print("\n=== Test 6: Relist Rule Type ===")
+        
+        self.engine.add_rule(AlertRule(rule_id="relist_shield", seller_name="PlayerA",
+                                       item_name="Magic Shield", relist=True))
+        changes = [
+            ChangeLogEntry("PlayerA", "Magic Shield", change_type, None, "Price: 500.0, Quantity: 1")
+            for change_type in ("NEW_ITEM", "NEW_COMBINATION", "SELLER_NEW", "PRICE_DECREASE", "ITEM_REMOVED")
+        ]
+        alerts = self.engine.evaluate(changes)
+        
+        self.assertEqual([alert.change_type for alert in alerts], ["NEW_ITEM", "NEW_COMBINATION", "SELLER_NEW"])
+        
+        with self.assertRaises(AlertEngineError):
+            self.engine.add_rule(AlertRule(rule_id="bad", relist=True, change_types=["NEW_ITEM"]))
+        print(f"✓ Relist rule matched {len(alerts)} of {len(changes)} changes")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,247 @@
+"""
+Tests for asyncio OCR client and async OCR queue dispatcher.
+Runs requests against a local stub OCR server.
+"""
+
+import unittest
+import asyncio
+import base64
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from config.settings import YandexOCRConfig
+from core.async_ocr_client import AsyncYandexOCRClient, AIOHTTP_AVAILABLE
+from core.ocr_client import YandexOCRClient
+from core.ocr_queue import OCRQueue, OCRJobStatus
+from core.simple_ocr_client import OCRRateLimitError
+
+
+class StubOCRServer:
+    """Local recognizeText stub answering with the decoded image size."""
+    
+    def __init__(self, delay=0.0, status=200):
+        self.delay = delay
+        self.status = status
+        self.connections = 0
+        self.concurrent = 0
+        self.max_concurrent = 0
+        self.bodies = []
+        self._lock = threading.Lock()
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+            
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                with stub._lock:
+                    stub.concurrent += 1
+                    stub.max_concurrent = max(stub.max_concurrent, stub.concurrent)
+                    stub.bodies.append(body)
+                try:
+                    time.sleep(stub.delay)
+                    content = base64.b64decode(json.loads(body)['content'])
+                    response = {'result': {'textAnnotation': {
+                        'fullText': f"recognized {len(content)} bytes",
+                        'blocks': [{'lines': [{
+                            'text': f"recognized {len(content)} bytes",
+                            'boundingBox': {'vertices': [{'x': '1', 'y': '2'}, {'x': '50', 'y': '12'}]}
+                        }]}]
+                    }}}
+                    data = json.dumps(response).encode('utf-8')
+                    self.send_response(stub.status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except BrokenPipeError:
+                    pass  # Client gave up after its deadline
+                finally:
+                    with stub._lock:
+                        stub.concurrent -= 1
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/ocr/v1/recognizeText"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+    
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@unittest.skipUnless(AIOHTTP_AVAILABLE, "aiohttp not installed")
+class AsyncOCRClientTest(unittest.TestCase):
+    """Test suite for async OCR client."""
+    
+    def setUp(self):
+        """Create temporary folder for images."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name)
+        self.server = None
+    
+    def tearDown(self):
+        """Stop stub server and remove temporary files."""
+        if self.server:
+            self.server.close()
+        self.temp_dir.cleanup()
+    
+    def run_client(self, coroutine_factory, **client_kwargs):
+        """Run coroutine with a started client against the stub server."""
+        async def main():
+            async with AsyncYandexOCRClient("test-key", api_url=self.server.url, **client_kwargs) as client:
+                return client, await coroutine_factory(client)
+        return asyncio.run(main())
+    
+    def test_1_recognize_bytes_and_file(self):
+        """Test 1: In-memory and streamed file images are recognized."""
+        print("\n=== Test 1: Recognize Bytes And File ===")
+        
+        self.server = StubOCRServer()
+        image_path = self.base / "merged.png"
+        image_path.write_bytes(b'\x89PNG\r\n\x1a\n' + bytes(range(256)) * 1000)
+        
+        async def recognize(client):
+            text = await client.recognize(b'\xff\xd8' + b'x' * 1000)
+            layout = await client.recognize(image_path, ['ru', 'en'], layout=True)
+            return text, layout
+        
+        client, (text, layout) = self.run_client(recognize)
+        
+        self.assertEqual(text, "recognized 1002 bytes")
+        self.assertEqual(layout['text'], f"recognized {image_path.stat().st_size} bytes")
+        self.assertEqual(layout['lines'][0]['top'], 2)
+        
+        payload = json.loads(self.server.bodies[1])
+        self.assertEqual(payload['mimeType'], 'PNG')
+        self.assertEqual(payload['languageCodes'], ['ru', 'en'])
+        self.assertEqual(base64.b64decode(payload['content']), image_path.read_bytes())
+        
+        stats = client.get_ocr_statistics()
+        self.assertEqual(stats['successful_requests'], 2)
+        self.assertEqual(self.server.connections, 1)
+        
+        print(f"✓ 2 requests over {self.server.connections} keep-alive connection")
+    
+    def test_2_bounded_concurrency(self):
+        """Test 2: In-flight requests never exceed max_in_flight."""
+        print("\n=== Test 2: Bounded Concurrency ===")
+        
+        self.server = StubOCRServer(delay=0.1)
+        
+        async def burst(client):
+            return await asyncio.gather(*(client.recognize(b'\xff\xd8' + bytes([i]) * 100) for i in range(12)))
+        
+        start_time = time.perf_counter()
+        client, results = self.run_client(burst, max_in_flight=4)
+        elapsed = time.perf_counter() - start_time
+        
+        self.assertTrue(all(results))
+        self.assertEqual(self.server.max_concurrent, 4)
+        self.assertLessEqual(self.server.connections, 4)
+        self.assertEqual(client.get_ocr_statistics()['max_in_flight_reached'], 4)
+        self.assertLess(elapsed, 12 * 0.1)
+        
+        print(f"✓ 12 requests in {elapsed:.2f}s, {self.server.connections} connections")
+    
+    def test_3_deadline_and_errors(self):
+        """Test 3: Requests past their deadline and HTTP errors fail, 429 is raised."""
+        print("\n=== Test 3: Deadline And Errors ===")
+        
+        self.server = StubOCRServer(delay=0.5)
+        client, result = self.run_client(lambda client: client.recognize(b'\xff\xd8data'), timeout=0.1)
+        
+        self.assertIsNone(result)
+        self.assertEqual(client.get_ocr_statistics()['timeouts'], 1)
+        self.server.close()
+        
+        self.server = StubOCRServer(status=500)
+        client, result = self.run_client(lambda client: client.recognize(b'\xff\xd8data'))
+        
+        self.assertIsNone(result)
+        self.assertEqual(client.get_ocr_statistics()['api_errors'], {500: 1})
+        self.server.close()
+        
+        # Rate limit rejections are raised so the queue can back off
+        self.server = StubOCRServer(status=429)
+        rejected = []
+        
+        async def rate_limited(client):
+            try:
+                await client.recognize(b'\xff\xd8data')
+            except OCRRateLimitError as e:
+                rejected.append(e)
+        
+        client, _ = self.run_client(rate_limited)
+        
+        self.assertEqual(len(rejected), 1)
+        self.assertEqual(client.get_ocr_statistics()['rate_limit_hits'], 1)
+        
+        print("✓ Deadline and HTTP 500 reported as failures, HTTP 429 raised")
+    
+    def test_4_queue_async_dispatch(self):
+        """Test 4: OCR queue dispatches jobs on the event loop and runs callbacks."""
+        print("\n=== Test 4: Queue Async Dispatch ===")
+        
+        self.server = StubOCRServer(delay=0.1)
+        settings = SimpleNamespace(
+            yandex_ocr=YandexOCRConfig(api_key="test-key", api_url=self.server.url,
+                                       async_requests=True, max_in_flight=3),
+            ocr_cache=None
+        )
+        ocr_client = YandexOCRClient(settings)
+        self.assertTrue(ocr_client.async_available)
+        
+        finished = []
+        done = threading.Event()
+        
+        def callback(job):
+            finished.append(job)
+            if len(finished) == 8:
+                done.set()
+        
+        image_path = self.base / "F1_merged.jpg"
+        image_path.write_bytes(b'\xff\xd8' + b'y' * 500)
+        
+        ocr_queue = OCRQueue(ocr_client, async_dispatch=True, max_in_flight=3)
+        ocr_queue.start()
+        try:
+            ocr_queue.submit_job(image_path, "F1", callback=callback)
+            for i in range(7):
+                ocr_queue.submit_job(None, "F2", callback=callback, image_data=b'\xff\xd8' + bytes([i]) * 100)
+            self.assertTrue(done.wait(timeout=10))
+            stats = ocr_queue.get_queue_statistics()
+        finally:
+            ocr_queue.stop()
+        
+        self.assertTrue(all(job.status == OCRJobStatus.COMPLETED for job in finished))
+        self.assertFalse(image_path.exists())
+        self.assertEqual(stats['total_jobs_completed'], 8)
+        self.assertEqual(stats['dispatch_mode'], 'async')
+        self.assertEqual(stats['worker_threads'], 0)
+        self.assertLessEqual(stats['max_requests_in_flight'], 3)
+        self.assertLessEqual(self.server.max_concurrent, 3)
+        
+        print(f"✓ 8 jobs, max {self.server.max_concurrent} requests in flight")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
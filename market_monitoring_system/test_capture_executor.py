@@ -0,0 +1,137 @@
+"""
+Tests for asynchronous capture executor.
+Verifies that hotkey presses only enqueue requests and bursts are coalesced.
+"""
+
+import threading
+import time
+import unittest
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from PIL import Image
+
+from config.settings import HotkeyConfig, ScreenshotDedupConfig, CaptureExecutorConfig
+from core.capture_executor import CaptureExecutor, CaptureExecutorError
+from core.screenshot_capture import ScreenshotCapture
+
+
+class SlowGrabber:
+    """Stand-in for mss instance with a slow grab."""
+    
+    def __init__(self, delay):
+        self.delay = delay
+        self.grab_threads = []
+        self.closed_in = None
+    
+    def grab(self, monitor):
+        self.grab_threads.append(threading.current_thread().name)
+        time.sleep(self.delay)
+        image = Image.new('RGB', (monitor['width'], monitor['height']), 'white')
+        return SimpleNamespace(rgb=image.tobytes(), size=image.size)
+    
+    def close(self):
+        self.closed_in = threading.current_thread().name
+
+
+class CaptureExecutorTest(unittest.TestCase):
+    """Test suite for CaptureExecutor."""
+    
+    def test_1_burst_coalescing(self):
+        """Test 1: Presses while a request is pending are coalesced."""
+        print("\n=== Test 1: Burst Coalescing ===")
+        
+        release = threading.Event()
+        handled = []
+        
+        def handler(request):
+            release.wait(5)
+            handled.append((request.hotkey, request.presses))
+            return True
+        
+        executor = CaptureExecutor(handler, max_queue_size=10)
+        executor.start()
+        try:
+            self.assertTrue(executor.submit("F1", (0, 0, 10, 10)))
+            time.sleep(0.1)  # Worker now busy with first F1 request
+            self.assertTrue(executor.submit("F1", (0, 0, 10, 10)))
+            self.assertFalse(executor.submit("F1", (0, 0, 10, 10)))
+            self.assertFalse(executor.submit("F1", (0, 0, 10, 10)))
+            self.assertTrue(executor.submit("F2", (0, 0, 10, 10)))
+            release.set()
+        finally:
+            executor.stop()
+        
+        self.assertEqual(handled, [("F1", 1), ("F1", 3), ("F2", 1)])
+        
+        stats = executor.get_executor_statistics()
+        self.assertEqual(stats['requests_submitted'], 5)
+        self.assertEqual(stats['requests_coalesced'], 2)
+        self.assertEqual(stats['captures_completed'], 3)
+        self.assertEqual(stats['max_queue_depth'], 2)
+        self.assertEqual(stats['queue_depth'], 0)
+        print("✓ Burst merged into pending request, order preserved")
+    
+    def test_2_queue_limit_and_stopped(self):
+        """Test 2: Full queue drops requests, stopped executor rejects them."""
+        print("\n=== Test 2: Queue Limit ===")
+        
+        release = threading.Event()
+        executor = CaptureExecutor(lambda request: release.wait(5), max_queue_size=1)
+        executor.start()
+        try:
+            executor.submit("F1", (0, 0, 10, 10))
+            time.sleep(0.1)
+            self.assertTrue(executor.submit("F2", (0, 0, 10, 10)))
+            self.assertFalse(executor.submit("F3", (0, 0, 10, 10)))
+            release.set()
+        finally:
+            executor.stop()
+        
+        self.assertEqual(executor.get_executor_statistics()['requests_dropped'], 1)
+        with self.assertRaises(CaptureExecutorError):
+            executor.submit("F1", (0, 0, 10, 10))
+        print("✓ Overflow dropped and counted")
+    
+    def test_3_hotkey_press_returns_immediately(self):
+        """Test 3: Hotkey handler returns quickly while worker owns the grabber."""
+        print("\n=== Test 3: Non-blocking Hotkey ===")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            hotkey = HotkeyConfig(area=(0, 0, 1920, 1080), folder="F1", merge_interval=60, enabled=True)
+            settings = SimpleNamespace(
+                capture_executor=CaptureExecutorConfig(),
+                screenshot_dedup=ScreenshotDedupConfig(enabled=False),
+                get_enabled_hotkeys=lambda: {"F1": hotkey},
+                get_hotkey_config=lambda key: hotkey,
+                get_screenshot_path=lambda key: Path(temp_dir)
+            )
+            capture = ScreenshotCapture(settings)
+            grabber = SlowGrabber(delay=0.2)
+            capture._mss_instance = grabber
+            capture.executor.start()
+            
+            start = time.perf_counter()
+            capture._handle_hotkey_press("F1", hotkey)
+            elapsed = time.perf_counter() - start
+            
+            capture.executor.stop()
+            
+            self.assertLess(elapsed, 0.05)
+            self.assertEqual(grabber.grab_threads, ["CaptureWorker"])
+            self.assertEqual(grabber.closed_in, "CaptureWorker")
+            self.assertEqual(len(list(Path(temp_dir).glob("F1_*.png"))), 1)
+            
+            stats = capture.get_capture_statistics()["F1"]
+            self.assertEqual(stats['total_captures'], 1)
+            self.assertEqual(stats['successful_captures'], 1)
+            print(f"✓ Hotkey handler returned in {elapsed * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
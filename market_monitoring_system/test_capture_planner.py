@@ -0,0 +1,130 @@
+"""
+Tests for union-region capture planning.
+Verifies that areas requested together share one grab and are sliced as views.
+"""
+
+import unittest
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+from PIL import Image
+
+from config.settings import HotkeyConfig, ScreenshotDedupConfig, CaptureExecutorConfig, CapturePlannerConfig
+from core.capture_planner import CapturePlanner, CaptureRegion
+from core.screenshot_capture import ScreenshotCapture
+
+
+class ScreenGrabber:
+    """Stand-in for mss instance grabbing from a synthetic screen."""
+    
+    def __init__(self, screen):
+        self.screen = screen
+        self.monitors = []
+    
+    def grab(self, monitor):
+        self.monitors.append(monitor)
+        top, left = monitor['top'], monitor['left']
+        rgb = self.screen[top:top + monitor['height'], left:left + monitor['width']]
+        alpha = np.full(rgb.shape[:2] + (1,), 255, dtype=np.uint8)
+        bgra = np.concatenate([rgb[:, :, ::-1], alpha], axis=2)
+        return SimpleNamespace(
+            rgb=np.ascontiguousarray(rgb).tobytes(),
+            bgra=bgra.tobytes(),
+            size=(monitor['width'], monitor['height'])
+        )
+    
+    def close(self):
+        pass
+
+
+class CapturePlannerTest(unittest.TestCase):
+    """Test suite for CapturePlanner and union grabs."""
+    
+    def setUp(self):
+        """Create synthetic screen and temporary screenshot folder."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.screenshots = Path(self.temp_dir.name)
+        rng = np.random.default_rng(7)
+        self.screen = rng.integers(0, 256, size=(300, 1000, 3), dtype=np.uint8)
+    
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+    
+    def test_1_plan_groups_nearby_areas(self):
+        """Test 1: Adjacent areas share a grab, distant areas do not."""
+        print("\n=== Test 1: Union Planning ===")
+        
+        planner = CapturePlanner(max_waste_ratio=2.0)
+        plans = planner.plan([
+            CaptureRegion("F1", (0, 0, 100, 100)),
+            CaptureRegion("F2", (100, 0, 200, 100)),
+            CaptureRegion("F3", (900, 200, 1000, 300))
+        ])
+        
+        self.assertEqual(len(plans), 2)
+        union = next(plan for plan in plans if len(plan.regions) == 2)
+        self.assertEqual(union.bbox, (0, 0, 200, 100))
+        
+        stats = planner.get_planner_statistics()
+        self.assertEqual(stats['grabs_saved'], 1)
+        self.assertEqual(stats['overscan_ratio'], 1.0)
+        print("✓ Two grabs planned for three areas")
+    
+    def test_2_slice_is_zero_copy_rgb_view(self):
+        """Test 2: Region slice is an RGB view into the union frame."""
+        plan_region = CaptureRegion("F1", (10, 20, 60, 50))
+        plan = CapturePlanner().plan([plan_region, CaptureRegion("F2", (0, 0, 80, 60))])[0]
+        grab = ScreenGrabber(self.screen).grab(plan.monitor)
+        
+        frame = CapturePlanner.frame_array(grab.bgra, grab.size)
+        view = CapturePlanner.slice_region(frame, plan, plan_region)
+        
+        self.assertTrue(np.shares_memory(view, frame))
+        np.testing.assert_array_equal(view, self.screen[20:50, 10:60])
+    
+    def test_3_capture_all_uses_one_grab(self):
+        """Test 3: Capture-all trigger grabs overlapping areas once."""
+        print("\n=== Test 3: Capture All ===")
+        
+        hotkeys = {
+            "F1": HotkeyConfig(area=(0, 0, 300, 200), folder="F1", merge_interval=60, enabled=True),
+            "F2": HotkeyConfig(area=(250, 50, 500, 250), folder="F2", merge_interval=60, enabled=True)
+        }
+        settings = SimpleNamespace(
+            capture_executor=CaptureExecutorConfig(enabled=False),
+            capture_planner=CapturePlannerConfig(),
+            screenshot_dedup=ScreenshotDedupConfig(enabled=False),
+            get_enabled_hotkeys=lambda: hotkeys,
+            get_hotkey_config=lambda key: hotkeys.get(key),
+            get_screenshot_path=lambda key: self.screenshots
+        )
+        capture = ScreenshotCapture(settings)
+        grabber = ScreenGrabber(self.screen)
+        capture._mss_instance = grabber
+        
+        self.assertEqual(capture.capture_all_enabled(), 2)
+        
+        self.assertEqual(len(grabber.monitors), 1)
+        self.assertEqual(grabber.monitors[0], {"top": 0, "left": 0, "width": 500, "height": 250})
+        
+        for hotkey, (x1, y1, x2, y2) in [("F1", (0, 0, 300, 200)), ("F2", (250, 50, 500, 250))]:
+            files = list(self.screenshots.glob(f"{hotkey}_*.png"))
+            self.assertEqual(len(files), 1)
+            with Image.open(files[0]) as img:
+                np.testing.assert_array_equal(np.asarray(img.convert('RGB')), self.screen[y1:y2, x1:x2])
+        
+        stats = capture.get_capture_statistics()
+        self.assertEqual(stats["F1"]['successful_captures'], 1)
+        self.assertEqual(stats["F2"]['successful_captures'], 1)
+        print("✓ Both areas saved from a single grab")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
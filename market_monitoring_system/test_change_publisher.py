@@ -0,0 +1,201 @@
+"""
+Tests for batched change publisher.
+Verifies size/time based batching, bounded buffer backpressure, delivery accounting and local transports.
+"""
+
+import unittest
+import tempfile
+import json
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.database_manager import ChangeLogEntry
+from core.change_publisher import ChangePublisher, ChangePublisherError
+from core.event_sinks import CallbackSink, JSONLFileSink, UnixSocketSink, NamedPipeSink, EventSinkError
+
+
+def make_changes(count, seller="PlayerA"):
+    """Create list of price change entries."""
+    return [
+        ChangeLogEntry(seller, f"Item {i}", "PRICE_DECREASE", "100", "90")
+        for i in range(count)
+    ]
+
+
+class ChangePublisherTest(unittest.TestCase):
+    """Test suite for ChangePublisher."""
+    
+    def setUp(self):
+        """Collect delivered batches in memory."""
+        self.batches = []
+        self.sink = CallbackSink(self.batches.append)
+    
+    def test_1_size_based_batching(self):
+        """Test 1: Changes are coalesced into batches of max_batch_size."""
+        print("\n=== Test 1: Size-based Batching ===")
+        
+        publisher = ChangePublisher([self.sink], max_batch_size=10, max_batch_delay=5.0)
+        publisher.publish(make_changes(25), hotkey="F1")
+        publisher.start()
+        publisher.stop()
+        
+        self.assertEqual([len(batch) for batch in self.batches], [10, 10, 5])
+        sequences = [record['sequence'] for batch in self.batches for record in batch]
+        self.assertEqual(sequences, list(range(1, 26)))
+        self.assertEqual(self.batches[0][0]['hotkey'], "F1")
+        print("✓ Batches respect max_batch_size and keep order")
+    
+    def test_2_time_based_flush(self):
+        """Test 2: Partial batch is flushed after max_batch_delay."""
+        print("\n=== Test 2: Time-based Flush ===")
+        
+        publisher = ChangePublisher([self.sink], max_batch_size=100, max_batch_delay=0.05)
+        publisher.start()
+        try:
+            publisher.publish(make_changes(3))
+            deadline = time.time() + 2.0
+            while not self.batches and time.time() < deadline:
+                time.sleep(0.01)
+            
+            self.assertEqual(len(self.batches), 1)
+            self.assertEqual(len(self.batches[0]), 3)
+        finally:
+            publisher.stop()
+        print("✓ Partial batch delivered within delay")
+    
+    def test_3_bounded_buffer_drops_oldest(self):
+        """Test 3: Slow consumer does not block publish; oldest changes dropped."""
+        print("\n=== Test 3: Backpressure ===")
+        
+        release = threading.Event()
+        
+        def slow_consumer(records):
+            release.wait(timeout=5.0)
+            self.batches.append(records)
+        
+        publisher = ChangePublisher([CallbackSink(slow_consumer)], max_batch_size=5,
+                                    max_batch_delay=0.0, max_buffer_size=10)
+        publisher.start()
+        try:
+            publisher.publish(make_changes(5, seller="First"))
+            time.sleep(0.1)  # First batch is now blocked in consumer
+            
+            start = time.time()
+            dropped = publisher.publish(make_changes(15, seller="Second"))
+            self.assertLess(time.time() - start, 0.5)
+            self.assertEqual(dropped, 5)
+        finally:
+            release.set()
+            publisher.stop()
+        
+        stats = publisher.get_publisher_statistics()
+        self.assertEqual(stats['changes_dropped'], 5)
+        self.assertEqual(stats['changes_delivered'], 15)
+        self.assertEqual(stats['buffer_depth'], 0)
+        print("✓ Publish stays non-blocking under slow consumer")
+    
+    def test_4_jsonl_and_unix_socket_transports(self):
+        """Test 4: Batches reach JSONL file and Unix socket consumers."""
+        print("\n=== Test 4: Local Transports ===")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            socket_path = os.path.join(temp_dir, "changes.sock")
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(socket_path)
+            server.listen(1)
+            received = []
+            
+            def consume():
+                conn, _ = server.accept()
+                with conn, conn.makefile('r', encoding='utf-8') as stream:
+                    for line in stream:
+                        received.append(json.loads(line))
+            
+            consumer = threading.Thread(target=consume, daemon=True)
+            consumer.start()
+            
+            jsonl_sink = JSONLFileSink(Path(temp_dir) / "changes.jsonl")
+            publisher = ChangePublisher([jsonl_sink, UnixSocketSink(socket_path)],
+                                        max_batch_size=4, max_batch_delay=0.01)
+            publisher.start()
+            publisher.publish(make_changes(6))
+            publisher.stop()
+            
+            consumer.join(timeout=2.0)
+            server.close()
+            
+            lines = jsonl_sink.path.read_text(encoding='utf-8').splitlines()
+            self.assertEqual(len(lines), 6)
+            self.assertEqual(len(received), 6)
+            self.assertEqual(received[-1]['item_name'], "Item 5")
+        print("✓ JSONL and Unix socket consumers received all changes")
+    
+    def test_5_invalid_configuration(self):
+        """Test 5: Buffer smaller than batch is rejected."""
+        with self.assertRaises(ChangePublisherError):
+            ChangePublisher([self.sink], max_batch_size=10, max_buffer_size=5)
+    
+    @unittest.skipUnless(hasattr(os, 'mkfifo'), "Named pipes not supported")
+    def test_6_named_pipe_keeps_whole_lines(self):
+        """Test 6: A full pipe never leaves a torn JSON line for the reader."""
+        print("\n=== Test 6: Named Pipe Whole Lines ===")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pipe_path = Path(temp_dir) / "changes.fifo"
+            sink = NamedPipeSink(pipe_path)
+            reader = os.open(pipe_path, os.O_RDONLY | os.O_NONBLOCK)
+            try:
+                record = {'seller': "PlayerA", 'note': "x" * 1000}
+                sink.deliver([{'seller': "PlayerA", 'note': "x" * (sink.max_record_bytes + 1)}])
+                with self.assertRaises(EventSinkError):
+                    for _ in range(1000):
+                        sink.deliver([record] * 6)
+                
+                data = b''
+                while True:
+                    try:
+                        chunk = os.read(reader, 65536)
+                    except BlockingIOError:
+                        break
+                    if not chunk:
+                        break
+                    data += chunk
+                
+                self.assertTrue(data.endswith(b'\n'))
+                lines = data.decode('utf-8').splitlines()
+                self.assertTrue(all(json.loads(line) == record for line in lines))
+                
+                # Drained pipe accepts the next batch on the same descriptor
+                sink.deliver([record])
+                self.assertEqual(json.loads(os.read(reader, 65536)), record)
+                self.assertEqual(sink.get_sink_statistics()['records_too_large'], 1)
+            finally:
+                sink.close()
+                os.close(reader)
+        print(f"✓ {len(lines)} whole lines read from a full pipe")
+    
+    def test_7_failed_batches_not_counted(self):
+        """Test 7: A batch rejected by every sink is not counted as delivered."""
+        def reject(records):
+            raise ConnectionError("consumer gone")
+        
+        publisher = ChangePublisher([CallbackSink(reject)], max_batch_size=5, max_batch_delay=0.0)
+        publisher.publish(make_changes(5))
+        publisher.start()
+        publisher.stop()
+        
+        stats = publisher.get_publisher_statistics()
+        self.assertEqual(stats['changes_delivered'], 0)
+        self.assertEqual(stats['batches_delivered'], 0)
+        self.assertEqual(stats['changes_failed'], 5)
+        self.assertEqual(stats['delivery_errors'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
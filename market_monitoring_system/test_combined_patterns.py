@@ -0,0 +1,91 @@
+"""
+Tests for the combined fallback pattern scan.
+Verifies positional one-scan matching, per-hotkey caching with invalidation and pattern-by-pattern fallback.
+"""
+
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.text_parser import TextParser, ParsingPattern
+
+
+class CombinedPatternsTest(unittest.TestCase):
+    """Test suite for combined regex pattern extraction."""
+    
+    def setUp(self):
+        """Create parser."""
+        self.parser = TextParser()
+    
+    def test_1_one_scan_in_position_order(self):
+        """Test 1: One scan returns matches in text order, higher priority first at a shared position."""
+        print("\n=== Test 1: One Scan In Position Order ===")
+        
+        text = self.parser._clean_text("Seller: Bob ID: X12\nPrice: 50 Qty: 3\n200 руб")
+        combined_pattern, groups = self.parser._get_combined_pattern("F1")
+        matches = self.parser._extract_combined_matches(text, combined_pattern, groups)
+        
+        self.assertEqual([match['pattern_name'] for match in matches],
+                         ['seller_context', 'item_id_pattern', 'price_quantity_pair', 'currency_price'])
+        self.assertEqual([match['match_start'] for match in matches],
+                         sorted(match['match_start'] for match in matches))
+        self.assertEqual((matches[2]['price'], matches[2]['quantity']), ('50', '3'))
+        self.assertEqual(matches[0]['groups'], ['Bob'])
+        
+        items = self.parser._extract_with_regex_patterns("Seller: Bob ID: X12 Price: 50 Qty: 3", "F1")
+        self.assertEqual([(item.seller_name, item.price, item.quantity, item.item_id) for item in items],
+                         [("Bob", 50.0, 3, "X12")])
+        
+        print(f"✓ {len(matches)} matches from {len(groups)} combined patterns")
+    
+    def test_2_cache_invalidation(self):
+        """Test 2: Combined pattern is built once per hotkey and rebuilt after a custom pattern is added."""
+        print("\n=== Test 2: Cache Invalidation ===")
+        
+        first = self.parser._get_combined_pattern("F2")
+        self.assertIs(self.parser._get_combined_pattern("F2"), first)
+        
+        added = self.parser.add_custom_pattern("general", ParsingPattern(
+            name="lot_number",
+            pattern=r'Lot\s*#\s*(\d+)\s+(\w+)',
+            description="Lot number and item",
+            fields=['item_id', 'item_name'],
+            priority=5
+        ))
+        self.assertTrue(added)
+        
+        combined_pattern, groups = self.parser._get_combined_pattern("F2")
+        self.assertIsNot((combined_pattern, groups), first)
+        self.assertEqual(len(groups), len(first[1]) + 1)
+        
+        matches = self.parser._extract_combined_matches("Lot #42 Sword", combined_pattern, groups)
+        self.assertEqual([(match['pattern_name'], match['item_id'], match['item_name']) for match in matches],
+                         [('lot_number', '42', 'Sword')])
+        self.assertEqual(self.parser.get_parsing_statistics()['pattern_usage']['lot_number'], 1)
+        
+        print(f"✓ Combined pattern rebuilt with {len(groups)} alternatives")
+    
+    def test_3_uncombinable_fallback(self):
+        """Test 3: Patterns with backreferences are scanned one by one."""
+        print("\n=== Test 3: Uncombinable Fallback ===")
+        
+        self.parser.add_custom_pattern("F3", ParsingPattern(
+            name="repeated_seller",
+            pattern=r'(\w+)\s+sells\s+\1\s+(\w+)',
+            description="Seller name repeated by OCR",
+            fields=['seller_name', 'item_name'],
+            priority=3
+        ))
+        self.assertIsNone(self.parser._get_combined_pattern("F3"))
+        self.assertIsNotNone(self.parser._get_combined_pattern("F1"))
+        
+        items = self.parser._extract_with_regex_patterns("Bob sells Bob Arrow", "F3")
+        self.assertEqual([(item.seller_name, item.item_name) for item in items], [("Bob", "Arrow")])
+        
+        print("✓ Backreference pattern parsed without combining")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,172 @@
+"""
+Tests for weighted fair OCR job scheduling.
+Verifies weighted shares, job cost accounting, priority aging, queue-wait SLOs and OCR queue integration.
+"""
+
+import unittest
+import queue
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.fair_job_queue import FairJobQueue
+from core.ocr_queue import OCRQueue, OCRJob, OCRJobPriority, OCRJobStatus
+
+
+def make_job(hotkey, priority=OCRJobPriority.NORMAL, size=100):
+    """Create an in-memory OCR job with a payload of size bytes."""
+    return OCRJob(job_id=f"{hotkey}_{time.monotonic_ns()}", image_path=None, hotkey=hotkey,
+                  priority=priority, image_data=b'\xff' * size)
+
+
+class FairJobQueueTest(unittest.TestCase):
+    """Test suite for fair job queue."""
+    
+    def test_1_weighted_share(self):
+        """Test 1: Backlogged hotkeys are served in proportion to their weights."""
+        print("\n=== Test 1: Weighted Share ===")
+        
+        job_queue = FairJobQueue(weights={'F1': 1.0, 'F2': 3.0})
+        for _ in range(40):
+            job_queue.put(make_job('F1'))
+            job_queue.put(make_job('F2'))
+        
+        served = Counter(job_queue.get().hotkey for _ in range(40))
+        self.assertEqual(served['F2'], 30)
+        self.assertEqual(served['F1'], 10)
+        self.assertEqual(job_queue.qsize(), 40)
+        
+        print(f"✓ First 40 dequeues: {dict(served)}")
+    
+    def test_2_large_merges_do_not_starve(self):
+        """Test 2: A hotkey submitting huge merges does not delay small jobs of others."""
+        print("\n=== Test 2: Large Merges Do Not Starve ===")
+        
+        job_queue = FairJobQueue(cost_function=lambda job: 1.0 + job.payload_size / 1000)
+        for _ in range(10):
+            job_queue.put(make_job('F1', size=20000))
+        for _ in range(5):
+            job_queue.put(make_job('F2', size=100))
+        
+        order = [job_queue.get().hotkey for _ in range(7)]
+        
+        # All small jobs go out before the first 20KB merge
+        self.assertEqual(order, ['F2'] * 5 + ['F1'] * 2)
+        
+        print(f"✓ Dequeue order: {order}")
+    
+    def test_3_priority_aging(self):
+        """Test 3: Waiting jobs rise in priority within their hotkey."""
+        print("\n=== Test 3: Priority Aging ===")
+        
+        job_queue = FairJobQueue(aging_interval=0.05)
+        old = make_job('F1', OCRJobPriority.LOW)
+        job_queue.put(old)
+        time.sleep(0.12)
+        job_queue.put(make_job('F1', OCRJobPriority.NORMAL))
+        self.assertIs(job_queue.get(), old)
+        
+        job_queue = FairJobQueue(aging_interval=0)
+        job_queue.put(make_job('F1', OCRJobPriority.LOW))
+        urgent = make_job('F1', OCRJobPriority.HIGH)
+        job_queue.put(urgent)
+        self.assertIs(job_queue.get(), urgent)
+        
+        print("✓ Aged LOW job overtook a fresh NORMAL job")
+    
+    def test_4_max_wait_slo(self):
+        """Test 4: A hotkey past its queue-wait SLO is served before weighted order."""
+        print("\n=== Test 4: Max Wait SLO ===")
+        
+        job_queue = FairJobQueue(weights={'F1': 10.0, 'F2': 1.0}, max_wait={'F2': 0.05})
+        for _ in range(5):
+            job_queue.put(make_job('F1'))
+        broker_job = make_job('F2')
+        job_queue.put(broker_job)
+        
+        # Fresh broker job waits its turn, overdue one is served next
+        self.assertEqual(job_queue.get().hotkey, 'F1')
+        time.sleep(0.07)
+        self.assertIs(job_queue.get(), broker_job)
+        
+        stats = job_queue.get_scheduling_statistics()
+        self.assertEqual(stats['F2']['slo_promotions'], 1)
+        self.assertEqual(stats['F2']['slo_violations'], 1)
+        self.assertGreaterEqual(stats['F2']['max_wait'], 0.05)
+        self.assertEqual(stats['F1']['depth'], 4)
+        self.assertEqual(stats['F1']['max_depth'], 5)
+        self.assertEqual(stats['F2']['max_wait_slo'], 0.05)
+        self.assertGreater(stats['F1']['oldest_wait'], 0.0)
+        
+        print(f"✓ Broker job served after {stats['F2']['max_wait'] * 1000:.0f}ms wait")
+    
+    def test_5_bounded_blocking(self):
+        """Test 5: Full and empty queues block until their timeout."""
+        print("\n=== Test 5: Bounded Blocking ===")
+        
+        job_queue = FairJobQueue(maxsize=2)
+        job_queue.put_nowait(make_job('F1'))
+        job_queue.put_nowait(make_job('F2'))
+        self.assertTrue(job_queue.full())
+        
+        start = time.monotonic()
+        with self.assertRaises(queue.Full):
+            job_queue.put(make_job('F1'), timeout=0.05)
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+        
+        # A blocked producer resumes once a consumer frees a slot
+        threading.Timer(0.05, job_queue.get).start()
+        job_queue.put(make_job('F3'), timeout=2.0)
+        self.assertEqual(job_queue.qsize(), 2)
+        
+        job_queue.get_nowait()
+        job_queue.get_nowait()
+        self.assertTrue(job_queue.empty())
+        with self.assertRaises(queue.Empty):
+            job_queue.get(timeout=0.05)
+        
+        print("✓ put/get honour maxsize and timeouts")
+    
+    def test_6_ocr_queue_integration(self):
+        """Test 6: OCR queue drains a fair queue and reports per-hotkey metrics."""
+        print("\n=== Test 6: OCR Queue Integration ===")
+        
+        finished = []
+        done = threading.Event()
+        
+        def callback(job):
+            finished.append(job)
+            if len(finished) == 12:
+                done.set()
+        
+        ocr_client = SimpleNamespace(process_image_bytes=lambda image_data, language_codes=None, layout=False: "text")
+        job_queue = FairJobQueue(weights={'F2': 3.0}, max_wait={'F2': 20.0})
+        ocr_queue = OCRQueue(ocr_client, num_workers=2, job_queue=job_queue)
+        self.assertIs(ocr_queue.job_queue, job_queue)
+        
+        ocr_queue.start()
+        try:
+            for i in range(6):
+                ocr_queue.submit_job(None, "F1", callback=callback, image_data=b'\xff\xd8' + bytes([i]) * 100)
+                ocr_queue.submit_job(None, "F2", callback=callback, image_data=b'\xff\xd8' + bytes([i]) * 100)
+            self.assertTrue(done.wait(timeout=5))
+            stats = ocr_queue.get_queue_statistics()
+        finally:
+            ocr_queue.stop()
+        
+        self.assertTrue(all(job.status == OCRJobStatus.COMPLETED for job in finished))
+        self.assertEqual(stats['hotkeys']['F1']['dequeued'], 6)
+        self.assertEqual(stats['hotkeys']['F2']['dequeued'], 6)
+        self.assertEqual(stats['hotkeys']['F2']['weight'], 3.0)
+        self.assertEqual(stats['hotkeys']['F2']['slo_violations'], 0)
+        
+        print(f"✓ 12 jobs, F2 average wait {stats['hotkeys']['F2']['average_wait'] * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Tests for process pool image merging.
+Verifies pooled merges match inline merges and fall back when the pool is unavailable.
+"""
+
+import io
+import unittest
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from config.settings import ImageProcessingConfig
+from core.frame_buffer import CapturedFrame
+from core.image_processor import ImageProcessor
+from core.image_worker_pool import ImageWorkerPool, MergeSource
+
+
+def make_screenshot(label, size=(240, 70)):
+    """Create screenshot with a text label."""
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    draw.text((10, 25), label, fill='black')
+    draw.line((0, 60, 240, 60), fill=(120, 120, 120))
+    return image
+
+
+class ImageWorkerPoolTest(unittest.TestCase):
+    """Test suite for the image worker pool."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Start one shared pool; spawning workers is slow."""
+        cls.pool = ImageWorkerPool(num_workers=2, chunk_rows=100)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Stop worker processes."""
+        cls.pool.shutdown()
+    
+    def setUp(self):
+        """Create screenshot files."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name)
+        self.paths = []
+        for index in range(6):
+            path = self.base / f"shot_{index}.png"
+            make_screenshot(f"Seller {index} price {index * 100}").save(path)
+            self.paths.append(path)
+    
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+    
+    def make_processor(self, pool=None, **config):
+        """Create image processor, optionally attached to the shared pool."""
+        settings = SimpleNamespace(
+            image_processing=ImageProcessingConfig(**config),
+            paths=SimpleNamespace(temp_merged=self.base / "merged")
+        )
+        processor = ImageProcessor(settings)
+        processor.worker_pool = pool
+        return processor
+    
+    def test_1_split_chunks(self):
+        """Test 1: Large merges are split into runs of whole screenshots."""
+        print("\n=== Test 1: Chunk Split ===")
+        
+        sources = [MergeSource(height=70, scaled_height=70) for _ in range(5)]
+        chunks = self.pool._split_chunks(sources)
+        
+        self.assertEqual([top for top, _ in chunks], [0, 140, 280])
+        self.assertEqual([len(chunk) for _, chunk in chunks], [2, 2, 1])
+        print("✓ Chunks start on screenshot boundaries")
+    
+    def test_2_pooled_file_merge_matches_inline(self):
+        """Test 2: Pooled file merge produces the same image as the inline NumPy merge."""
+        print("\n=== Test 2: Pooled File Merge ===")
+        
+        pooled_path = self.make_processor(self.pool).merge_to_vertical_column(self.paths, self.base / "pooled.jpg")
+        inline_path = self.make_processor().merge_to_vertical_column(self.paths, self.base / "inline.jpg")
+        
+        with Image.open(pooled_path) as pooled, Image.open(inline_path) as inline:
+            self.assertEqual(pooled.mode, 'L')
+            self.assertEqual(pooled.size, (240, 420))
+            np.testing.assert_array_equal(np.asarray(pooled), np.asarray(inline))
+        self.assertGreaterEqual(self.pool.get_pool_statistics()['chunks'], 5)
+        print("✓ Identical output from chunked pool merge")
+    
+    def test_3_pooled_frame_merge(self):
+        """Test 3: In-memory frames are handed to workers through shared memory."""
+        print("\n=== Test 3: Pooled Frame Merge ===")
+        
+        frames = []
+        for index in range(3):
+            image = make_screenshot(f"Frame {index}")
+            frames.append(CapturedFrame(hotkey="F1", rgb=image.tobytes(), size=image.size))
+        
+        processor = self.make_processor(self.pool, optimize_for_ocr=False)
+        image_data = processor.merge_frames(frames)
+        expected = self.make_processor(optimize_for_ocr=False).merge_frames(frames)
+        
+        with Image.open(io.BytesIO(image_data)) as merged, Image.open(io.BytesIO(expected)) as reference:
+            self.assertEqual(merged.size, (240, 210))
+            np.testing.assert_array_equal(np.asarray(merged), np.asarray(reference))
+        self.assertEqual(processor.get_processing_statistics()['pooled_merges'], 1)
+        print("✓ Frames merged by workers")
+    
+    def test_4_fallback_to_inline(self):
+        """Test 4: A stopped pool falls back to merging inline."""
+        print("\n=== Test 4: Inline Fallback ===")
+        
+        stopped = ImageWorkerPool(num_workers=1)
+        stopped.shutdown()
+        processor = self.make_processor(stopped)
+        
+        merged_path = processor.merge_to_vertical_column(self.paths, self.base / "fallback.jpg")
+        
+        self.assertIsNotNone(merged_path)
+        self.assertEqual(processor.get_processing_statistics()['pooled_merges'], 0)
+        print("✓ Merge completed inline")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,180 @@
+"""
+Tests for in-memory capture-to-OCR pipeline.
+Verifies that frames flow from capture to OCR as bytes without temp files.
+"""
+
+import io
+import threading
+import unittest
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from PIL import Image, ImageDraw
+
+from config.settings import HotkeyConfig, ImageProcessingConfig, ScreenshotDedupConfig
+from core.frame_buffer import FrameBuffer, CapturedFrame
+from core.image_processor import ImageProcessor
+from core.ocr_queue import OCRQueue
+from core.screenshot_capture import ScreenshotCapture
+from core.simple_ocr_client import SimpleYandexOCRClient
+
+
+def make_frame(label, hotkey="F1", size=(200, 60)):
+    """Create captured frame with a single text label."""
+    image = Image.new('RGB', size, 'white')
+    ImageDraw.Draw(image).text((5, 20), label, fill='black')
+    return CapturedFrame(hotkey=hotkey, rgb=image.tobytes(), size=image.size)
+
+
+class FakeGrabber:
+    """Stand-in for mss instance returning prepared frames."""
+    
+    def __init__(self, frames):
+        self.frames = list(frames)
+    
+    def grab(self, monitor):
+        frame = self.frames.pop(0)
+        return SimpleNamespace(rgb=frame.rgb, size=frame.size)
+    
+    def close(self):
+        pass
+
+
+class FakeBytesOCRClient:
+    """OCR client recording in-memory requests."""
+    
+    def __init__(self):
+        self.received = []
+    
+    def process_image_bytes(self, image_data, language_codes=None, layout=False):
+        self.received.append(image_data)
+        return "Seller A 100"
+
+
+class InMemoryPipelineTest(unittest.TestCase):
+    """Test suite for the in-memory pipeline."""
+    
+    def setUp(self):
+        """Create temporary folder used to detect stray files."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name)
+    
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+    
+    def test_1_frame_buffer_bounded(self):
+        """Test 1: Buffer drops oldest frames when full and drains in order."""
+        print("\n=== Test 1: Bounded Frame Buffer ===")
+        
+        buffer = FrameBuffer(max_frames_per_hotkey=2)
+        for label in ["one", "two", "three"]:
+            buffer.add(make_frame(label))
+        buffer.add(make_frame("other", hotkey="F2"))
+        
+        frames = buffer.drain("F1")
+        self.assertEqual(frames[0].rgb, make_frame("two").rgb)
+        self.assertEqual(len(frames), 2)
+        self.assertEqual(buffer.drain("F1"), [])
+        
+        stats = buffer.get_buffer_statistics()
+        self.assertEqual(stats['frames_dropped'], 1)
+        self.assertEqual(stats['pending_frames'], {"F2": 1})
+        self.assertEqual(stats['bytes_buffered'], 200 * 60 * 3)
+        print("✓ Oldest frame dropped, drain returns capture order")
+    
+    def test_2_capture_to_buffer_without_files(self):
+        """Test 2: Captured frames go to the buffer, nothing is written to disk."""
+        print("\n=== Test 2: Capture Into Buffer ===")
+        
+        hotkey = HotkeyConfig(area=(0, 0, 200, 60), folder="F1", merge_interval=60, enabled=True)
+        settings = SimpleNamespace(
+            screenshot_dedup=ScreenshotDedupConfig(enabled=False),
+            get_enabled_hotkeys=lambda: {"F1": hotkey},
+            get_hotkey_config=lambda key: hotkey,
+            get_screenshot_path=lambda key: self.base
+        )
+        buffer = FrameBuffer()
+        capture = ScreenshotCapture(settings, frame_buffer=buffer)
+        capture._mss_instance = FakeGrabber([make_frame("a"), make_frame("b")])
+        
+        self.assertTrue(capture.capture_area((0, 0, 200, 60), "F1"))
+        self.assertTrue(capture.capture_area((0, 0, 200, 60), "F1"))
+        
+        self.assertEqual(buffer.pending_count("F1"), 2)
+        self.assertEqual(list(self.base.iterdir()), [])
+        print("✓ Frames buffered without temp PNG files")
+    
+    def test_3_merge_frames_encodes_once(self):
+        """Test 3: Frames merge into a single in-memory JPEG."""
+        print("\n=== Test 3: In-Memory Merge ===")
+        
+        settings = SimpleNamespace(
+            image_processing=ImageProcessingConfig(optimize_for_ocr=False),
+            paths=SimpleNamespace(temp_merged=self.base / "merged")
+        )
+        processor = ImageProcessor(settings)
+        buffer = FrameBuffer()
+        for label in ["Seller A 100", "Seller B 200", "Seller C 300"]:
+            buffer.add(make_frame(label))
+        
+        image_data = processor.process_hotkey_frames("F1", buffer)
+        
+        with Image.open(io.BytesIO(image_data)) as merged:
+            self.assertEqual(merged.format, 'JPEG')
+            self.assertEqual(merged.size, (200, 180))
+        self.assertFalse((self.base / "merged").exists())
+        self.assertIsNone(processor.process_hotkey_frames("F1", buffer))
+        print("✓ Merged image produced as bytes")
+    
+    def test_4_queue_sends_bytes(self):
+        """Test 4: OCR queue passes in-memory image data to the client."""
+        print("\n=== Test 4: Bytes OCR Job ===")
+        
+        client = FakeBytesOCRClient()
+        done = threading.Event()
+        results = []
+        
+        with OCRQueue(client, num_workers=1) as ocr_queue:
+            ocr_queue.submit_job(
+                image_path=None,
+                hotkey="F1",
+                image_data=b"jpeg-bytes",
+                callback=lambda job: (results.append(job), done.set())
+            )
+            self.assertTrue(done.wait(5))
+        
+        self.assertEqual(client.received, [b"jpeg-bytes"])
+        self.assertEqual(results[0].result, "Seller A 100")
+        self.assertIsNone(results[0].image_data)
+        print("✓ Image bytes delivered, released after completion")
+    
+    def test_5_simple_client_posts_bytes(self):
+        """Test 5: Simple client base64-encodes bytes directly into the request."""
+        posted = []
+        
+        class FakeSession:
+            def post(self, url, json=None, timeout=None):
+                posted.append(json)
+                body = {'result': {'textAnnotation': {'fullText': ' text '}}}
+                return SimpleNamespace(status_code=200, json=lambda: body, text="")
+            
+            def close(self):
+                pass
+        
+        client = SimpleYandexOCRClient(api_key="test-key")
+        client.session = FakeSession()
+        
+        self.assertEqual(client.process_image_bytes(b"\x01\x02", language_codes=["ru"]), "text")
+        self.assertEqual(posted[0]['content'], "AQI=")
+        self.assertEqual(posted[0]['mimeType'], "JPEG")
+        self.assertEqual(posted[0]['languageCodes'], ["ru"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""
+Tests for structured OCR layout parsing.
+Verifies trade and broker extraction by line geometry, API response layout extraction and strip layout stitching.
+"""
+
+import unittest
+from pathlib import Path
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.ocr_document import OCRDocument, shift_layout_line
+from core.simple_ocr_client import SimpleYandexOCRClient
+from core.strip_tracker import StripTracker, ImageStrip, StripMergeResult
+from core.text_parser import TextParser
+
+
+def line(text, left, top, right=None, block=0, height=20):
+    """Build a layout line dictionary."""
+    return {'text': text, 'left': left, 'top': top, 'right': right if right is not None else left + 10 * len(text),
+            'bottom': top + height, 'block': block}
+
+
+def layout(lines):
+    """Build a layout result whose text follows the given line order."""
+    return {'text': '\n'.join(entry['text'] for entry in lines), 'lines': lines}
+
+
+def vertices(left, top, right, bottom):
+    """Build an API bounding box."""
+    return {'vertices': [{'x': str(left), 'y': str(top)}, {'x': str(left), 'y': str(bottom)},
+                         {'x': str(right), 'y': str(bottom)}, {'x': str(right), 'y': str(top)}]}
+
+
+class LayoutParserTest(unittest.TestCase):
+    """Test suite for layout-based parsing."""
+    
+    def setUp(self):
+        """Create text parser."""
+        self.parser = TextParser()
+    
+    def test_1_trade_lines_out_of_order(self):
+        """Test 1: Trade fields are read by position even when lines come back shuffled and split."""
+        print("\n=== Test 1: Trade Lines Out Of Order ===")
+        
+        lines = [
+            line("8,888 Adena", 200, 100),
+            line("Items to Sell Merchant", 10, 0),
+            line("Quantity : 3", 10, 130),
+            line("Unit Price :", 10, 100),
+            line("Soulshot (111)", 10, 60),
+            line("Trade", 10, -40),
+        ]
+        
+        result = self.parser.parse_layout(layout(lines), "F1", processing_type="full")
+        
+        self.assertEqual(result.parsing_stats['extraction_method'], 'layout')
+        self.assertEqual(len(result.items), 1)
+        item = result.items[0]
+        self.assertEqual((item.seller_name, item.item_name, item.price, item.quantity),
+                         ("Merchant", "Soulshot", 8888.0, 3))
+        
+        print(f"✓ Parsed {item.seller_name}: {item.item_name} x{item.quantity} @ {item.price}")
+    
+    def test_2_side_by_side_trade_windows(self):
+        """Test 2: Two trade windows next to each other are parsed as separate columns."""
+        print("\n=== Test 2: Side By Side Trade Windows ===")
+        
+        lines = []
+        for left, seller, item, price in [(10, "Alice", "Arrow", "100"), (500, "Bob", "Bolt", "250")]:
+            lines.extend([
+                line(f"Items to Sell {seller}", left, 0),
+                line(item, left, 40),
+                line(f"Unit Price : {price}", left, 80),
+                line("Quantity : 5", left, 110),
+            ])
+        # Interleaved by row, as a reading order across both windows would return them
+        lines.sort(key=lambda entry: (entry['top'], entry['left']))
+        
+        result = self.parser.parse_layout(layout(lines), "F1", processing_type="full")
+        
+        parsed = sorted((item.seller_name, item.item_name, item.price) for item in result.items)
+        self.assertEqual(parsed, [("Alice", "Arrow", 100.0), ("Bob", "Bolt", 250.0)])
+        
+        print(f"✓ Parsed {len(parsed)} windows: {parsed}")
+    
+    def test_3_broker_name_column(self):
+        """Test 3: Broker sellers are taken from the Name column, not from quantity cells."""
+        print("\n=== Test 3: Broker Name Column ===")
+        
+        lines = [
+            line("Item Broker", 10, 0),
+            line("Elven Mithril Gloves : 12", 10, 30),
+            line("Name", 10, 60), line("Qty.", 200, 60), line("Currency", 300, 60),
+            line("17", 200, 90), line("Seller1", 12, 90), line("Adena", 300, 90),
+            line("Seller2", 10, 120), line(": 24", 200, 120),
+        ]
+        
+        result = self.parser.parse_layout(layout(lines), "F2", processing_type="minimal")
+        
+        pairs = [(item.seller_name, item.item_name) for item in result.items]
+        self.assertEqual(pairs, [("Seller1", "Elven Mithril Gloves"), ("Seller2", "Elven Mithril Gloves")])
+        
+        # Layout without any recognizable window falls back to text parsing
+        fallback = self.parser.parse_layout(layout([line("nothing here", 0, 0)]), "F2", processing_type="minimal")
+        self.assertNotEqual(fallback.parsing_stats.get('extraction_method'), 'layout')
+        
+        print(f"✓ Parsed pairs: {pairs}")
+    
+    def test_4_api_response_layout(self):
+        """Test 4: API text annotation becomes lines with block index, right edge and word boxes."""
+        print("\n=== Test 4: API Response Layout ===")
+        
+        annotation = {'blocks': [
+            {'lines': [{'text': "Unit Price : 10", 'boundingBox': vertices(5, 10, 150, 30), 'words': [
+                {'text': "Unit", 'boundingBox': vertices(5, 10, 40, 30)},
+                {'text': "10", 'boundingBox': vertices(130, 10, 150, 30)},
+            ]}]},
+            {'lines': [{'boundingBox': vertices(5, 50, 60, 70), 'words': [
+                {'text': "Quantity", 'boundingBox': vertices(5, 50, 60, 70)},
+            ]}, {'text': "no box"}]},
+        ]}
+        
+        lines = SimpleYandexOCRClient._extract_layout_lines(annotation)
+        
+        self.assertEqual(len(lines), 2)
+        self.assertEqual((lines[0]['left'], lines[0]['top'], lines[0]['right'], lines[0]['bottom']), (5, 10, 150, 30))
+        self.assertEqual([word['text'] for word in lines[0]['words']], ["Unit", "10"])
+        self.assertEqual((lines[1]['text'], lines[1]['block']), ("Quantity", 1))
+        
+        document = OCRDocument.from_layout({'text': '', 'lines': lines})
+        self.assertEqual([block.index for block in document.blocks], [0, 1])
+        self.assertEqual(document.blocks[0].bbox.right, 150)
+        self.assertEqual(document.lines[0].words[1].bbox.left, 130)
+        
+        shifted = shift_layout_line(lines[0], 100, scale=0.5)
+        self.assertEqual((shifted['left'], shifted['top'], shifted['words'][1]['right']), (10, 120, 300))
+        
+        print(f"✓ Extracted {len(lines)} lines in {len(document.blocks)} blocks")
+    
+    def test_5_strip_layout_stitching(self):
+        """Test 5: Cached strip lines are stitched into one layout in capture order."""
+        print("\n=== Test 5: Strip Layout Stitching ===")
+        
+        tracker = StripTracker(max_strips_per_hotkey=10)
+        strips = [
+            ImageStrip(Path("a.png"), 0, 0, 200, 50, "hash_a"),
+            ImageStrip(Path("a.png"), 1, 50, 200, 40, "hash_b"),
+        ]
+        merge_result = StripMergeResult(
+            hotkey="F1", strips=strips, changed_hashes=["hash_b", "hash_a"],
+            merged_path=Path("merged.png"), offsets={'hash_b': (0, 40), 'hash_a': (40, 90)}
+        )
+        
+        tracker.record_layout(merge_result, [
+            {'text': "Unit Price : 5", 'left': 0, 'top': 50, 'bottom': 70},
+            {'text': "Quantity : 2", 'left': 0, 'top': 10, 'bottom': 30},
+        ])
+        stitched = tracker.stitch_layout("F1", strips)
+        
+        self.assertEqual(stitched['text'], "Unit Price : 5\nQuantity : 2")
+        self.assertEqual([(entry['text'], entry['top']) for entry in stitched['lines']],
+                         [("Unit Price : 5", 10), ("Quantity : 2", 60)])
+        
+        # Text recorded without lines leaves the layout unavailable
+        tracker.record_texts("F1", {'hash_a': "Unit Price : 5"})
+        self.assertIsNone(tracker.stitch_layout("F1", strips))
+        self.assertIsNotNone(tracker.stitch_text("F1", strips))
+        
+        print(f"✓ Stitched {len(stitched['lines'])} lines across {len(strips)} strips")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
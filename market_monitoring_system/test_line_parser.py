@@ -0,0 +1,110 @@
+"""
+Tests for the single-pass OCR text parser.
+Verifies line classification, trade and broker state machines and linear parsing of large broker dumps.
+"""
+
+import inspect
+import time
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.text_parser import TextParser
+
+
+def broker_dump(windows, sellers_per_window=5):
+    """Build broker OCR text with the given number of windows."""
+    lines = []
+    for window in range(windows):
+        lines += ["Item Broker", f"Scroll of {'ABCDEFGHIJ'[window % 10]} :{window % 40}", "Name", "Qty.", "Currency"]
+        for seller in range(sellers_per_window):
+            lines += [f"Seller{window}_{seller}", f": {seller + 1}"]
+    return '\n'.join(lines)
+
+
+class LineParserTest(unittest.TestCase):
+    """Test suite for single-pass text parser."""
+    
+    def setUp(self):
+        """Create parser."""
+        self.parser = TextParser()
+    
+    def test_1_line_classification(self):
+        """Test 1: Every line gets its type from one combined pattern."""
+        print("\n=== Test 1: Line Classification ===")
+        
+        text = "Trade Items to Sell Alice\nTrade\nSword (10)\nUnit Price : 8,888 Adena\nQuantity : 3\nItem Broke\nName\n: 13\nTrader Joe"
+        tokens = [(kind, value) for kind, value, _ in self.parser._tokenize_lines(text)]
+        self.assertEqual(tokens, [
+            ('seller', 'Alice'),
+            ('trade', 'Trade'),
+            ('text', 'Sword (10)'),
+            ('price', '8,888'),
+            ('quantity', '3'),
+            ('broker', 'Item Broke'),
+            ('header', 'Name'),
+            ('artifact', ': 13'),
+            ('text', 'Trader Joe'),
+        ])
+        
+        print(f"✓ {len(tokens)} lines classified")
+    
+    def test_2_trade_windows(self):
+        """Test 2: Trade windows yield entries with real whitespace in seller and quantity lines."""
+        print("\n=== Test 2: Trade Windows ===")
+        
+        text = """
+        Trade
+        Items to Sell   Bob
+        Soulshot (10)
+        Unit Price : 1,500 Adena
+        Quantity :  10
+        
+        Trade Items to Sell Carol
+        Invalid Line
+        Arrow
+        Unit Price : 20 Adena
+        Quantity : 400
+        
+        Trade Items to Sell Dave
+        Broken Entry
+        Unit Price : INVALID
+        """
+        items = self.parser._iter_trade_items(text, "F1")
+        self.assertTrue(inspect.isgenerator(items))
+        self.assertEqual([(item.seller_name, item.item_name, item.price, item.quantity) for item in items], [
+            ("Bob", "Soulshot", 1500.0, 10),
+            ("Carol", "Arrow", 20.0, 400),
+        ])
+        
+        result = self.parser.parse_items_data(text, "F1", processing_type="full")
+        self.assertEqual(result.parsing_stats['extraction_method'], 'trade_data')
+        self.assertEqual(len(result.items), 2)
+        
+        print(f"✓ {len(result.items)} trade entries parsed")
+    
+    def test_3_broker_dump(self):
+        """Test 3: Broker dumps of thousands of lines parse in linear time."""
+        print("\n=== Test 3: Broker Dump ===")
+        
+        timings = {}
+        for windows in (500, 2000):
+            text = broker_dump(windows)
+            start = time.perf_counter()
+            items = self.parser._extract_broker_data(text, "F2")
+            timings[windows] = time.perf_counter() - start
+            self.assertEqual(len(items), windows * 5)
+        
+        self.assertEqual((items[0].seller_name, items[0].item_name), ("Seller0_0", "Scroll of A"))
+        self.assertEqual((items[-1].seller_name, items[-1].item_name), ("Seller1999_4", "Scroll of J"))
+        self.assertTrue(all(item.price is None and item.processing_type == "minimal" for item in items))
+        # Four times the text, far from sixteen times the time
+        self.assertLess(timings[2000], timings[500] * 10)
+        
+        print(f"✓ {len(items)} pairs from {len(broker_dump(2000).splitlines())} lines in {timings[2000] * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""
+Tests for OCR name variant canonicalization.
+Verifies confusable-only matching, protected number and grade tokens, learned aliases and fewer engine rows for OCR variants.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from config.settings import MonitoringConfig
+from core.database_manager import DatabaseManager, ItemData
+from core.monitoring_engine import MonitoringEngine
+from core.name_canonicalizer import NameCanonicalizer, ocr_skeleton, confusable_substitutions
+from core.text_parser import ParsingResult
+
+
+def trade_item(seller, item, price=100.0, quantity=1):
+    """Build parsed full processing item."""
+    return ItemData(seller, item, price, quantity, None, "F1", "full")
+
+
+class NameCanonicalizerTest(unittest.TestCase):
+    """Test suite for name canonicalizer."""
+    
+    def setUp(self):
+        """Create database in a temporary folder."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DatabaseManager(str(Path(self.temp_dir.name) / "market.db"))
+    
+    def tearDown(self):
+        """Close database and remove temporary files."""
+        self.db.close_connection()
+        self.temp_dir.cleanup()
+    
+    def test_1_ocr_skeleton(self):
+        """Test 1: Only OCR-confusable characters fold, protected tokens stay verbatim."""
+        print("\n=== Test 1: OCR Skeleton ===")
+        
+        self.assertEqual(ocr_skeleton("Sword of Va1or"), ocr_skeleton("Sw0rd of VaIor"))
+        self.assertEqual(ocr_skeleton("Mithril Ore"), ocr_skeleton("Mithri1 0re"))
+        self.assertEqual(ocr_skeleton("Comet Hammer"), ocr_skeleton("Comet Harnmer"))
+        self.assertNotEqual(ocr_skeleton("Potion x10"), ocr_skeleton("Potion xl0"))
+        
+        self.assertEqual(confusable_substitutions("Sword of Valor", "Sw0rd of Va1or"), 2)
+        self.assertEqual(confusable_substitutions("Comet Hammer", "Comet Harnmer"), 1)
+        self.assertIsNone(confusable_substitutions("Sword of Valor", "Sword of Vigor"))
+        self.assertIsNone(confusable_substitutions("Scroll +10", "Scroll +1O"))
+        
+        print("✓ Confusable spellings share a skeleton, numbers never fold")
+    
+    def test_2_variant_matching(self):
+        """Test 2: OCR variants map to known names, short names and other kinds stay separate."""
+        print("\n=== Test 2: Variant Matching ===")
+        
+        canonicalizer = NameCanonicalizer(self.db)
+        for kind, name in [('item', "Sword of Valor"), ('item', "Steel"), ('seller', "Lilith"), ('seller', "Kage")]:
+            self.assertEqual(canonicalizer.canonicalize(kind, name), name)
+        
+        self.assertEqual(canonicalizer.canonicalize('item', "Sword of Va1or"), "Sword of Valor")
+        self.assertEqual(canonicalizer.canonicalize('item', "Sw0rd of Va1or"), "Sword of Valor")
+        self.assertEqual(canonicalizer.canonicalize('item', "Stee1"), "Steel")
+        self.assertEqual(canonicalizer.canonicalize('seller', "Li1ith"), "Lilith")
+        # Two substitutions are too many for a seller, and four letters too short for any
+        self.assertEqual(canonicalizer.canonicalize('seller', "L1I1th"), "L1I1th")
+        self.assertEqual(canonicalizer.canonicalize('seller', "Kag0"), "Kag0")
+        # Sellers and items are separate vocabularies
+        self.assertEqual(canonicalizer.canonicalize('seller', "Stee1"), "Stee1")
+        
+        stats = canonicalizer.get_canonicalizer_statistics()
+        self.assertEqual(stats['fuzzy_matches'], 4)
+        self.assertEqual(stats['known_sellers'], 5)
+        # Alias learning is off unless enabled
+        self.assertIsNone(self.db.get_name_alias('item', "Sword of Va1or"))
+        
+        print(f"✓ {stats['fuzzy_matches']} variants matched, {stats['new_names']} new names")
+    
+    def test_3_learned_aliases(self):
+        """Test 3: Matched variants are saved and resolved from the alias table after restart."""
+        print("\n=== Test 3: Learned Aliases ===")
+        
+        first = NameCanonicalizer(self.db, cache_size=2, learn_aliases=True)
+        first.canonicalize('item', "Mithril Ore")
+        self.assertEqual(first.canonicalize('item', "Mithri1 Ore"), "Mithril Ore")
+        self.assertEqual(self.db.get_name_alias('item', "Mithri1 Ore"), "Mithril Ore")
+        
+        for name in ["Animal Bone", "Metallic Fiber", "Silver Nugget"]:
+            first.canonicalize('item', name)
+        for variant in ["Anima1 Bone", "Meta11ic Fiber", "Si1ver Nugget"]:
+            first.canonicalize('item', variant)
+        self.assertEqual(first.get_canonicalizer_statistics()['cached_variants'], 2)
+        
+        # Known names come back from the alias table, not from current state
+        second = NameCanonicalizer(self.db, learn_aliases=True)
+        self.assertEqual(second.get_canonicalizer_statistics()['known_items'], 4)
+        self.assertEqual(second.canonicalize('item', "Mithri1 Ore"), "Mithril Ore")
+        self.assertEqual(second.canonicalize('item', "Mithri1 Ore"), "Mithril Ore")
+        stats = second.get_canonicalizer_statistics()
+        self.assertEqual((stats['alias_hits'], stats['cache_hits'], stats['fuzzy_matches']), (1, 1, 0))
+        
+        print(f"✓ Aliases survived restart, {stats['alias_hits']} alias hit")
+    
+    def test_4_engine_cardinality(self):
+        """Test 4: Variants across cycles reuse current rows instead of adding new items."""
+        print("\n=== Test 4: Engine Cardinality ===")
+        
+        settings = MagicMock()
+        settings.monitoring = MonitoringConfig(status_transition_delay=10, status_check_interval=5)
+        engine = MonitoringEngine(self.db, settings)
+        canonicalizer = NameCanonicalizer(self.db, learn_aliases=True)
+        
+        cycles = [
+            [trade_item("Mirabel", "Sword of Valor"), trade_item("Taupa", "Mithril Ore")],
+            [trade_item("Mirabel", "Sword of Va1or"), trade_item("Taupa", "Mithri1 Ore")],
+            [trade_item("Mirabe1", "Sword of Valor"), trade_item("Taupa", "Mithril Ore")],
+        ]
+        for items in cycles:
+            canonicalizer.canonicalize_items(items)
+            engine.process_parsing_results([ParsingResult(items=items, hotkey="F1")])
+        
+        conn = self.db._get_connection()
+        rows = conn.execute("SELECT COUNT(*) FROM sellers_current").fetchone()[0]
+        self.assertEqual(rows, 2)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM monitoring_queue").fetchone()[0], 2)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM changes_log WHERE change_type = 'NEW_ITEM'").fetchone()[0], 2)
+        self.assertEqual(canonicalizer.get_canonicalizer_statistics()['items_renamed'], 3)
+        
+        # One screenshot listing two spellings with the same item shows two sellers
+        items = [trade_item("Mirabel", "Steel"), trade_item("Mirabe1", "Steel")]
+        self.assertEqual(canonicalizer.canonicalize_items(items), 0)
+        self.assertEqual([item.seller_name for item in items], ["Mirabel", "Mirabe1"])
+        self.assertEqual(canonicalizer.canonicalize('seller', "Mirabe1"), "Mirabe1")
+        self.assertIsNone(self.db.get_name_alias('seller', "Mirabe1"))
+        
+        print(f"✓ {rows} current rows after {len(cycles)} cycles with variants")
+    
+    def test_5_distinct_names_not_merged(self):
+        """Test 5: Names differing in numbers, levels, stack sizes, grades or letters stay distinct."""
+        print("\n=== Test 5: Distinct Names Not Merged ===")
+        
+        canonicalizer = NameCanonicalizer(self.db, max_seller_substitutions=2, learn_aliases=True)
+        pairs = [
+            ('seller', "Archer1", "Archer2"),
+            ('item', "Scroll +10", "Scroll +12"),
+            ('item', "Enchant Armor (S)", "Enchant Armor (A)"),
+            ('item', "Sword of Valor", "Sword of Vigor"),
+            ('item', "Potion x10", "Potion x20"),
+            ('item', "Elixir of Life", "Elixir of Lift"),
+            ('seller', "Karabas", "Karabaz"),
+        ]
+        for kind, known, other in pairs:
+            canonicalizer.canonicalize(kind, known)
+            self.assertEqual(canonicalizer.canonicalize(kind, other), other)
+        
+        stats = canonicalizer.get_canonicalizer_statistics()
+        self.assertEqual(stats['fuzzy_matches'], 0)
+        self.assertEqual(self.db._get_connection().execute("SELECT COUNT(*) FROM name_aliases").fetchone()[0], 0)
+        
+        print(f"✓ {len(pairs)} look-alike pairs kept as {stats['new_names']} names")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+Tests for NumPy merge engine and OCR preprocessing.
+Verifies the array pipeline matches the PIL pipeline within rounding.
+"""
+
+import unittest
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from config.settings import ImageProcessingConfig
+from core.image_processor import ImageProcessor
+from core.numpy_imaging import compose_vertical, enhance_for_ocr
+
+
+def make_screenshot(label, size=(300, 80), color='white'):
+    """Create screenshot with a text label."""
+    image = Image.new('RGB', size, color)
+    draw = ImageDraw.Draw(image)
+    draw.text((10, 30), label, fill='black')
+    draw.rectangle((200, 10, 290, 70), outline=(90, 140, 200))
+    return image
+
+
+class NumpyImagingTest(unittest.TestCase):
+    """Test suite for NumPy imaging."""
+    
+    def setUp(self):
+        """Create temporary folder for merged images."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name)
+    
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+    
+    def make_processor(self, engine):
+        """Create image processor using the given merge engine."""
+        settings = SimpleNamespace(
+            image_processing=ImageProcessingConfig(merge_engine=engine),
+            paths=SimpleNamespace(temp_merged=self.base / "merged")
+        )
+        return ImageProcessor(settings)
+    
+    def test_1_compose_layout(self):
+        """Test 1: Images are stacked and resized into their slots."""
+        print("\n=== Test 1: Compose Layout ===")
+        
+        top = Image.new('RGB', (100, 20), (255, 0, 0))
+        bottom = Image.new('RGB', (50, 10), (0, 0, 255))
+        
+        array = compose_vertical([top, None, bottom], 100, [20, 5, 20], grayscale=False)
+        
+        self.assertEqual(array.shape, (45, 100, 3))
+        self.assertEqual(tuple(array[0, 0]), (255, 0, 0))
+        self.assertEqual(tuple(array[22, 50]), (255, 255, 255))
+        self.assertEqual(tuple(array[44, 99]), (0, 0, 255))
+        print("✓ Slots filled in order, missing image left blank")
+    
+    def test_2_enhance_band_invariant(self):
+        """Test 2: Band size does not change the enhanced output."""
+        print("\n=== Test 2: Band Invariance ===")
+        
+        rng = np.random.default_rng(7)
+        source = rng.integers(0, 256, size=(97, 61), dtype=np.uint8)
+        
+        reference = enhance_for_ocr(source.copy(), band_rows=1000)
+        for band_rows in [1, 2, 3, 16]:
+            np.testing.assert_array_equal(enhance_for_ocr(source.copy(), band_rows=band_rows), reference)
+        print("✓ Identical output for all band sizes")
+    
+    def test_3_enhance_matches_pil(self):
+        """Test 3: Array enhancement follows the PIL pipeline within rounding."""
+        print("\n=== Test 3: PIL Equivalence ===")
+        
+        screenshot = make_screenshot("Seller A 1 500")
+        processor = self.make_processor("pil")
+        expected = np.asarray(processor._optimize_for_ocr(screenshot).convert('L')).astype(int)
+        
+        actual = enhance_for_ocr(np.array(screenshot.convert('L')), band_rows=16).astype(int)
+        
+        self.assertLessEqual(np.abs(actual - expected).max(), 2)
+        print("✓ Within 2 levels of PIL output")
+    
+    def test_4_merge_files_grayscale(self):
+        """Test 4: NumPy engine merges files into a grayscale JPEG of the same size."""
+        print("\n=== Test 4: NumPy File Merge ===")
+        
+        paths = []
+        for index, label in enumerate(["Seller A 100", "Seller B 200", "Seller C 300"]):
+            path = self.base / f"shot_{index}.png"
+            make_screenshot(label).save(path)
+            paths.append(path)
+        
+        numpy_path = self.make_processor("numpy").merge_to_vertical_column(paths, self.base / "numpy.jpg")
+        pil_path = self.make_processor("pil").merge_to_vertical_column(paths, self.base / "pil.jpg")
+        
+        with Image.open(numpy_path) as merged, Image.open(pil_path) as reference:
+            self.assertEqual(merged.mode, 'L')
+            self.assertEqual(merged.size, reference.size)
+            difference = np.abs(np.asarray(merged).astype(int) - np.asarray(reference.convert('L')).astype(int))
+            self.assertLess(difference.mean(), 2)
+        print("✓ Grayscale merge matches PIL merge")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
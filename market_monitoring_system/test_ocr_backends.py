@@ -0,0 +1,212 @@
+"""
+Tests for pluggable OCR backends and latency-aware routing.
+Verifies small-image routing, rate limit and slow cloud avoidance with probes, fallback and OCR queue integration.
+"""
+
+import asyncio
+import unittest
+import threading
+import time
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.ocr_backends import OCRBackend, OCRBackendRouter, TesseractOCRBackend, OCRBackendError, PYTESSERACT_AVAILABLE
+from core.ocr_queue import OCRQueue, OCRJobStatus
+from core.simple_ocr_client import OCRRateLimitError
+
+
+class ScriptedBackend(OCRBackend):
+    """Backend returning its name, with scripted delay and failures."""
+    
+    def __init__(self, name, delay=0.0):
+        self.name = name
+        self.delay = delay
+        self.failures = []  # Exceptions or None results to return before succeeding
+        self.requests = 0
+        self._lock = threading.Lock()
+    
+    def recognize(self, image, language_codes=None, layout=False):
+        with self._lock:
+            self.requests += 1
+            outcome = self.failures.pop(0) if self.failures else self.name
+        time.sleep(self.delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        if outcome and layout:
+            return {'text': outcome, 'lines': [{'text': outcome, 'left': 0, 'top': 0, 'bottom': 10}]}
+        return outcome
+
+
+class OCRBackendRouterTest(unittest.TestCase):
+    """Test suite for OCR backend router."""
+    
+    def setUp(self):
+        """Create cloud and local backends."""
+        self.cloud = ScriptedBackend("cloud")
+        self.local = ScriptedBackend("local")
+    
+    def test_1_small_images_stay_local(self):
+        """Test 1: Small images go to the local backend, large ones to the cloud."""
+        print("\n=== Test 1: Small Images Stay Local ===")
+        
+        router = OCRBackendRouter(self.cloud, self.local, small_image_bytes=1000)
+        self.assertEqual(router.process_image_bytes(b'\x00' * 500), "local")
+        self.assertEqual(router.process_image_bytes(b'\x00' * 5000), "cloud")
+        self.assertEqual(router.process_image_bytes(b'\x00' * 5000, layout=True)['text'], "cloud")
+        
+        stats = router.get_routing_statistics()
+        self.assertEqual(stats['routed'], {'small_image': 1, 'cloud': 2})
+        self.assertEqual(stats['backends']['cloud']['requests'], 2)
+        
+        # Without a local backend everything goes to the cloud
+        cloud_only = OCRBackendRouter(self.cloud)
+        self.assertEqual(cloud_only.process_image_bytes(b'\x00' * 10), "cloud")
+        
+        print(f"✓ Routed: {stats['routed']}")
+    
+    def test_2_rate_limited_cloud(self):
+        """Test 2: A rate limited request is served locally and the cloud is avoided for Retry-After."""
+        print("\n=== Test 2: Rate Limited Cloud ===")
+        
+        router = OCRBackendRouter(self.cloud, self.local, small_image_bytes=0)
+        self.cloud.failures = [OCRRateLimitError("429", retry_after=0.1)]
+        
+        self.assertEqual(router.process_image_bytes(b'\x00' * 100), "local")
+        self.assertEqual(router.process_image_bytes(b'\x00' * 100), "local")
+        self.assertEqual(self.cloud.requests, 1)
+        
+        time.sleep(0.15)
+        self.assertEqual(router.process_image_bytes(b'\x00' * 100), "cloud")
+        
+        stats = router.get_routing_statistics()
+        self.assertEqual(stats['fallbacks'], 1)
+        self.assertEqual(stats['routed']['rate_limited'], 1)
+        self.assertEqual(stats['backends']['cloud']['rate_limited'], 1)
+        
+        # Rate limit is raised when the fallback produced nothing either
+        router = OCRBackendRouter(self.cloud, self.local, small_image_bytes=0)
+        self.cloud.failures = [OCRRateLimitError("429")]
+        self.local.failures = [None]
+        with self.assertRaises(OCRRateLimitError):
+            router.process_image_bytes(b'\x00' * 100)
+        
+        print(f"✓ Routed: {stats['routed']}")
+    
+    def test_3_slow_cloud_is_probed(self):
+        """Test 3: A slow cloud is avoided and probed once per interval."""
+        print("\n=== Test 3: Slow Cloud Is Probed ===")
+        
+        self.cloud.delay = 0.05
+        router = OCRBackendRouter(self.cloud, self.local, small_image_bytes=0,
+                                  max_cloud_latency=0.02, probe_interval=0.2, ewma_alpha=1.0)
+        
+        self.assertEqual(router.process_image_bytes(b'\x00' * 100), "cloud")
+        self.assertEqual([router.process_image_bytes(b'\x00' * 100) for _ in range(3)], ["local"] * 3)
+        
+        # Probe finds the cloud fast again
+        self.cloud.delay = 0.0
+        time.sleep(0.25)
+        self.assertEqual(router.process_image_bytes(b'\x00' * 100), "cloud")
+        self.assertEqual(router.process_image_bytes(b'\x00' * 100), "cloud")
+        
+        stats = router.get_routing_statistics()
+        self.assertEqual(stats['routed']['cloud_slow'], 3)
+        self.assertEqual(stats['cloud_probes'], 1)
+        self.assertLess(stats['backends']['cloud']['latency_ewma'], 0.02)
+        
+        print(f"✓ Routed: {stats['routed']}")
+    
+    def test_4_failing_cloud(self):
+        """Test 4: Failed cloud requests fall back locally, and a high error EWMA keeps the cloud avoided."""
+        print("\n=== Test 4: Failing Cloud ===")
+        
+        router = OCRBackendRouter(self.cloud, self.local, small_image_bytes=0,
+                                  max_cloud_error_rate=0.4, probe_interval=60.0, ewma_alpha=0.25)
+        self.cloud.failures = [None, RuntimeError("502")]
+        
+        self.assertEqual(router.process_image_bytes(b'\x00' * 100), "local")
+        self.assertEqual(router.process_image_bytes(b'\x00' * 100), "local")
+        self.assertEqual(router.process_image_bytes(b'\x00' * 100), "local")
+        self.assertEqual(self.cloud.requests, 2)
+        
+        stats = router.get_routing_statistics()
+        self.assertEqual(stats['fallbacks'], 2)
+        self.assertEqual(stats['routed']['cloud_errors'], 1)
+        self.assertEqual(stats['backends']['cloud']['failures'], 2)
+        self.assertAlmostEqual(stats['backends']['cloud']['error_ewma'], 0.4375)
+        
+        print(f"✓ Cloud error EWMA {stats['backends']['cloud']['error_ewma']:.2f}, requests served locally")
+    
+    def test_5_async_and_queue_integration(self):
+        """Test 5: Router serves the OCR queue in threaded and async dispatch."""
+        print("\n=== Test 5: Async And Queue Integration ===")
+        
+        router = OCRBackendRouter(self.cloud, self.local, small_image_bytes=1000)
+        self.assertEqual(asyncio.run(router.process_image_async(image_data=b'\x00' * 50)), "local")
+        self.assertFalse(router.async_available)
+        
+        finished = []
+        done = threading.Event()
+        
+        def callback(job):
+            finished.append(job)
+            if len(finished) == 4:
+                done.set()
+        
+        ocr_queue = OCRQueue(router, num_workers=2)
+        ocr_queue.start()
+        try:
+            for size in (100, 5000, 200, 8000):
+                ocr_queue.submit_job(None, "F1", callback=callback, image_data=b'\xff' * size)
+            self.assertTrue(done.wait(timeout=5))
+        finally:
+            ocr_queue.stop()
+        
+        self.assertTrue(all(job.status == OCRJobStatus.COMPLETED for job in finished))
+        self.assertEqual(sorted(job.result for job in finished), ["cloud", "cloud", "local", "local"])
+        
+        print("✓ 4 queued jobs split between cloud and local backends")
+    
+    @unittest.skipUnless(PYTESSERACT_AVAILABLE, "pytesseract not installed")
+    def test_6_tesseract_backend(self):
+        """Test 6: Tesseract backend recognizes rendered text with line positions."""
+        print("\n=== Test 6: Tesseract Backend ===")
+        
+        from PIL import Image, ImageDraw
+        import io
+        
+        try:
+            backend = TesseractOCRBackend()
+        except OCRBackendError as e:
+            self.skipTest(str(e))
+        
+        image = Image.new('L', (400, 60), 255)
+        ImageDraw.Draw(image).text((10, 20), "Market 1234", fill=0)
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG')
+        
+        result = backend.recognize(buffer.getvalue(), ['en'], layout=True)
+        self.assertIsNotNone(result)
+        self.assertIn("1234", result['text'])
+        self.assertTrue(all(0 <= line['top'] < line['bottom'] <= 60 for line in result['lines']))
+        
+        print(f"✓ Recognized: {result['text']!r}")
+    
+    def test_7_backend_interface(self):
+        """Test 7: Backends without recognize cannot be created."""
+        print("\n=== Test 7: Backend Interface ===")
+        
+        class NamedOnlyBackend(OCRBackend):
+            name = "named"
+        
+        with self.assertRaises(TypeError):
+            NamedOnlyBackend()
+        self.assertEqual(ScriptedBackend("cloud").name, "cloud")
+        
+        print("✓ Abstract recognize enforced at creation")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
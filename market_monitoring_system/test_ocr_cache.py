@@ -0,0 +1,206 @@
+"""
+Tests for OCR result cache.
+Verifies exact and perceptual hits, TTL expiry, LRU eviction and disk persistence.
+"""
+
+import unittest
+import tempfile
+import time
+import json
+import shutil
+from pathlib import Path
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'benchmarks'))
+
+from PIL import Image, ImageDraw
+
+from config.settings import SettingsManager
+from core.database_manager import DatabaseManager
+from core.image_processor import ImageProcessor
+from core.monitoring_engine import MonitoringEngine
+from core.ocr_cache import OCRResultCache
+from core.ocr_client import YandexOCRClient
+from core.ocr_queue import OCRQueue
+from core.image_hashing import difference_hash, hamming_distance
+from core.text_parser import TextParser
+from utils.scheduler import TaskScheduler
+from stub_ocr_server import StubOCRServer
+from pipeline_benchmark import write_config
+
+
+def make_listing_image(path, lines, size=(300, 600), compress_level=6):
+    """Draw simple text listing image and save as PNG."""
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(lines):
+        draw.text((10, 10 + i * 40), line, fill='black')
+    image.save(path, 'PNG', compress_level=compress_level)
+    return path
+
+
+class OCRResultCacheTest(unittest.TestCase):
+    """Test suite for OCRResultCache."""
+    
+    def setUp(self):
+        """Create temporary directory for images and cache store."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp_dir.name)
+        self.lines = [f"Seller{i} Item{i} {i * 100}" for i in range(10)]
+    
+    def tearDown(self):
+        """Remove temporary directory."""
+        self.temp_dir.cleanup()
+    
+    def test_1_exact_hit(self):
+        """Test 1: Byte-identical image hits the cache."""
+        print("\n=== Test 1: Exact Hit ===")
+        
+        cache = OCRResultCache(ttl_seconds=60)
+        image_path = make_listing_image(self.dir / "a.png", self.lines)
+        
+        key = cache.compute_key(image_path, ['ru', 'en'])
+        self.assertIsNone(cache.get(key))
+        cache.put(key, "recognized text")
+        
+        self.assertEqual(cache.get(cache.compute_key(image_path, ['ru', 'en'])), "recognized text")
+        self.assertIsNone(cache.get(cache.compute_key(image_path, ['en'])))
+        
+        stats = cache.get_cache_statistics()
+        self.assertEqual(stats['exact_hits'], 1)
+        self.assertEqual(stats['misses'], 2)
+        print("✓ Exact content hash hit, language variant respected")
+    
+    def test_2_perceptual_hit_and_changed_listing(self):
+        """Test 2: Perceptual hits are opt-in; changed listing misses."""
+        print("\n=== Test 2: Perceptual Hit ===")
+        
+        original = make_listing_image(self.dir / "a.png", self.lines, compress_level=1)
+        reencoded = make_listing_image(self.dir / "b.png", self.lines, compress_level=9)
+        self.assertNotEqual(original.read_bytes(), reencoded.read_bytes())
+        
+        default_cache = OCRResultCache(ttl_seconds=60)
+        default_cache.put(default_cache.compute_key(original), "text")
+        self.assertIsNone(default_cache.get(default_cache.compute_key(reencoded)))
+        self.assertEqual(default_cache.get_cache_statistics()['perceptual_hits'], 0)
+        
+        cache = OCRResultCache(ttl_seconds=60, perceptual_matching=True)
+        cache.put(cache.compute_key(original), "text")
+        self.assertEqual(cache.get(cache.compute_key(reencoded)), "text")
+        self.assertEqual(cache.get_cache_statistics()['perceptual_hits'], 1)
+        
+        changed_lines = list(self.lines)
+        changed_lines[3] = "NewSeller ########## 99999999"
+        changed = make_listing_image(self.dir / "c.png", changed_lines)
+        self.assertIsNone(cache.get(cache.compute_key(changed)))
+        
+        resized = make_listing_image(self.dir / "d.png", self.lines, size=(300, 640))
+        self.assertIsNone(cache.get(cache.compute_key(resized)))
+        print("✓ Perceptual match requires same dimensions and content")
+    
+    def test_3_ttl_and_lru_eviction(self):
+        """Test 3: Entries expire after TTL and LRU evicts least recently used."""
+        print("\n=== Test 3: TTL and LRU ===")
+        
+        cache = OCRResultCache(ttl_seconds=60, max_entries=2, perceptual_matching=False)
+        keys = []
+        for i in range(3):
+            path = make_listing_image(self.dir / f"{i}.png", [f"Only line {i}"])
+            keys.append(cache.compute_key(path))
+        
+        cache.put(keys[0], "zero")
+        cache.put(keys[1], "one")
+        cache.get(keys[0])  # keys[1] becomes least recently used
+        cache.put(keys[2], "two")
+        
+        self.assertEqual(cache.get(keys[0]), "zero")
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.get_cache_statistics()['evictions'], 1)
+        
+        short_cache = OCRResultCache(ttl_seconds=0.05)
+        short_cache.put(keys[0], "zero")
+        time.sleep(0.1)
+        self.assertIsNone(short_cache.get(keys[0]))
+        self.assertEqual(short_cache.get_cache_statistics()['expirations'], 1)
+        print("✓ TTL expiry and LRU eviction work")
+    
+    def test_4_disk_persistence(self):
+        """Test 4: Entries survive cache restart through SQLite store."""
+        print("\n=== Test 4: Disk Persistence ===")
+        
+        db_path = self.dir / "cache" / "ocr_cache.db"
+        image_path = make_listing_image(self.dir / "a.png", self.lines)
+        
+        cache = OCRResultCache(db_path=db_path, ttl_seconds=60)
+        key = cache.compute_key(image_path)
+        cache.put(key, "persisted text")
+        cache.close()
+        
+        reopened = OCRResultCache(db_path=db_path, ttl_seconds=60)
+        self.assertEqual(reopened.get(key), "persisted text")
+        self.assertEqual(reopened.get_cache_statistics()['entries'], 1)
+        reopened.close()
+        print("✓ Cache reloaded from disk")
+    
+    def test_5_difference_hash(self):
+        """Test 5: dHash scales rows with aspect ratio."""
+        image = Image.new('L', (100, 400), 128)
+        self.assertEqual(difference_hash(image, hash_size=8), 0)
+        self.assertEqual(hamming_distance(0b1011, 0b0001), 2)
+        
+        gradient = Image.linear_gradient('L').rotate(90).resize((100, 400))
+        value = difference_hash(gradient, hash_size=8)
+        self.assertLessEqual(value.bit_length(), 8 * 32)
+    
+    def test_6_scheduler_layout_hit(self):
+        """Test 6: A repeated screenshot sent through the scheduler reuses the cached layout."""
+        print("\n=== Test 6: Scheduler Layout Hit ===")
+        
+        screenshot = make_listing_image(self.dir / "listing.png", self.lines)
+        
+        with StubOCRServer(texts=["Trade\nItems to Sell Bob\nArrow\nUnit Price : 20 Adena\nQuantity : 5"], seed=6) as stub:
+            config_path = write_config(Path(__file__).parent / "config.json", self.dir, stub.url)
+            data = json.loads(config_path.read_text(encoding='utf-8'))
+            data['ocr_cache'].update({'enabled': True, 'db_path': str(self.dir / "cache" / "ocr_cache.db")})
+            config_path.write_text(json.dumps(data, indent=4), encoding='utf-8')
+            
+            settings = SettingsManager(str(config_path))
+            db = DatabaseManager(str(settings.paths.database))
+            ocr_client = YandexOCRClient(settings)
+            ocr_queue = OCRQueue(ocr_client, num_workers=1)
+            scheduler = TaskScheduler(settings, db, ImageProcessor(settings), ocr_queue,
+                                      TextParser(), MonitoringEngine(db, settings))
+            folder = settings.get_screenshot_path("F1")
+            folder.mkdir(parents=True, exist_ok=True)
+            
+            ocr_queue.start()
+            try:
+                for cycle in range(2):
+                    # Source backups left by cleanup would be merged again
+                    for backup in folder.glob("*.backup.png"):
+                        backup.unlink()
+                    shutil.copy(screenshot, folder / f"F1_cycle{cycle}.png")
+                    scheduler.process_hotkey_folder("F1")
+                    deadline = time.time() + 10
+                    while ocr_queue.get_queue_statistics()['total_jobs_completed'] <= cycle and time.time() < deadline:
+                        time.sleep(0.05)
+            finally:
+                ocr_queue.stop()
+                ocr_client.cache.close()
+                db.close_connection()
+            
+            requests = stub.get_server_statistics()['requests']
+        
+        cache_stats = ocr_client.get_ocr_statistics()['cache']
+        self.assertEqual(ocr_queue.get_queue_statistics()['total_jobs_completed'], 2)
+        self.assertEqual(requests, 1)
+        self.assertEqual(cache_stats['exact_hits'] + cache_stats['perceptual_hits'], 1)
+        self.assertEqual(cache_stats['stores'], 1)
+        
+        print(f"✓ Second cycle served from cache, {requests} OCR request sent")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Tests for payload-minimizing OCR image encoder.
+Verifies trimming, candidate selection, byte cap handling and processor integration.
+"""
+
+import unittest
+import io
+import pickle
+import random
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from PIL import Image, ImageDraw
+
+from config.settings import ImageProcessingConfig, OCREncodingConfig
+from core.image_processor import ImageProcessor
+from core.ocr_image_encoder import OCRImageEncoder, OCRImageEncoderError, sniff_mime_type
+
+
+def make_listing(rows=6, size=(400, 300), margin=40, gap=0):
+    """Create dark market listing with text rows, margins and an optional blank gap."""
+    image = Image.new('RGB', size, (24, 26, 30))
+    draw = ImageDraw.Draw(image)
+    for row in range(rows):
+        y = margin + row * 20 + (gap if row >= rows // 2 else 0)
+        draw.text((margin, y), f"Seller{row}  {row + 1}  {row * 1000 + 250}", fill=(214, 206, 180))
+    return image
+
+
+class OCRImageEncoderTest(unittest.TestCase):
+    """Test suite for OCR image encoder."""
+    
+    def setUp(self):
+        """Create temporary folder for merged images."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name)
+    
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+    
+    def test_1_trim_margins_and_blank_rows(self):
+        """Test 1: Margins are cropped and long blank runs collapsed."""
+        print("\n=== Test 1: Trim Margins And Blank Rows ===")
+        
+        image = make_listing(size=(400, 500), gap=200)
+        encoder = OCRImageEncoder(trim_padding=4, blank_row_gap=8)
+        trimmed = encoder.trim(image)
+        
+        self.assertLess(trimmed.width, image.width - 2 * 30)
+        self.assertLess(trimmed.height, image.height - 200)
+        
+        # Collapsing keeps the content rows
+        untouched = OCRImageEncoder(collapse_blank_rows=False).trim(image)
+        self.assertGreater(untouched.height, trimmed.height + 150)
+        
+        disabled = OCRImageEncoder(trim_margins=False, collapse_blank_rows=False)
+        self.assertIs(disabled.trim(image), image)
+        
+        print(f"✓ {image.size} trimmed to {trimmed.size}")
+    
+    def test_2_smallest_candidate_wins(self):
+        """Test 2: The smallest candidate is chosen and beats plain JPEG."""
+        print("\n=== Test 2: Smallest Candidate Wins ===")
+        
+        image = make_listing()
+        encoder = OCRImageEncoder()
+        encoded = encoder.encode(image)
+        
+        self.assertEqual(encoded.nbytes, min(encoded.candidates.values()))
+        self.assertEqual(sniff_mime_type(encoded.data), encoded.mime_type)
+        # Quantizing palette PNG is lossy and must be enabled explicitly
+        self.assertNotIn('png_palette', encoded.candidates)
+        
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', optimize=True, quality=85)
+        self.assertLess(encoded.nbytes, len(buffer.getvalue()))
+        
+        stats = encoder.get_encoder_statistics()
+        self.assertEqual(stats['images_encoded'], 1)
+        self.assertEqual(stats['encodings_chosen'], {encoded.encoding: 1})
+        
+        print(f"✓ {encoded.encoding} {encoded.nbytes}B vs JPEG {len(buffer.getvalue())}B")
+    
+    def test_3_byte_cap(self):
+        """Test 3: Byte cap walks the quality ladder, then downscales, then fails."""
+        print("\n=== Test 3: Byte Cap ===")
+        
+        # Noise compresses badly in every format
+        rng = random.Random(3)
+        noise = Image.frombytes('L', (300, 300), bytes(rng.randrange(256) for _ in range(300 * 300)))
+        
+        unlimited = OCRImageEncoder(encodings=['jpeg'], trim_margins=False, collapse_blank_rows=False)
+        preferred = unlimited.encode(noise)
+        self.assertEqual(preferred.quality, 85)
+        
+        capped = OCRImageEncoder(encodings=['jpeg'], max_bytes=preferred.nbytes - 1,
+                                 trim_margins=False, collapse_blank_rows=False)
+        laddered = capped.encode(noise)
+        self.assertLess(laddered.quality, 85)
+        self.assertEqual(laddered.scale, 1.0)
+        self.assertLessEqual(laddered.nbytes, capped.max_bytes)
+        
+        tight = OCRImageEncoder(encodings=['png_gray'], max_bytes=40000,
+                                trim_margins=False, collapse_blank_rows=False)
+        downscaled = tight.encode(noise)
+        self.assertLess(downscaled.scale, 1.0)
+        self.assertLess(downscaled.size[0], noise.width)
+        
+        impossible = OCRImageEncoder(encodings=['png_gray'], max_bytes=100,
+                                     trim_margins=False, collapse_blank_rows=False)
+        with self.assertRaises(OCRImageEncoderError):
+            impossible.encode(noise)
+        
+        with self.assertRaises(OCRImageEncoderError):
+            OCRImageEncoder(encodings=['gif'])
+        
+        print(f"✓ Quality {laddered.quality}, scale {downscaled.scale:.2f}")
+    
+    def test_4_pickle_and_sniff(self):
+        """Test 4: Encoder pickles for worker processes and mime types are sniffed."""
+        print("\n=== Test 4: Pickle And Sniff ===")
+        
+        encoder = pickle.loads(pickle.dumps(OCRImageEncoder(encodings=['png_gray', 'webp'])))
+        self.assertEqual(encoder.encodings, ['png_gray', 'webp'])
+        self.assertIsNotNone(encoder.logger)
+        
+        image = make_listing()
+        for encoding, mime_type in (('png_palette', 'PNG'), ('jpeg', 'JPEG'), ('webp', 'WEBP')):
+            data = OCRImageEncoder(encodings=[encoding]).encode(image).data
+            self.assertEqual(sniff_mime_type(data), mime_type)
+        
+        print("✓ Encoder pickled, PNG/JPEG/WEBP detected")
+    
+    def test_5_processor_writes_chosen_format(self):
+        """Test 5: Image processor saves merges with the chosen encoding suffix."""
+        print("\n=== Test 5: Processor Writes Chosen Format ===")
+        
+        paths = []
+        for index in range(3):
+            path = self.base / f"F1_{index:03d}.png"
+            make_listing(rows=3, size=(300, 120), margin=20).save(path)
+            paths.append(path)
+        
+        settings = SimpleNamespace(
+            image_processing=ImageProcessingConfig(),
+            ocr_encoding=OCREncodingConfig(),
+            paths=SimpleNamespace(temp_merged=self.base / "merged")
+        )
+        processor = ImageProcessor(settings)
+        output = processor.merge_to_vertical_column(paths, output_path=self.base / "merged" / "merged_F1.jpg")
+        
+        self.assertIsNotNone(output)
+        self.assertTrue(output.exists())
+        expected_suffix = {'PNG': '.png', 'JPEG': '.jpg'}[sniff_mime_type(output.read_bytes())]
+        self.assertEqual(output.suffix, expected_suffix)
+        self.assertEqual(processor.get_processing_statistics()['encoder']['images_encoded'], 1)
+        
+        print(f"✓ Merged into {output.name}")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,261 @@
+"""
+Tests for OCR job journal and crash recovery.
+Verifies journaled job states, replay of unfinished jobs and image retention until commit.
+"""
+
+import unittest
+import tempfile
+import threading
+from pathlib import Path
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.ocr_job_journal import OCRJobJournal
+from core.ocr_queue import OCRQueue, OCRJobStatus
+
+
+class RecordingOCRClient:
+    """OCR client echoing the image content and recording each request."""
+    
+    def __init__(self):
+        self.requests = []
+        self.cleanup_flags = []
+        self._lock = threading.Lock()
+    
+    def process_image_full_pipeline(self, image_path, cleanup_image=True, language_codes=None):
+        with self._lock:
+            self.requests.append(image_path)
+            self.cleanup_flags.append(cleanup_image)
+        return f"text of {image_path.read_bytes().decode()}"
+    
+    def process_image_bytes(self, image_data, language_codes=None, layout=False):
+        with self._lock:
+            self.requests.append(image_data)
+        return f"text of {image_data.decode()}"
+
+
+class OCRJobJournalTest(unittest.TestCase):
+    """Test suite for OCR job journal."""
+    
+    def setUp(self):
+        """Create temporary journal and image folder."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name)
+        self.journal_path = self.base / "ocr_journal.db"
+        self.journals = []
+        self.queues = []
+    
+    def tearDown(self):
+        """Stop queues, close journals and remove temporary files."""
+        for ocr_queue in self.queues:
+            ocr_queue.stop(timeout=2.0)
+        for journal in self.journals:
+            journal.close()
+        self.temp_dir.cleanup()
+    
+    def open_queue(self, client, num_workers=1):
+        """Start OCR queue on a new journal connection."""
+        journal = OCRJobJournal(self.journal_path)
+        ocr_queue = OCRQueue(client, num_workers=num_workers, journal=journal)
+        ocr_queue.start()
+        self.journals.append(journal)
+        self.queues.append(ocr_queue)
+        return ocr_queue, journal
+    
+    def crash(self, ocr_queue):
+        """Abandon queue without stopping it, as a killed process would."""
+        self.queues.remove(ocr_queue)
+        ocr_queue.is_running = False
+        ocr_queue.retry_scheduler.stop()
+    
+    def write_image(self, name):
+        """Create merged image file."""
+        path = self.base / name
+        path.write_bytes(name.encode())
+        return path
+    
+    def test_1_journal_records(self):
+        """Test 1: Submissions, transitions and results are journaled, unfinished rows come from an index."""
+        print("\n=== Test 1: Journal Records ===")
+        
+        ocr_queue, journal = self.open_queue(RecordingOCRClient(), num_workers=0)
+        job_id = ocr_queue.submit_job(self.write_image("F1_merged.jpg"), "F1", context={'session_id': 7})
+        
+        records = journal.load_unfinished()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].job_id, job_id)
+        self.assertEqual(records[0].status, 'pending')
+        self.assertEqual(records[0].context, {'session_id': 7})
+        
+        job = ocr_queue.get_job_status(job_id)
+        job.status = OCRJobStatus.COMPLETED
+        job.result = {'text': 'recognized', 'lines': []}
+        journal.record_result(job)
+        self.assertEqual(journal.load_unfinished()[0].result, {'text': 'recognized', 'lines': []})
+        
+        journal.mark_finished(job)
+        self.assertEqual(journal.load_unfinished(), [])
+        
+        plan = journal._connection.execute(
+            f"EXPLAIN QUERY PLAN SELECT {journal.COLUMNS} FROM ocr_jobs WHERE finished = 0 ORDER BY created_at"
+        ).fetchall()
+        self.assertIn('idx_ocr_jobs_unfinished', str(plan))
+        
+        stats = journal.get_journal_statistics()
+        self.assertEqual(stats['submissions'], 1)
+        self.assertEqual(stats['finished'], 1)
+        self.assertEqual(stats['unfinished_jobs'], 0)
+        
+        print(f"✓ Journal statistics: {stats['submissions']} submitted, {stats['finished']} finished")
+    
+    def test_2_crash_recovery(self):
+        """Test 2: Jobs queued before a crash are replayed and images kept until commit."""
+        print("\n=== Test 2: Crash Recovery ===")
+        
+        crashed_queue, _ = self.open_queue(RecordingOCRClient(), num_workers=0)
+        image_path = self.write_image("F1_merged.jpg")
+        crashed_queue.submit_job(image_path, "F1", context={'session_id': 1})
+        crashed_queue.submit_job(None, "F2", image_data=b'in-memory merge', context={'session_id': 2})
+        self.crash(crashed_queue)
+        
+        finished = []
+        done = threading.Event()
+        
+        def resolve_callback(hotkey, context):
+            def callback(job):
+                finished.append((hotkey, context['session_id'], job.result, job.image_path and job.image_path.exists()))
+                if len(finished) == 2:
+                    done.set()
+            return callback
+        
+        client = RecordingOCRClient()
+        ocr_queue, journal = self.open_queue(client)
+        recovered = ocr_queue.recover_jobs(resolve_callback)
+        self.assertEqual(recovered, 2)
+        self.assertTrue(done.wait(timeout=5))
+        
+        self.assertEqual(sorted(finished), [
+            ('F1', 1, 'text of F1_merged.jpg', True),
+            ('F2', 2, 'text of in-memory merge', None)
+        ])
+        self.assertEqual(client.cleanup_flags, [False])
+        self.assertFalse(image_path.exists())
+        self.assertEqual(journal.count_unfinished(), 0)
+        self.assertEqual(ocr_queue.get_queue_statistics()['jobs_recovered'], 2)
+        
+        print(f"✓ Recovered {recovered} jobs, merged image deleted after commit")
+    
+    def test_3_recorded_result_replays_callback(self):
+        """Test 3: A job whose result was recorded only reruns its callback."""
+        print("\n=== Test 3: Recorded Result Replays Callback ===")
+        
+        crashed_queue, crashed_journal = self.open_queue(RecordingOCRClient(), num_workers=0)
+        job_id = crashed_queue.submit_job(None, "F1", image_data=b'merge', context={'session_id': 3})
+        job = crashed_queue.get_job_status(job_id)
+        job.status = OCRJobStatus.COMPLETED
+        job.result = "text recorded before crash"
+        crashed_journal.record_result(job)
+        self.crash(crashed_queue)
+        
+        results = []
+        client = RecordingOCRClient()
+        ocr_queue, journal = self.open_queue(client)
+        ocr_queue.recover_jobs(lambda hotkey, context: lambda job: results.append(job.result))
+        
+        self.assertEqual(results, ["text recorded before crash"])
+        self.assertEqual(client.requests, [])
+        self.assertEqual(journal.count_unfinished(), 0)
+        self.assertEqual(ocr_queue.get_job_status(job_id).status, OCRJobStatus.COMPLETED)
+        
+        print("✓ Callback replayed without a new OCR request")
+    
+    def test_4_group_recovery(self):
+        """Test 4: A chunk group resumes with the chunk results recorded before the crash."""
+        print("\n=== Test 4: Group Recovery ===")
+        
+        crashed_queue, crashed_journal = self.open_queue(RecordingOCRClient(), num_workers=0)
+        chunks = [self.write_image(f"F1_chunk_{i}.jpg") for i in range(3)]
+        group_id = crashed_queue.submit_job_group(chunks, "F1", context={'session_id': 4})
+        
+        first = crashed_queue.get_job_status(crashed_journal.load_group(group_id)[0].job_id)
+        first.status = OCRJobStatus.COMPLETED
+        first.result = "text of first chunk"
+        crashed_journal.record_result(first)
+        crashed_journal.mark_finished(first)
+        self.crash(crashed_queue)
+        
+        groups = []
+        done = threading.Event()
+        
+        def resolve_callback(hotkey, context):
+            def callback(group):
+                groups.append(group)
+                done.set()
+            return callback
+        
+        client = RecordingOCRClient()
+        ocr_queue, journal = self.open_queue(client)
+        self.assertEqual(ocr_queue.recover_jobs(resolve_callback), 2)
+        self.assertTrue(done.wait(timeout=5))
+        
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(groups[0].job_id, group_id)
+        self.assertEqual(groups[0].result, "text of first chunk\ntext of F1_chunk_1.jpg\ntext of F1_chunk_2.jpg")
+        self.assertEqual(sorted(path.name for path in client.requests), ["F1_chunk_1.jpg", "F1_chunk_2.jpg"])
+        self.assertEqual(journal.count_unfinished(), 0)
+        
+        print(f"✓ Group completed with {len(client.requests)} new chunk requests")
+    
+    def test_5_lost_image(self):
+        """Test 5: A job whose image vanished is failed through its callback."""
+        print("\n=== Test 5: Lost Image ===")
+        
+        crashed_queue, _ = self.open_queue(RecordingOCRClient(), num_workers=0)
+        image_path = self.write_image("F3_merged.jpg")
+        crashed_queue.submit_job(image_path, "F3", context={'session_id': 5})
+        self.crash(crashed_queue)
+        image_path.unlink()
+        
+        failed = []
+        ocr_queue, journal = self.open_queue(RecordingOCRClient())
+        ocr_queue.recover_jobs(lambda hotkey, context: failed.append)
+        
+        self.assertEqual(len(failed), 1)
+        self.assertEqual(failed[0].status, OCRJobStatus.FAILED)
+        self.assertIn("Image lost", failed[0].error)
+        self.assertEqual(journal.count_unfinished(), 0)
+        
+        print(f"✓ {failed[0].error}")
+
+    
+    def test_6_cancelled_jobs(self):
+        """Test 6: Cancelled jobs leave the active jobs and are not recovered."""
+        print("\n=== Test 6: Cancelled Jobs ===")
+        
+        ocr_queue, journal = self.open_queue(RecordingOCRClient(), num_workers=0)
+        job_id = ocr_queue.submit_job(self.write_image("F1_merged.jpg"), "F1", context={'session_id': 1})
+        kept_id = ocr_queue.submit_job(self.write_image("F2_merged.jpg"), "F2", context={'session_id': 2})
+        
+        self.assertTrue(ocr_queue.cancel_job(job_id))
+        self.assertFalse(ocr_queue.cancel_job(job_id))
+        self.assertEqual(ocr_queue.get_job_status(job_id).status, OCRJobStatus.CANCELLED)
+        
+        stats = ocr_queue.get_queue_statistics()
+        self.assertEqual(stats['active_jobs_count'], 1)
+        self.assertEqual(stats['job_status_counts']['cancelled'], 0)
+        self.assertEqual(stats['total_jobs_cancelled'], 1)
+        self.assertEqual([record.job_id for record in journal.load_unfinished()], [kept_id])
+        self.assertEqual(journal.get_journal_statistics()['transitions'], 1)
+        self.crash(ocr_queue)
+        
+        restarted, _ = self.open_queue(RecordingOCRClient(), num_workers=0)
+        self.assertEqual(restarted.recover_jobs(), 1)
+        self.assertIsNone(restarted.get_job_status(job_id))
+        
+        print(f"✓ Cancelled job finished in journal, {stats['active_jobs_count']} job left active")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""
+Tests for OCR request rate limiting.
+Verifies token bucket pacing, circuit breaker states, the retry delay heap and OCR queue integration,
+including cache hits that bypass throttling.
+"""
+
+import unittest
+import threading
+import time
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.rate_limiter import TokenBucket, CircuitBreaker, CircuitState, RetryScheduler, RateLimiterError
+from core.ocr_queue import OCRQueue, OCRJobStatus
+from core.simple_ocr_client import OCRRateLimitError
+
+
+class ScriptedOCRClient:
+    """OCR client answering from a script of results, exceptions or None."""
+    
+    def __init__(self, script, default="recognized text"):
+        self.script = list(script)
+        self.default = default
+        self.calls = []
+        self._lock = threading.Lock()
+    
+    def process_image_bytes(self, image_data, language_codes=None, layout=False):
+        with self._lock:
+            self.calls.append(time.monotonic())
+            outcome = self.script.pop(0) if self.script else self.default
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class CachingOCRClient(ScriptedOCRClient):
+    """Scripted OCR client with a result cache keyed by image bytes."""
+    
+    def __init__(self, cached):
+        super().__init__([])
+        self.cached = cached
+    
+    def get_cached_result(self, image_path=None, image_data=None, language_codes=None, layout=False):
+        return self.cached.get(image_data)
+
+
+class OCRRateLimitingTest(unittest.TestCase):
+    """Test suite for OCR rate limiting."""
+    
+    def test_1_token_bucket(self):
+        """Test 1: Bucket allows a burst, then paces requests at its rate."""
+        print("\n=== Test 1: Token Bucket ===")
+        
+        bucket = TokenBucket(rate=20.0, capacity=3)
+        self.assertEqual([bucket.try_acquire() for _ in range(4)], [True, True, True, False])
+        
+        wait = bucket.time_until_available()
+        self.assertGreater(wait, 0.0)
+        self.assertLessEqual(wait, 0.05 + 1e-6)
+        
+        time.sleep(wait + 0.01)
+        self.assertTrue(bucket.try_acquire())
+        
+        stats = bucket.get_statistics()
+        self.assertEqual(stats['tokens_granted'], 4)
+        self.assertEqual(stats['requests_delayed'], 1)
+        
+        with self.assertRaises(RateLimiterError):
+            TokenBucket(rate=0)
+        
+        print(f"✓ Burst of 3, next token after {wait * 1000:.0f}ms")
+    
+    def test_2_circuit_breaker(self):
+        """Test 2: Breaker opens on errors or 429s and recovers through a probe."""
+        print("\n=== Test 2: Circuit Breaker ===")
+        
+        breaker = CircuitBreaker(failure_threshold=3, rate_limit_threshold=2,
+                                 reset_timeout=0.1, max_reset_timeout=0.4)
+        for _ in range(2):
+            breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertFalse(breaker.allow_request())
+        self.assertGreater(breaker.retry_after(), 0.0)
+        
+        # One probe after the timeout; a failed probe doubles the open period
+        time.sleep(0.12)
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertGreater(breaker.retry_after(), 0.15)
+        
+        time.sleep(0.22)
+        self.assertTrue(breaker.allow_request())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+        
+        # Rate limit responses trip sooner and honour Retry-After
+        breaker.record_failure(rate_limited=True)
+        breaker.record_failure(rate_limited=True, retry_after=0.3)
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertGreater(breaker.retry_after(), 0.25)
+        
+        stats = breaker.get_statistics()
+        self.assertEqual(stats['trips'], 3)
+        self.assertEqual(stats['rate_limits_recorded'], 2)
+        
+        print(f"✓ {stats['trips']} trips, {stats['rejected_requests']} requests rejected")
+    
+    def test_3_retry_scheduler(self):
+        """Test 3: Delayed items are released in due order by one thread."""
+        print("\n=== Test 3: Retry Scheduler ===")
+        
+        released = []
+        scheduler = RetryScheduler(lambda item: released.append((item, time.monotonic())))
+        scheduler.start()
+        threads_before = threading.active_count()
+        
+        start = time.monotonic()
+        for name, delay in (('c', 0.15), ('a', 0.05), ('b', 0.1), ('late', 30.0)):
+            scheduler.schedule(name, delay)
+        self.assertEqual(threading.active_count(), threads_before)
+        
+        time.sleep(0.3)
+        pending = scheduler.stop()
+        
+        self.assertEqual([item for item, _ in released], ['a', 'b', 'c'])
+        self.assertGreaterEqual(released[0][1] - start, 0.05)
+        self.assertEqual(pending, ['late'])
+        
+        print(f"✓ Released {len(released)} items in order, {len(pending)} pending at stop")
+    
+    def test_4_queue_rate_limited_retries(self):
+        """Test 4: HTTP 429 jobs retry without using attempts and trip the breaker."""
+        print("\n=== Test 4: Queue Rate Limited Retries ===")
+        
+        rate_limit = OCRRateLimitError("HTTP 429", retry_after=0.05)
+        client = ScriptedOCRClient([rate_limit, rate_limit])
+        breaker = CircuitBreaker(rate_limit_threshold=2, reset_timeout=0.2)
+        
+        ocr_queue = OCRQueue(client, num_workers=2, circuit_breaker=breaker,
+                             rate_limiter=TokenBucket(rate=50.0, capacity=1))
+        ocr_queue.max_retry_delay = 0.05
+        
+        done = threading.Event()
+        ocr_queue.start()
+        try:
+            threads_before = threading.active_count()
+            job_id = ocr_queue.submit_job(None, "F1", image_data=b'\xff\xd8data', callback=lambda job: done.set())
+            self.assertTrue(done.wait(timeout=5))
+            threads_during = threading.active_count()
+            stats = ocr_queue.get_queue_statistics()
+        finally:
+            ocr_queue.stop()
+        
+        job = ocr_queue.get_job_status(job_id)
+        self.assertEqual(job.status, OCRJobStatus.COMPLETED)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.rate_limit_hits, 2)
+        self.assertEqual(threads_during, threads_before)
+        
+        # The open circuit held the third call back for its reset timeout
+        self.assertEqual(len(client.calls), 3)
+        self.assertGreaterEqual(client.calls[2] - client.calls[1], 0.15)
+        self.assertEqual(stats['rate_limited_attempts'], 2)
+        self.assertEqual(stats['circuit_breaker']['state'], 'closed')
+        self.assertEqual(stats['circuit_breaker']['trips'], 1)
+        
+        print(f"✓ Completed after {job.rate_limit_hits} rate limit rejections")
+    
+    def test_5_degraded_api(self):
+        """Test 5: While the API keeps failing, requests are held back instead of hammering it."""
+        print("\n=== Test 5: Degraded API ===")
+        
+        client = ScriptedOCRClient([], default=None)
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=5.0)
+        ocr_queue = OCRQueue(client, num_workers=1, circuit_breaker=breaker)
+        
+        ocr_queue.start()
+        try:
+            for i in range(10):
+                ocr_queue.submit_job(None, f"F{i}", image_data=b'\xff\xd8data')
+            time.sleep(0.5)
+            stats = ocr_queue.get_queue_statistics()
+        finally:
+            ocr_queue.stop()
+        
+        self.assertEqual(len(client.calls), 3)
+        self.assertEqual(stats['circuit_breaker']['state'], 'open')
+        self.assertEqual(stats['total_jobs_failed'], 0)
+        self.assertEqual(stats['retries_pending'], 3)
+        
+        print(f"✓ {len(client.calls)} requests sent, {stats['retries_pending']} retries waiting")
+    
+    def test_6_cache_hits_bypass_throttle(self):
+        """Test 6: Cached jobs complete without a token and leave the breaker untouched."""
+        print("\n=== Test 6: Cache Hits Bypass Throttle ===")
+        
+        client = CachingOCRClient({b'\xff\xd8cached': "cached text"})
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.1)
+        breaker.record_failure()
+        limiter = TokenBucket(rate=0.01, capacity=1)
+        limiter.try_acquire()
+        ocr_queue = OCRQueue(client, num_workers=1, circuit_breaker=breaker, rate_limiter=limiter)
+        
+        done = threading.Event()
+        ocr_queue.start()
+        try:
+            job_id = ocr_queue.submit_job(None, "F1", image_data=b'\xff\xd8cached', callback=lambda job: done.set())
+            self.assertTrue(done.wait(timeout=0.5))
+            time.sleep(0.15)
+            stats = ocr_queue.get_queue_statistics()
+        finally:
+            ocr_queue.stop()
+        
+        self.assertEqual(ocr_queue.get_job_status(job_id).result, "cached text")
+        self.assertEqual(client.calls, [])
+        self.assertEqual(stats['cache_hits'], 1)
+        self.assertEqual(stats['total_throttle_wait'], 0.0)
+        # The probe is still free, a cache hit did not close the circuit
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+        self.assertTrue(breaker.allow_request())
+        
+        print("✓ Cache hit served while the circuit was open and no token was left")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
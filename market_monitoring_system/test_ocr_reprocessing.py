@@ -0,0 +1,176 @@
+"""
+Tests for the raw OCR text archive and offline reprocessing.
+Verifies compressed archiving, schema migration, bulk item replacement, change rebuilding and pooled parsing.
+"""
+
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.database_manager import DatabaseManager, ItemData
+from core.ocr_reprocessor import OCRReprocessor, OCRReprocessorError
+
+
+def trade_layout(seller, item, price, quantity):
+    """Build OCR layout of one trade window."""
+    texts = ["Trade", f"Items to Sell {seller}", f"{item} (10)", f"Unit Price : {price} Adena", f"Quantity : {quantity}"]
+    lines = [{'text': text, 'left': 10, 'top': 10 + row * 30, 'right': 300, 'bottom': 30 + row * 30}
+             for row, text in enumerate(texts)]
+    return '\n'.join(texts), lines
+
+
+class OCRReprocessingTest(unittest.TestCase):
+    """Test suite for OCR text archive and reprocessing."""
+    
+    def setUp(self):
+        """Create database in a temporary folder."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.temp_dir.name) / "market.db"
+        self.db = DatabaseManager(str(self.db_path))
+    
+    def tearDown(self):
+        """Close database and remove temporary files."""
+        self.db.close_connection()
+        self.temp_dir.cleanup()
+    
+    def archive_session(self, created_at, seller, item, price, quantity, parsed_items=None):
+        """Create a session with archived text and the items parsed at capture time."""
+        session_id = self.db.create_ocr_session("F1")
+        text, lines = trade_layout(seller, item, price, quantity)
+        self.db.save_ocr_text(session_id, "F1", text, lines, 'full', 'individual_seller_items')
+        self.db.save_items_data(parsed_items or [], session_id)
+        
+        conn = self.db._get_connection()
+        conn.execute("UPDATE ocr_texts SET created_at = ? WHERE session_id = ?", (created_at, session_id))
+        conn.execute("UPDATE items SET created_at = ? WHERE session_id = ?", (created_at, session_id))
+        return session_id
+    
+    def test_1_archive_and_migration(self):
+        """Test 1: Text is archived compressed and old databases gain items.session_id."""
+        print("\n=== Test 1: Archive And Migration ===")
+        
+        text, lines = trade_layout("Alice", "Soulshot", "1,000", 5)
+        session_id = self.db.create_ocr_session("F1")
+        self.db.save_ocr_text(session_id, "F1", text * 20, lines, 'full', 'individual_seller_items')
+        
+        archived = self.db.get_ocr_text(session_id)
+        self.assertEqual(archived['text'], text * 20)
+        self.assertEqual(archived['lines'], lines)
+        stored = self.db._get_connection().execute(
+            "SELECT length(text), text_length FROM ocr_texts WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        self.assertLess(stored[0], stored[1] / 5)
+        
+        # Database created before the archive
+        old_path = Path(self.temp_dir.name) / "old.db"
+        with sqlite3.connect(old_path) as conn:
+            conn.execute(DatabaseManager.SCHEMA_SQL['items'])
+            conn.execute("INSERT INTO items (seller_name, item_name, hotkey) VALUES ('Bob', 'Arrow', 'F1')")
+        old_db = DatabaseManager(str(old_path))
+        columns = {row[1] for row in old_db._get_connection().execute("PRAGMA table_info(items)")}
+        old_db.close_connection()
+        self.assertIn('session_id', columns)
+        
+        print(f"✓ {stored[1]} characters archived in {stored[0]} bytes, items.session_id migrated")
+    
+    def test_2_reprocess_range(self):
+        """Test 2: Sessions in range get reparsed items and rebuilt changes, others stay untouched."""
+        print("\n=== Test 2: Reprocess Range ===")
+        
+        wrong = ItemData("Alice", "Soulshot (10)", None, None, None, "F1")
+        before = self.archive_session("2026-01-01 09:00:00", "Alice", "Soulshot", "900", 5, [wrong])
+        first = self.archive_session("2026-01-02 10:00:00", "Alice", "Soulshot", "1,000", 5, [wrong])
+        second = self.archive_session("2026-01-02 11:00:00", "Alice", "Soulshot", "800", 7)
+        
+        reprocessor = OCRReprocessor(self.db, num_workers=1, batch_size=1)
+        stats = reprocessor.reprocess(datetime(2026, 1, 2), datetime(2026, 1, 3))
+        
+        conn = self.db._get_connection()
+        items = conn.execute(
+            "SELECT session_id, item_name, price, quantity, created_at FROM items ORDER BY session_id"
+        ).fetchall()
+        self.assertEqual(items, [
+            (before, "Soulshot (10)", None, None, "2026-01-01 09:00:00"),
+            (first, "Soulshot", 1000.0, 5, "2026-01-02 10:00:00"),
+            (second, "Soulshot", 800.0, 7, "2026-01-02 11:00:00"),
+        ])
+        
+        changes = conn.execute(
+            "SELECT change_type, old_value, new_value, detected_at FROM changes_log ORDER BY id"
+        ).fetchall()
+        self.assertEqual(changes, [
+            ('NEW_ITEM', None, 'Price: 1000.0, Quantity: 5', "2026-01-02 10:00:00"),
+            ('PRICE_DECREASE', '1000.0', '800.0', "2026-01-02 11:00:00"),
+            ('QUANTITY_INCREASE', '5', '7', "2026-01-02 11:00:00"),
+        ])
+        
+        self.assertEqual(stats['sessions'], 2)
+        self.assertEqual(stats['batches'], 2)
+        self.assertEqual(stats['items_written'], 2)
+        self.assertEqual(stats['changes_written'], 3)
+        self.assertEqual(conn.execute("SELECT processed_items FROM ocr_sessions WHERE id = ?", (second,)).fetchone()[0], 1)
+        
+        # Running again gives the same history
+        reprocessor.reprocess(datetime(2026, 1, 2), datetime(2026, 1, 3))
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM items").fetchone()[0], 3)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM changes_log").fetchone()[0], 3)
+        
+        with self.assertRaises(OCRReprocessorError):
+            reprocessor.reprocess(datetime(2026, 1, 3), datetime(2026, 1, 2))
+        
+        print(f"✓ {stats['sessions']} sessions reparsed, {stats['changes_written']} changes rebuilt")
+    
+    def test_3_pooled_reprocessing(self):
+        """Test 3: Worker processes produce the same items as in-process parsing."""
+        print("\n=== Test 3: Pooled Reprocessing ===")
+        
+        for hour, (seller, price) in enumerate([("Alice", "100"), ("Bob", "200"), ("Carol", "300"), ("Dave", "400")]):
+            self.archive_session(f"2026-02-01 {hour + 10:02d}:00:00", seller, "Arrow", price, 1)
+        
+        stats = OCRReprocessor(self.db, num_workers=2, batch_size=1).reprocess(datetime(2026, 2, 1), datetime(2026, 2, 2))
+        
+        rows = self.db._get_connection().execute("SELECT seller_name, price FROM items ORDER BY seller_name").fetchall()
+        self.assertEqual(rows, [("Alice", 100.0), ("Bob", 200.0), ("Carol", 300.0), ("Dave", 400.0)])
+        self.assertEqual(stats['sessions'], 4)
+        self.assertEqual(stats['changes_written'], 4)
+        
+        print(f"✓ {stats['sessions']} sessions reparsed on 2 processes in {stats['total_time']:.2f}s")
+    
+    def test_4_combination_changes_kept(self):
+        """Test 4: Combination changes logged by the monitoring engine survive a reparse."""
+        print("\n=== Test 4: Combination Changes Kept ===")
+        
+        self.archive_session("2026-03-01 10:00:00", "Alice", "Arrow", "100", 1)
+        conn = self.db._get_connection()
+        conn.executemany('''
+            INSERT INTO changes_log (seller_name, item_name, change_type, old_value, new_value, detected_at)
+            VALUES (?, ?, ?, NULL, ?, ?)
+        ''', [
+            ("Alice", "Arrow", 'NEW_ITEM', "Alice/Arrow", "2026-03-01 10:00:01"),
+            ("Bob", "Arrow", 'SELLER_NEW', "Bob/Arrow", "2026-03-01 10:00:01"),
+            ("Alice", "Arrow", 'NEW_ITEM', "Price: 90.0, Quantity: 1", "2026-03-01 10:00:00"),
+        ])
+        
+        for _ in range(2):
+            OCRReprocessor(self.db, num_workers=1).reprocess(datetime(2026, 3, 1), datetime(2026, 3, 2))
+        
+        changes = conn.execute(
+            "SELECT change_type, new_value FROM changes_log ORDER BY detected_at, change_type, new_value"
+        ).fetchall()
+        self.assertEqual(changes, [
+            ('NEW_ITEM', 'Price: 100.0, Quantity: 1'),
+            ('NEW_ITEM', 'Alice/Arrow'),
+            ('SELLER_NEW', 'Bob/Arrow'),
+        ])
+        
+        print(f"✓ {len(changes) - 1} combination changes kept, item change rebuilt")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
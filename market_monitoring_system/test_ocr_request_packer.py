@@ -0,0 +1,229 @@
+"""
+Tests for OCR request packing.
+Verifies composite layout, per-image line split, packing under backlog, solo retry after a failed packed request
+and that an unpackable batch does not use up the circuit breaker probe.
+"""
+
+import io
+import unittest
+import threading
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from PIL import Image
+
+from core.ocr_request_packer import OCRRequestPacker
+from core.ocr_queue import OCRQueue, OCRJob, OCRJobStatus
+from core.rate_limiter import CircuitBreaker, CircuitState
+
+
+def make_image(shade, width=200, height=40):
+    """Create a PNG with one dark band of the given shade."""
+    image = Image.new('L', (width, height), 255)
+    image.paste(shade, (10, height // 4, width - 10, height * 3 // 4))
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def read_bands(image_data):
+    """Recognize each dark band as a line named after its shade."""
+    with Image.open(io.BytesIO(image_data)) as image:
+        gray = image.convert('L')
+    width, height = gray.size
+    pixels = gray.load()
+    lines = []
+    top = None
+    for y in range(height + 1):
+        shade = min(pixels[x, y] for x in range(width)) if y < height else 255
+        if shade < 255 and top is None:
+            top, band_shade = y, shade
+        elif shade == 255 and top is not None:
+            lines.append({'text': f"shade {band_shade}", 'left': 10, 'top': top, 'bottom': y})
+            top = None
+    return lines
+
+
+class BandOCRClient:
+    """OCR client reading dark bands, optionally failing layout requests."""
+    
+    def __init__(self, fail_layout=False):
+        self.fail_layout = fail_layout
+        self.requests = []
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+        self.gate.set()
+        self._lock = threading.Lock()
+    
+    def process_image_bytes(self, image_data, language_codes=None, layout=False):
+        self.entered.set()
+        self.gate.wait(timeout=5)
+        with self._lock:
+            self.requests.append(layout)
+        if layout and self.fail_layout:
+            raise RuntimeError("Composite rejected")
+        lines = read_bands(image_data)
+        text = '\n'.join(line['text'] for line in lines)
+        return {'text': text, 'lines': lines} if layout else text
+
+
+class OCRRequestPackerTest(unittest.TestCase):
+    """Test suite for OCR request packer."""
+    
+    def test_1_pack_and_split(self):
+        """Test 1: Images are stacked with gaps and lines come back relative to their image."""
+        print("\n=== Test 1: Pack And Split ===")
+        
+        packer = OCRRequestPacker(gap=20)
+        jobs = [
+            OCRJob(job_id=f"job_{shade}", image_path=None, hotkey="F1", image_data=make_image(shade, height=height))
+            for shade, height in [(10, 40), (60, 80), (120, 40)]
+        ]
+        jobs[1].layout = True
+        
+        packed, leftover = packer.pack(jobs)
+        self.assertEqual(leftover, [])
+        self.assertEqual(packed.job_ids, ['job_10', 'job_60', 'job_120'])
+        self.assertEqual([region.top for region in packed.regions], [0, 60, 160])
+        self.assertEqual(packed.size, (200, 200))
+        
+        results = packer.split(packed, {'lines': read_bands(packed.data)}, ['job_60'])
+        self.assertEqual(results['job_10'], "shade 10")
+        self.assertEqual(results['job_120'], "shade 120")
+        self.assertEqual(results['job_60'], {
+            'text': "shade 60",
+            'lines': [{'text': "shade 60", 'left': 10, 'top': 20, 'bottom': 60}]
+        })
+        
+        # Large images and single leftovers are not packed
+        big = OCRJob(job_id="big", image_path=None, hotkey="F1", image_data=b'\x00' * (packer.max_image_bytes + 1))
+        self.assertFalse(packer.can_pack(big))
+        packed, leftover = packer.pack(jobs[:1])
+        self.assertIsNone(packed)
+        self.assertEqual(leftover, jobs[:1])
+        
+        print(f"✓ 3 images split back: {sorted(results)}")
+    
+    def test_2_queue_packs_under_backlog(self):
+        """Test 2: Jobs waiting behind a busy worker share one OCR request."""
+        print("\n=== Test 2: Queue Packs Under Backlog ===")
+        
+        client = BandOCRClient()
+        client.gate.clear()
+        finished = []
+        done = threading.Event()
+        
+        def callback(job):
+            finished.append(job)
+            if len(finished) == 6:
+                done.set()
+        
+        ocr_queue = OCRQueue(client, num_workers=1, packer=OCRRequestPacker(min_backlog=3))
+        ocr_queue.start()
+        try:
+            # First job occupies the worker while the others queue up
+            for shade in range(10, 70, 10):
+                ocr_queue.submit_job(None, "F1", callback=callback, image_data=make_image(shade))
+                self.assertTrue(client.entered.wait(timeout=5))
+            client.gate.set()
+            self.assertTrue(done.wait(timeout=5))
+            stats = ocr_queue.get_queue_statistics()
+        finally:
+            ocr_queue.stop()
+        
+        self.assertTrue(all(job.status == OCRJobStatus.COMPLETED for job in finished))
+        self.assertEqual(sorted(job.result for job in finished), [f"shade {shade}" for shade in range(10, 70, 10)])
+        self.assertEqual(client.requests, [False, True])
+        self.assertEqual(stats['packed_requests'], 1)
+        self.assertEqual(stats['packed_jobs'], 5)
+        self.assertEqual(stats['packer']['images_packed'], 5)
+        
+        print(f"✓ 6 jobs recognized with {len(client.requests)} OCR requests")
+    
+    def test_3_failed_composite_retries_alone(self):
+        """Test 3: Jobs of a failed packed request are retried with requests of their own."""
+        print("\n=== Test 3: Failed Composite Retries Alone ===")
+        
+        client = BandOCRClient(fail_layout=True)
+        client.gate.clear()
+        finished = []
+        done = threading.Event()
+        
+        def callback(job):
+            finished.append(job)
+            if len(finished) == 4:
+                done.set()
+        
+        ocr_queue = OCRQueue(client, num_workers=1, packer=OCRRequestPacker(min_backlog=2))
+        ocr_queue.max_retry_delay = 0.05
+        ocr_queue.start()
+        try:
+            for shade in range(10, 50, 10):
+                ocr_queue.submit_job(None, "F1", callback=callback, image_data=make_image(shade))
+                self.assertTrue(client.entered.wait(timeout=5))
+            client.gate.set()
+            self.assertTrue(done.wait(timeout=5))
+            stats = ocr_queue.get_queue_statistics()
+        finally:
+            ocr_queue.stop()
+        
+        self.assertTrue(all(job.status == OCRJobStatus.COMPLETED for job in finished))
+        self.assertEqual(client.requests, [False, True, False, False, False])
+        self.assertTrue(all(job.attempts == 2 for job in finished if not job.allow_packing))
+        self.assertEqual(stats['packed_requests'], 0)
+        self.assertEqual(stats['retries_scheduled'], 3)
+        
+        print(f"✓ {stats['retries_scheduled']} jobs retried alone after the composite failed")
+    
+    def test_4_unpackable_batch_keeps_probe(self):
+        """Test 4: A batch that cannot be packed leaves the half-open probe for a real request."""
+        print("\n=== Test 4: Unpackable Batch Keeps Probe ===")
+        
+        client = BandOCRClient()
+        client.gate.clear()
+        original = client.process_image_bytes
+        calls = []
+        
+        def fail_first(image_data, language_codes=None, layout=False):
+            calls.append(layout)
+            if len(calls) == 1:
+                original(image_data, language_codes, layout)
+                raise RuntimeError("API unavailable")
+            return original(image_data, language_codes, layout)
+        client.process_image_bytes = fail_first
+        
+        finished = []
+        done = threading.Event()
+        
+        def callback(job):
+            finished.append(job)
+            if len(finished) == 3:
+                done.set()
+        
+        # Two 40 px images do not fit a 60 px composite
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        ocr_queue = OCRQueue(client, num_workers=1, circuit_breaker=breaker,
+                             packer=OCRRequestPacker(min_backlog=2, max_height=60))
+        ocr_queue.max_retry_delay = 0.05
+        ocr_queue.start()
+        try:
+            # The failing first request opens the circuit while the others queue up
+            for shade in range(10, 40, 10):
+                ocr_queue.submit_job(None, "F1", callback=callback, image_data=make_image(shade))
+                self.assertTrue(client.entered.wait(timeout=5))
+            client.gate.set()
+            self.assertTrue(done.wait(timeout=5))
+        finally:
+            ocr_queue.stop()
+        
+        self.assertTrue(all(job.status == OCRJobStatus.COMPLETED for job in finished))
+        self.assertNotIn(True, calls)
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+        
+        print(f"✓ Circuit closed again after {len(calls)} single requests")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
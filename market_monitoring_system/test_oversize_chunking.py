@@ -0,0 +1,154 @@
+"""
+Tests for chunked OCR of oversize merges.
+Verifies columns are split at screenshot boundaries and chunk texts are joined in order.
+"""
+
+import threading
+import time
+import unittest
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from PIL import Image, ImageDraw
+
+from config.settings import ImageProcessingConfig
+from core.frame_buffer import FrameBuffer, CapturedFrame
+from core.image_processor import ImageProcessor
+from core.ocr_queue import OCRQueue, OCRJobStatus
+
+
+class SlowBytesOCRClient:
+    """OCR client answering later chunks faster than earlier ones."""
+    
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.calls = 0
+        self._lock = threading.Lock()
+    
+    def process_image_bytes(self, image_data, language_codes=None, layout=False):
+        with self._lock:
+            self.calls += 1
+        index = int(image_data.decode())
+        if index == self.fail_on:
+            return None
+        time.sleep(0.05 * (3 - index))
+        return f"chunk {index}"
+
+
+class OversizeChunkingTest(unittest.TestCase):
+    """Test suite for oversize chunking."""
+    
+    def setUp(self):
+        """Create processor with a small height limit."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name)
+        self.screenshots = self.base / "F1"
+        self.screenshots.mkdir()
+        settings = SimpleNamespace(
+            image_processing=ImageProcessingConfig(max_image_height=250, oversize_mode="chunk",
+                                                   optimize_for_ocr=False),
+            paths=SimpleNamespace(temp_merged=self.base / "merged"),
+            get_screenshot_path=lambda hotkey: self.screenshots
+        )
+        self.processor = ImageProcessor(settings)
+    
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+    
+    def test_1_plan_chunks(self):
+        """Test 1: Chunks end on screenshot boundaries within the height limit."""
+        print("\n=== Test 1: Chunk Planning ===")
+        
+        self.assertEqual(self.processor.plan_chunks([100, 100, 100, 400, 50]), [[0, 1], [2], [3], [4]])
+        self.assertEqual(self.processor.plan_chunks([100, 100]), [[0, 1]])
+        print("✓ Oversize screenshot isolated, others grouped")
+    
+    def test_2_folder_chunks_keep_resolution(self):
+        """Test 2: Oversize folder is merged into full resolution chunks."""
+        print("\n=== Test 2: Folder Chunks ===")
+        
+        for index in range(5):
+            image = Image.new('RGB', (300, 100), 'white')
+            ImageDraw.Draw(image).text((10, 40), f"Seller {index}", fill='black')
+            image.save(self.screenshots / f"F1_{index:03d}.png")
+        
+        chunk_paths = self.processor.process_hotkey_folder_chunks("F1")
+        
+        self.assertEqual(len(chunk_paths), 3)
+        sizes = []
+        for path in chunk_paths:
+            with Image.open(path) as chunk:
+                sizes.append(chunk.size)
+        self.assertEqual(sizes, [(300, 200), (300, 200), (300, 100)])
+        self.assertEqual(list(self.screenshots.glob("F1_???.png")), [])
+        self.assertEqual(self.processor.get_processing_statistics()['chunks_created'], 3)
+        print("✓ No downscaling, sources cleaned up")
+    
+    def test_3_frame_chunks(self):
+        """Test 3: In-memory frames are chunked the same way."""
+        print("\n=== Test 3: Frame Chunks ===")
+        
+        buffer = FrameBuffer()
+        for _ in range(3):
+            image = Image.new('RGB', (300, 120), 'white')
+            buffer.add(CapturedFrame(hotkey="F1", rgb=image.tobytes(), size=image.size))
+        
+        chunks = self.processor.process_hotkey_frame_chunks("F1", buffer)
+        
+        self.assertEqual(len(chunks), 2)
+        self.assertTrue(all(data.startswith(b"\xff\xd8") for data in chunks))
+        print("✓ Two JPEG chunks produced")
+    
+    def test_4_group_joins_in_order(self):
+        """Test 4: Chunk texts are joined in column order regardless of finish order."""
+        print("\n=== Test 4: Ordered Reassembly ===")
+        
+        done = threading.Event()
+        groups = []
+        
+        with OCRQueue(SlowBytesOCRClient(), num_workers=3) as ocr_queue:
+            ocr_queue.submit_job_group(
+                [b"0", b"1", b"2"], hotkey="F1",
+                callback=lambda group: (groups.append(group), done.set())
+            )
+            self.assertTrue(done.wait(5))
+            stats = ocr_queue.get_queue_statistics()
+        
+        self.assertEqual(groups[0].status, OCRJobStatus.COMPLETED)
+        self.assertEqual(groups[0].result, "chunk 0\nchunk 1\nchunk 2")
+        self.assertEqual(stats['total_groups_completed'], 1)
+        self.assertEqual(stats['active_groups_count'], 0)
+        print("✓ Texts reassembled in order")
+    
+    def test_5_group_fails_once(self):
+        """Test 5: A failed chunk fails the group and its callback runs once."""
+        print("\n=== Test 5: Group Failure ===")
+        
+        done = threading.Event()
+        groups = []
+        
+        with OCRQueue(SlowBytesOCRClient(fail_on=1), num_workers=2) as ocr_queue:
+            ocr_queue.submit_job_group(
+                [b"0", b"1", b"2"], hotkey="F1",
+                callback=lambda group: (groups.append(group), done.set())
+            )
+            # Failing chunk is retried with backoff; shorten it for the test
+            for job in list(ocr_queue.active_jobs.values()):
+                job.max_attempts = 1
+            self.assertTrue(done.wait(5))
+            time.sleep(0.3)
+        
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(groups[0].status, OCRJobStatus.FAILED)
+        self.assertIn("Chunk 2/3", groups[0].error)
+        print("✓ Group failed with chunk error")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Tests for the parser corpus and benchmark.
+Verifies golden corpus loading, accuracy floors on stored OCR outputs and regression detection.
+"""
+
+import copy
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'benchmarks'))
+
+from core.database_manager import ItemData
+from parser_benchmark import DEFAULT_CORPUS, load_corpus, run_benchmark, score, find_regressions
+
+
+class ParserBenchmarkTest(unittest.TestCase):
+    """Test suite for parser benchmark."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Run benchmark once over the stored corpus."""
+        cls.cases = load_corpus(DEFAULT_CORPUS)
+        cls.report = run_benchmark(cls.cases, repeat=2)
+    
+    def test_1_corpus_and_scoring(self):
+        """Test 1: Corpus covers trade, broker and fallback formats and scoring counts multisets."""
+        print("\n=== Test 1: Corpus And Scoring ===")
+        
+        self.assertEqual({case.format for case in self.cases}, {'trade', 'broker', 'fallback'})
+        self.assertEqual({case.processing_type for case in self.cases}, {'full', 'minimal'})
+        self.assertTrue(all(case.golden for case in self.cases))
+        
+        scaled = load_corpus(DEFAULT_CORPUS, scale=3)
+        self.assertEqual(len(scaled[0].golden), len(self.cases[0].golden) * 3)
+        
+        items = [ItemData("Bob", "Arrow", 10.0, 2, None, "F1"), ItemData("Bob", "Arrow", 10.0, 2, None, "F1"),
+                 ItemData("Ann", "Bow", 5.0, 1, None, "F1")]
+        golden = [("Bob", "Arrow", 10.0, 2), ("Ann", "Bow", 5.0, 3)]
+        self.assertEqual(score(items, golden), {'true_positives': 1, 'false_positives': 2, 'false_negatives': 1})
+        
+        print(f"✓ {len(self.cases)} cases with {sum(len(case.golden) for case in self.cases)} golden items")
+    
+    def test_2_accuracy_floors(self):
+        """Test 2: Clean trade and broker outputs parse exactly, noisy ones stay at their recorded level."""
+        print("\n=== Test 2: Accuracy Floors ===")
+        
+        cases = self.report['cases']
+        for name in ('trade_sell_list', 'broker_materials', 'broker_noisy'):
+            self.assertEqual((cases[name]['precision'], cases[name]['recall']), (1.0, 1.0), name)
+        self.assertGreaterEqual(cases['trade_noisy']['recall'], 0.57)
+        self.assertGreaterEqual(cases['fallback_listing']['recall'], 0.33)
+        self.assertGreaterEqual(self.report['overall']['precision'], 0.98)
+        self.assertGreaterEqual(self.report['overall']['recall'], 0.94)
+        
+        for row in cases.values():
+            self.assertGreater(row['mb_per_s'], 0)
+            self.assertGreater(row['lines_per_s'], 0)
+            self.assertGreater(row['alloc_blocks'], 0)
+        
+        print(f"✓ Overall precision {self.report['overall']['precision']}, recall {self.report['overall']['recall']}")
+    
+    def test_3_regression_detection(self):
+        """Test 3: Throughput and accuracy drops beyond tolerance are reported."""
+        print("\n=== Test 3: Regression Detection ===")
+        
+        self.assertEqual(find_regressions(self.report, self.report, 0.2, 0.0), [])
+        
+        baseline = copy.deepcopy(self.report)
+        baseline['formats']['trade']['mb_per_s'] = self.report['formats']['trade']['mb_per_s'] * 2
+        baseline['overall']['recall'] = 1.0
+        regressions = find_regressions(self.report, baseline, 0.2, 0.01)
+        
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("trade throughput"))
+        self.assertTrue(regressions[1].startswith("overall recall"))
+        
+        print(f"✓ {len(regressions)} regressions found")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
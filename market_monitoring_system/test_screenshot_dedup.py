@@ -0,0 +1,136 @@
+"""
+Tests for capture-time screenshot deduplication.
+Verifies that identical frames are suppressed before they are written to disk.
+"""
+
+import unittest
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from PIL import Image, ImageDraw
+
+from config.settings import HotkeyConfig, ScreenshotDedupConfig
+from core.screenshot_capture import ScreenshotCapture
+
+
+def make_frame(label, size=(200, 80)):
+    """Create grabbed frame with a single text label."""
+    image = Image.new('RGB', size, 'white')
+    ImageDraw.Draw(image).text((5, 30), label, fill='black')
+    return SimpleNamespace(rgb=image.tobytes(), size=image.size)
+
+
+class FakeGrabber:
+    """Stand-in for mss instance returning prepared frames."""
+    
+    def __init__(self):
+        self.frames = []
+    
+    def grab(self, monitor):
+        return self.frames.pop(0)
+    
+    def close(self):
+        pass
+
+
+class ScreenshotDedupTest(unittest.TestCase):
+    """Test suite for duplicate frame suppression."""
+    
+    def setUp(self):
+        """Create capture system writing to a temporary folder."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.screenshots = Path(self.temp_dir.name)
+        self.capture = self._make_capture(ScreenshotDedupConfig())
+    
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+    
+    def _make_capture(self, dedup_config):
+        """Build capture system with fake screen grabber."""
+        hotkey = HotkeyConfig(area=(0, 0, 200, 80), folder="F1", merge_interval=60, enabled=True)
+        settings = SimpleNamespace(
+            screenshot_dedup=dedup_config,
+            get_enabled_hotkeys=lambda: {"F1": hotkey},
+            get_hotkey_config=lambda key: hotkey,
+            get_screenshot_path=lambda key: self.screenshots
+        )
+        capture = ScreenshotCapture(settings)
+        capture._mss_instance = FakeGrabber()
+        return capture
+    
+    def _grab(self, capture, labels):
+        """Capture one frame per label."""
+        capture._mss_instance.frames.extend(make_frame(label) for label in labels)
+        return [capture.capture_area((0, 0, 200, 80), "F1") for _ in labels]
+    
+    def test_1_duplicates_not_written(self):
+        """Test 1: Repeated unchanged frames are dropped before disk."""
+        print("\n=== Test 1: Drop Duplicates ===")
+        
+        results = self._grab(self.capture, ["Seller A 100", "Seller A 100", "Seller B 200", "Seller A 100"])
+        
+        self.assertTrue(all(results))
+        self.assertEqual(len(list(self.screenshots.glob("*.png"))), 2)
+        
+        stats = self.capture.get_capture_statistics()["F1"]
+        self.assertEqual(stats['duplicates_detected'], 2)
+        self.assertEqual(stats['duplicates_suppressed'], 2)
+        print("✓ Only unique frames written")
+    
+    def test_2_count_mode_keeps_files(self):
+        """Test 2: Count mode records duplicates but still writes them."""
+        print("\n=== Test 2: Count Only ===")
+        
+        capture = self._make_capture(ScreenshotDedupConfig(action='count'))
+        self._grab(capture, ["Seller A 100", "Seller A 100"])
+        
+        self.assertEqual(len(list(self.screenshots.glob("*.png"))), 2)
+        stats = capture.get_capture_statistics()["F1"]
+        self.assertEqual(stats['duplicates_detected'], 1)
+        self.assertEqual(stats['duplicates_suppressed'], 0)
+        print("✓ Duplicates counted without suppression")
+    
+    def test_3_changed_frames_kept(self):
+        """Test 3: Frames matching only by dHash are counted but still written."""
+        print("\n=== Test 3: Keep Changed Frames ===")
+        
+        base = make_frame("Seller A 100")
+        image = Image.frombytes('RGB', base.size, base.rgb)
+        image.putpixel((150, 40), (0, 0, 0))
+        self.capture._mss_instance.frames.extend([base, SimpleNamespace(rgb=image.tobytes(), size=image.size)])
+        self.capture.capture_area((0, 0, 200, 80), "F1")
+        self.capture.capture_area((0, 0, 200, 80), "F1")
+        self._grab(self.capture, ["Seller A 101"])
+        
+        self.assertEqual(len(list(self.screenshots.glob("*.png"))), 3)
+        stats = self.capture.get_capture_statistics()["F1"]
+        self.assertGreaterEqual(stats['duplicates_detected'], 1)
+        self.assertEqual(stats.get('duplicates_suppressed', 0), 0)
+        print("✓ Only byte-identical frames are dropped")
+    
+    def test_4_history_expires(self):
+        """Test 4: Frames older than the merge window are not compared."""
+        capture = self._make_capture(ScreenshotDedupConfig(max_age_seconds=0.01))
+        self._grab(capture, ["Seller A 100"])
+        frame_hash, digest, _ = capture._recent_frames["F1"][0]
+        capture._recent_frames["F1"][0] = (frame_hash, digest, 0.0)
+        self._grab(capture, ["Seller A 100"])
+        
+        self.assertEqual(len(list(self.screenshots.glob("*.png"))), 2)
+    
+    def test_5_disabled(self):
+        """Test 5: Disabled dedup writes every frame."""
+        capture = self._make_capture(ScreenshotDedupConfig(enabled=False))
+        self._grab(capture, ["Seller A 100", "Seller A 100"])
+        
+        self.assertEqual(len(list(self.screenshots.glob("*.png"))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
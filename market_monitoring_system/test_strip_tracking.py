@@ -0,0 +1,138 @@
+"""
+Tests for strip-level change detection.
+Verifies that only changed screenshot strips are merged and text is stitched from cache.
+"""
+
+import unittest
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from PIL import Image, ImageDraw
+
+from config.settings import ImageProcessingConfig
+from core.image_processor import ImageProcessor
+from core.strip_tracker import StripTracker
+
+
+def make_screenshot(path, label, size=(200, 60)):
+    """Create screenshot image with a single text label."""
+    image = Image.new('RGB', size, 'white')
+    ImageDraw.Draw(image).text((5, 20), label, fill='black')
+    image.save(path, 'PNG')
+    return path
+
+
+class StripTrackingTest(unittest.TestCase):
+    """Test suite for strip mode image processing."""
+    
+    def setUp(self):
+        """Create image processor with temporary folders."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        base = Path(self.temp_dir.name)
+        self.screenshots = base / "F1"
+        self.screenshots.mkdir()
+        
+        settings = SimpleNamespace(
+            image_processing=ImageProcessingConfig(optimize_for_ocr=False),
+            paths=SimpleNamespace(temp_merged=base / "merged"),
+            get_screenshot_path=lambda hotkey: self.screenshots
+        )
+        self.processor = ImageProcessor(settings)
+        self.tracker = StripTracker()
+    
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+    
+    def _capture(self, labels):
+        """Write one screenshot per label in capture order."""
+        for i, label in enumerate(labels):
+            path = make_screenshot(self.screenshots / f"F1_{i:03d}.png", label)
+            os.utime(path, (1000 + i, 1000 + i))
+    
+    def _ocr_lines(self, merge_result, labels_by_hash):
+        """Simulate OCR layout: one line centred in every merged strip."""
+        return [
+            {'text': labels_by_hash[strip_hash], 'left': 5, 'top': top + 5, 'bottom': bottom - 5}
+            for strip_hash, (top, bottom) in merge_result.offsets.items()
+        ]
+    
+    def test_1_first_cycle_ocrs_all_strips(self):
+        """Test 1: First cycle merges every unique strip."""
+        print("\n=== Test 1: First Cycle ===")
+        
+        labels = ["Seller A 100", "Seller B 200", "Seller A 100"]
+        self._capture(labels)
+        
+        result = self.processor.process_hotkey_folder_strips("F1", self.tracker, auto_cleanup=False)
+        
+        self.assertEqual(len(result.strips), 3)
+        self.assertEqual(len(result.changed_hashes), 2)  # Duplicate strip OCR'd once
+        self.assertTrue(result.merged_path.exists())
+        with Image.open(result.merged_path) as merged:
+            self.assertEqual(merged.height, 120)
+        print("✓ Unique strips merged once")
+    
+    def test_2_only_changed_strip_is_merged(self):
+        """Test 2: Second cycle sends only the changed strip and stitches full text."""
+        print("\n=== Test 2: Changed Strip Only ===")
+        
+        labels = ["Seller A 100", "Seller B 200", "Seller C 300"]
+        self._capture(labels)
+        first = self.processor.process_hotkey_folder_strips("F1", self.tracker)
+        labels_by_hash = {strip.strip_hash: label for strip, label in zip(first.strips, labels)}
+        self.tracker.record_layout(first, self._ocr_lines(first, labels_by_hash))
+        
+        labels[1] = "Seller B 150"
+        self._capture(labels)
+        second = self.processor.process_hotkey_folder_strips("F1", self.tracker)
+        
+        self.assertEqual(len(second.changed_hashes), 1)
+        with Image.open(second.merged_path) as merged:
+            self.assertEqual(merged.height, 60)
+        
+        labels_by_hash = {strip.strip_hash: label for strip, label in zip(second.strips, labels)}
+        self.tracker.record_layout(second, self._ocr_lines(second, labels_by_hash))
+        self.assertEqual(
+            self.tracker.stitch_text("F1", second.strips),
+            "Seller A 100\nSeller B 150\nSeller C 300"
+        )
+        print("✓ Only changed strip OCR'd, text stitched in capture order")
+    
+    def test_3_unchanged_cycle_skips_ocr(self):
+        """Test 3: Unchanged screen produces no merged image."""
+        print("\n=== Test 3: Unchanged Cycle ===")
+        
+        labels = ["Seller A 100", "Seller B 200"]
+        self._capture(labels)
+        first = self.processor.process_hotkey_folder_strips("F1", self.tracker)
+        labels_by_hash = {strip.strip_hash: label for strip, label in zip(first.strips, labels)}
+        self.tracker.record_layout(first, self._ocr_lines(first, labels_by_hash))
+        
+        self._capture(labels)
+        second = self.processor.process_hotkey_folder_strips("F1", self.tracker)
+        
+        self.assertIsNone(second.merged_path)
+        self.assertEqual(self.tracker.stitch_text("F1", second.strips), "Seller A 100\nSeller B 200")
+        
+        stats = self.tracker.get_strip_statistics()
+        self.assertEqual(stats['cycles_skipped'], 1)
+        self.assertEqual(stats['strips_reused'], 2)
+        print("✓ OCR skipped when no strip changed")
+    
+    def test_4_fixed_height_strips(self):
+        """Test 4: Screenshots split into fixed-height strips."""
+        self._capture(["Seller A 100"])
+        strips = self.processor.split_into_strips(sorted(self.screenshots.glob("*.png")), strip_height=25)
+        
+        self.assertEqual([strip.height for strip in strips], [25, 25, 10])
+        self.assertEqual([strip.top for strip in strips], [0, 25, 50])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file
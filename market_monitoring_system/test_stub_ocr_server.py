@@ -0,0 +1,132 @@
+"""
+Tests for the local stub OCR server and pipeline benchmark.
+Verifies recognizeText responses with layout, injected 429 and 500 errors, canned text loading and an offline pipeline run.
+"""
+
+import io
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'benchmarks'))
+
+from PIL import Image
+
+from config.settings import SettingsManager
+from core.simple_ocr_client import SimpleYandexOCRClient, OCRRateLimitError
+from stub_ocr_server import StubOCRServer, LatencyModel, load_canned_texts
+from pipeline_benchmark import PipelineBenchmark, generate_corpus, write_config
+
+
+def make_png():
+    """Create a small PNG."""
+    buffer = io.BytesIO()
+    Image.new('L', (40, 20), 255).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class StubOCRServerTest(unittest.TestCase):
+    """Test suite for stub OCR server."""
+    
+    def test_1_recognize_with_layout(self):
+        """Test 1: Client pointed at the stub gets canned text with line and word boxes."""
+        print("\n=== Test 1: Recognize With Layout ===")
+        
+        image = make_png()
+        with StubOCRServer(texts=["Items to Sell Bob\nArrow"], seed=1) as stub:
+            client = SimpleYandexOCRClient(api_key="stub-key", api_url=stub.url)
+            self.assertEqual(client.process_image_bytes(image), "Items to Sell Bob\nArrow")
+            
+            layout = client.process_image_bytes(image, layout=True)
+            self.assertEqual([line['text'] for line in layout['lines']], ["Items to Sell Bob", "Arrow"])
+            self.assertLess(layout['lines'][0]['bottom'], layout['lines'][1]['top'])
+            self.assertEqual([word['text'] for word in layout['lines'][0]['words']], ["Items", "to", "Sell", "Bob"])
+            
+            stats = stub.get_server_statistics()
+        
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['responses'], {200: 2})
+        self.assertEqual(client.get_ocr_statistics()['config_summary']['api_url'], stub.url)
+        
+        print(f"✓ {stats['requests']} requests served by {stub.url}")
+    
+    def test_2_injected_errors(self):
+        """Test 2: Rate limit and server errors are returned as the API would."""
+        print("\n=== Test 2: Injected Errors ===")
+        
+        with StubOCRServer(rate_limit_rate=1.0, retry_after=2.5) as stub:
+            client = SimpleYandexOCRClient(api_key="stub-key", api_url=stub.url)
+            with self.assertRaises(OCRRateLimitError) as context:
+                client.process_image_bytes(make_png())
+            self.assertEqual(context.exception.retry_after, 2.5)
+        
+        with StubOCRServer(error_rate=1.0) as stub:
+            client = SimpleYandexOCRClient(api_key="stub-key", api_url=stub.url)
+            self.assertIsNone(client.process_image_bytes(make_png()))
+            self.assertEqual(stub.get_server_statistics()['responses'], {500: 1})
+        
+        print("✓ 429 with Retry-After and 500 reached the client")
+    
+    def test_3_latency_and_canned_texts(self):
+        """Test 3: Latency specifications parse and canned texts come from stored screenshots."""
+        print("\n=== Test 3: Latency And Canned Texts ===")
+        
+        self.assertEqual(LatencyModel.parse("0.2"), LatencyModel('fixed', 0.2))
+        model = LatencyModel.parse("lognormal:0.3:0.5")
+        rng = random.Random(5)
+        samples = [model.sample(rng) for _ in range(2000)]
+        self.assertTrue(all(sample >= 0 for sample in samples))
+        self.assertAlmostEqual(sum(samples) / len(samples), 0.3, delta=0.05)
+        with self.assertRaises(ValueError):
+            LatencyModel.parse("pareto:1")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            corpus = Path(temp_dir)
+            generate_corpus(corpus, 3)
+            texts, by_hash = load_canned_texts(corpus)
+            stored = (corpus / "trade_001.png").read_bytes()
+            
+            with StubOCRServer(texts, by_hash) as stub:
+                client = SimpleYandexOCRClient(api_key="stub-key", api_url=stub.url)
+                self.assertEqual(client.process_image_bytes(stored),
+                                 (corpus / "trade_001.txt").read_text(encoding='utf-8'))
+        
+        self.assertEqual(len(texts), 3)
+        
+        print(f"✓ Mean lognormal latency {sum(samples) / len(samples):.3f}s, {len(texts)} canned texts")
+    
+    def test_4_pipeline_benchmark(self):
+        """Test 4: Benchmark drives cycles through merge, OCR, parse, engine and database."""
+        print("\n=== Test 4: Pipeline Benchmark ===")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            generate_corpus(base / "corpus", 4)
+            corpus = sorted((base / "corpus").glob("*.png"))
+            
+            with StubOCRServer(seed=2) as stub:
+                config_path = write_config(Path(__file__).parent / "config.json", base, stub.url)
+                settings = SettingsManager(str(config_path))
+                benchmark = PipelineBenchmark(settings, stub, corpus, "F1", screenshots_per_cycle=2, workers=2)
+                try:
+                    report = benchmark.run(cycles=3, rate=20.0, timeout=30.0)
+                finally:
+                    benchmark.close()
+            
+            self.assertEqual(json.loads(config_path.read_text(encoding='utf-8'))['yandex_ocr']['api_url'], stub.url)
+        
+        self.assertEqual(report['completed_cycles'], 3)
+        self.assertEqual(report['items'], 6)
+        self.assertEqual(report['stages']['end_to_end']['count'], 3)
+        self.assertGreaterEqual(report['stages']['end_to_end']['p95_ms'], report['stages']['ocr']['p50_ms'])
+        
+        print(f"✓ {report['completed_cycles']} cycles, {report['items']} items, {report['cycles_per_s']} cycles/s")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
\ No newline at end of file